@@ -8,10 +8,12 @@ designer_config = {
 
 coder_config = {
     "model": "openai:gpt-4o-mini",
+    "context_token_budget": 12000,  # Tokens of existing code per prompt
 }
 
 test_writer_config = {
     "model": "openai:gpt-4o-mini",
+    "context_token_budget": 6000,  # Tokens of existing code per prompt
 }
 
 reviewer_config = {
@@ -24,6 +26,7 @@ executor_config = {
 
 feature_coder_config = {
     "model": "openai:gpt-4o-mini",
+    "context_token_budget": 8000,  # Tokens of existing code per prompt
 }
 
 validator_config = {
@@ -33,3 +36,11 @@ validator_config = {
 feature_reviewer_config = {
     "model": "openai:gpt-4o-mini",  # Use same model as other reviewers
 }
+
+# Models for cascade routing, cheapest first. Routed calls start low and
+# escalate to stronger models when an attempt fails
+model_ladder = [
+    "openai:gpt-3.5-turbo",
+    "openai:gpt-4o-mini",
+    "openai:gpt-4o",
+]
@@ -18,6 +18,8 @@ from beeai_framework.memory import TokenMemory
 from beeai_framework.utils.dicts import exclude_none
 
 from agents.agent_configs import coder_config
+from shared.utils.model_router import resolve_model
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 from workflows.workflow_config import GENERATED_CODE_PATH
 
 # Load environment variables from .env file
@@ -26,7 +28,10 @@ load_dotenv()
 
 async def coder_agent(input: list[Message]) -> AsyncGenerator:
     """Agent responsible for writing code implementations and creating project files"""
-    llm = ChatModel.from_name(coder_config["model"])
+    priority = resolve_priority(input)
+    # The orchestrator may route this call to another model on the ladder
+    model = resolve_model(input, coder_config["model"])
+    llm = ChatModel.from_name(model)
     
     agent = ReActAgent(
         llm=llm, 
@@ -87,7 +92,9 @@ async def coder_agent(input: list[Message]) -> AsyncGenerator:
         memory=TokenMemory(llm)
     )
     
-    response = await agent.run(prompt="Implement the following requirements and create all necessary project files: " + str(input))
+    prompt = "Implement the following requirements and create all necessary project files: " + str(input)
+    async with llm_call_slot(model, prompt, priority):
+        response = await agent.run(prompt=prompt)
     
     # Parse the response to extract files and create project structure
     response_text = response.result.text
@@ -18,6 +18,7 @@ from beeai_framework.utils.dicts import exclude_none
 # Import from agents package using absolute import
 from agents.agent_configs import designer_config
 from agents.designer.prompt_templates import ENHANCED_DESIGNER_TEMPLATE
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 
 # Load environment variables from .env file
 load_dotenv()
@@ -25,6 +26,7 @@ load_dotenv()
 
 async def designer_agent(input: list[Message]) -> AsyncGenerator:
     """Agent responsible for system design and architecture"""
+    priority = resolve_priority(input)
     llm = ChatModel.from_name(designer_config["model"])
     
     agent = ReActAgent(
@@ -41,5 +43,7 @@ async def designer_agent(input: list[Message]) -> AsyncGenerator:
         memory=TokenMemory(llm)
     )
     
-    response = await agent.run(prompt="Create a detailed technical design for: " + str(input))
+    prompt = "Create a detailed technical design for: " + str(input)
+    async with llm_call_slot(designer_config["model"], prompt, priority):
+        response = await agent.run(prompt=prompt)
     yield MessagePart(content=response.result.text)
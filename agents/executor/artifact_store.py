@@ -0,0 +1,525 @@
+"""
+Content-Addressed Artifact Store for the Build Manager
+
+Build artifacts are stored as one blob per unique file content plus a small
+JSON manifest per build key:
+
+    <root>/blobs/<hash[:2]>/<hash>
+    <root>/manifests/<key>.json
+
+Identical files (the same dependency bundled by several projects, unchanged
+files between builds) are stored once. Restoring a build clones blobs into
+the project instead of copying trees: a reflink (copy-on-write) where the
+file system supports it, otherwise a plain copy. Hardlinks are opt-in
+(link_mode="hardlink"): projects restored that way share inodes, so a
+project rebuilding in place changes the files of every other project
+restored from the same blobs. Reflinks and hardlinks only work within one
+file system, so the store should live on the same one as the projects it
+restores into. Lookups read the manifest rather than walking the cached
+tree, and the store is kept under a size limit by evicting the least
+recently used builds.
+
+Earlier versions cached each build as a copied tree, <root>/<type>_<hash>/;
+migrate_legacy_cache removes those once.
+"""
+
+import errno
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from workflows.logger import workflow_logger as logger
+
+
+# FICLONE ioctl (Linux): copy-on-write clone on btrfs/xfs/overlayfs
+_FICLONE = 0x40049409
+
+# Build keys of the copytree cache, <build type>_<12 hex digits>
+_LEGACY_KEY = re.compile(r'^[a-z_]+_[0-9a-f]{12}$')
+
+# Written to a cache directory once its legacy trees are removed
+_LEGACY_MIGRATED = ".legacy_trees_removed"
+
+
+def _hash_file(path: Path) -> str:
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _copy_and_hash(src: Path, dst: Path) -> str:
+    """Copy src to dst and return the SHA-256 of the data, in one read."""
+    digest = hashlib.sha256()
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        for block in iter(lambda: s.read(1024 * 1024), b""):
+            digest.update(block)
+            d.write(block)
+    return digest.hexdigest()
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Try a copy-on-write clone of src to dst."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        return False
+
+
+def migrate_legacy_cache(root: Path) -> int:
+    """
+    Delete the build trees of the copytree build cache, <root>/<type>_<hash>/.
+
+    Runs once per directory (a marker file records the migration) and only
+    removes directories named like legacy build keys.
+
+    Returns:
+        Number of trees removed
+    """
+    root = Path(root)
+    marker = root / _LEGACY_MIGRATED
+    if not root.is_dir() or marker.exists():
+        return 0
+
+    removed = 0
+    for entry in os.scandir(root):
+        if entry.is_dir(follow_symlinks=False) and _LEGACY_KEY.match(entry.name):
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+    marker.touch()
+    if removed:
+        logger.info(f"Removed {removed} legacy build cache trees from {root}")
+    return removed
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for build artifacts.
+
+    With link_mode="hardlink", restored files are hardlinks to blobs. Blob
+    size and mtime are recorded in the manifest and checked before every
+    restore, so a blob modified in place through a hardlink invalidates the
+    builds that reference it instead of being restored. That protects the
+    store, not other projects sharing the inode, hence the opt-in.
+    """
+
+    def __init__(self,
+                 root: Path,
+                 max_size_bytes: int = 2 * 1024 ** 3,
+                 link_mode: str = "auto"):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory
+            max_size_bytes: Total blob size kept before LRU eviction
+            link_mode: "auto" or "reflink" (reflink, then copy), "copy", or
+                "hardlink" (hardlink, then copy; restored projects share files)
+        """
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.manifest_dir = self.root / "manifests"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+        migrate_legacy_cache(self.root)
+        self.max_size_bytes = max_size_bytes
+        self.link_mode = link_mode
+        self._lock = threading.RLock()
+        # Whether the store's file system supports reflinks (probed on first use)
+        self._reflink_supported: Optional[bool] = None
+        # Source files already hashed: path -> (size, mtime_ns, inode, hash)
+        self._source_hashes: Dict[str, tuple] = {}
+        # Blobs verified this session: hash -> (size, mtime_ns)
+        self._known_blobs: Dict[str, tuple] = {}
+        # Manifest index, loaded on first use: key -> (last_used, {hash: size}),
+        # plus the number of builds referencing each blob and their total size
+        self._index: Optional[Dict[str, tuple]] = None
+        self._refcounts: Dict[str, int] = {}
+        self._blob_sizes: Dict[str, int] = {}
+        self._used_bytes = 0
+        self.stats = {
+            "files_stored": 0,
+            "files_deduplicated": 0,
+            "bytes_stored": 0,
+            "bytes_deduplicated": 0,
+            "files_restored": 0,
+            "restores": {"reflink": 0, "hardlink": 0, "copy": 0},
+            "evictions": 0
+        }
+
+    def _blob_path(self, file_hash: str) -> Path:
+        return self.blob_dir / file_hash[:2] / file_hash
+
+    def _manifest_path(self, key: str) -> Path:
+        return self.manifest_dir / f"{key}.json"
+
+    def has(self, key: str) -> bool:
+        """Whether a build key is stored."""
+        return self._manifest_path(key).exists()
+
+    def get_manifest(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a build manifest, or None if the key is not stored."""
+        try:
+            with open(self._manifest_path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Discarding unreadable artifact manifest {key}: {e}")
+            self.remove(key)
+            return None
+
+    def list_files(self, key: str) -> List[str]:
+        """Relative paths of the files stored for a build key."""
+        manifest = self.get_manifest(key)
+        return sorted(manifest["files"]) if manifest else []
+
+    def put(self, key: str, project_path: Path, artifacts: List[str]) -> Dict[str, Any]:
+        """
+        Store the artifacts of a build.
+
+        Args:
+            key: Build cache key
+            project_path: Project the artifacts are relative to
+            artifacts: Artifact files or directories, relative to project_path
+
+        Returns:
+            The written manifest
+        """
+        project_path = Path(project_path)
+        files: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            for artifact in artifacts:
+                src = project_path / artifact
+                if src.is_dir():
+                    sources = [p for p in sorted(src.rglob("*")) if p.is_file() and not p.is_symlink()]
+                elif src.is_file():
+                    sources = [src]
+                else:
+                    continue
+
+                for source in sources:
+                    rel_path = source.relative_to(project_path).as_posix()
+                    files[rel_path] = self._store_blob(source)
+
+            now = time.time()
+            manifest = {
+                "key": key,
+                "artifacts": list(artifacts),
+                "files": files,
+                "total_size": sum(f["size"] for f in files.values()),
+                "created": now,
+                "last_used": now
+            }
+            self._write_manifest(key, manifest)
+            self._index_add(manifest)
+
+        logger.info(f"Stored {len(files)} artifact files for {key}")
+        self.evict()
+        return manifest
+
+    def _store_blob(self, source: Path) -> Dict[str, Any]:
+        """Add one file to the blob store, deduplicating by content."""
+        source_stat = source.stat()
+        signature = (source_stat.st_size, source_stat.st_mtime_ns, source_stat.st_ino)
+        cached = self._source_hashes.get(str(source))
+        file_hash = cached[3] if cached and cached[:3] == signature else None
+
+        if file_hash is None:
+            # Unknown source: copy and hash in one pass, then file it by hash
+            tmp = self.blob_dir / f".incoming.{os.getpid()}.{threading.get_ident()}.tmp"
+            file_hash = _copy_and_hash(source, tmp)
+            blob = self._blob_path(file_hash)
+            if self._blob_valid(file_hash, source_stat.st_size):
+                os.unlink(tmp)
+                self._count_dedup(source_stat.st_size)
+            else:
+                self._add_blob(tmp, blob, source_stat)
+            self._source_hashes[str(source)] = signature + (file_hash,)
+        else:
+            blob = self._blob_path(file_hash)
+            if self._blob_valid(file_hash, source_stat.st_size):
+                self._count_dedup(source_stat.st_size)
+            else:
+                tmp = self.blob_dir / f".incoming.{os.getpid()}.{threading.get_ident()}.tmp"
+                if _copy_and_hash(source, tmp) != file_hash:
+                    # Changed without touching size/mtime: start over
+                    os.unlink(tmp)
+                    self._source_hashes.pop(str(source), None)
+                    return self._store_blob(source)
+                self._add_blob(tmp, blob, source_stat)
+
+        blob_size, blob_mtime_ns = self._known_blobs[file_hash]
+        return {
+            "hash": file_hash,
+            "size": blob_size,
+            "mode": source_stat.st_mode & 0o777,
+            "blob_mtime_ns": blob_mtime_ns
+        }
+
+    def _add_blob(self, tmp: Path, blob: Path, source_stat: os.stat_result):
+        blob.parent.mkdir(exist_ok=True)
+        # Hardlinked restores share the blob's mode
+        os.chmod(tmp, source_stat.st_mode & 0o777)
+        os.replace(tmp, blob)
+        blob_stat = blob.stat()
+        self._known_blobs[blob.name] = (blob_stat.st_size, blob_stat.st_mtime_ns)
+        self.stats["files_stored"] += 1
+        self.stats["bytes_stored"] += source_stat.st_size
+
+    def _count_dedup(self, size: int):
+        self.stats["files_deduplicated"] += 1
+        self.stats["bytes_deduplicated"] += size
+
+    def _blob_valid(self, file_hash: str, size: int) -> bool:
+        """
+        Whether the blob for a hash exists with the right content.
+
+        Blobs seen unchanged this session are trusted by size and mtime; others
+        are re-hashed once, since a blob changed in place through a restored
+        hardlink no longer matches its name.
+        """
+        blob = self._blob_path(file_hash)
+        try:
+            blob_stat = blob.stat()
+        except FileNotFoundError:
+            return False
+        if blob_stat.st_size != size:
+            return False
+
+        signature = (blob_stat.st_size, blob_stat.st_mtime_ns)
+        if self._known_blobs.get(file_hash) == signature:
+            return True
+        if _hash_file(blob) == file_hash:
+            self._known_blobs[file_hash] = signature
+            return True
+        return False
+
+    def restore(self, key: str, dest: Path) -> Optional[List[str]]:
+        """
+        Restore a build's artifacts into a project directory.
+
+        Args:
+            key: Build cache key
+            dest: Project directory to restore into
+
+        Returns:
+            Restored relative paths, or None if the key is missing or a blob
+            is missing or was modified (the key is then dropped)
+        """
+        dest = Path(dest)
+        with self._lock:
+            manifest = self.get_manifest(key)
+            if not manifest:
+                return None
+
+            for rel_path, entry in manifest["files"].items():
+                if not self._blob_intact(entry):
+                    logger.warning(f"Artifact blob for {rel_path} in {key} is missing or modified; dropping {key}")
+                    self.remove(key)
+                    return None
+
+            created_dirs = set()
+            for rel_path, entry in manifest["files"].items():
+                target = dest / rel_path
+                if target.parent not in created_dirs:
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    created_dirs.add(target.parent)
+                try:
+                    target.unlink()
+                except FileNotFoundError:
+                    pass
+                except IsADirectoryError:
+                    shutil.rmtree(target)
+                method = self._link(self._blob_path(entry["hash"]), target)
+                if method != "hardlink":
+                    os.chmod(target, entry.get("mode", 0o644))
+                self.stats["restores"][method] += 1
+                self.stats["files_restored"] += 1
+
+            manifest["last_used"] = time.time()
+            self._write_manifest(key, manifest)
+            self._index_add(manifest)
+
+        return sorted(manifest["files"])
+
+    def _blob_intact(self, entry: Dict[str, Any]) -> bool:
+        try:
+            blob_stat = self._blob_path(entry["hash"]).stat()
+        except FileNotFoundError:
+            return False
+        if (blob_stat.st_size, blob_stat.st_mtime_ns) != (entry["size"], entry["blob_mtime_ns"]):
+            return False
+        self._known_blobs.setdefault(entry["hash"], (blob_stat.st_size, blob_stat.st_mtime_ns))
+        return True
+
+    def _link(self, blob: Path, target: Path) -> str:
+        """Materialize a blob at target; returns the method used."""
+        if self.link_mode in ("auto", "reflink") and self._reflink_supported is not False:
+            if _reflink(blob, target):
+                self._reflink_supported = True
+                return "reflink"
+            self._reflink_supported = False
+        if self.link_mode == "hardlink":
+            try:
+                os.link(blob, target)
+                return "hardlink"
+            except OSError as e:
+                if e.errno == errno.EXDEV:
+                    logger.warning(f"Artifact store {self.root} is on another file system than "
+                                   f"{target.parent}; restoring by copy")
+                    self.link_mode = "copy"
+        shutil.copyfile(blob, target)
+        return "copy"
+
+    def remove(self, key: str):
+        """Forget a build key (blobs are reclaimed by gc)."""
+        with self._lock:
+            try:
+                self._manifest_path(key).unlink()
+            except FileNotFoundError:
+                pass
+            if self._index is not None:
+                self._index_remove(key)
+
+    def _load_index(self, reload: bool = False):
+        """Build the manifest index from disk if it is not loaded yet (or again)."""
+        if self._index is None or reload:
+            self._index = {}
+            self._refcounts.clear()
+            self._blob_sizes.clear()
+            self._used_bytes = 0
+            for manifest in self._load_manifests():
+                self._index_add(manifest)
+
+    def _index_add(self, manifest: Dict[str, Any]):
+        """Add or replace a build in the index."""
+        if self._index is None:
+            # Loading reads the manifest just written
+            self._load_index()
+            return
+        self._index_remove(manifest["key"])
+        hashes = {entry["hash"]: entry["size"] for entry in manifest["files"].values()}
+        self._index[manifest["key"]] = (manifest.get("last_used", 0), hashes)
+        for file_hash, size in hashes.items():
+            if not self._refcounts.get(file_hash):
+                self._blob_sizes[file_hash] = size
+                self._used_bytes += size
+            self._refcounts[file_hash] = self._refcounts.get(file_hash, 0) + 1
+
+    def _index_remove(self, key: str):
+        """Drop a build from the index, releasing its blob references."""
+        indexed = self._index.pop(key, None)
+        if indexed is None:
+            return
+        for file_hash in indexed[1]:
+            self._refcounts[file_hash] -= 1
+            if not self._refcounts[file_hash]:
+                del self._refcounts[file_hash]
+                self._used_bytes -= self._blob_sizes.pop(file_hash)
+
+    def _write_manifest(self, key: str, manifest: Dict[str, Any]):
+        path = self._manifest_path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.manifest_dir, prefix=f".{key}.", suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, path)
+
+    def _load_manifests(self) -> List[Dict[str, Any]]:
+        manifests = []
+        for path in self.manifest_dir.glob("*.json"):
+            manifest = self.get_manifest(path.stem)
+            if manifest:
+                manifests.append(manifest)
+        return manifests
+
+    def total_size(self) -> int:
+        """Total size of all blobs on disk."""
+        return sum(blob.stat().st_size for blob in self.blob_dir.glob("*/*") if not blob.name.startswith("."))
+
+    def evict(self, max_size_bytes: Optional[int] = None) -> List[str]:
+        """
+        Evict least recently used builds until blobs fit the size limit.
+
+        Returns:
+            Evicted build keys
+        """
+        limit = self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        evicted = []
+
+        with self._lock:
+            self._load_index()
+            if self._used_bytes > limit:
+                for key in sorted(self._index, key=lambda k: self._index[k][0]):
+                    if self._used_bytes <= limit:
+                        break
+                    self.remove(key)
+                    evicted.append(key)
+
+            if evicted:
+                self.stats["evictions"] += len(evicted)
+                logger.info(f"Evicted {len(evicted)} cached builds: {', '.join(evicted)}")
+                self.gc()
+
+        return evicted
+
+    def evict_older_than(self, seconds: float) -> List[str]:
+        """Evict builds not used within the given number of seconds."""
+        cutoff = time.time() - seconds
+        evicted = []
+        with self._lock:
+            self._load_index()
+            for key, (last_used, _) in list(self._index.items()):
+                if last_used < cutoff:
+                    self.remove(key)
+                    evicted.append(key)
+            self.gc()
+        return evicted
+
+    def gc(self) -> int:
+        """
+        Delete blobs no manifest references.
+
+        Returns:
+            Number of blobs removed
+        """
+        with self._lock:
+            # Re-read the manifests: other processes may share the store
+            self._load_index(reload=True)
+            removed = 0
+            for blob in self.blob_dir.glob("*/*"):
+                # Dot-prefixed names are blobs still being written
+                if not blob.name.startswith(".") and blob.name not in self._refcounts:
+                    blob.unlink()
+                    removed += 1
+            return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Store statistics, including current size and number of builds."""
+        return {
+            **self.stats,
+            "builds": len(list(self.manifest_dir.glob("*.json"))),
+            "total_size": self.total_size(),
+            "max_size": self.max_size_bytes
+        }
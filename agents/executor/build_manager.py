@@ -7,14 +7,16 @@ import os
 import subprocess
 import json
 import hashlib
-import shutil
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import tempfile
 
+from agents.executor.artifact_store import ArtifactStore, migrate_legacy_cache
+from agents.executor.dependency_cache import DependencyCache, get_dependency_cache
+from shared.utils.project_index import ProjectIndex, get_project_index
 from workflows.logger import workflow_logger as logger
-from workflows.workflow_config import BUILD_CONFIGS
+from workflows.workflow_config import BUILD_CONFIGS, GENERATED_CODE_PATH
 
 
 class BuildResult:
@@ -70,15 +72,29 @@ class BuildConfig:
 class BuildManager:
     """Manages build operations for different project types"""
     
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(self,
+                 cache_dir: Optional[Path] = None,
+                 max_cache_size_bytes: int = 2 * 1024 ** 3,
+                 dependency_cache: Optional[DependencyCache] = None):
         """
         Initialize BuildManager
         
         Args:
-            cache_dir: Directory for caching build artifacts
+            cache_dir: Directory for caching build artifacts (default: next to
+                the generated projects, so restores can reflink)
+            max_cache_size_bytes: Size limit of the artifact cache (LRU eviction)
+            dependency_cache: Shared dependency cache (default: the global one)
         """
-        self.cache_dir = cache_dir or Path(tempfile.gettempdir()) / "build_cache"
+        self.cache_dir = cache_dir or Path(GENERATED_CODE_PATH) / ".build_cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.artifact_store = ArtifactStore(self.cache_dir, max_size_bytes=max_cache_size_bytes)
+        if cache_dir is None:
+            # Builds cached in the previous default location as copied trees
+            migrate_legacy_cache(Path(tempfile.gettempdir()) / "build_cache")
+        self.dependency_cache = dependency_cache or get_dependency_cache()
+        
+        # Digests of cache key input files, keyed by path and (size, mtime)
+        self._file_digests: Dict[str, Tuple[Tuple[int, int], str]] = {}
         
         # Build detection patterns
         self.detection_patterns = {
@@ -92,12 +108,13 @@ class BuildManager:
             "dotnet": ["*.csproj", "*.sln"]
         }
     
-    def detect_build_type(self, project_path: Path) -> Optional[str]:
+    def detect_build_type(self, project_path: Path, index: Optional[ProjectIndex] = None) -> Optional[str]:
         """
         Detect the build type for a project
         
         Args:
             project_path: Path to the project directory
+            index: Project index covering project_path (file system is used if None)
             
         Returns:
             Build type string or None if not detected
@@ -105,25 +122,45 @@ class BuildManager:
         if not project_path.exists():
             return None
         
+        if index is not None:
+            rel_dir = os.path.relpath(project_path, index.root)
+            
+            def exists(name: str) -> bool:
+                return index.exists(os.path.join(rel_dir, name))
+            
+            def glob(pattern: str) -> List[str]:
+                return index.glob(rel_dir, pattern)
+            
+            def read_package_json() -> Dict:
+                return index.read_json(os.path.join(rel_dir, "package.json")) or {}
+        else:
+            def exists(name: str) -> bool:
+                return (project_path / name).exists()
+            
+            def glob(pattern: str) -> List[str]:
+                return list(project_path.glob(pattern))
+            
+            def read_package_json() -> Dict:
+                return json.loads((project_path / "package.json").read_text())
+        
         # Check for specific build files
         for build_type, patterns in self.detection_patterns.items():
             for pattern in patterns:
                 if pattern.startswith("*"):
                     # Glob pattern
-                    if list(project_path.glob(pattern)):
+                    if glob(pattern):
                         return build_type
                 else:
                     # Exact file
-                    if (project_path / pattern).exists():
+                    if exists(pattern):
                         # Additional checks for specific types
-                        if build_type == "angular" and (project_path / "angular.json").exists():
+                        if build_type == "angular" and exists("angular.json"):
                             return "angular"
                         elif build_type == "react":
                             # Check package.json for React
-                            pkg_path = project_path / "package.json"
-                            if pkg_path.exists():
+                            if exists("package.json"):
                                 try:
-                                    pkg_data = json.loads(pkg_path.read_text())
+                                    pkg_data = read_package_json()
                                     deps = pkg_data.get("dependencies", {})
                                     dev_deps = pkg_data.get("devDependencies", {})
                                     if "react" in deps or "react" in dev_deps:
@@ -132,18 +169,17 @@ class BuildManager:
                                     pass
                         elif build_type == "node_typescript":
                             # Must have both tsconfig and package.json
-                            if (project_path / "tsconfig.json").exists() and \
-                               (project_path / "package.json").exists():
+                            if exists("tsconfig.json") and exists("package.json"):
                                 return "node_typescript"
                         elif build_type == "node":
                             # Only return node if not TypeScript
-                            if not (project_path / "tsconfig.json").exists():
+                            if not exists("tsconfig.json"):
                                 return "node"
                         else:
                             return build_type
         
         # Check for Dockerfile as fallback
-        if (project_path / "Dockerfile").exists():
+        if exists("Dockerfile"):
             return "docker"
         
         return None
@@ -152,6 +188,9 @@ class BuildManager:
         """
         Detect all buildable projects in a directory tree
         
+        Uses the shared project index, so the tree is walked once rather
+        than globbed per level and probed file by file.
+        
         Args:
             root_path: Root directory to search
             
@@ -160,48 +199,31 @@ class BuildManager:
         """
         builds = []
         detected_paths = set()
-        
-        # First check root
-        root_type = self.detect_build_type(root_path)
-        if root_type:
-            builds.append({
-                "path": root_path,
-                "type": root_type
-            })
-            detected_paths.add(root_path)
-        
-        # Then check immediate subdirectories
-        for subdir in root_path.iterdir():
-            if subdir.is_dir() and not subdir.name.startswith('.'):
-                if subdir not in detected_paths:
-                    build_type = self.detect_build_type(subdir)
-                    if build_type:
-                        builds.append({
-                            "path": subdir,
-                            "type": build_type
-                        })
-                        detected_paths.add(subdir)
-        
-        # Check nested directories up to 3 levels
-        for level in range(1, 3):
-            pattern = "*/" * level
-            for path in root_path.glob(pattern):
-                if path.is_dir() and not path.name.startswith('.') and path not in detected_paths:
-                    # Skip if a parent directory is already detected
-                    skip = False
-                    for detected in detected_paths:
-                        if path != detected and path.is_relative_to(detected):
-                            skip = True
-                            break
-                    
-                    if not skip:
-                        build_type = self.detect_build_type(path)
-                        if build_type:
-                            builds.append({
-                                "path": path,
-                                "type": build_type
-                            })
-                            detected_paths.add(path)
+        index = get_project_index(root_path)
+        
+        # Root first, then subdirectories up to 2 levels deep, shallowest first
+        candidates = [root_path] + [
+            root_path / rel_dir
+            for rel_dir in sorted(index.directories, key=lambda d: (d.count(os.sep), d))
+            if rel_dir.count(os.sep) < 2
+        ]
+        
+        for path in candidates:
+            rel_parts = path.relative_to(root_path).parts
+            if any(part.startswith('.') for part in rel_parts):
+                continue
+            
+            # Skip nested directories if a parent directory is already detected
+            if len(rel_parts) > 1 and any(path.is_relative_to(detected) for detected in detected_paths):
+                continue
+            
+            build_type = self.detect_build_type(path, index)
+            if build_type:
+                builds.append({
+                    "path": path,
+                    "type": build_type
+                })
+                detected_paths.add(path)
         
         return builds
     
@@ -215,43 +237,52 @@ class BuildManager:
                         "requirements.txt", "Pipfile", "Pipfile.lock",
                         "pom.xml", "build.gradle"]
         
-        for pkg_file in package_files:
-            file_path = build_config.path / pkg_file
-            if file_path.exists():
-                hasher.update(file_path.read_bytes())
-        
         # Hash build configuration files
         config_files = ["tsconfig.json", "angular.json", "webpack.config.js",
                        "vite.config.js", ".babelrc", "setup.py"]
         
-        for cfg_file in config_files:
-            file_path = build_config.path / cfg_file
-            if file_path.exists():
-                hasher.update(file_path.read_bytes())
+        for name in package_files + config_files:
+            digest = self._file_digest(build_config.path / name)
+            if digest:
+                hasher.update(digest.encode())
         
         # Include build type
         hasher.update(build_config.type.encode())
         
         return f"{build_config.type}_{hasher.hexdigest()[:12]}"
     
+    def _file_digest(self, file_path: Path) -> Optional[str]:
+        """Digest of a file, only re-read when its size or mtime changed"""
+        try:
+            file_stat = file_path.stat()
+        except OSError:
+            return None
+        
+        signature = (file_stat.st_size, file_stat.st_mtime_ns)
+        cached = self._file_digests.get(str(file_path))
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        digest = hashlib.md5(file_path.read_bytes()).hexdigest()
+        self._file_digests[str(file_path)] = (signature, digest)
+        return digest
+    
     def is_cached(self, cache_key: str) -> bool:
         """Check if build artifacts are cached"""
-        cache_path = self.cache_dir / cache_key
-        return cache_path.exists()
+        return self.artifact_store.has(cache_key)
     
     def get_cached_artifacts(self, cache_key: str) -> List[str]:
-        """Get list of cached artifacts"""
-        cache_path = self.cache_dir / cache_key
-        if not cache_path.exists():
-            return []
-        
-        # List all files in cache
-        artifacts = []
-        for item in cache_path.rglob("*"):
-            if item.is_file():
-                artifacts.append(str(item.relative_to(cache_path)))
+        """Get list of cached artifacts (read from the build's manifest)"""
+        return self.artifact_store.list_files(cache_key)
+    
+    def restore_cached_artifacts(self, cache_key: str, project_path: Path) -> Optional[List[str]]:
+        """
+        Restore cached artifacts into a project by linking stored blobs
         
-        return artifacts
+        Returns:
+            Restored files, or None if the cache entry is missing or invalid
+        """
+        return self.artifact_store.restore(cache_key, project_path)
     
     def _run_command(self, command: str, cwd: Path, env: Dict[str, str] = None) -> Tuple[bool, str, str]:
         """
@@ -291,22 +322,72 @@ class BuildManager:
         """
         Install project dependencies
         
+        Installs go through the shared dependency cache: a project whose
+        dependency set matches an environment snapshot reuses it, otherwise
+        the install command runs against the shared pip/npm caches.
+        
         Args:
             project_path: Path to project
             install_command: Command to run
             env: Environment variables
             
         Returns:
-            Result dictionary
+            Result dictionary. "environment" holds variables later commands
+            need (e.g. an activated virtualenv), "snapshot" whether a
+            snapshot was used.
         """
         logger.info(f"Installing dependencies for {project_path}")
+        project_path = Path(project_path)
+        cache = self.dependency_cache
+        ecosystem = DependencyCache.detect_ecosystem(install_command) if cache else None
+        
+        if ecosystem == "python" and cache.snapshots:
+            requirements = project_path / "requirements.txt"
+            # Only the pip step is served by the snapshot; other steps run in a
+            # project venv layered on it so they cannot change the shared snapshot
+            remaining = DependencyCache.split_requirements_install(install_command)
+            if requirements.exists() and remaining is not None:
+                snapshot = cache.python_snapshot(requirements.read_text())
+                venv = snapshot
+                if snapshot and remaining:
+                    venv = cache.layered_venv(snapshot, project_path / ".venv")
+                if venv:
+                    environment = DependencyCache.venv_environment(venv, snapshot if venv != snapshot else None)
+                    output = f"Using Python environment snapshot {snapshot.parent.name}"
+                    success, stdout, stderr = True, "", ""
+                    if remaining:
+                        step_env = {**cache.install_env(ecosystem), **(env or {}), **environment}
+                        success, stdout, stderr = self._run_command(remaining, project_path, step_env)
+                    return {
+                        "success": success,
+                        "output": f"{output}\n{stdout}" if stdout else output,
+                        "error": stderr,
+                        "environment": environment,
+                        "snapshot": True
+                    }
+        
+        if ecosystem == "node" and cache.snapshots and cache.restore_node_snapshot(project_path):
+            return {
+                "success": True,
+                "output": "Restored node_modules from snapshot",
+                "error": "",
+                "environment": {},
+                "snapshot": True
+            }
+        
+        install_env = dict(cache.install_env(ecosystem)) if ecosystem else {}
+        install_env.update(env or {})
+        success, stdout, stderr = self._run_command(install_command, project_path, install_env)
         
-        success, stdout, stderr = self._run_command(install_command, project_path, env)
+        if success and ecosystem == "node" and cache.snapshots:
+            cache.save_node_snapshot(project_path)
         
         return {
             "success": success,
             "output": stdout,
-            "error": stderr
+            "error": stderr,
+            "environment": {},
+            "snapshot": False
         }
     
     def build(self, build_config: BuildConfig) -> BuildResult:
@@ -325,17 +406,19 @@ class BuildManager:
         cache_key = ""
         if build_config.cache:
             cache_key = self._get_cache_key(build_config)
-            if self.is_cached(cache_key):
+            restored = self.restore_cached_artifacts(cache_key, build_config.path)
+            if restored is not None:
                 logger.info(f"Using cached build for {cache_key}")
                 return BuildResult(
                     success=True,
                     build_type=build_config.type,
                     output="Using cached build",
-                    artifacts=self.get_cached_artifacts(cache_key),
+                    artifacts=restored,
                     cache_key=cache_key
                 )
         
         # Run install if specified
+        build_env = dict(build_config.environment)
         if "install" in build_config.commands:
             install_result = self.install_dependencies(
                 build_config.path,
@@ -349,6 +432,7 @@ class BuildManager:
                     error=f"Install failed: {install_result['error']}",
                     output=install_result["output"]
                 )
+            build_env.update(install_result.get("environment", {}))
         
         # Run build command
         if "build" in build_config.commands:
@@ -357,7 +441,7 @@ class BuildManager:
             success, stdout, stderr = self._run_command(
                 build_config.commands["build"],
                 build_config.path,
-                build_config.environment
+                build_env
             )
             
             if not success:
@@ -425,19 +509,8 @@ class BuildManager:
         return artifacts
     
     def _cache_artifacts(self, cache_key: str, project_path: Path, artifacts: List[str]):
-        """Cache build artifacts"""
-        cache_path = self.cache_dir / cache_key
-        cache_path.mkdir(parents=True, exist_ok=True)
-        
-        for artifact in artifacts:
-            src = project_path / artifact
-            if src.exists():
-                dst = cache_path / artifact
-                if src.is_dir():
-                    shutil.copytree(src, dst, dirs_exist_ok=True)
-                else:
-                    dst.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(src, dst)
+        """Cache build artifacts in the content-addressed store"""
+        self.artifact_store.put(cache_key, project_path, artifacts)
         
         logger.info(f"Cached {len(artifacts)} artifacts for {cache_key}")
     
@@ -482,14 +555,5 @@ class BuildManager:
     
     def clean_cache(self, older_than_days: int = 7):
         """Clean old cache entries"""
-        import time
-        
-        now = time.time()
-        cutoff = now - (older_than_days * 24 * 60 * 60)
-        
-        for cache_entry in self.cache_dir.iterdir():
-            if cache_entry.is_dir():
-                mtime = cache_entry.stat().st_mtime
-                if mtime < cutoff:
-                    shutil.rmtree(cache_entry)
-                    logger.info(f"Removed old cache: {cache_entry.name}")
\ No newline at end of file
+        for cache_key in self.artifact_store.evict_older_than(older_than_days * 24 * 60 * 60):
+            logger.info(f"Removed old cache: {cache_key}")
@@ -0,0 +1,655 @@
+"""
+Shared Dependency Cache for Generated Projects
+
+Generated projects keep installing the same few frameworks (fastapi, pytest,
+express, jest), so installs are served from caches shared across projects:
+
+- pip's HTTP cache and a local wheelhouse (offline-capable with --no-index)
+- npm's content cache (with --prefer-offline / --offline)
+- environment snapshots keyed by the normalized dependency set: a Python
+  virtualenv per requirements set and a node_modules tree per package.json
+  dependency set. A project whose manifest matches a snapshot starts from
+  that environment instead of reinstalling.
+
+Building a Python snapshot also fills the wheelhouse, which later offline
+installs and Docker builds install from; the full set of wheels pip
+resolved for each requirements set is recorded so it can be staged as a
+whole. node_modules snapshots are
+hardlinked into projects, so a project writing to a linked file in place
+also changes the snapshot; snapshots record the size and modification time
+of every file and are discarded when they no longer match.
+
+Docker builds reuse the same caches: matching wheels and node_modules
+snapshots are linked into the build context (see
+DockerEnvironmentManager._stage_dependency_cache).
+"""
+
+import hashlib
+import json
+import os
+import platform
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from workflows.logger import workflow_logger as logger
+from workflows.workflow_config import DEPENDENCY_CACHE_CONFIG
+
+
+# Marker written once a snapshot is fully installed
+_COMPLETE_MARKER = ".snapshot-complete"
+
+# Sizes and modification times of the files in a node_modules snapshot
+_MANIFEST = ".snapshot-manifest.json"
+
+# Python tag of a wheel ("py3", "cp311"): interpreter, major, minor
+_PYTHON_TAG = re.compile(r"^(py|cp)(\d)(\d*)$")
+
+
+def normalize_package_name(name: str) -> str:
+    """Normalize a Python distribution name (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def normalize_requirements(requirements_text: str) -> List[str]:
+    """
+    Normalize requirements.txt content into a sorted, de-duplicated list.
+
+    Comments, blank lines and whitespace are dropped and package names are
+    normalized, so formatting-only differences map to the same snapshot.
+    """
+    normalized = set()
+    for line in requirements_text.splitlines():
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("-"):
+            # Options such as --index-url are kept verbatim
+            normalized.add(" ".join(line.split()))
+            continue
+        match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$", line)
+        if match:
+            name, rest = match.groups()
+            normalized.add(normalize_package_name(name) + rest.replace(" ", "").lower())
+        else:
+            normalized.add(line.replace(" ", ""))
+    return sorted(normalized)
+
+
+def requirement_names(requirements_text: str) -> List[str]:
+    """Normalized names of the packages in a requirements file."""
+    names = []
+    for requirement in normalize_requirements(requirements_text):
+        match = re.match(r"^([a-z0-9][a-z0-9-]*)", requirement)
+        if match and not requirement.startswith("-"):
+            names.append(match.group(1))
+    return names
+
+
+def normalize_package_json(package_data: Dict[str, Any]) -> List[str]:
+    """Normalize the dependency sections of a package.json."""
+    normalized = []
+    for section in ("dependencies", "devDependencies", "optionalDependencies"):
+        for name, spec in sorted(package_data.get(section, {}).items()):
+            normalized.append(f"{section}:{name}@{spec}")
+    return normalized
+
+
+def wheel_supported(filename: str, python_version: str, musl: bool = False) -> bool:
+    """
+    Whether a wheel installs on a Linux CPython of the given version.
+
+    Containers run on the host's architecture; glibc images take manylinux
+    wheels and Alpine (musl) images musllinux ones. Wheels built for another
+    interpreter, ABI or operating system (e.g. on a macOS host) are rejected.
+    """
+    parts = filename[:-len(".whl")].split("-")
+    if not filename.endswith(".whl") or len(parts) not in (5, 6):
+        return False
+    pythons, abis, platforms = (set(tags.split(".")) for tags in parts[-3:])
+    match = re.match(r"^(\d+)(?:\.(\d+))?", python_version or "")
+    if not match:
+        return False
+    major = int(match.group(1))
+    minor = int(match.group(2)) if match.group(2) else None
+
+    def runs_on(tag: str, exact: bool = False) -> bool:
+        tag_match = _PYTHON_TAG.match(tag)
+        if not tag_match or int(tag_match.group(2)) != major:
+            return False
+        if not tag_match.group(3):
+            return not exact
+        if minor is None:
+            return False
+        tag_minor = int(tag_match.group(3))
+        return tag_minor == minor if exact else tag_minor <= minor
+
+    if "any" not in platforms:
+        linux = "musllinux" if musl else "manylinux"
+        arch = platform.machine().lower()
+        if not any(re.match(rf"^{linux}\w*_{re.escape(arch)}$", tag) for tag in platforms):
+            return False
+        if "abi3" in abis:
+            return any(tag.startswith("cp") and runs_on(tag) for tag in pythons)
+        if "none" not in abis:
+            # CPython-specific ABI such as cp311: only that exact version
+            return minor is not None and f"cp{major}{minor}" in pythons and any(
+                abi.startswith(f"cp{major}{minor}") for abi in abis
+            )
+    return "none" in abis and any(runs_on(tag) for tag in pythons)
+
+
+def dependency_key(ecosystem: str, normalized: List[str], runtime: str = "") -> str:
+    """Snapshot key for a normalized dependency set."""
+    digest = hashlib.sha256("\n".join([runtime] + normalized).encode()).hexdigest()
+    return f"{ecosystem}-{digest[:16]}"
+
+
+def link_tree(src: Path, dst: Path) -> int:
+    """
+    Recreate a directory tree using hardlinks (copying across devices).
+
+    Symlinks are recreated as symlinks. Returns the number of files linked.
+    """
+    linked = 0
+    for root, dirs, files in os.walk(src):
+        rel_root = os.path.relpath(root, src)
+        target_root = dst / rel_root if rel_root != "." else dst
+        target_root.mkdir(parents=True, exist_ok=True)
+        for name in dirs + files:
+            source = Path(root) / name
+            target = target_root / name
+            if source.is_symlink():
+                os.symlink(os.readlink(source), target)
+                if name in dirs:
+                    dirs.remove(name)
+            elif name in files:
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copy2(source, target)
+                linked += 1
+    return linked
+
+
+class DependencyCache:
+    """Shared pip/npm caches and environment snapshots."""
+
+    def __init__(self,
+                 cache_dir: Optional[Path] = None,
+                 offline: bool = False,
+                 snapshots: bool = True,
+                 max_snapshots: int = 20):
+        """
+        Initialize the dependency cache.
+
+        Args:
+            cache_dir: Root directory (default: ~/.cache/agent_blackwell/dependencies)
+            offline: Install only from local caches
+            snapshots: Reuse installed environments for identical dependency sets
+            max_snapshots: Snapshots kept per ecosystem (least recently used removed)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else \
+            Path.home() / ".cache" / "agent_blackwell" / "dependencies"
+        self.pip_cache_dir = self.cache_dir / "pip"
+        self.wheelhouse = self.cache_dir / "wheels"
+        # Wheel file names each requirements set resolved to, keyed like snapshots
+        self.wheel_set_dir = self.cache_dir / "wheel_sets"
+        self.npm_cache_dir = self.cache_dir / "npm"
+        self.snapshot_dir = self.cache_dir / "snapshots"
+        for directory in (self.pip_cache_dir, self.wheelhouse, self.wheel_set_dir,
+                          self.npm_cache_dir, self.snapshot_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self.offline = offline
+        self.snapshots = snapshots
+        self.max_snapshots = max_snapshots
+        # _lock guards stats and the per-snapshot locks; installs hold only their snapshot's lock
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._node_version: Optional[str] = None
+        self.stats = {"snapshot_hits": 0, "snapshot_misses": 0, "snapshots_created": 0}
+
+    # Install environment
+
+    def install_env(self, ecosystem: str) -> Dict[str, str]:
+        """Environment variables pointing pip/npm at the shared caches."""
+        if ecosystem == "python":
+            env = {
+                "PIP_CACHE_DIR": str(self.pip_cache_dir),
+                "PIP_FIND_LINKS": str(self.wheelhouse),
+                "PIP_DISABLE_PIP_VERSION_CHECK": "1"
+            }
+            if self.offline:
+                env["PIP_NO_INDEX"] = "1"
+            return env
+        if ecosystem == "node":
+            env = {
+                "npm_config_cache": str(self.npm_cache_dir),
+                "npm_config_prefer_offline": "true",
+                "npm_config_audit": "false",
+                "npm_config_fund": "false"
+            }
+            if self.offline:
+                env["npm_config_offline"] = "true"
+            return env
+        return {}
+
+    @staticmethod
+    def detect_ecosystem(install_command: str) -> Optional[str]:
+        """Ecosystem an install command belongs to."""
+        if re.search(r"\b(pip3?|python3? -m pip|poetry|pipenv)\b", install_command):
+            return "python"
+        if re.search(r"\b(npm|yarn|pnpm)\b", install_command):
+            return "node"
+        return None
+
+    @staticmethod
+    def split_requirements_install(install_command: str) -> Optional[str]:
+        """
+        Remove the `pip install -r requirements.txt` step from an install command.
+
+        Only `&&` chains are split; a command with other shell operators is
+        left alone. Returns the remaining steps joined with `&&` ("" if the
+        pip step was the whole command), or None if there is no such step.
+        """
+        if re.search(r"[;|&]", install_command.replace("&&", " ")):
+            return None
+        steps = [step.strip() for step in install_command.split("&&")]
+        remaining = [step for step in steps if not DependencyCache._is_requirements_install(step)]
+        if len(remaining) == len(steps):
+            return None
+        return " && ".join(remaining)
+
+    @staticmethod
+    def _is_requirements_install(step: str) -> bool:
+        """Whether a command only installs requirements.txt with pip (flags allowed)."""
+        try:
+            tokens = shlex.split(step)
+        except ValueError:
+            return False
+        if tokens[:1] in (["pip"], ["pip3"]):
+            args = tokens[1:]
+        elif len(tokens) >= 3 and tokens[0] in ("python", "python3") and tokens[1:3] == ["-m", "pip"]:
+            args = tokens[3:]
+        else:
+            return False
+        if args[:1] != ["install"]:
+            return False
+        args = args[1:]
+        for option in ("-r", "--requirement"):
+            if option in args:
+                index = args.index(option)
+                if args[index + 1:index + 2] in (["requirements.txt"], ["./requirements.txt"]):
+                    rest = args[:index] + args[index + 2:]
+                    return all(arg.startswith("-") for arg in rest)
+        return False
+
+    # Keys
+
+    def python_key(self, requirements_text: str) -> str:
+        runtime = f"py{sys.version_info.major}.{sys.version_info.minor}-{sys.platform}"
+        return dependency_key("python", normalize_requirements(requirements_text), runtime)
+
+    def node_key(self, package_data: Dict[str, Any], lockfile: Optional[str] = None) -> str:
+        normalized = normalize_package_json(package_data)
+        if lockfile:
+            # A lockfile pins the full tree, so it is part of the key
+            normalized.append("lock:" + hashlib.sha256(lockfile.encode()).hexdigest())
+        return dependency_key("node", normalized, self._get_node_version())
+
+    def _get_node_version(self) -> str:
+        if self._node_version is None:
+            try:
+                result = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=10)
+                self._node_version = result.stdout.strip()
+            except (OSError, subprocess.SubprocessError):
+                self._node_version = ""
+        return self._node_version
+
+    # Python snapshots
+
+    def python_snapshot(self, requirements_text: str) -> Optional[Path]:
+        """
+        Get a virtualenv with the given requirements installed.
+
+        The venv is created on first use and reused for every project with
+        the same normalized requirements. Virtualenvs are not relocatable, so
+        it is built in place and only marked complete once the install succeeded.
+
+        Returns:
+            Path of the virtualenv, or None if it could not be created
+        """
+        key = self.python_key(requirements_text)
+        snapshot = self.snapshot_dir / key
+        venv = snapshot / "venv"
+
+        with self._key_lock(key):
+            if (snapshot / _COMPLETE_MARKER).exists():
+                self._touch(snapshot)
+                self._count("snapshot_hits")
+                logger.info(f"Using Python environment snapshot {key}")
+                return venv
+
+            self._count("snapshot_misses")
+            shutil.rmtree(snapshot, ignore_errors=True)
+            snapshot.mkdir(parents=True)
+            (snapshot / "requirements.txt").write_text(requirements_text)
+
+            logger.info(f"Creating Python environment snapshot {key}")
+            if not self.offline and not self.populate_wheelhouse(requirements_text):
+                # Packages without wheels are still installed from source below
+                logger.info(f"Wheelhouse only partly covers snapshot {key}")
+            commands = [
+                [sys.executable, "-m", "venv", str(venv)],
+                [str(self.venv_python(venv)), "-m", "pip", "install", "-r", str(snapshot / "requirements.txt")]
+            ]
+            for command in commands:
+                if not self._run(command, self.install_env("python")):
+                    shutil.rmtree(snapshot, ignore_errors=True)
+                    return None
+
+            self._mark_complete(snapshot)
+            self._count("snapshots_created")
+        self._evict_snapshots("python")
+        return venv
+
+    @staticmethod
+    def venv_python(venv: Path) -> Path:
+        """Interpreter of a virtualenv."""
+        if os.name == "nt":
+            return venv / "Scripts" / "python.exe"
+        return venv / "bin" / "python"
+
+    def layered_venv(self, snapshot_venv: Path, venv: Path) -> Optional[Path]:
+        """
+        Create a project virtualenv layered on a snapshot.
+
+        The snapshot's site-packages is added to the new venv's path with a
+        .pth file, so the project sees the snapshot's packages while further
+        installs go into its own venv. pip does not uninstall packages
+        outside the active environment, so the snapshot stays unchanged.
+
+        Returns:
+            Path of the project virtualenv, or None if it could not be created
+        """
+        shutil.rmtree(venv, ignore_errors=True)
+        if not self._run([sys.executable, "-m", "venv", str(venv)], {}):
+            return None
+        site_packages = self.venv_site_packages(venv)
+        site_packages.mkdir(parents=True, exist_ok=True)
+        (site_packages / "_dependency_snapshot.pth").write_text(
+            f"{self.venv_site_packages(snapshot_venv).resolve()}\n"
+        )
+        return venv
+
+    @staticmethod
+    def venv_site_packages(venv: Path) -> Path:
+        """site-packages directory of a virtualenv created by this interpreter."""
+        if os.name == "nt":
+            return venv / "Lib" / "site-packages"
+        return venv / "lib" / f"python{sys.version_info.major}.{sys.version_info.minor}" / "site-packages"
+
+    @staticmethod
+    def venv_environment(venv: Path, base: Optional[Path] = None) -> Dict[str, str]:
+        """
+        Environment variables that activate a virtualenv.
+
+        The scripts of a base virtualenv (the snapshot a layered venv is
+        built on) follow the venv's own on PATH.
+        """
+        bin_name = "Scripts" if os.name == "nt" else "bin"
+        bin_dirs = [str(venv / bin_name)] + ([str(base / bin_name)] if base else [])
+        return {
+            "VIRTUAL_ENV": str(venv),
+            "PATH": os.pathsep.join(bin_dirs + [os.environ.get('PATH', '')])
+        }
+
+    # Node snapshots
+
+    def _node_snapshot_path(self, project_path: Path) -> Optional[Path]:
+        package_json = project_path / "package.json"
+        if not package_json.exists():
+            return None
+        try:
+            package_data = json.loads(package_json.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        lockfile = project_path / "package-lock.json"
+        lock_text = lockfile.read_text() if lockfile.exists() else None
+        return self.snapshot_dir / self.node_key(package_data, lock_text)
+
+    def restore_node_snapshot(self, project_path: Path) -> bool:
+        """
+        Link a matching node_modules snapshot into a project.
+
+        Returns:
+            True if the project now has node_modules from a snapshot
+        """
+        project_path = Path(project_path)
+        if (project_path / "node_modules").exists():
+            return False
+        snapshot = self._node_snapshot_path(project_path)
+        if not snapshot or not self._node_snapshot_intact(snapshot):
+            self._count("snapshot_misses")
+            return False
+
+        link_tree(snapshot / "node_modules", project_path / "node_modules")
+        self._touch(snapshot)
+        self._count("snapshot_hits")
+        logger.info(f"Restored node_modules from snapshot {snapshot.name}")
+        return True
+
+    def save_node_snapshot(self, project_path: Path) -> Optional[str]:
+        """
+        Snapshot a project's freshly installed node_modules.
+
+        Returns:
+            Snapshot key, or None if nothing was saved
+        """
+        project_path = Path(project_path)
+        node_modules = project_path / "node_modules"
+        snapshot = self._node_snapshot_path(project_path)
+        if not snapshot or not node_modules.is_dir() or (snapshot / _COMPLETE_MARKER).exists():
+            return None
+
+        with self._key_lock(snapshot.name):
+            tmp = snapshot.with_name(f".{snapshot.name}.{os.getpid()}.tmp")
+            shutil.rmtree(tmp, ignore_errors=True)
+            try:
+                link_tree(node_modules, tmp / "node_modules")
+                self._write_manifest(tmp)
+                self._mark_complete(tmp)
+                shutil.rmtree(snapshot, ignore_errors=True)
+                os.replace(tmp, snapshot)
+            except OSError as e:
+                logger.warning(f"Failed to snapshot node_modules for {project_path}: {e}")
+                shutil.rmtree(tmp, ignore_errors=True)
+                return None
+            self._count("snapshots_created")
+        self._evict_snapshots("node")
+        logger.info(f"Saved node_modules snapshot {snapshot.name}")
+        return snapshot.name
+
+    def node_snapshot_for(self, package_data: Dict[str, Any], lockfile: Optional[str] = None) -> Optional[Path]:
+        """node_modules directory of a complete snapshot for these dependencies."""
+        snapshot = self.snapshot_dir / self.node_key(package_data, lockfile)
+        if self._node_snapshot_intact(snapshot):
+            self._touch(snapshot)
+            return snapshot / "node_modules"
+        return None
+
+    def _write_manifest(self, snapshot: Path):
+        """Record the size and modification time of every file in a node_modules snapshot."""
+        manifest = {}
+        node_modules = snapshot / "node_modules"
+        for root, _, files in os.walk(node_modules):
+            for name in files:
+                path = Path(root) / name
+                if not path.is_symlink():
+                    stat = path.stat()
+                    manifest[str(path.relative_to(node_modules))] = [stat.st_size, stat.st_mtime_ns]
+        (snapshot / _MANIFEST).write_text(json.dumps(manifest))
+
+    def _node_snapshot_intact(self, snapshot: Path) -> bool:
+        """
+        Whether a node_modules snapshot is complete and unmodified.
+
+        Its files are hardlinked into projects, so a project writing to one in
+        place changes the snapshot too. A modified snapshot is removed.
+        """
+        if not (snapshot / _COMPLETE_MARKER).exists():
+            return False
+        node_modules = snapshot / "node_modules"
+        try:
+            manifest = json.loads((snapshot / _MANIFEST).read_text())
+            intact = all(
+                [stat.st_size, stat.st_mtime_ns] == expected
+                for relative, expected in manifest.items()
+                for stat in [(node_modules / relative).stat()]
+            )
+        except (OSError, ValueError):
+            intact = False
+        if not intact:
+            with self._key_lock(snapshot.name):
+                shutil.rmtree(snapshot, ignore_errors=True)
+            logger.warning(f"Removed node_modules snapshot {snapshot.name}: files changed since it was saved")
+        return intact
+
+    # Wheelhouse
+
+    def populate_wheelhouse(self, requirements_text: str) -> bool:
+        """
+        Build or download wheels for a requirements set into the wheelhouse.
+
+        pip writes every wheel of the resolved set (dependencies included) to
+        a fresh directory; they are moved into the wheelhouse and, if the whole
+        set resolved, their names are recorded for wheels_for.
+        """
+        build_dir = self.cache_dir / f".wheels.{os.getpid()}.{threading.get_ident()}"
+        shutil.rmtree(build_dir, ignore_errors=True)
+        (build_dir / "wheels").mkdir(parents=True)
+        requirements_file = build_dir / "requirements.txt"
+        requirements_file.write_text(requirements_text)
+        try:
+            resolved = self._run(
+                [sys.executable, "-m", "pip", "wheel", "-r", str(requirements_file), "-w", str(build_dir / "wheels")],
+                self.install_env("python")
+            )
+            names = sorted(wheel.name for wheel in (build_dir / "wheels").glob("*.whl"))
+            for name in names:
+                os.replace(build_dir / "wheels" / name, self.wheelhouse / name)
+            if resolved:
+                wheel_set = self.wheel_set_dir / f"{self.python_key(requirements_text)}.json"
+                wheel_set.write_text(json.dumps(names))
+            return resolved
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def wheels_for(self, requirements_text: str, python_version: Optional[str] = None,
+                   musl: bool = False) -> List[Path]:
+        """
+        Wheels resolved for a requirements file, dependencies included.
+
+        Args:
+            requirements_text: Contents of requirements.txt
+            python_version: Target Python ("3.11"); wheels it cannot install
+                are skipped. None returns the whole set.
+            musl: Whether the target is an Alpine (musl) image
+
+        Returns:
+            Wheel paths, or [] if the requirements were never resolved
+        """
+        wheel_set = self.wheel_set_dir / f"{self.python_key(requirements_text)}.json"
+        try:
+            names = json.loads(wheel_set.read_text())
+        except (OSError, ValueError):
+            return []
+        wheels = []
+        for name in names:
+            if python_version is not None and not wheel_supported(name, python_version, musl):
+                logger.debug(f"Skipping wheel {name}: not installable on Python {python_version}")
+            elif (self.wheelhouse / name).exists():
+                wheels.append(self.wheelhouse / name)
+        return wheels
+
+    # Housekeeping
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Lock serializing work on one snapshot (other snapshots proceed in parallel)."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _run(self, command: List[str], env: Dict[str, str]) -> bool:
+        try:
+            result = subprocess.run(
+                command,
+                env={**os.environ, **env},
+                capture_output=True,
+                text=True,
+                timeout=600
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"Dependency cache command failed: {' '.join(command)}: {e}")
+            return False
+        if result.returncode != 0:
+            logger.warning(f"Dependency cache command failed: {' '.join(command)}: {result.stderr[-500:]}")
+            return False
+        return True
+
+    @staticmethod
+    def _mark_complete(snapshot: Path):
+        (snapshot / _COMPLETE_MARKER).write_text(str(time.time()))
+
+    @staticmethod
+    def _touch(snapshot: Path):
+        os.utime(snapshot / _COMPLETE_MARKER)
+
+    def _evict_snapshots(self, ecosystem: str):
+        """Remove least recently used snapshots beyond max_snapshots."""
+        snapshots = sorted(
+            (p for p in self.snapshot_dir.glob(f"{ecosystem}-*") if (p / _COMPLETE_MARKER).exists()),
+            key=lambda p: (p / _COMPLETE_MARKER).stat().st_mtime,
+            reverse=True
+        )
+        for stale in snapshots[self.max_snapshots:]:
+            shutil.rmtree(stale, ignore_errors=True)
+            logger.info(f"Removed dependency snapshot {stale.name}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        return {
+            **self.stats,
+            "wheels": len(list(self.wheelhouse.glob("*.whl"))),
+            "snapshots": len(list(self.snapshot_dir.glob(f"*/{_COMPLETE_MARKER}")))
+        }
+
+
+# Global dependency cache instance
+_dependency_cache: Optional[DependencyCache] = None
+
+
+def get_dependency_cache() -> Optional[DependencyCache]:
+    """Get the shared dependency cache, or None if it is disabled."""
+    global _dependency_cache
+    if not DEPENDENCY_CACHE_CONFIG.get("enabled", True):
+        return None
+    if _dependency_cache is None:
+        cache_dir = os.getenv("AGENT_DEPENDENCY_CACHE_DIR") or DEPENDENCY_CACHE_CONFIG.get("cache_dir")
+        _dependency_cache = DependencyCache(
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            offline=DEPENDENCY_CACHE_CONFIG.get("offline", False),
+            snapshots=DEPENDENCY_CACHE_CONFIG.get("snapshots", True),
+            max_snapshots=DEPENDENCY_CACHE_CONFIG.get("max_snapshots", 20)
+        )
+    return _dependency_cache
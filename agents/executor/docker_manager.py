@@ -20,6 +20,8 @@ from workflows.workflow_config import GENERATED_CODE_PATH
 
 # Import EnvironmentSpec from shared module
 from agents.executor.environment_spec import EnvironmentSpec
+from agents.executor.dependency_cache import get_dependency_cache, link_tree
+from shared.utils.code_block_parser import FILENAME, parse_code_blocks
 
 class DockerEnvironmentManager:
     """Manages Docker environments for code execution"""
@@ -27,6 +29,9 @@ class DockerEnvironmentManager:
     # Container registry to track active containers
     _container_registry = {}  # session_id -> container_info
     
+    # Build context directory holding cached wheels / node_modules
+    DEPENDENCY_CACHE_DIR = ".dependency_cache"
+    
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.docker_client = None
@@ -183,6 +188,7 @@ class DockerEnvironmentManager:
             
             # Write dependency files if needed
             self._write_dependency_files(build_path, env_spec, code_files)
+            self._stage_dependency_cache(build_path, env_spec)
             
             # Build image
             image_tag = f"executor_{container_key}:latest"
@@ -285,16 +291,29 @@ class DockerEnvironmentManager:
         
         # Language-specific setup
         if env_spec.language == "python":
-            # Copy requirements first for better caching
+            # Copy requirements first for better caching, installing offline
+            # from cached wheels when they cover every requirement and using
+            # them alongside the index otherwise
             dockerfile.append("COPY requirements.txt* ./")
-            dockerfile.append("RUN if [ -f requirements.txt ]; then pip install --no-cache-dir -r requirements.txt && echo 'Dependencies installed successfully'; else echo 'No requirements.txt found'; fi")
+            dockerfile.append(f"COPY {self.DEPENDENCY_CACHE_DIR}/ /tmp/dependency_cache/")
+            dockerfile.append("RUN if [ -f requirements.txt ]; then "
+                              "(pip install --no-index --find-links /tmp/dependency_cache/wheels -r requirements.txt "
+                              "|| pip install --no-cache-dir --find-links /tmp/dependency_cache/wheels -r requirements.txt) "
+                              "&& echo 'Dependencies installed successfully'; else echo 'No requirements.txt found'; fi "
+                              "&& rm -rf /tmp/dependency_cache")
         elif env_spec.language == "nodejs":
-            # Copy package files first for better caching
+            # Copy package files first for better caching, starting from a
+            # node_modules snapshot when one matches
             dockerfile.append("COPY package*.json ./")
-            dockerfile.append("RUN npm ci --only=production || npm install || echo 'No package.json'")
+            dockerfile.append(f"COPY {self.DEPENDENCY_CACHE_DIR}/ /tmp/dependency_cache/")
+            dockerfile.append("RUN if [ -d /tmp/dependency_cache/node_modules ]; then "
+                              "mv /tmp/dependency_cache/node_modules ./node_modules && npm rebuild; "
+                              "else npm ci --only=production || npm install || echo 'No package.json'; fi "
+                              "&& rm -rf /tmp/dependency_cache")
         
         # Copy application code
         dockerfile.append("COPY . .")
+        dockerfile.append(f"RUN rm -rf {self.DEPENDENCY_CACHE_DIR}")
         
         # Run any build commands
         for cmd in env_spec.build_commands:
@@ -307,19 +326,58 @@ class DockerEnvironmentManager:
     
     def _parse_code_files(self, code_content: str) -> List[Dict[str, str]]:
         """Parse code files from input"""
-        files = []
-        
         # Look for FILENAME: pattern
-        filename_pattern = r'FILENAME:\s*(.+?)\n```(?:\w*)\n(.*?)\n```'
-        matches = re.findall(filename_pattern, code_content, re.DOTALL)
+        return [
+            {'filename': block.filename, 'content': block.content.strip()}
+            for block in parse_code_blocks(code_content)
+            if block.style == FILENAME
+        ]
+    
+    def _stage_dependency_cache(self, build_path: Path, env_spec: EnvironmentSpec) -> None:
+        """
+        Link cached dependencies into the build context.
         
-        for filename, content in matches:
-            files.append({
-                'filename': filename.strip(),
-                'content': content.strip()
-            })
+        The Docker SDK builds with the classic builder, which has no cache
+        mounts, so cached wheels and node_modules snapshots are passed
+        through the build context instead. The directory always exists so
+        the Dockerfile COPY succeeds.
+        """
+        staging = build_path / self.DEPENDENCY_CACHE_DIR
+        staging.mkdir(exist_ok=True)
+        cache = get_dependency_cache()
+        if not cache:
+            return
         
-        return files
+        try:
+            if env_spec.language == "python":
+                requirements = build_path / "requirements.txt"
+                wheels = cache.wheels_for(
+                    requirements.read_text(),
+                    python_version=env_spec.version,
+                    musl="alpine" in env_spec.base_image
+                ) if requirements.exists() else []
+                if wheels:
+                    (staging / "wheels").mkdir()
+                    for wheel in wheels:
+                        try:
+                            os.link(wheel, staging / "wheels" / wheel.name)
+                        except OSError:
+                            shutil.copy2(wheel, staging / "wheels" / wheel.name)
+                    print(f"   📦 Using {len(wheels)} cached wheels")
+            elif env_spec.language == "nodejs" and cache.snapshots:
+                package_json = build_path / "package.json"
+                if package_json.exists():
+                    lockfile = build_path / "package-lock.json"
+                    node_modules = cache.node_snapshot_for(
+                        json.loads(package_json.read_text()),
+                        lockfile.read_text() if lockfile.exists() else None
+                    )
+                    if node_modules:
+                        link_tree(node_modules, staging / "node_modules")
+                        print("   📦 Using cached node_modules snapshot")
+        except (OSError, ValueError) as e:
+            # The Dockerfile falls back to a regular install
+            print(f"   ⚠️  Could not stage dependency cache: {e}")
     
     def _write_dependency_files(self, build_path: Path, env_spec: EnvironmentSpec, code_files: List[Dict[str, str]]) -> None:
         """Write dependency files based on language"""
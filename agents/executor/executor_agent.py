@@ -38,6 +38,7 @@ from beeai_framework.utils.dicts import exclude_none
 # Import from agents package
 from agents.agent_configs import executor_config
 from agents.executor.environment_analyzer import parse_environment_spec
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 from workflows.workflow_config import GENERATED_CODE_PATH
 
 load_dotenv()
@@ -193,6 +194,7 @@ async def executor_agent(input: list[Message]) -> AsyncGenerator:
     build_path = None
     
     # Initialize OpenAI client
+    priority = resolve_priority(input)
     llm = ChatModel.from_name(executor_config["model"])
     
     # Extract input
@@ -282,7 +284,8 @@ async def executor_agent(input: list[Message]) -> AsyncGenerator:
         {input_text}
         """
         
-        analysis_response = await agent.run(prompt=analysis_prompt)
+        async with llm_call_slot(executor_config["model"], analysis_prompt, priority):
+            analysis_response = await agent.run(prompt=analysis_prompt)
         environment_spec = parse_environment_spec(analysis_response.result.text, input_text)
         
         # Log environment analysis completion
@@ -430,7 +433,8 @@ async def executor_agent(input: list[Message]) -> AsyncGenerator:
         - Whether the implementation meets requirements
         """
         
-        final_analysis = await result_agent.run(prompt=result_prompt)
+        async with llm_call_slot(executor_config["model"], result_prompt, priority):
+            final_analysis = await result_agent.run(prompt=result_prompt)
         
         # Log analysis completion
         analysis_complete_entry = create_proof_of_execution_entry(
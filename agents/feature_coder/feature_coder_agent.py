@@ -15,6 +15,8 @@ from beeai_framework.memory import TokenMemory
 from beeai_framework.utils.dicts import exclude_none
 
 from agents.agent_configs import feature_coder_config
+from shared.utils.model_router import resolve_model
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,7 +24,10 @@ load_dotenv()
 
 async def feature_coder_agent(input: list[Message]) -> AsyncGenerator:
     """Agent responsible for implementing specific features in an existing codebase"""
-    llm = ChatModel.from_name(feature_coder_config["model"])
+    priority = resolve_priority(input)
+    # The orchestrator may route this call to another model on the ladder
+    model = resolve_model(input, feature_coder_config["model"])
+    llm = ChatModel.from_name(model)
     
     agent = ReActAgent(
         llm=llm, 
@@ -78,7 +83,9 @@ async def feature_coder_agent(input: list[Message]) -> AsyncGenerator:
         memory=TokenMemory(llm)
     )
     
-    response = await agent.run(prompt=str(input))
+    prompt = str(input)
+    async with llm_call_slot(model, prompt, priority):
+        response = await agent.run(prompt=prompt)
     
     # Return just the response text without any file creation or project metadata
     yield Message(parts=[MessagePart(content=response.result.text, content_type="text/plain")])
\ No newline at end of file
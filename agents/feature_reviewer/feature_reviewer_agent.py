@@ -21,6 +21,7 @@ from beeai_framework.backend.chat import ChatModel
 from beeai_framework.memory import TokenMemory
 from beeai_framework.utils.dicts import exclude_none
 from agents.feature_reviewer.feature_reviewer_config import DEFAULT_FEATURE_REVIEWER_INSTRUCTIONS
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 
 # Load environment variables from .env file
 load_dotenv()
@@ -40,6 +41,7 @@ async def feature_reviewer_agent(input: list[Message]) -> AsyncGenerator:
     from core.agent_registry import get_agent_config
     feature_reviewer_config = get_agent_config("feature_reviewer")
     
+    priority = resolve_priority(input)
     llm = ChatModel.from_name(feature_reviewer_config["model"])
     
     agent = ReActAgent(
@@ -71,5 +73,6 @@ Remember to:
 - Be pragmatic about what constitutes "good enough"
 """
     
-    response = await agent.run(prompt=review_prompt)
+    async with llm_call_slot(feature_reviewer_config["model"], review_prompt, priority):
+        response = await agent.run(prompt=review_prompt)
     yield MessagePart(content=response.result.text)
\ No newline at end of file
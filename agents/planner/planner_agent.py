@@ -16,6 +16,7 @@ from beeai_framework.utils.dicts import exclude_none
 
 # Import from agents package using absolute import
 from agents.agent_configs import planner_config
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 
 # Load environment variables from .env file
 load_dotenv()
@@ -23,6 +24,7 @@ load_dotenv()
 
 async def planner_agent(input: list[Message]) -> AsyncGenerator:
     """Agent responsible for creating project plans and breaking down requirements"""
+    priority = resolve_priority(input)
     llm = ChatModel.from_name(planner_config["model"])
     
     agent = ReActAgent(
@@ -77,5 +79,7 @@ async def planner_agent(input: list[Message]) -> AsyncGenerator:
         memory=TokenMemory(llm=llm)
     )
     
-    response = await agent.run(prompt="Create a detailed project plan for: " + str(input))
+    prompt = "Create a detailed project plan for: " + str(input)
+    async with llm_call_slot(planner_config["model"], prompt, priority):
+        response = await agent.run(prompt=prompt)
     yield MessagePart(content=response.result.text)
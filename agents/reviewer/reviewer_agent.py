@@ -23,12 +23,14 @@ from agents.reviewer.reviewer_config import DEFAULT_REVIEWER_INSTRUCTIONS
 
 # Import from agents package using absolute import
 from agents.agent_configs import reviewer_config
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 
 # Load environment variables from .env file
 load_dotenv()
 
 async def reviewer_agent(input: list[Message]) -> AsyncGenerator:
     """Agent responsible for code review and quality assurance"""
+    priority = resolve_priority(input)
     llm = ChatModel.from_name(reviewer_config["model"])
     
     agent = ReActAgent(
@@ -45,5 +47,7 @@ async def reviewer_agent(input: list[Message]) -> AsyncGenerator:
         memory=TokenMemory(llm)
     )
     
-    response = await agent.run(prompt="Review the following work: " + str(input))
+    prompt = "Review the following work: " + str(input)
+    async with llm_call_slot(reviewer_config["model"], prompt, priority):
+        response = await agent.run(prompt=prompt)
     yield MessagePart(content=response.result.text)
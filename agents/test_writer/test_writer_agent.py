@@ -17,6 +17,7 @@ from beeai_framework.utils.dicts import exclude_none
 
 # Import from agents package using absolute import
 from agents.agent_configs import test_writer_config
+from shared.utils.rate_limiter import llm_call_slot, resolve_priority
 
 # Load environment variables from .env file
 load_dotenv()
@@ -24,6 +25,7 @@ load_dotenv()
 
 async def test_writer_agent(input: list[Message]) -> AsyncGenerator:
     """Agent responsible for writing business-value focused tests for TDD"""
+    priority = resolve_priority(input)
     llm = ChatModel.from_name(test_writer_config["model"])
     
     agent = ReActAgent(
@@ -90,5 +92,7 @@ async def test_writer_agent(input: list[Message]) -> AsyncGenerator:
         memory=TokenMemory(llm)
     )
     
-    response = await agent.run(prompt="Write business-value focused tests for TDD approach: " + str(input))
+    prompt = "Write business-value focused tests for TDD approach: " + str(input)
+    async with llm_call_slot(test_writer_config["model"], prompt, priority):
+        response = await agent.run(prompt=prompt)
     yield MessagePart(content=response.result.text)
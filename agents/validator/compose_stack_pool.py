@@ -0,0 +1,350 @@
+"""
+Compose Stack Pool
+
+Keeps docker-compose stacks running between validations. Stacks are keyed
+by their service definitions, so successive features of a project reuse
+the same Mongo/Postgres/Redis containers instead of starting them cold:
+
+- database services get their state reset through reset hooks
+  (truncate/drop, or a custom command/snapshot restore)
+- services built from the project are rebuilt and restarted
+- stacks whose services bind-mount host paths are only reused while those
+  paths are the ones mounted at start (a project's temp dir may be gone)
+- idle stacks are torn down after a timeout
+"""
+
+import hashlib
+import json
+import shlex
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from agents.validator.docker_compose_manager import (
+    ComposeConfig, DockerComposeManager, ServiceDefinition
+)
+from workflows.logger import workflow_logger as logger
+from workflows.workflow_config import COMPOSE_STACK_CONFIG
+
+
+# Service label holding a custom reset command
+RESET_LABEL = "validator.reset"
+
+ResetHook = Callable[[DockerComposeManager, ServiceDefinition], None]
+
+
+def stack_key(config: ComposeConfig) -> str:
+    """Key identifying stacks with identical service definitions"""
+    data = {
+        "version": config.version,
+        "services": {name: asdict(service) for name, service in sorted(config.services.items())},
+        "networks": config.networks,
+        "volumes": config.volumes
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def bind_mounts(config: ComposeConfig, context_path: Path) -> Dict[str, Optional[int]]:
+    """Host paths bind-mounted by the services, mapped to their inode (None if missing)"""
+    mounts = {}
+    for service in config.services.values():
+        for volume in service.volumes:
+            if ':' not in volume:
+                continue
+            source = Path(volume.split(':', 1)[0])
+            if not source.is_absolute():
+                source = Path(context_path) / source
+            try:
+                mounts[str(source)] = source.stat().st_ino
+            except OSError:
+                mounts[str(source)] = None
+    return mounts
+
+
+def _run_reset(manager: DockerComposeManager, service: ServiceDefinition, command: str):
+    exit_code, output = manager.execute_in_service(service.name, ["sh", "-c", command])
+    if exit_code != 0:
+        raise RuntimeError(f"State reset of '{service.name}' failed: {output}")
+
+
+def reset_mongo(manager: DockerComposeManager, service: ServiceDefinition):
+    """Drop all non-system Mongo databases"""
+    env = service.environment
+    auth = ""
+    if env.get("MONGO_INITDB_ROOT_USERNAME"):
+        auth = (f"-u {shlex.quote(env['MONGO_INITDB_ROOT_USERNAME'])} "
+                f"-p {shlex.quote(env.get('MONGO_INITDB_ROOT_PASSWORD', ''))} "
+                "--authenticationDatabase admin")
+    script = ("db.getMongo().getDBNames().forEach(function(name) { "
+              "if (['admin', 'config', 'local'].indexOf(name) < 0) { db.getSiblingDB(name).dropDatabase(); } })")
+    _run_reset(manager, service,
+               f"mongosh --quiet {auth} --eval {shlex.quote(script)} || mongo --quiet {auth} --eval {shlex.quote(script)}")
+
+
+def reset_postgres(manager: DockerComposeManager, service: ServiceDefinition):
+    """Recreate the public schema of the Postgres database"""
+    user = service.environment.get("POSTGRES_USER", "postgres")
+    database = service.environment.get("POSTGRES_DB", user)
+    sql = "DROP SCHEMA public CASCADE; CREATE SCHEMA public;"
+    _run_reset(manager, service,
+               f"psql -U {shlex.quote(user)} -d {shlex.quote(database)} -v ON_ERROR_STOP=1 -c {shlex.quote(sql)}")
+
+
+def reset_mysql(manager: DockerComposeManager, service: ServiceDefinition):
+    """Recreate the MySQL application database"""
+    database = service.environment.get("MYSQL_DATABASE")
+    if not database:
+        return
+    password = service.environment.get("MYSQL_ROOT_PASSWORD", "")
+    sql = f"DROP DATABASE IF EXISTS `{database}`; CREATE DATABASE `{database}`;"
+    _run_reset(manager, service,
+               f"mysql -uroot -p{shlex.quote(password)} -e {shlex.quote(sql)}")
+
+
+def reset_redis(manager: DockerComposeManager, service: ServiceDefinition):
+    """Flush all Redis keys"""
+    _run_reset(manager, service, "redis-cli FLUSHALL")
+
+
+# Reset hooks by image name
+RESET_HOOKS: Dict[str, ResetHook] = {
+    "mongo": reset_mongo,
+    "postgres": reset_postgres,
+    "mysql": reset_mysql,
+    "mariadb": reset_mysql,
+    "redis": reset_redis
+}
+
+
+def register_reset_hook(image_name: str, hook: ResetHook):
+    """
+    Register a state reset hook for an image (e.g. a snapshot restore)
+
+    Args:
+        image_name: Image name without registry or tag (e.g. "postgres")
+        hook: Callable(manager, service) raising on failure
+    """
+    RESET_HOOKS[image_name] = hook
+
+
+def _image_name(image: str) -> str:
+    return image.rsplit("/", 1)[-1].split(":", 1)[0].split("@", 1)[0]
+
+
+def reset_stack_state(manager: DockerComposeManager):
+    """Reset the state of every image-based service that has a reset hook"""
+    for service in manager.compose_config.services.values():
+        if service.build:
+            continue
+        command = service.labels.get(RESET_LABEL) if isinstance(service.labels, dict) else None
+        if command:
+            _run_reset(manager, service, command)
+            continue
+        hook = RESET_HOOKS.get(_image_name(service.image or ""))
+        if hook:
+            hook(manager, service)
+
+
+@dataclass
+class PooledStack:
+    """A running compose stack held by the pool"""
+    key: str
+    manager: DockerComposeManager
+    in_use: bool = False
+    last_used: float = field(default_factory=time.time)
+    uses: int = 0
+    # Bind mount sources and their inodes when the stack was started
+    mounts: Dict[str, Optional[int]] = field(default_factory=dict)
+
+
+class ComposeStackPool:
+    """Pool of running compose stacks keyed by service definitions"""
+
+    def __init__(self, idle_timeout: float = 600, max_stacks: int = 4):
+        self.idle_timeout = idle_timeout
+        self.max_stacks = max_stacks
+        self._stacks: Dict[str, PooledStack] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self.metrics = {
+            "cold_starts": 0,
+            "reuses": 0,
+            "reset_failures": 0,
+            "evictions": 0,
+            "stale_mounts": 0,
+            "cold_start_seconds": 0.0,
+            "reuse_seconds": 0.0
+        }
+
+    def acquire(self, session_id: str, compose_path: Path,
+                context_path: Path) -> Tuple[DockerComposeManager, bool]:
+        """
+        Get a running stack for a compose file
+
+        A matching idle stack is reset and its application services
+        refreshed; otherwise a new stack is started.
+
+        Returns:
+            Tuple of (manager, reused)
+        """
+        parser = DockerComposeManager(session_id)
+        config = parser.parse_compose_file(compose_path)
+        key = stack_key(config)
+        started = time.time()
+
+        with self._lock:
+            stack = self._stacks.get(key)
+            if stack and not stack.in_use:
+                stack.in_use = True
+            else:
+                stack = None
+
+        mounts = bind_mounts(config, context_path)
+        if stack and stack.mounts != mounts:
+            # Containers would keep the mounts of the project that started them
+            logger.info(f"Compose stack {key} mounts other host paths, starting cold")
+            self._count("stale_mounts")
+            self._discard(stack)
+            stack = None
+
+        if stack:
+            try:
+                reset_stack_state(stack.manager)
+                stack.manager.refresh_build_services(context_path)
+                stack.uses += 1
+                self._count("reuses")
+                self._count("reuse_seconds", time.time() - started)
+                logger.info(f"Reusing compose stack {key} ({time.time() - started:.1f}s)")
+                return stack.manager, True
+            except Exception as e:
+                logger.warning(f"Compose stack {key} could not be reset, starting cold: {e}")
+                self._count("reset_failures")
+                self._discard(stack)
+
+        # Unique per stack: a transient stack started while the pooled one is busy
+        # must not share its container, network or image names
+        manager = DockerComposeManager(session_id, project_name=f"validator_stack_{key}_{uuid.uuid4().hex[:8]}")
+        manager.compose_config = config
+        try:
+            manager.start_services(context_path)
+        except Exception:
+            manager.cleanup()
+            raise
+        self._count("cold_starts")
+        self._count("cold_start_seconds", time.time() - started)
+        logger.info(f"Started compose stack {key} cold ({time.time() - started:.1f}s)")
+
+        with self._lock:
+            if key not in self._stacks:
+                self._stacks[key] = PooledStack(key=key, manager=manager, in_use=True, uses=1,
+                                                mounts=mounts)
+        self._ensure_reaper()
+        return manager, False
+
+    def release(self, manager: DockerComposeManager, healthy: bool = True):
+        """
+        Return a stack to the pool
+
+        Args:
+            manager: Manager returned by acquire
+            healthy: False tears the stack down instead of keeping it
+        """
+        with self._lock:
+            stack = next((s for s in self._stacks.values() if s.manager is manager), None)
+            if stack and healthy:
+                stack.in_use = False
+                stack.last_used = time.time()
+                manager = None
+            elif stack:
+                del self._stacks[stack.key]
+
+        if manager is not None:
+            # Unhealthy, or a transient stack started while the pooled one was busy
+            manager.cleanup()
+        self._evict_excess()
+
+    def _count(self, metric: str, amount: float = 1):
+        with self._lock:
+            self.metrics[metric] += amount
+
+    def _discard(self, stack: PooledStack):
+        with self._lock:
+            self._stacks.pop(stack.key, None)
+        try:
+            stack.manager.cleanup()
+        except Exception as e:
+            logger.warning(f"Error tearing down compose stack {stack.key}: {e}")
+
+    def _evict_excess(self):
+        """Tear down least recently used idle stacks beyond max_stacks"""
+        with self._lock:
+            idle = sorted((s for s in self._stacks.values() if not s.in_use), key=lambda s: s.last_used)
+            excess = idle[:max(0, len(self._stacks) - self.max_stacks)]
+        for stack in excess:
+            self._count("evictions")
+            self._discard(stack)
+
+    def reap_idle(self) -> int:
+        """
+        Tear down stacks idle longer than idle_timeout
+
+        Returns:
+            Number of stacks torn down
+        """
+        now = time.time()
+        with self._lock:
+            stale = [s for s in self._stacks.values()
+                     if not s.in_use and now - s.last_used > self.idle_timeout]
+        for stack in stale:
+            logger.info(f"Tearing down idle compose stack {stack.key}")
+            self._count("evictions")
+            self._discard(stack)
+        return len(stale)
+
+    def _ensure_reaper(self):
+        if self._reaper and self._reaper.is_alive():
+            return
+
+        def reap():
+            while self._stacks:
+                time.sleep(max(self.idle_timeout / 2, 1))
+                self.reap_idle()
+
+        self._reaper = threading.Thread(target=reap, name="compose-stack-reaper", daemon=True)
+        self._reaper.start()
+
+    def cleanup_all(self):
+        """Tear down every pooled stack"""
+        with self._lock:
+            stacks = list(self._stacks.values())
+        for stack in stacks:
+            self._discard(stack)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Reuse vs cold start metrics"""
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics["pooled_stacks"] = len(self._stacks)
+        if metrics["cold_starts"]:
+            metrics["avg_cold_start_seconds"] = metrics["cold_start_seconds"] / metrics["cold_starts"]
+        if metrics["reuses"]:
+            metrics["avg_reuse_seconds"] = metrics["reuse_seconds"] / metrics["reuses"]
+        return metrics
+
+
+# Global instance with lazy initialization
+_stack_pool = None
+
+
+def get_stack_pool() -> ComposeStackPool:
+    """Get the global compose stack pool"""
+    global _stack_pool
+    if _stack_pool is None:
+        _stack_pool = ComposeStackPool(
+            idle_timeout=COMPOSE_STACK_CONFIG.get("idle_timeout", 600),
+            max_stacks=COMPOSE_STACK_CONFIG.get("max_stacks", 4)
+        )
+    return _stack_pool
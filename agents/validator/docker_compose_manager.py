@@ -9,9 +9,11 @@ import docker
 import time
 import tempfile
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from collections import defaultdict
 import networkx as nx
 
@@ -56,6 +58,115 @@ class ComposeConfig:
         self.volumes = self.volumes or {}
 
 
+@dataclass
+class ServiceTiming:
+    """Startup timing of a single service (seconds)"""
+    service: str
+    wave: int = 0
+    image_source: str = ""  # built, pulled or cached
+    image_seconds: float = 0.0
+    create_seconds: float = 0.0
+    start_seconds: float = 0.0
+    health_seconds: float = 0.0
+    ready_at: float = 0.0  # since start_services began
+
+
+class HealthEventWatcher:
+    """
+    Event-driven container health tracking.
+    
+    Subscribes to the Docker event stream for the project's containers and
+    records health_status / die events, so waiting for health does not
+    poll every container. A periodic reload covers events missed while
+    the stream reconnects.
+    """
+    
+    HEALTH_PREFIX = "health_status: "
+    
+    def __init__(self, client: Any, labels: Dict[str, str], recheck_interval: float = 5.0):
+        self.client = client
+        self.filters = {"type": "container", "label": [f"{k}={v}" for k, v in labels.items()]}
+        self.recheck_interval = recheck_interval
+        self._statuses: Dict[str, str] = {}
+        # Events seen per container, so waiters only wake up for new ones
+        self._versions: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._stream = None
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start consuming events (call before starting containers)"""
+        try:
+            self._stream = self.client.events(decode=True, filters=self.filters)
+        except docker.errors.APIError as e:
+            logger.warning(f"Docker events unavailable, falling back to polling: {e}")
+            return
+        self._thread = threading.Thread(target=self._consume, name="compose-health-events", daemon=True)
+        self._thread.start()
+    
+    def _consume(self):
+        try:
+            for event in self._stream:
+                action = event.get("Action") or event.get("status") or ""
+                container_id = event.get("id") or event.get("Actor", {}).get("ID")
+                if action.startswith(self.HEALTH_PREFIX):
+                    status = action[len(self.HEALTH_PREFIX):]
+                elif action == "die":
+                    status = "exited"
+                else:
+                    continue
+                with self._condition:
+                    self._statuses[container_id] = status
+                    self._versions[container_id] = self._versions.get(container_id, 0) + 1
+                    self._condition.notify_all()
+        except Exception as e:
+            # Stream closed or failed; waiters fall back to reloads
+            logger.debug(f"Docker event stream ended: {e}")
+    
+    def close(self):
+        """Stop consuming events"""
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except Exception:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+    
+    def _current_status(self, container: Any) -> str:
+        container.reload()
+        state = container.attrs.get('State', {})
+        if state.get('Status') in ('exited', 'dead'):
+            return 'exited'
+        return state.get('Health', {}).get('Status', 'none')
+    
+    def wait(self, container: Any, timeout: float) -> str:
+        """
+        Wait until a container is healthy, unhealthy or exited
+        
+        Returns:
+            Final status, or the last seen status on timeout
+        """
+        deadline = time.time() + timeout
+        with self._condition:
+            seen = self._versions.get(container.id, 0)
+        status = self._current_status(container)
+        while status not in ('healthy', 'unhealthy', 'exited'):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            with self._condition:
+                changed = self._condition.wait_for(
+                    lambda: self._versions.get(container.id, 0) != seen,
+                    timeout=min(remaining, self.recheck_interval)
+                )
+                seen = self._versions.get(container.id, 0)
+                status = self._statuses.get(container.id) if changed else None
+            if status is None:
+                status = self._current_status(container)
+        return status
+
+
 class DockerComposeManager:
     """Manages multi-container orchestration using docker-compose concepts"""
     
@@ -73,6 +184,7 @@ class DockerComposeManager:
         self.containers: Dict[str, Any] = {}
         self.networks: Dict[str, Any] = {}
         self.compose_config: Optional[ComposeConfig] = None
+        self.startup_timings: Dict[str, ServiceTiming] = {}
         
         # Default labels for tracking
         self.default_labels = {
@@ -240,6 +352,29 @@ class DockerComposeManager:
         except nx.NetworkXError as e:
             raise ValueError(f"Failed to resolve dependencies: {e}")
     
+    def _resolve_dependency_waves(self) -> List[List[str]]:
+        """
+        Group services into startup waves
+        
+        Every service in a wave only depends on services in earlier waves,
+        so a wave can be started in parallel.
+        
+        Returns:
+            List of waves, each a sorted list of service names
+        """
+        order = self._resolve_dependency_order()
+        levels: Dict[str, int] = {}
+        for name in order:
+            deps = [d for d in self.compose_config.services[name].depends_on if d in levels]
+            levels[name] = max((levels[d] + 1 for d in deps), default=0)
+        
+        waves: List[List[str]] = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+        for name, level in levels.items():
+            waves[level].append(name)
+        waves = [sorted(wave) for wave in waves]
+        logger.info(f"Service startup waves: {waves}")
+        return waves
+    
     def _create_networks(self):
         """Create networks defined in compose file"""
         if not self.compose_config:
@@ -419,12 +554,92 @@ class DockerComposeManager:
                 except docker.errors.APIError:
                     pass  # Already connected
     
-    def start_services(self, context_path: Optional[Path] = None) -> Dict[str, Any]:
+    def _prepare_image(self, service: ServiceDefinition, context_path: Path) -> Tuple[str, str, float]:
+        """
+        Build or pull the image for a service
+        
+        Returns:
+            Tuple of (image, source, seconds) where source is built, pulled or cached
+        """
+        step = time.time()
+        if service.build:
+            image, source = self._build_service_image(service, context_path), "built"
+        else:
+            try:
+                self.client.images.get(service.image)
+                image, source = service.image, "cached"
+            except docker.errors.ImageNotFound:
+                logger.info(f"Pulling image: {service.image}")
+                self.client.images.pull(service.image)
+                image, source = service.image, "pulled"
+        return image, source, round(time.time() - step, 3)
+    
+    def _prepare_images(self, executor: ThreadPoolExecutor, context_path: Path) -> Dict[str, str]:
+        """Build and pull all service images concurrently"""
+        services = self.compose_config.services
+        futures = {}
+        pulls: Dict[str, Any] = {}
+        for name, service in services.items():
+            if service.build:
+                futures[name] = executor.submit(self._prepare_image, service, context_path)
+            else:
+                # Services sharing an image pull it once
+                if service.image not in pulls:
+                    pulls[service.image] = executor.submit(self._prepare_image, service, context_path)
+                futures[name] = pulls[service.image]
+        
+        images = {}
+        for name, future in futures.items():
+            images[name], source, seconds = future.result()
+            timing = self.startup_timings[name]
+            timing.image_source = source
+            timing.image_seconds = seconds
+        return images
+    
+    def _start_service(self, service: ServiceDefinition, image: str) -> Any:
+        """Create, connect and start the container of a service"""
+        timing = self.startup_timings[service.name]
+        
+        step = time.time()
+        container = self._create_container(service, image)
+        timing.create_seconds = round(time.time() - step, 3)
+        
+        step = time.time()
+        self._connect_container_networks(container, service)
+        container.start()
+        timing.start_seconds = round(time.time() - step, 3)
+        logger.info(f"Started service: {service.name}")
+        return container
+    
+    def _await_health(self, watcher: HealthEventWatcher, service_name: str,
+                      container: Any, timeout: int = 60):
+        """Wait for a service's healthcheck using Docker events"""
+        logger.info(f"Waiting for {service_name} to become healthy...")
+        step = time.time()
+        status = watcher.wait(container, timeout)
+        self.startup_timings[service_name].health_seconds = round(time.time() - step, 3)
+        
+        if status == 'healthy':
+            logger.info(f"Service {service_name} is healthy")
+        elif status in ('unhealthy', 'exited'):
+            logs = container.logs(tail=50).decode('utf-8')
+            raise RuntimeError(f"Service {service_name} is {status}. Last logs:\n{logs}")
+        else:
+            raise TimeoutError(f"Service {service_name} health check timed out")
+    
+    def start_services(self, context_path: Optional[Path] = None,
+                       max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
-        Start all services in dependency order
+        Start all services in dependency waves
+        
+        All images are built/pulled concurrently, then each wave of services
+        whose dependencies are up is started in parallel. A wave waits for
+        its healthchecks (via Docker events) before the next one starts.
+        Per-service timings are recorded in startup_timings.
         
         Args:
             context_path: Base path for build contexts and compose file
+            max_workers: Maximum concurrent Docker operations (default: one per service)
             
         Returns:
             Dictionary of service_name -> container mapping
@@ -433,77 +648,150 @@ class DockerComposeManager:
             raise ValueError("No compose configuration loaded")
         
         context_path = context_path or Path.cwd()
+        started = time.time()
         
         # Create networks first
         self._create_networks()
         
-        # Resolve startup order
-        startup_order = self._resolve_dependency_order()
+        # Resolve startup waves
+        waves = self._resolve_dependency_waves()
+        self.startup_timings = {
+            name: ServiceTiming(service=name, wave=index)
+            for index, wave in enumerate(waves) for name in wave
+        }
+        
+        services = self.compose_config.services
+        watcher = HealthEventWatcher(self.client, self.default_labels)
+        watcher.start()
+        executor = ThreadPoolExecutor(max_workers=max_workers or max(len(services), 1))
         
-        # Start services
-        for service_name in startup_order:
-            service = self.compose_config.services[service_name]
+        try:
+            images = self._prepare_images(executor, context_path)
             
-            try:
-                # Build or pull image
-                if service.build:
-                    image = self._build_service_image(service, context_path)
-                else:
-                    # Pull image if not exists
-                    try:
-                        self.client.images.get(service.image)
-                        image = service.image
-                    except docker.errors.ImageNotFound:
-                        logger.info(f"Pulling image: {service.image}")
-                        self.client.images.pull(service.image)
-                        image = service.image
-                
-                # Create container
-                container = self._create_container(service, image)
-                
-                # Connect to networks
-                self._connect_container_networks(container, service)
-                
-                # Start container
-                container.start()
-                logger.info(f"Started service: {service_name}")
-                
-                self.containers[service_name] = container
+            for wave in waves:
+                futures = {
+                    executor.submit(self._start_service, services[name], images[name]): name
+                    for name in wave
+                }
+                self._collect(futures, store=True)
                 
-                # Wait for health check if defined
-                if service.healthcheck:
-                    self._wait_for_health(service_name, container)
+                futures = {
+                    executor.submit(self._await_health, watcher, name, self.containers[name]): name
+                    for name in wave if services[name].healthcheck
+                }
+                self._collect(futures)
                 
-            except Exception as e:
-                logger.error(f"Failed to start service '{service_name}': {e}")
-                # Clean up started containers on failure
-                self.stop_services()
-                raise
+                for name in wave:
+                    self.startup_timings[name].ready_at = round(time.time() - started, 3)
+        
+        except Exception as e:
+            logger.error(f"Failed to start services: {e}")
+            # Clean up started containers on failure
+            self.stop_services()
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            watcher.close()
         
+        self._log_startup_timings(time.time() - started)
         logger.info(f"Successfully started {len(self.containers)} services")
         return self.containers
     
-    def _wait_for_health(self, service_name: str, container: Any, timeout: int = 60):
-        """Wait for container to become healthy"""
-        logger.info(f"Waiting for {service_name} to become healthy...")
-        
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            container.reload()
-            health = container.attrs.get('State', {}).get('Health', {})
-            status = health.get('Status', 'none')
-            
-            if status == 'healthy':
-                logger.info(f"Service {service_name} is healthy")
-                return
-            elif status == 'unhealthy':
-                logs = container.logs(tail=50).decode('utf-8')
-                raise RuntimeError(f"Service {service_name} is unhealthy. Last logs:\n{logs}")
-            
-            time.sleep(2)
+    def _collect(self, futures: Dict[Any, str], store: bool = False):
+        """
+        Wait for a batch of per-service futures
         
-        raise TimeoutError(f"Service {service_name} health check timed out")
+        Successful results are stored as containers when store is set, so a
+        failure still cleans up every container that did start.
+        """
+        errors = []
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+                if store:
+                    self.containers[name] = result
+            except Exception as e:
+                logger.error(f"Failed to start service '{name}': {e}")
+                errors.append(e)
+        if errors:
+            raise errors[0]
+    
+    def _log_startup_timings(self, total: float):
+        """Log where startup time was spent"""
+        logger.info(f"Compose stack started in {total:.1f}s")
+        for timing in sorted(self.startup_timings.values(), key=lambda t: t.ready_at):
+            logger.info(
+                f"  wave {timing.wave} {timing.service}: image {timing.image_seconds:.1f}s "
+                f"({timing.image_source}), create {timing.create_seconds:.1f}s, "
+                f"start {timing.start_seconds:.1f}s, health {timing.health_seconds:.1f}s, "
+                f"ready at {timing.ready_at:.1f}s"
+            )
     
+    def get_startup_timings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-service timings of the last start_services call
+        
+        Returns:
+            Dictionary of service_name -> timing info
+        """
+        return {name: asdict(timing) for name, timing in self.startup_timings.items()}
+
+    def _refresh_service(self, service: ServiceDefinition, context_path: Path) -> Any:
+        """Rebuild a service image and restart or recreate its container"""
+        image = self._build_service_image(service, context_path)
+        container = self.containers[service.name]
+        container.reload()
+
+        if container.image.id == self.client.images.get(image).id:
+            container.restart(timeout=10)
+            logger.info(f"Restarted service: {service.name}")
+            return container
+
+        # Image changed: replace the container
+        container.stop(timeout=10)
+        container.remove()
+        return self._start_service(service, image)
+
+    def refresh_build_services(self, context_path: Path, max_workers: Optional[int] = None):
+        """
+        Refresh the application services of a running stack
+
+        Services built from the project are rebuilt (the layer cache makes
+        unchanged builds cheap) and restarted, or recreated when their image
+        changed. Image-based services such as databases keep running.
+
+        Args:
+            context_path: Base path for build contexts
+            max_workers: Maximum concurrent Docker operations
+        """
+        if not self.compose_config:
+            raise ValueError("No compose configuration loaded")
+
+        services = self.compose_config.services
+        waves = [[name for name in wave if services[name].build]
+                 for wave in self._resolve_dependency_waves()]
+        watcher = HealthEventWatcher(self.client, self.default_labels)
+        watcher.start()
+        executor = ThreadPoolExecutor(max_workers=max_workers or max(len(services), 1))
+
+        try:
+            for wave in filter(None, waves):
+                futures = {
+                    executor.submit(self._refresh_service, services[name], context_path): name
+                    for name in wave
+                }
+                self._collect(futures, store=True)
+
+                futures = {
+                    executor.submit(self._await_health, watcher, name, self.containers[name]): name
+                    for name in wave if services[name].healthcheck
+                }
+                self._collect(futures)
+        finally:
+            executor.shutdown(wait=True)
+            watcher.close()
+
     def stop_services(self):
         """Stop all managed services"""
         logger.info("Stopping all services...")
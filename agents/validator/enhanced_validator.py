@@ -16,7 +16,9 @@ sys.path.insert(0, str(project_root))
 
 from agents.validator.container_manager import get_container_manager
 from agents.validator.docker_compose_manager import DockerComposeManager
+from agents.validator.compose_stack_pool import get_stack_pool
 from workflows.logger import workflow_logger as logger
+from workflows.workflow_config import COMPOSE_STACK_CONFIG
 
 
 class EnhancedValidator:
@@ -111,27 +113,50 @@ class EnhancedValidator:
     def _validate_with_compose(self, compose_path: Path, 
                              test_commands: Optional[List[str]] = None) -> Tuple[bool, str]:
         """Validate using docker-compose approach"""
-        self.compose_manager = DockerComposeManager(self.session_id)
+        reuse = COMPOSE_STACK_CONFIG.get("reuse", True)
+        pooled_manager = None
+        stack_healthy = False
+        reused = False
         
         try:
-            # Parse compose file
-            config = self.compose_manager.parse_compose_file(compose_path)
-            logger.info(f"Parsed compose file with {len(config.services)} services")
-            
-            # Start services
-            self.compose_manager.start_services(self.temp_dir)
+            if reuse:
+                # Reuse a running stack with the same service definitions
+                pooled_manager, reused = get_stack_pool().acquire(
+                    self.session_id, compose_path, self.temp_dir
+                )
+                self.compose_manager = pooled_manager
+                config = pooled_manager.compose_config
+            else:
+                self.compose_manager = DockerComposeManager(self.session_id)
+                
+                # Parse compose file
+                config = self.compose_manager.parse_compose_file(compose_path)
+                logger.info(f"Parsed compose file with {len(config.services)} services")
+                
+                # Start services
+                self.compose_manager.start_services(self.temp_dir)
             
             # Wait for services to be healthy
             if not self.compose_manager.wait_for_healthy(timeout=120):
                 return False, "Services failed to become healthy"
+            stack_healthy = True
             
-            output = ["All services started successfully"]
+            output = ["Reused running services" if reused else "All services started successfully"]
             
             # Get service status
             status = self.compose_manager.get_service_status()
             for service, info in status.items():
                 output.append(f"Service '{service}': {info['status']} (health: {info['health']})")
-            
+
+            # Report where startup time went
+            startup_timings = {} if reused else self.compose_manager.get_startup_timings()
+            for service, timing in startup_timings.items():
+                output.append(
+                    f"Service '{service}' startup: wave {timing['wave']}, "
+                    f"image {timing['image_seconds']:.1f}s ({timing['image_source']}), "
+                    f"health {timing['health_seconds']:.1f}s, ready at {timing['ready_at']:.1f}s"
+                )
+
             # Run test commands if provided
             if test_commands:
                 # Determine which service to run tests in
@@ -167,8 +192,12 @@ class EnhancedValidator:
             return False, "\n".join(error_output)
             
         finally:
-            # Cleanup compose resources
-            if self.compose_manager:
+            if pooled_manager:
+                # Keep the stack for the next validation unless it is broken
+                get_stack_pool().release(pooled_manager, healthy=stack_healthy)
+                self.compose_manager = None
+            elif self.compose_manager:
+                # Cleanup compose resources
                 self.compose_manager.cleanup()
     
     def _find_test_service(self, services: Dict) -> str:
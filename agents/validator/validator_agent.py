@@ -17,6 +17,7 @@ from acp_sdk import Message
 from acp_sdk.models import MessagePart
 from agents.agent_configs import validator_config
 from agents.validator.container_manager import get_container_manager
+from shared.utils.code_block_parser import HASH_FILENAME, extract_files
 
 import logging
 logging.basicConfig(level=logging.INFO)
@@ -32,17 +33,8 @@ def extract_session_id(input_text: str) -> Optional[str]:
 
 def extract_code_files(input_text: str) -> Dict[str, str]:
     """Extract code files from input text"""
-    files = {}
-    
-    # Pattern to match code blocks with filename
-    file_pattern = r'```(?:python|py|javascript|js)\s*\n#\s*filename:\s*(\S+)\n(.*?)```'
-    matches = re.findall(file_pattern, input_text, re.DOTALL)
-    
-    if matches:
-        for filename, content in matches:
-            files[filename] = content.strip()
-    
-    return files
+    # Code blocks whose first line is "# filename: path"
+    return extract_files(input_text, styles=(HASH_FILENAME,))
 
 
 async def validator_agent(input: list[Message]) -> AsyncGenerator:
@@ -23,7 +23,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from shared.data_models import CodingTeamInput, CodingTeamResult, WorkflowType, StepType, TeamMemberResult
 from workflows import execute_workflow
 from workflows.monitoring import WorkflowExecutionTracer
-from agents.executor.docker_manager import DockerEnvironmentManager
+from shared.utils.rate_limiter import Priority, call_priority
+from workflows.workflow_manager import cleanup_docker_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -142,8 +143,10 @@ async def execute_workflow_async(
         logger.info(f"Execute_workflow module: {wf_execute_workflow.__module__}")
         logger.info(f"Execute_workflow signature: {inspect.signature(wf_execute_workflow)}")
         
-        # Execute the workflow with monitoring
-        agent_results, execution_report = await wf_execute_workflow(coding_input, tracer=tracer)
+        # Execute the workflow with monitoring; API sessions are interactive, so
+        # their agent calls are served before queued batch runs
+        with call_priority(Priority.INTERACTIVE):
+            agent_results, execution_report = await wf_execute_workflow(coding_input, tracer=tracer)
         
         # Format results for storage
         workflow_executions[session_id]["result"] = {
@@ -179,9 +182,7 @@ async def execute_workflow_async(
             
             if docker_session_id:
                 logger.info(f"Initiating Docker cleanup for session: {docker_session_id}")
-                docker_manager = DockerEnvironmentManager(docker_session_id)
-                await docker_manager.initialize()
-                await docker_manager.cleanup_session(docker_session_id)
+                await cleanup_docker_session(docker_session_id)
                 logger.info(f"Docker cleanup completed for session: {docker_session_id}")
         except Exception as cleanup_error:
             logger.warning(f"Docker cleanup failed: {str(cleanup_error)}")
@@ -200,9 +201,7 @@ async def execute_workflow_async(
             # Use the tracer's execution_id as the session ID for cleanup
             if 'tracer' in locals() and hasattr(tracer, 'execution_id'):
                 logger.info(f"Running cleanup after failure for execution: {tracer.execution_id}")
-                docker_manager = DockerEnvironmentManager(tracer.execution_id)
-                await docker_manager.initialize()
-                await docker_manager.cleanup_session(tracer.execution_id)
+                await cleanup_docker_session(tracer.execution_id)
         except Exception as cleanup_error:
             logger.warning(f"Docker cleanup after failure failed: {str(cleanup_error)}")
 
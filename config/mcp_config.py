@@ -75,7 +75,25 @@ MCP_FILESYSTEM_CONFIG = {
         "max_list_items": 1000,
         
         # Maximum directory depth for recursive operations
-        "max_recursion_depth": 10
+        "max_recursion_depth": 10,
+        
+        # Maximum number of files in a single batch operation
+        "max_batch_files": 500,
+        
+        # Paginated listings whose walk is kept to resume at the next page
+        "max_suspended_listings": 16
+    },
+    
+    # Audit log settings
+    "audit": {
+        # Seconds between periodic flushes of buffered audit entries
+        "flush_interval": float(os.getenv("MCP_FILESYSTEM_AUDIT_FLUSH_INTERVAL", "1.0")),
+        
+        # Number of buffered entries that triggers an immediate flush
+        "max_buffer_entries": 100,
+        
+        # fsync the audit file after each flush (durable, but slower)
+        "fsync_on_flush": os.getenv("MCP_FILESYSTEM_AUDIT_FSYNC", "false").lower() == "true"
     },
     
     # Performance settings
@@ -139,7 +157,29 @@ MCP_CLIENT_CONFIG = {
         
         # Connection pooling
         "pool_size": 10,
-        "pool_timeout": 30
+        "pool_timeout": 30,
+        
+        # Reuse one long-lived server connection per event loop instead of
+        # spawning the server for every connect() block
+        "shared_connection": True
+    },
+    
+    # Batching and pipelining of tool calls
+    "batching": {
+        # Maximum files per write_files/read_files/stat_many call
+        "max_batch_files": 100,
+        
+        # Maximum content bytes per write_files call
+        "max_batch_bytes": 4 * 1024 * 1024,  # 4MB
+        
+        # Maximum tool calls in flight on one session
+        "max_concurrent_calls": 8
+    },
+    
+    # Chunked transfer of large files
+    "transfer": {
+        # Bytes per read_file range / write_file append call
+        "chunk_size": 1024 * 1024  # 1MB
     },
     
     # Error handling
@@ -9,10 +9,16 @@ file operations with permission management and sandboxing.
 import os
 import sys
 import asyncio
+import base64
+import hashlib
 import json
 import shutil
+import stat
+import itertools
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 from dotenv import load_dotenv
 from mcp.server import Server
@@ -33,6 +39,111 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class BufferedAuditLog:
+    """
+    Buffered, append-only audit log writer.
+    
+    Entries are kept in memory and written in one append when the buffer
+    fills up, when the periodic flush task runs, or on shutdown, so tool
+    calls never wait on audit file I/O.
+    """
+    
+    def __init__(self,
+                 path: Path,
+                 flush_interval: float = 1.0,
+                 max_buffer_entries: int = 100,
+                 fsync_on_flush: bool = False):
+        """
+        Initialize the audit writer.
+        
+        Args:
+            path: Audit log file (JSON lines)
+            flush_interval: Seconds between periodic flushes
+            max_buffer_entries: Buffered entries that trigger an immediate flush
+            fsync_on_flush: Whether to fsync the file after each flush
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_buffer_entries = max_buffer_entries
+        self.fsync_on_flush = fsync_on_flush
+        self._buffer: List[str] = []
+        # _lock guards the buffer only; _write_lock keeps flushes in order
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.flush_count = 0
+    
+    def write(self, entry: Dict[str, Any]):
+        """Buffer an entry, flushing in a worker thread once the buffer is full."""
+        with self._lock:
+            self._buffer.append(json.dumps(entry, default=str) + "\n")
+            full = len(self._buffer) >= self.max_buffer_entries
+        
+        if full:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop (e.g. during startup or tests): flush inline
+                self.flush()
+                return
+            loop.run_in_executor(None, self.flush).add_done_callback(self._check_flush)
+    
+    def flush(self):
+        """Write all buffered entries to disk.
+        
+        The buffer is swapped out under the lock and written after releasing
+        it, so write() never waits on file I/O. Entries of a failed write are
+        put back at the front of the buffer.
+        """
+        with self._write_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                pending, self._buffer = self._buffer, []
+            
+            try:
+                with open(self.path, "a") as f:
+                    f.writelines(pending)
+                    if self.fsync_on_flush:
+                        f.flush()
+                        os.fsync(f.fileno())
+            except Exception:
+                with self._lock:
+                    self._buffer[:0] = pending
+                raise
+            self.flush_count += 1
+    
+    @staticmethod
+    def _check_flush(future: asyncio.Future):
+        """Log the error of a flush run in the executor."""
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Failed to flush audit log: {future.exception()}")
+    
+    def start(self):
+        """Start the periodic flush task on the running event loop."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+    
+    async def close(self):
+        """Stop periodic flushing and write out remaining entries."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+    
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Failed to flush audit log: {e}")
+
+
 class FileSystemServer:
     """
     MCP server providing file system operations as tools.
@@ -40,7 +151,9 @@ class FileSystemServer:
     Features:
     - Secure file operations with sandboxing
     - Permission management
-    - Audit logging
+    - Buffered audit logging
+    - Blocking file I/O offloaded to worker threads
+    - Paginated directory listings
     - Error handling and validation
     """
     
@@ -49,9 +162,19 @@ class FileSystemServer:
         self.server = Server("filesystem-server")
         self.config = MCP_FILESYSTEM_CONFIG
         self.sandbox_root = Path(self.config.get("sandbox_root", "./generated"))
-        self.audit_log_path = Path(self.config.get("audit_log_path", "./logs/mcp_filesystem_audit.log"))
+        audit_config = self.config.get("audit", {})
+        self._audit_writer = BufferedAuditLog(
+            Path(self.config.get("audit_log_path", "./logs/mcp_filesystem_audit.log")),
+            flush_interval=audit_config.get("flush_interval", 1.0),
+            max_buffer_entries=audit_config.get("max_buffer_entries", 100),
+            fsync_on_flush=audit_config.get("fsync_on_flush", False)
+        )
         self.permissions = self.config.get("permissions", {})
         
+        # Suspended walks of paginated listings, keyed by (path, recursive, next offset)
+        self._listing_walks: "OrderedDict[tuple, Iterator[tuple]]" = OrderedDict()
+        self._listing_lock = threading.Lock()
+        
         # Ensure directories exist
         self.sandbox_root.mkdir(parents=True, exist_ok=True)
         self.audit_log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -59,6 +182,15 @@ class FileSystemServer:
         # Register tools
         self._register_tools()
     
+    @property
+    def audit_log_path(self) -> Path:
+        """Path of the audit log file."""
+        return self._audit_writer.path
+    
+    @audit_log_path.setter
+    def audit_log_path(self, path: Path):
+        self._audit_writer.path = Path(path)
+    
     def _register_tools(self):
         """Register all file system operations as MCP tools."""
         
@@ -68,24 +200,29 @@ class FileSystemServer:
             return [
                 Tool(
                     name="read_file",
-                    description="Read contents of a file",
+                    description="Read contents of a file, or a byte range of it",
                     inputSchema={
                         "type": "object",
                         "properties": {
-                            "path": {"type": "string", "description": "File path relative to sandbox root"}
+                            "path": {"type": "string", "description": "File path relative to sandbox root"},
+                            "encoding": {"type": "string", "description": "File encoding, or 'base64' for raw bytes as base64 text", "default": "utf-8"},
+                            "offset": {"type": "integer", "description": "Byte offset to start reading at", "default": 0},
+                            "length": {"type": "integer", "description": "Maximum number of bytes to read (to end of file if omitted)"}
                         },
                         "required": ["path"]
                     }
                 ),
                 Tool(
                     name="write_file",
-                    description="Write content to a file",
+                    description="Write or append content to a file",
                     inputSchema={
                         "type": "object",
                         "properties": {
                             "path": {"type": "string", "description": "File path relative to sandbox root"},
                             "content": {"type": "string", "description": "Content to write"},
-                            "encoding": {"type": "string", "description": "File encoding", "default": "utf-8"}
+                            "encoding": {"type": "string", "description": "File encoding, or 'base64' for raw bytes as base64 text", "default": "utf-8"},
+                            "mode": {"type": "string", "enum": ["overwrite", "append"], "default": "overwrite"},
+                            "if_changed": {"type": "boolean", "description": "Skip the write if the file already has this content", "default": False}
                         },
                         "required": ["path", "content"]
                     }
@@ -108,7 +245,10 @@ class FileSystemServer:
                         "type": "object",
                         "properties": {
                             "path": {"type": "string", "description": "Directory path relative to sandbox root"},
-                            "recursive": {"type": "boolean", "description": "List recursively", "default": False}
+                            "recursive": {"type": "boolean", "description": "List recursively", "default": False},
+                            "offset": {"type": "integer", "description": "Number of entries to skip", "default": 0},
+                            "limit": {"type": "integer", "description": "Maximum entries to return (page size)"},
+                            "include_size": {"type": "boolean", "description": "Stat files for their size", "default": True}
                         },
                         "required": ["path"]
                     }
@@ -142,10 +282,66 @@ class FileSystemServer:
                     inputSchema={
                         "type": "object",
                         "properties": {
-                            "path": {"type": "string", "description": "File path relative to sandbox root"}
+                            "path": {"type": "string", "description": "File path relative to sandbox root"},
+                            "include_hash": {"type": "boolean", "description": "Include the SHA-256 of file contents", "default": False}
                         },
                         "required": ["path"]
                     }
+                ),
+                Tool(
+                    name="write_files",
+                    description="Write multiple files in one call",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "files": {
+                                "type": "array",
+                                "description": "Files to write",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "path": {"type": "string", "description": "File path relative to sandbox root"},
+                                        "content": {"type": "string", "description": "Content to write"}
+                                    },
+                                    "required": ["path", "content"]
+                                }
+                            },
+                            "encoding": {"type": "string", "description": "File encoding", "default": "utf-8"},
+                            "if_changed": {"type": "boolean", "description": "Skip files that already have this content", "default": False}
+                        },
+                        "required": ["files"]
+                    }
+                ),
+                Tool(
+                    name="read_files",
+                    description="Read multiple files in one call",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "paths": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "File paths relative to sandbox root"
+                            },
+                            "encoding": {"type": "string", "description": "File encoding", "default": "utf-8"}
+                        },
+                        "required": ["paths"]
+                    }
+                ),
+                Tool(
+                    name="stat_many",
+                    description="Get existence, type and size of multiple paths in one call",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "paths": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Paths relative to sandbox root"
+                            }
+                        },
+                        "required": ["paths"]
+                    }
                 )
             ]
         
@@ -156,7 +352,7 @@ class FileSystemServer:
                 # Log the operation
                 self._audit_log("tool_call", {
                     "tool": name,
-                    "arguments": arguments,
+                    "arguments": self._summarize_arguments(arguments),
                     "timestamp": datetime.now().isoformat()
                 })
                 
@@ -173,7 +369,10 @@ class FileSystemServer:
                     "list_directory": self._list_directory,
                     "create_directory": self._create_directory,
                     "file_exists": self._file_exists,
-                    "get_file_info": self._get_file_info
+                    "get_file_info": self._get_file_info,
+                    "write_files": self._write_files,
+                    "read_files": self._read_files,
+                    "stat_many": self._stat_many
                 }
                 
                 handler = handlers.get(name)
@@ -219,52 +418,178 @@ class FileSystemServer:
         return absolute_path
     
     def _audit_log(self, action: str, details: Dict[str, Any]):
-        """Log an audit entry."""
+        """Log an audit entry (buffered, see BufferedAuditLog)."""
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "action": action,
             "details": details
         }
         
-        # Write to audit log file
-        with open(self.audit_log_path, "a") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        self._audit_writer.write(log_entry)
         
         # Also log to standard logger
-        logger.info(f"Audit: {action} - {details}")
+        logger.debug(f"Audit: {action} - {details}")
+    
+    @staticmethod
+    def _summarize_arguments(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace file contents with their size so audit entries stay small."""
+        summary = {}
+        for key, value in arguments.items():
+            if key == "content" and isinstance(value, str):
+                summary["content_size"] = len(value)
+            elif key == "files" and isinstance(value, list):
+                summary["files"] = [
+                    {"path": f.get("path"), "content_size": len(f.get("content", ""))}
+                    for f in value if isinstance(f, dict)
+                ]
+            else:
+                summary[key] = value
+        return summary
+    
+    @staticmethod
+    def _content_bytes(content: str, encoding: str) -> bytes:
+        """Bytes to write for content; 'base64' content is decoded to the raw bytes."""
+        if encoding == "base64":
+            return base64.b64decode(content, validate=True)
+        return content.encode(encoding)
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """SHA-256 of a file's contents, read in blocks."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
     
-    async def _read_file(self, path: Path, encoding: str = "utf-8") -> Dict[str, Any]:
-        """Read contents of a file."""
+    async def _read_file(self,
+                         path: Path,
+                         encoding: str = "utf-8",
+                         offset: int = 0,
+                         length: Optional[int] = None) -> Dict[str, Any]:
+        """Read contents of a file, or the byte range [offset, offset + length)."""
+        return await asyncio.to_thread(self._read_file_sync, path, encoding, offset, length)
+    
+    def _read_file_sync(self,
+                        path: Path,
+                        encoding: str = "utf-8",
+                        offset: int = 0,
+                        length: Optional[int] = None) -> Dict[str, Any]:
+        """Blocking part of _read_file, run in a worker thread."""
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
         
         if not path.is_file():
             raise ValueError(f"Path is not a file: {path}")
         
-        content = path.read_text(encoding=encoding)
+        if offset == 0 and length is None:
+            if encoding == "base64":
+                data = path.read_bytes()
+                content, size = base64.b64encode(data).decode("ascii"), len(data)
+            else:
+                content = path.read_text(encoding=encoding)
+                size = len(content)
+            
+            return {
+                "success": True,
+                "path": str(path.relative_to(self.sandbox_root)),
+                "content": content,
+                "size": size,
+                "encoding": encoding
+            }
+        
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("offset and length must be non-negative")
+        
+        max_size = self.config.get("limits", {}).get("max_file_size", 10 * 1024 * 1024)
+        length = max_size if length is None else min(length, max_size)
+        
+        total_size = path.stat().st_size
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        
+        if encoding == "base64":
+            content, consumed = base64.b64encode(data).decode("ascii"), len(data)
+        else:
+            content, consumed = self._decode_range(data, encoding)
+        end = offset + consumed
         
         return {
             "success": True,
             "path": str(path.relative_to(self.sandbox_root)),
             "content": content,
-            "size": len(content),
-            "encoding": encoding
+            "size": consumed if encoding == "base64" else len(content),
+            "encoding": encoding,
+            "offset": offset,
+            "length": consumed,
+            "total_size": total_size,
+            "next_offset": end if end < total_size else None,
+            "eof": end >= total_size
         }
     
-    async def _write_file(self, path: Path, content: str, encoding: str = "utf-8") -> Dict[str, Any]:
-        """Write content to a file."""
-        # Create parent directories if needed
-        path.parent.mkdir(parents=True, exist_ok=True)
+    @staticmethod
+    def _decode_range(data: bytes, codec: str) -> tuple:
+        """
+        Decode a byte range, dropping a multi-byte character cut off at its end.
         
-        # Write the file
-        path.write_text(content, encoding=encoding)
+        Returns:
+            Tuple of (text, number of bytes consumed)
+        """
+        try:
+            return data.decode(codec), len(data)
+        except UnicodeDecodeError as e:
+            # A chunk boundary may split one character; leave it for the next range
+            if e.reason == "unexpected end of data" and len(data) - e.start < 4:
+                return data[:e.start].decode(codec), e.start
+            raise
+    
+    async def _write_file(self,
+                          path: Path,
+                          content: str,
+                          encoding: str = "utf-8",
+                          mode: str = "overwrite",
+                          if_changed: bool = False) -> Dict[str, Any]:
+        """Write content to a file, or append it in append mode."""
+        return await asyncio.to_thread(self._write_file_sync, path, content, encoding, mode, if_changed)
+    
+    def _write_file_sync(self,
+                         path: Path,
+                         content: str,
+                         encoding: str = "utf-8",
+                         mode: str = "overwrite",
+                         if_changed: bool = False) -> Dict[str, Any]:
+        """Blocking part of _write_file, run in a worker thread."""
+        if mode not in ("overwrite", "append"):
+            raise ValueError(f"Unknown write mode: {mode}")
         
-        return {
+        data = self._content_bytes(content, encoding)
+        result = {
             "success": True,
             "path": str(path.relative_to(self.sandbox_root)),
-            "size": len(content),
-            "encoding": encoding
+            "size": len(data) if encoding == "base64" else len(content),
+            "encoding": encoding,
+            "mode": mode,
+            "changed": True
         }
+        
+        if if_changed and mode == "overwrite":
+            new_hash = hashlib.sha256(data).hexdigest()
+            result["sha256"] = new_hash
+            # Only hash the existing file when the sizes match
+            if (path.is_file() and path.stat().st_size == len(data)
+                    and self._hash_file(path) == new_hash):
+                result["changed"] = False
+                return result
+        
+        # Create parent directories if needed
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Write the file
+        with open(path, "ab" if mode == "append" else "wb") as f:
+            f.write(data)
+        
+        return result
     
     async def _delete_file(self, path: Path) -> Dict[str, Any]:
         """Delete a file."""
@@ -282,40 +607,96 @@ class FileSystemServer:
             "deleted": True
         }
     
-    async def _list_directory(self, path: Path, recursive: bool = False) -> Dict[str, Any]:
-        """List contents of a directory."""
+    async def _list_directory(self,
+                              path: Path,
+                              recursive: bool = False,
+                              offset: int = 0,
+                              limit: Optional[int] = None,
+                              include_size: bool = True) -> Dict[str, Any]:
+        """List contents of a directory, one page at a time.
+        
+        The walk runs in a worker thread using os.scandir and stops as soon
+        as the requested page is filled, so large trees never block other
+        tool calls or get materialized in full. The walk is kept and resumed
+        when the next page is requested, so paging through a tree walks it
+        once instead of rescanning every earlier page.
+        """
+        max_items = self.config.get("limits", {}).get("max_list_items", 1000)
+        limit = max_items if limit is None else max(0, min(limit, max_items))
+        offset = max(0, offset)
+        
+        return await asyncio.to_thread(
+            self._list_directory_page, path, recursive, offset, limit, include_size
+        )
+    
+    def _list_directory_page(self,
+                             path: Path,
+                             recursive: bool,
+                             offset: int,
+                             limit: int,
+                             include_size: bool) -> Dict[str, Any]:
+        """Blocking part of _list_directory, run in a worker thread."""
         if not path.exists():
             raise FileNotFoundError(f"Directory not found: {path}")
         
         if not path.is_dir():
             raise ValueError(f"Path is not a directory: {path}")
         
-        items = []
+        with self._listing_lock:
+            entries = self._listing_walks.pop((str(path), recursive, offset), None)
+        if entries is None:
+            entries = itertools.islice(self._iter_directory(path, recursive), offset, None)
         
-        if recursive:
-            for item in path.rglob("*"):
-                relative_path = item.relative_to(self.sandbox_root)
-                items.append({
-                    "path": str(relative_path),
-                    "type": "directory" if item.is_dir() else "file",
-                    "size": item.stat().st_size if item.is_file() else None
-                })
-        else:
-            for item in path.iterdir():
-                relative_path = item.relative_to(self.sandbox_root)
-                items.append({
-                    "path": str(relative_path),
-                    "type": "directory" if item.is_dir() else "file",
-                    "size": item.stat().st_size if item.is_file() else None
-                })
+        items = []
+        has_more = False
+        for item in entries:
+            if len(items) >= limit:
+                has_more = True
+                self._suspend_walk((str(path), recursive, offset + len(items)),
+                                   itertools.chain([item], entries))
+                break
+            entry, is_dir = item
+            items.append({
+                "path": os.path.relpath(entry.path, self.sandbox_root),
+                "type": "directory" if is_dir else "file",
+                "size": entry.stat().st_size if include_size and not is_dir else None
+            })
         
         return {
             "success": True,
             "path": str(path.relative_to(self.sandbox_root)),
             "items": items,
-            "count": len(items)
+            "count": len(items),
+            "offset": offset,
+            "has_more": has_more,
+            "next_offset": offset + len(items) if has_more else None
         }
     
+    def _suspend_walk(self, key: tuple, entries: Iterator[tuple]):
+        """Keep a listing walk for the request of its next page."""
+        max_walks = self.config.get("limits", {}).get("max_suspended_listings", 16)
+        with self._listing_lock:
+            self._listing_walks[key] = entries
+            while len(self._listing_walks) > max_walks:
+                self._listing_walks.popitem(last=False)
+    
+    def _iter_directory(self, path: Path, recursive: bool) -> Iterator[tuple]:
+        """Yield (DirEntry, is_dir) in a stable, depth-first name order."""
+        max_depth = self.config.get("limits", {}).get("max_recursion_depth", 10)
+        stack = [(str(path), 0)]
+        while stack:
+            directory, depth = stack.pop()
+            with os.scandir(directory) as scanner:
+                entries = sorted(scanner, key=lambda e: e.name)
+            subdirectories = []
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                yield entry, is_dir
+                if recursive and is_dir and depth < max_depth:
+                    subdirectories.append((entry.path, depth + 1))
+            # Visit subdirectories in name order after their parent's entries
+            stack.extend(reversed(subdirectories))
+    
     async def _create_directory(self, path: Path, parents: bool = True) -> Dict[str, Any]:
         """Create a directory."""
         path.mkdir(parents=parents, exist_ok=True)
@@ -337,14 +718,14 @@ class FileSystemServer:
             "type": "directory" if path.is_dir() else "file" if path.is_file() else None
         }
     
-    async def _get_file_info(self, path: Path) -> Dict[str, Any]:
+    async def _get_file_info(self, path: Path, include_hash: bool = False) -> Dict[str, Any]:
         """Get information about a file."""
         if not path.exists():
             raise FileNotFoundError(f"Path not found: {path}")
         
         stat = path.stat()
         
-        return {
+        info = {
             "success": True,
             "path": str(path.relative_to(self.sandbox_root)),
             "type": "directory" if path.is_dir() else "file",
@@ -353,6 +734,86 @@ class FileSystemServer:
             "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
             "permissions": oct(stat.st_mode)[-3:]
         }
+        if include_hash and path.is_file():
+            info["sha256"] = await asyncio.to_thread(self._hash_file, path)
+        
+        return info
+    
+    def _check_batch_size(self, count: int):
+        """Reject batches larger than the configured limit."""
+        max_batch = self.config.get("limits", {}).get("max_batch_files", 500)
+        if count > max_batch:
+            raise ValueError(f"Batch of {count} items exceeds limit of {max_batch}")
+    
+    async def _write_files(self,
+                           files: List[Dict[str, str]],
+                           encoding: str = "utf-8",
+                           if_changed: bool = False) -> Dict[str, Any]:
+        """Write multiple files. Failures are reported per file."""
+        self._check_batch_size(len(files))
+        
+        results = []
+        for item in files:
+            try:
+                path = self._sanitize_path(item["path"])
+                results.append(await self._write_file(path, item["content"], encoding, if_changed=if_changed))
+            except Exception as e:
+                results.append({"success": False, "path": item.get("path"), "error": str(e)})
+        
+        failed = sum(1 for r in results if not r["success"])
+        return {
+            "success": failed == 0,
+            "results": results,
+            "count": len(results),
+            "failed": failed
+        }
+    
+    async def _read_files(self, paths: List[str], encoding: str = "utf-8") -> Dict[str, Any]:
+        """Read multiple files. Failures are reported per file."""
+        self._check_batch_size(len(paths))
+        
+        results = []
+        for path_str in paths:
+            try:
+                results.append(await self._read_file(self._sanitize_path(path_str), encoding))
+            except Exception as e:
+                results.append({"success": False, "path": path_str, "error": str(e)})
+        
+        failed = sum(1 for r in results if not r["success"])
+        return {
+            "success": failed == 0,
+            "files": results,
+            "count": len(results),
+            "failed": failed
+        }
+    
+    async def _stat_many(self, paths: List[str]) -> Dict[str, Any]:
+        """Stat multiple paths with a single stat() call each."""
+        self._check_batch_size(len(paths))
+        
+        items = []
+        for path_str in paths:
+            item = {"path": path_str, "exists": False, "type": None, "size": None, "modified": None}
+            try:
+                path_stat = os.stat(self._sanitize_path(path_str))
+                is_dir = stat.S_ISDIR(path_stat.st_mode)
+                item.update({
+                    "exists": True,
+                    "type": "directory" if is_dir else "file",
+                    "size": None if is_dir else path_stat.st_size,
+                    "modified": datetime.fromtimestamp(path_stat.st_mtime).isoformat()
+                })
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                item["error"] = str(e)
+            items.append(item)
+        
+        return {
+            "success": True,
+            "items": items,
+            "count": len(items)
+        }
     
     async def run_server(self):
         """Run the MCP server."""
@@ -364,17 +825,21 @@ class FileSystemServer:
             "sandbox_root": str(self.sandbox_root),
             "config": self.config
         })
+        self._audit_writer.start()
         
         # Run the server using stdio transport
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="filesystem-server",
-                    server_version="1.0.0"
+        try:
+            async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="filesystem-server",
+                        server_version="1.0.0"
+                    )
                 )
-            )
+        finally:
+            await self._audit_writer.close()
 
 
 # Server entry point
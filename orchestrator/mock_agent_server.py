@@ -0,0 +1,295 @@
+"""
+Mock Agent Server
+
+A local stand-in for orchestrator_agent.py that serves the nine team member
+agents over ACP without calling an LLM. Responses are either replayed from a
+recordings file (or a run.py --record-agents archive) or generated from
+templates the workflow parsers understand (a FEATURE[n] implementation plan,
+code and test files with filename markers, APPROVED reviews, passing
+validations). Each call sleeps for a latency drawn from a configurable
+distribution, seeded so runs are repeatable.
+
+Used by scripts/benchmark_workflow_engine.py to measure the workflow engine
+itself; it can also be started by hand:
+
+    python orchestrator/mock_agent_server.py --port 8090 --latency lognormal:0.5,0.3
+    python orchestrator/mock_agent_server.py --agent-latency coder_agent=fixed:2 --features 5
+
+Workflows reach it when ORCHESTRATOR_SERVER_CONFIG["port"] points at its port.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Add the project root to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from orchestrator.server_lifecycle import build_health
+
+# Team member agents served (registered as <name>_wrapper like the real server)
+MOCK_AGENTS = [
+    "planner_agent",
+    "designer_agent",
+    "coder_agent",
+    "feature_coder_agent",
+    "test_writer_agent",
+    "reviewer_agent",
+    "executor_agent",
+    "validator_agent",
+    "feature_reviewer_agent"
+]
+
+# Agents a readiness probe should wait for
+MOCK_SERVER_AGENTS = [f"{agent}_wrapper" for agent in MOCK_AGENTS] + ["health"]
+
+
+@dataclass
+class LatencyModel:
+    """Distribution of simulated agent call latencies (seconds)"""
+    kind: str = "fixed"
+    params: List[float] = field(default_factory=lambda: [0.0])
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """
+        Parse a latency spec: "fixed:S", "uniform:LOW,HIGH" or
+        "lognormal:MEDIAN,SIGMA" (a bare number means fixed).
+        """
+        kind, _, values = spec.partition(":")
+        if not values:
+            kind, values = "fixed", kind
+        params = [float(v) for v in values.split(",")]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        return cls(kind, params)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0.0
+        return self.params[0]
+
+
+class MockAgentBackend:
+    """Generates agent responses and latencies, independent of the ACP transport"""
+
+    def __init__(self, features: int = 3, latency: Optional[LatencyModel] = None,
+                 agent_latency: Optional[Dict[str, LatencyModel]] = None,
+                 recordings: Optional[Dict[str, List[str]]] = None, seed: int = 0):
+        """
+        Initialize the backend.
+
+        Args:
+            features: Features in the generated implementation plan
+            latency: Default latency model
+            agent_latency: Per-agent latency models
+            recordings: Outputs to replay per agent (cycled); other agents use templates
+            seed: Seed for latency sampling
+        """
+        self.features = features
+        self.latency = latency or LatencyModel()
+        self.agent_latency = agent_latency or {}
+        self.recordings = recordings or {}
+        self.rng = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+        self.simulated_seconds = 0.0
+
+    def sample_latency(self, agent: str) -> float:
+        return self.agent_latency.get(agent, self.latency).sample(self.rng)
+
+    async def handle(self, agent: str, text: str) -> str:
+        """Answer one agent call after its simulated latency"""
+        latency = self.sample_latency(agent)
+        self.calls[agent] = self.calls.get(agent, 0) + 1
+        self.simulated_seconds += latency
+        if latency > 0:
+            await asyncio.sleep(latency)
+        return self.respond(agent, text)
+
+    def respond(self, agent: str, text: str) -> str:
+        recorded = self.recordings.get(agent)
+        if recorded:
+            return recorded[(self.calls.get(agent, 1) - 1) % len(recorded)]
+        template = getattr(self, f"_{agent}", None)
+        return template(text) if template else f"{agent} completed the task."
+
+    def get_stats(self) -> Dict:
+        return {"calls": dict(self.calls), "simulated_seconds": round(self.simulated_seconds, 3)}
+
+    # Templates ---------------------------------------------------------------
+
+    def _modules_for(self, text: str) -> List[int]:
+        """Modules a call is about: the feature being worked on, else all mentioned"""
+        titles = re.findall(r'Title:\s*Mock Module (\d+)', text)
+        if titles:
+            return [int(titles[-1])]
+        mentioned = sorted({int(n) for n in re.findall(r'Mock Module (\d+)', text)})
+        return mentioned or list(range(1, self.features + 1))
+
+    def _planner_agent(self, text: str) -> str:
+        steps = "\n".join(f"{n}. Implement Mock Module {n}" for n in range(1, self.features + 1))
+        return f"""PROJECT PLAN
+
+Goal: deliver the requested application as {self.features} small modules.
+
+Steps:
+{steps}
+
+Technologies: Python 3, pytest"""
+
+    def _designer_agent(self, text: str) -> str:
+        blocks = []
+        for n in range(1, self.features + 1):
+            dependencies = f"FEATURE[{n - 1}]" if n > 1 else "None"
+            blocks.append(f"""FEATURE[{n}]: Mock Module {n}
+Description: Provide module_{n}(value) in mock_app/module_{n}.py returning its input unchanged
+Files: mock_app/module_{n}.py
+Validation: module_{n}(42) returns 42
+Test Criteria:
+- Input: module_{n}(42)
+- Expected: 42
+Dependencies: {dependencies}
+Complexity: Low""")
+        return "TECHNICAL DESIGN\n\nIMPLEMENTATION PLAN\n\n" + "\n\n".join(blocks)
+
+    def _code_files(self, modules: List[int]) -> str:
+        files = ["```python\n# filename: mock_app/__init__.py\n```"]
+        for n in modules:
+            files.append(f"""```python
+# filename: mock_app/module_{n}.py
+def module_{n}(value):
+    return value
+```""")
+        return "\n\n".join(files)
+
+    def _coder_agent(self, text: str) -> str:
+        return "Implementation:\n\n" + self._code_files(self._modules_for(text))
+
+    def _feature_coder_agent(self, text: str) -> str:
+        return self._coder_agent(text)
+
+    def _test_writer_agent(self, text: str) -> str:
+        modules = self._modules_for(text)
+        required = re.search(r'REQUIRED TEST FILE:\s*(\S+)', text)
+        tests = []
+        for n in modules:
+            filename = required.group(1) if required and len(modules) == 1 else f"tests/test_mock_module_{n}.py"
+            tests.append(f"""```python
+# filename: {filename}
+from mock_app.module_{n} import module_{n}
+
+
+def test_module_{n}_returns_input():
+    assert module_{n}(42) == 42
+```""")
+        return "Tests:\n\n" + "\n\n".join(tests)
+
+    def _reviewer_agent(self, text: str) -> str:
+        return "REVIEW: APPROVED\nThe output meets the requirements."
+
+    def _feature_reviewer_agent(self, text: str) -> str:
+        return "REVIEW: FEATURE APPROVED\nThe feature is implemented and tested."
+
+    def _executor_agent(self, text: str) -> str:
+        session = self.calls.get("executor_agent", 0)
+        return f"""SESSION_ID: mock_exec_{session}
+
+EXECUTION RESULT: SUCCESS
+All tests passed: {self.features} passed, 0 failed"""
+
+    def _validator_agent(self, text: str) -> str:
+        session = self.calls.get("validator_agent", 0)
+        return f"""SESSION_ID: mock_validation_{session}
+
+VALIDATION_RESULT: PASS
+DETAILS: All files executed successfully"""
+
+
+def load_recordings(path: str) -> Dict[str, List[str]]:
+    """
+    Load a recordings file: {"coder_agent": ["output", ...], ...}, or a replay
+    archive written by run.py --record-agents (served per agent in recorded order)
+    """
+    if path.endswith(".gz"):
+        from shared.utils.agent_replay import load_archive
+        data = {}
+        for entry in load_archive(path):
+            data.setdefault(entry["agent"], []).append("".join(entry["output"][0]) if entry["output"] else "")
+        return data
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return {agent: outputs if isinstance(outputs, list) else [outputs] for agent, outputs in data.items()}
+
+
+def create_server(backend: MockAgentBackend):
+    """ACP server exposing the backend under the real agent wrapper names"""
+    from acp_sdk.models import Message, MessagePart
+    from acp_sdk.server import Server
+
+    server = Server()
+    started_at = datetime.now().isoformat()
+
+    def make_handler(agent: str):
+        async def handler(input: list[Message]) -> AsyncGenerator:
+            text = "".join(str(part.content or "") for message in input for part in message.parts)
+            yield MessagePart(content=await backend.handle(agent, text), content_type="text/plain")
+        handler.__name__ = f"{agent}_wrapper"
+        handler.__doc__ = f"Mock {agent}"
+        return handler
+
+    for agent in MOCK_AGENTS:
+        server.agent(name=f"{agent}_wrapper")(make_handler(agent))
+
+    @server.agent(name="health")
+    async def health(input: list[Message]) -> AsyncGenerator:
+        """Readiness of the mock server (its fingerprint never matches, so run.py won't reuse it)"""
+        report = build_health(MOCK_SERVER_AGENTS, started_at, "mock", expected=MOCK_SERVER_AGENTS)
+        report["mock"] = backend.get_stats()
+        yield MessagePart(content=json.dumps(report), content_type="application/json")
+
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the team member agents with mock LLM responses")
+    parser.add_argument("--port", type=int, default=8090, help="Port to listen on")
+    parser.add_argument("--latency", default="fixed:0", help="Default latency: fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--agent-latency", action="append", default=[], metavar="AGENT=SPEC",
+                        help="Latency for one agent (repeatable), e.g. coder_agent=lognormal:2,0.4")
+    parser.add_argument("--features", type=int, default=3, help="Features in the generated design")
+    parser.add_argument("--recordings", help="JSON file of recorded outputs per agent, or a replay archive (.jsonl.gz)")
+    parser.add_argument("--seed", type=int, default=0, help="Latency sampling seed")
+    args = parser.parse_args()
+
+    agent_latency = {}
+    for item in args.agent_latency:
+        agent, _, spec = item.partition("=")
+        agent_latency[agent] = LatencyModel.parse(spec)
+
+    backend = MockAgentBackend(
+        features=args.features,
+        latency=LatencyModel.parse(args.latency),
+        agent_latency=agent_latency,
+        recordings=load_recordings(args.recordings) if args.recordings else None,
+        seed=args.seed
+    )
+    print(f"🧪 Starting mock agent server on port {args.port}...")
+    create_server(backend).run(port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Orchestrator server lifecycle helpers.
+
+Used by run.py to start the ACP agent server and wait for it to become ready,
+and to reuse an already running server instead of restarting it. Readiness is
+probed over HTTP with exponential backoff, so callers continue as soon as all
+agents are registered rather than after a fixed sleep.
+
+Only the standard library is used here so run.py can import this module
+without loading the agent frameworks.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from workflows.workflow_config import ORCHESTRATOR_SERVER_CONFIG
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Agents the orchestrator server registers; the server is ready once all are listed
+ORCHESTRATOR_AGENTS = [
+    "planner_agent_wrapper",
+    "designer_agent_wrapper",
+    "coder_agent_wrapper",
+    "feature_coder_agent_wrapper",
+    "test_writer_agent_wrapper",
+    "reviewer_agent_wrapper",
+    "executor_agent_wrapper",
+    "validator_agent_wrapper",
+    "feature_reviewer_agent_wrapper",
+    "orchestrator",
+    "health"
+]
+
+# Code loaded by the agent server; a running server is only reused if none of it changed
+_FINGERPRINT_PATHS = ["agents", "orchestrator", "shared", "workflows/workflow_config.py", ".env"]
+
+
+def get_server_url(port: Optional[int] = None) -> str:
+    return f"http://localhost:{port or ORCHESTRATOR_SERVER_CONFIG['port']}"
+
+
+def get_log_path() -> Path:
+    """File receiving the output of servers started in the background"""
+    if ORCHESTRATOR_SERVER_CONFIG["log_file"]:
+        return Path(ORCHESTRATOR_SERVER_CONFIG["log_file"])
+    return Path.home() / ".cache" / "agent_blackwell" / "orchestrator_server.log"
+
+
+def code_fingerprint(root: Path = PROJECT_ROOT) -> str:
+    """Hash of the paths, sizes and modification times of the server's source files"""
+    digest = hashlib.sha256()
+    for relative in _FINGERPRINT_PATHS:
+        path = root / relative
+        if path.is_file():
+            files = [path]
+        elif path.is_dir():
+            files = sorted(p for p in path.rglob("*.py") if "__pycache__" not in p.parts)
+        else:
+            continue
+        for file in files:
+            stat = file.stat()
+            digest.update(f"{file.relative_to(root)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_health(agent_names: List[str], started_at: str, fingerprint: str,
+                 expected: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Health report returned by the server's health agent"""
+    missing = [name for name in expected or ORCHESTRATOR_AGENTS if name not in agent_names]
+    return {
+        "status": "ready" if not missing else "starting",
+        "pid": os.getpid(),
+        "started_at": started_at,
+        "uptime_seconds": round((datetime.now() - datetime.fromisoformat(started_at)).total_seconds(), 1),
+        "agents": agent_names,
+        "missing_agents": missing,
+        "fingerprint": fingerprint
+    }
+
+
+def list_registered_agents(base_url: Optional[str] = None, timeout: float = 1.0) -> Optional[List[str]]:
+    """Names of the agents registered on the server, or None if it isn't answering"""
+    try:
+        with urllib.request.urlopen(f"{base_url or get_server_url()}/agents", timeout=timeout) as response:
+            data = json.loads(response.read())
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
+    return [agent.get("name") for agent in data.get("agents", [])]
+
+
+def is_ready(base_url: Optional[str] = None, timeout: float = 1.0,
+             agents: Optional[List[str]] = None) -> bool:
+    """Whether the server is up and all agents (default: the orchestrator's) are registered"""
+    registered = list_registered_agents(base_url, timeout)
+    return registered is not None and all(name in registered for name in agents or ORCHESTRATOR_AGENTS)
+
+
+def get_health(base_url: Optional[str] = None, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+    """Run the server's health agent, or None if the server doesn't provide one"""
+    request = urllib.request.Request(
+        f"{base_url or get_server_url()}/runs",
+        data=json.dumps({
+            "agent_name": "health",
+            "input": [{"role": "user", "parts": [{"content": "", "content_type": "text/plain"}]}],
+            "mode": "sync"
+        }).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            run = json.loads(response.read())
+        return json.loads(run["output"][0]["parts"][0]["content"])
+    except (urllib.error.URLError, OSError, ValueError, KeyError, IndexError, TypeError):
+        return None
+
+
+def wait_until_ready(base_url: Optional[str] = None, process: Optional[subprocess.Popen] = None,
+                     timeout: Optional[float] = None, agents: Optional[List[str]] = None) -> bool:
+    """
+    Probe the server with exponential backoff until it is ready.
+
+    Args:
+        base_url: Server URL
+        process: Server process; waiting stops early if it exits
+        timeout: Seconds to wait (default: startup_timeout from the config)
+        agents: Agents that must be registered (default: the orchestrator's)
+
+    Returns:
+        True once ready, False if the process exited or the timeout passed
+    """
+    deadline = time.monotonic() + (timeout or ORCHESTRATOR_SERVER_CONFIG["startup_timeout"])
+    delay = ORCHESTRATOR_SERVER_CONFIG["probe_initial_delay"]
+    while True:
+        if is_ready(base_url, timeout=min(1.0, max(0.1, deadline - time.monotonic())), agents=agents):
+            return True
+        if process is not None and process.poll() is not None:
+            return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, ORCHESTRATOR_SERVER_CONFIG["probe_max_delay"])
+
+
+def wait_until_stopped(base_url: Optional[str] = None, timeout: float = 5.0) -> bool:
+    """Wait until nothing answers on the server URL (e.g. after killing it)"""
+    deadline = time.monotonic() + timeout
+    delay = ORCHESTRATOR_SERVER_CONFIG["probe_initial_delay"]
+    while list_registered_agents(base_url, timeout=0.5) is not None:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, ORCHESTRATOR_SERVER_CONFIG["probe_max_delay"])
+    return True
+
+
+def find_reusable_server(base_url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Health of a running server that can be reused, or None if it must be (re)started"""
+    if not ORCHESTRATOR_SERVER_CONFIG["reuse_running"] or not is_ready(base_url):
+        return None
+    health = get_health(base_url)
+    if not health or health.get("status") != "ready" or health.get("fingerprint") != code_fingerprint():
+        return None
+    return health
+
+
+def launch_server(debug: bool = False, detached: bool = False) -> subprocess.Popen:
+    """
+    Start orchestrator_agent.py without waiting for it.
+
+    Args:
+        debug: Show the server output in this terminal
+        detached: Run in its own session so it outlives this process (warm standby)
+    """
+    env = os.environ.copy()
+    if debug:
+        env['ORCHESTRATOR_DEBUG'] = '1'
+
+    if debug and not detached:
+        output = None
+    else:
+        # Written to a file: an unread pipe would block the server once it fills up
+        log_path = get_log_path()
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        output = open(log_path, 'a')
+
+    kwargs = {}
+    if detached:
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS
+        else:
+            kwargs["start_new_session"] = True
+
+    try:
+        return subprocess.Popen(
+            [sys.executable, str(PROJECT_ROOT / "orchestrator" / "orchestrator_agent.py")],
+            stdin=subprocess.DEVNULL,
+            stdout=output,
+            stderr=subprocess.STDOUT if output else None,
+            env=env,
+            **kwargs
+        )
+    finally:
+        if output:
+            output.close()
+
+
+def read_log_tail(lines: int = 20) -> str:
+    """Last lines of the background server log (for startup errors)"""
+    log_path = get_log_path()
+    if not log_path.exists():
+        return ""
+    with open(log_path, 'r', errors='replace') as f:
+        return "".join(f.readlines()[-lines:])
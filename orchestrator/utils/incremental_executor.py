@@ -14,6 +14,7 @@ from workflows.workflow_config import EXECUTION_CONFIG
 from workflows.incremental.error_analyzer import ErrorAnalyzer, ErrorContext
 from workflows.incremental.validation_system import GranularValidator
 from agents.executor.validation_debugger import ValidationDebugger
+from workflows.logger import workflow_logger as logger
 
 
 @dataclass
@@ -38,6 +39,8 @@ class IncrementalExecutor:
         self.tracer = tracer
         self.codebase_state: Dict[str, str] = {}
         self.validated_features: List[str] = []
+        # Files accepted from candidate sessions that this session hasn't seen yet
+        self._unsynced_files: Dict[str, str] = {}
         self.error_analyzer = ErrorAnalyzer()
         self.granular_validator = GranularValidator()
         # Enable debugging for validation decisions
@@ -47,22 +50,36 @@ class IncrementalExecutor:
         self,
         feature: Feature,
         new_files: Dict[str, str],
-        existing_tests: Optional[str] = None
+        existing_tests: Optional[str] = None,
+        candidate_id: Optional[str] = None
     ) -> ValidationResult:
         """
         Validate a single feature implementation.
         Follows ACP pattern for agent invocation.
+        
+        With a candidate_id, the files are validated as a speculative
+        candidate: in a session of their own (so several candidates can be
+        validated at once) with the full codebase, leaving codebase_state
+        untouched. Call accept_candidate with the files that should be kept.
         """
         from orchestrator.orchestrator_agent import run_team_member
         
-        # Update codebase state
-        self.codebase_state.update(new_files)
+        if candidate_id:
+            session_id = f"{self.session_id}_{candidate_id}"
+            files_to_send = {**self.codebase_state, **new_files}
+        else:
+            # Update codebase state
+            self.codebase_state.update(new_files)
+            session_id = self.session_id
+            files_to_send = {**self._unsynced_files, **new_files}
+            self._unsynced_files = {}
         
         # Prepare executor input following ACP message format
         executor_input = self._prepare_executor_input(
             feature, 
-            new_files, 
-            existing_tests
+            files_to_send, 
+            existing_tests,
+            session_id=session_id
         )
         
         # Record validation attempt if tracer is available
@@ -121,7 +138,7 @@ class IncrementalExecutor:
                 )
             
             # Track successful features
-            if validation_result.success:
+            if validation_result.success and not candidate_id:
                 self.validated_features.append(feature.id)
             
             return validation_result
@@ -146,15 +163,34 @@ class IncrementalExecutor:
             
             return error_result
     
+    def accept_candidate(self, feature: Feature, files: Dict[str, str]):
+        """Keep the files of a speculative candidate that passed validation"""
+        self.codebase_state.update(files)
+        # The main session gets them with its next validation
+        self._unsynced_files.update(files)
+        self.validated_features.append(feature.id)
+    
+    async def release_candidate(self, candidate_id: str):
+        """Remove the executor containers of a speculative candidate's session"""
+        from workflows.workflow_manager import cleanup_docker_session
+        
+        session_id = f"{self.session_id}_{candidate_id}"
+        try:
+            await cleanup_docker_session(session_id)
+        except Exception as e:
+            # A leftover container doesn't affect the workflow
+            logger.warning(f"Failed to clean up candidate session {session_id}: {e}")
+    
     def _prepare_executor_input(
         self, 
         feature: Feature,
         new_files: Dict[str, str],
-        tests: Optional[str]
+        tests: Optional[str],
+        session_id: Optional[str] = None
     ) -> str:
         """Prepare input for executor agent following ACP message format"""
         input_lines = [
-            f"SESSION_ID: {self.session_id}",
+            f"SESSION_ID: {session_id or self.session_id}",
             "OPERATION: incremental_validation",
             f"FEATURE: {feature.title}",
             "",
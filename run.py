@@ -10,6 +10,10 @@ Usage:
     python run.py workflow tdd --task "Build a calculator API"
     python run.py workflow mvp_incremental --task "Create a task manager"
     python run.py workflow enhanced_full --task "Build a REST API"
+    python run.py resume <session_id> # Resume an interrupted workflow
+    python run.py diagnose           # Check that all workflows can be imported
+    python run.py orchestrator start # Keep a warm orchestrator server for faster runs
+    python run.py --replay-agents run.jsonl.gz workflow tdd --task "..."  # Rerun recorded agent calls offline
     python run.py --debug            # Enable debug logging
     python run.py --help            # Get help
 """
@@ -33,9 +37,14 @@ import logging
 sys.path.insert(0, str(Path(__file__).parent))
 
 # Import workflow components directly
-from workflows.workflow_manager import execute_workflow, get_available_workflows, get_workflow_description
+from workflows.workflow_manager import (
+    execute_workflow, resume, get_available_workflows, get_workflow_description, verify_imports
+)
+from workflows.checkpoint_store import list_checkpoints
 from shared.data_models import CodingTeamInput
 from workflows.monitoring import WorkflowExecutionTracer
+from workflows.workflow_config import ORCHESTRATOR_SERVER_CONFIG
+from orchestrator import server_lifecycle
 
 
 # Global variables
@@ -56,8 +65,6 @@ def signal_handler(signum, frame):
 
 def configure_logging(debug=False):
     """Configure logging based on debug mode."""
-    import logging
-    
     if debug:
         # Debug mode: show all logs with timestamps
         logging.basicConfig(
@@ -136,53 +143,62 @@ def kill_process_on_port(port: int, debug: bool = False):
             print(f"⚠️  Error checking port {port}: {e}")
 
 
-def start_orchestrator_server(debug: bool = False):
-    """Start the orchestrator server in the background."""
+def start_orchestrator_server(debug: bool = False, detached: Optional[bool] = None):
+    """
+    Make sure an orchestrator server is ready, starting one if needed.
+    
+    A healthy server running the same code is reused. Otherwise whatever holds
+    the port is stopped, a new server is started and its readiness is probed
+    with exponential backoff until all agents are registered.
+    
+    Args:
+        debug: Print progress and show the server output
+        detached: Leave the server running after this process exits
+                  (default: warm_standby from ORCHESTRATOR_SERVER_CONFIG)
+    """
     global ORCHESTRATOR_PROCESS
+    port = ORCHESTRATOR_SERVER_CONFIG["port"]
+    if detached is None:
+        detached = ORCHESTRATOR_SERVER_CONFIG["warm_standby"]
     
-    # Kill any existing process on port 8080
-    if debug:
-        print("🔍 Checking for existing orchestrator on port 8080...")
-    kill_process_on_port(8080, debug=debug)
+    start_time = time.perf_counter()
+    health = server_lifecycle.find_reusable_server()
+    if health:
+        if debug:
+            print(f"♻️  Reusing orchestrator server on port {port} "
+                  f"(pid {health.get('pid')}, up {health.get('uptime_seconds')}s)")
+        return True
     
-    # Give it a moment to clean up
-    time.sleep(1)
+    # Stop whatever is on the port (an old or foreign server)
+    if debug:
+        print(f"🔍 Checking for existing orchestrator on port {port}...")
+    kill_process_on_port(port, debug=debug)
+    server_lifecycle.wait_until_stopped()
     
     # Start the orchestrator
     if debug:
         print("🚀 Starting orchestrator server...")
-    orchestrator_path = Path(__file__).parent / "orchestrator" / "orchestrator_agent.py"
     
     try:
-        # Set debug environment variable if needed
-        env = os.environ.copy()
-        if debug:
-            env['ORCHESTRATOR_DEBUG'] = '1'
-        
-        # Start orchestrator in background
-        ORCHESTRATOR_PROCESS = subprocess.Popen(
-            [sys.executable, str(orchestrator_path)],
-            stdout=subprocess.PIPE if not debug else None,
-            stderr=subprocess.PIPE if not debug else None,
-            text=True,
-            env=env
-        )
-        
-        # Wait a bit for it to start
-        time.sleep(3)
+        process = server_lifecycle.launch_server(debug=debug, detached=detached)
+        if not detached:
+            ORCHESTRATOR_PROCESS = process
         
-        # Check if it's running
-        if ORCHESTRATOR_PROCESS.poll() is None:
+        if server_lifecycle.wait_until_ready(process=process):
             if debug:
-                print("✅ Orchestrator server started successfully on port 8080")
+                print(f"✅ Orchestrator server ready on port {port} "
+                      f"in {time.perf_counter() - start_time:.2f}s")
             return True
+        
+        if process.poll() is None:
+            print(f"❌ Orchestrator server not ready after {ORCHESTRATOR_SERVER_CONFIG['startup_timeout']}s")
+            process.terminate()
         else:
             print("❌ Orchestrator server failed to start")
-            if debug:
-                stdout, stderr = ORCHESTRATOR_PROCESS.communicate(timeout=1)
-                if stderr:
-                    print(f"Error: {stderr}")
-            return False
+        log_tail = server_lifecycle.read_log_tail()
+        if log_tail and not (debug and not detached):
+            print(f"Last server output ({server_lifecycle.get_log_path()}):\n{log_tail}")
+        return False
             
     except Exception as e:
         print(f"❌ Failed to start orchestrator: {e}")
@@ -287,8 +303,9 @@ class DirectWorkflowRunner:
         await self._execute_workflow(requirements, workflow_type)
         
     async def _execute_workflow(self, requirements: str, workflow_type: str, 
-                              config: Optional[Dict[str, Any]] = None):
-        """Execute a workflow directly."""
+                              config: Optional[Dict[str, Any]] = None,
+                              resume_session: Optional[str] = None):
+        """Execute a workflow directly (or resume a checkpointed session)."""
         # Ensure orchestrator is running
         self.ensure_orchestrator_running()
         
@@ -300,7 +317,7 @@ class DirectWorkflowRunner:
         start_time = time.time()
         
         print(f"\n{'='*60}")
-        print(f"🚀 Starting {workflow_type} workflow")
+        print(f"🚀 {'Resuming' if resume_session else 'Starting'} {workflow_type} workflow")
         print(f"📋 Requirements: {requirements[:100]}..." if len(requirements) > 100 else f"📋 Requirements: {requirements}")
         print(f"{'='*60}\n")
         
@@ -326,7 +343,10 @@ class DirectWorkflowRunner:
         
         try:
             # Execute workflow
-            results, report = await execute_workflow(input_data, tracer)
+            if resume_session:
+                results, report = await resume(resume_session, tracer)
+            else:
+                results, report = await execute_workflow(input_data, tracer)
             
             duration = time.time() - start_time
             
@@ -550,6 +570,12 @@ class DirectWorkflowRunner:
             await self._cli_workflow(args)
         elif args.command == "list":
             self._cli_list()
+        elif args.command == "resume":
+            await self._cli_resume(args)
+        elif args.command == "diagnose":
+            self._cli_diagnose()
+        elif args.command == "orchestrator":
+            self._cli_orchestrator(args)
         else:
             # No command specified, run interactive
             await self.run_interactive()
@@ -616,6 +642,73 @@ class DirectWorkflowRunner:
         # Execute workflow
         await self._execute_workflow(args.task, args.type, config)
         
+    async def _cli_resume(self, args):
+        """Handle CLI resume command."""
+        checkpoints = [c for c in list_checkpoints() if c["status"] != "completed"]
+        
+        if args.list or not args.session_id:
+            if not checkpoints:
+                print("\nNo interrupted workflow sessions to resume")
+                return
+            print("\nResumable sessions:")
+            for c in checkpoints:
+                requirements = c["requirements"].split("\n")[0][:50]
+                print(f"  {c['session_id']:<45} {c['workflow_type']:<15} "
+                      f"phases: {', '.join(c['phases']) or '-'}; features: {c['features']} - {requirements}")
+            return
+        
+        checkpoint = next((c for c in checkpoints if c["session_id"] == args.session_id), None)
+        if not checkpoint:
+            print(f"Error: No resumable session '{args.session_id}'")
+            print("Use 'python run.py resume --list' to see resumable sessions")
+            return
+        
+        await self._execute_workflow(checkpoint["requirements"], checkpoint["workflow_type"],
+                                     resume_session=args.session_id)
+        
+    def _cli_diagnose(self):
+        """Import every registered workflow and report failures."""
+        print("\n🔍 Verifying workflow imports...")
+        if verify_imports():
+            print("✅ All workflow imports verified successfully")
+        else:
+            print("❌ Some imports failed (errors above; use --debug for details)")
+            sys.exit(1)
+            
+    def _cli_orchestrator(self, args):
+        """Handle CLI orchestrator server command."""
+        port = ORCHESTRATOR_SERVER_CONFIG["port"]
+        
+        if args.action == "start":
+            start_time = time.perf_counter()
+            if not start_orchestrator_server(debug=self.debug_mode, detached=True):
+                sys.exit(1)
+            print(f"✅ Orchestrator server ready on port {port} in {time.perf_counter() - start_time:.2f}s")
+            print("   It keeps running after this command; stop it with 'python run.py orchestrator stop'")
+        elif args.action == "stop":
+            kill_process_on_port(port, debug=self.debug_mode)
+            if server_lifecycle.wait_until_stopped():
+                print(f"✅ Orchestrator server on port {port} stopped")
+            else:
+                print(f"❌ Something is still answering on port {port}")
+                sys.exit(1)
+        else:
+            health = server_lifecycle.get_health()
+            if health is None:
+                if server_lifecycle.list_registered_agents() is None:
+                    print(f"⚪ No orchestrator server on port {port}")
+                else:
+                    print(f"⚠️  A server on port {port} doesn't report its health (it will be restarted)")
+                return
+            current = health.get("fingerprint") == server_lifecycle.code_fingerprint()
+            print(f"🟢 Orchestrator server on port {port}: {health.get('status')}")
+            print(f"   pid {health.get('pid')}, up {health.get('uptime_seconds')}s, "
+                  f"{len(health.get('agents', []))} agents")
+            if health.get("missing_agents"):
+                print(f"   missing agents: {', '.join(health['missing_agents'])}")
+            if not current:
+                print("   code changed since it started (it will be restarted on the next run)")
+            
     def _cli_list(self):
         """List available workflows."""
         print("\nAvailable workflows:")
@@ -636,8 +729,10 @@ class DirectWorkflowRunner:
 
 ⚙️  Orchestrator Management:
   - The orchestrator server starts automatically on port 8080
-  - Existing processes on port 8080 are killed first
-  - The server stops automatically when run.py exits
+  - A healthy server already running the same code is reused
+  - Otherwise existing processes on port 8080 are killed first
+  - The server stops automatically when run.py exits, unless it was
+    started with 'python run.py orchestrator start' (warm standby)
   - Use --no-orchestrator if managing it manually
 
 📋 Command Line Usage:
@@ -646,6 +741,8 @@ class DirectWorkflowRunner:
   python run.py --help                          # Show CLI help
   python run.py --debug ...                     # Enable verbose debug logging
   python run.py --no-orchestrator ...           # Skip auto-start
+  python run.py --record-agents FILE ...        # Record agent calls for replay
+  python run.py --replay-agents FILE ...        # Replay recorded agent calls offline
 
 🔧 Available Workflows:
   - individual: Execute individual workflow steps with enhanced features
@@ -745,6 +842,22 @@ Enhanced Full Workflow:
   python run.py workflow enhanced_full --task "Hello World API"
   # Features: retry logic, caching, performance monitoring, rollback
   
+Resuming Interrupted Runs (enhanced_full, mvp_incremental):
+  python run.py resume --list                   # List resumable sessions
+  python run.py resume <session_id>             # Skip completed phases and features
+  
+Troubleshooting:
+  python run.py diagnose                        # Check that all workflows can be imported
+  
+Record and Replay:
+  python run.py --record-agents run.jsonl.gz workflow tdd --task "..."   # Keep every agent call
+  python run.py --replay-agents run.jsonl.gz workflow tdd --task "..."   # Rerun offline without LLM calls
+  
+Orchestrator Server:
+  python run.py orchestrator start              # Warm standby: later runs start in well under a second
+  python run.py orchestrator status             # Readiness, uptime and whether the code changed
+  python run.py orchestrator stop
+  
 Note: The orchestrator server will be started automatically on port 8080.
       Use --no-orchestrator if you're managing it manually.
       Use --debug to enable verbose logging for troubleshooting.
@@ -756,6 +869,11 @@ Note: The orchestrator server will be started automatically on port 8080.
                        help="Enable verbose debug logging")
     parser.add_argument("--no-orchestrator", action="store_true",
                        help="Don't start the orchestrator server (assumes it's already running)")
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument("--record-agents", metavar="ARCHIVE",
+                             help="Record every agent call to a replay archive (.jsonl.gz)")
+    replay_group.add_argument("--replay-agents", metavar="ARCHIVE",
+                             help="Answer agent calls from a recorded archive instead of the agent server")
     
     # Subcommands
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
@@ -792,6 +910,19 @@ Note: The orchestrator server will be started automatically on port 8080.
     # List command
     list_parser = subparsers.add_parser("list", help="List available workflows")
     
+    # Resume command
+    resume_parser = subparsers.add_parser("resume", help="Resume an interrupted workflow from its checkpoint")
+    resume_parser.add_argument("session_id", nargs="?", help="Checkpoint session id printed when the workflow started")
+    resume_parser.add_argument("--list", action="store_true", help="List resumable sessions")
+    
+    # Diagnose command
+    subparsers.add_parser("diagnose", help="Verify that all workflow implementations can be imported")
+    
+    # Orchestrator server command
+    orchestrator_parser = subparsers.add_parser("orchestrator", help="Manage the orchestrator server")
+    orchestrator_parser.add_argument("action", choices=["start", "stop", "status"],
+                                     help="start a warm standby server, stop it, or show its status")
+    
     return parser
 
 
@@ -811,7 +942,6 @@ async def main():
     configure_logging(debug=DEBUG_MODE)
     
     # Set environment variable to control debug in subprocesses
-    import os
     os.environ['ORCHESTRATOR_DEBUG'] = 'true' if DEBUG_MODE else 'false'
     
     # Initialize core after logging is configured
@@ -836,6 +966,19 @@ async def main():
         if DEBUG_MODE:
             print("ℹ️  Skipping orchestrator startup (--no-orchestrator flag)")
     
+    # Record agent calls, or replay a recorded run offline
+    replay = None
+    if args.record_agents or args.replay_agents:
+        from shared.utils.agent_replay import configure_agent_replay
+        if args.record_agents:
+            replay = configure_agent_replay("record", args.record_agents)
+            print(f"⏺️  Recording agent calls to {args.record_agents}")
+        else:
+            replay = configure_agent_replay("replay", args.replay_agents)
+            print(f"⏪ Replaying agent calls from {args.replay_agents}")
+            if replay.offline:
+                runner.orchestrator_started = True  # Every call is answered from the archive
+    
     # Show help if no arguments
     if len(sys.argv) == 1:
         # Run interactive mode
@@ -852,6 +995,15 @@ async def main():
                 import traceback
                 traceback.print_exc()
             sys.exit(1)
+        finally:
+            if replay:
+                stats = replay.get_stats()
+                if replay.recording:
+                    print(f"\n⏺️  Recorded {stats['recorded']} agent calls to {args.record_agents}")
+                else:
+                    print(f"\n⏪ Replayed agent calls: {stats['matched']} matched, "
+                          f"{stats['sequence']} by agent order, {stats['live']} live, "
+                          f"{stats['missed']} missing, {stats['unserved']} recordings unused")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Orchestrator API Load
+
+Drives the Orchestrator REST API (api/orchestrator_api.py) with open-loop
+Poisson arrivals at one or more request rates. Each arrival starts a
+workflow with POST /execute-workflow and polls GET /workflow-status until
+it finishes. execute_workflow is replaced by a mock that waits for a
+latency drawn from --workflow-latency and fills in a tracer report, so the
+numbers reflect the API's request handling rather than the agents.
+
+For each rate it reports:
+
+- latency percentiles of /execute-workflow and /workflow-status
+- error rate (non-2xx responses, timeouts and failed workflows)
+- completion time from submission until the status shows the result
+- size of the in-memory workflow_executions store and process peak RSS
+
+The API server runs in a thread of this process (uvicorn on --port) so the
+store can be measured directly; --url targets an already running server
+instead (its own execute_workflow is used and the store isn't measured).
+Save a baseline with --save and compare later runs with --baseline; the
+script exits non-zero when a p95 latency grew by more than --max-regression.
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import resource
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from orchestrator.mock_agent_server import LatencyModel
+
+MOCK_AGENTS = ["planner_agent", "designer_agent", "coder_agent", "reviewer_agent"]
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate memory held by a structure of dicts, lists and scalars"""
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        # Copied first: unfinished workflows may still update the store
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in list(obj.items()))
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(item, seen) for item in list(obj))
+    return size
+
+
+def install_mock_workflow(latency: LatencyModel, error_rate: float, output_size: int, seed: int):
+    """Replace execute_workflow (as the API imports it) with a mock of the given latency"""
+    import workflows
+    from shared.data_models import TeamMember, TeamMemberResult
+
+    rng = random.Random(seed)
+    output = "x" * output_size
+
+    async def mock_execute_workflow(input_data, tracer=None):
+        await asyncio.sleep(latency.sample(rng))
+        if rng.random() < error_rate:
+            raise RuntimeError("Mock workflow failure")
+        results = []
+        for agent in MOCK_AGENTS:
+            if tracer:
+                step_id = tracer.start_step(agent.replace("_agent", ""), agent, {"requirements": input_data.requirements})
+                tracer.complete_step(step_id, {"output": output})
+            results.append(TeamMemberResult(team_member=TeamMember(agent), output=output))
+        if tracer:
+            tracer.complete_execution(final_output={"status": "completed"})
+            return results, tracer.get_report()
+        return results, None
+
+    workflows.execute_workflow = mock_execute_workflow
+
+
+class ApiServerThread:
+    """Runs the API app with uvicorn on its own event loop in a background thread"""
+
+    def __init__(self, app, port: int):
+        import uvicorn
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port,
+                                                    log_level="warning", access_log=False))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self, timeout: float = 10.0) -> bool:
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+class LoadStats:
+    """Latencies and errors collected during one rate step"""
+
+    def __init__(self):
+        self.latency: Dict[str, List[float]] = {"execute": [], "status": [], "delete": []}
+        self.errors: Dict[str, int] = {"execute": 0, "status": 0, "delete": 0, "workflow": 0}
+        self.completion: List[float] = []
+        self.incomplete = 0
+        self.sessions = 0
+
+    async def request(self, client, endpoint: str, method: str, path: str, **kwargs):
+        """Send a request, recording its latency; returns the response or None on error"""
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception:
+            self.errors[endpoint] += 1
+            return None
+        self.latency[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+
+async def run_session(client, stats: LoadStats, args, number: int):
+    """Submit a workflow and poll its status until it finishes"""
+    stats.sessions += 1
+    start = time.perf_counter()
+    response = await stats.request(client, "execute", "POST", "/execute-workflow", json={
+        "requirements": f"Load test request {number}",
+        "workflow_type": args.workflow_type,
+        "max_retries": 3,
+        "timeout_seconds": 300
+    })
+    if response is None:
+        return
+    session_id = response.json()["session_id"]
+
+    deadline = start + args.max_wait
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(args.poll_interval)
+        status = await stats.request(client, "status", "GET", f"/workflow-status/{session_id}")
+        if status is None:
+            continue
+        state = status.json().get("status")
+        if state in TERMINAL_STATUSES:
+            stats.completion.append(time.perf_counter() - start)
+            if state == "failed":
+                stats.errors["workflow"] += 1
+            if args.delete:
+                await stats.request(client, "delete", "DELETE", f"/workflow-status/{session_id}")
+            return
+    stats.incomplete += 1
+
+
+async def run_rate(base_url: str, rate: float, args, rng: random.Random) -> LoadStats:
+    """Start sessions at Poisson arrival times for the step duration, then let them finish"""
+    import httpx
+
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        tasks = []
+        start = time.perf_counter()
+        next_arrival = rng.expovariate(rate)
+        while next_arrival < args.duration:
+            delay = start + next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(run_session(client, stats, args, len(tasks))))
+            next_arrival += rng.expovariate(rate)
+        await asyncio.gather(*tasks)
+    return stats
+
+
+def summarize(rate: float, stats: LoadStats, duration: float) -> Dict[str, Any]:
+    result = {"offered_rate": rate, "achieved_rate": stats.sessions / duration, "sessions": stats.sessions}
+    for endpoint in ("execute", "status", "delete"):
+        latencies = [seconds * 1000 for seconds in stats.latency[endpoint]]
+        if not latencies and not stats.errors[endpoint]:
+            continue
+        result[endpoint] = {
+            "requests": len(latencies) + stats.errors[endpoint],
+            "errors": stats.errors[endpoint],
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": max(latencies, default=0.0)
+        }
+    requests = sum(len(v) for v in stats.latency.values()) + sum(
+        stats.errors[e] for e in ("execute", "status", "delete"))
+    result["error_rate"] = (sum(stats.errors.values()) + stats.incomplete) / max(requests + stats.incomplete, 1)
+    result["failed_workflows"] = stats.errors["workflow"]
+    result["incomplete"] = stats.incomplete
+    result["completion_p50_s"] = percentile(stats.completion, 50)
+    result["completion_p95_s"] = percentile(stats.completion, 95)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Orchestrator REST API")
+    parser.add_argument("--rates", default="5,20,50",
+                        help="Comma-separated arrival rates (workflow submissions per second), run in turn")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of arrivals per rate")
+    parser.add_argument("--workflow-type", default="full", help="workflow_type of submitted requests")
+    parser.add_argument("--workflow-latency", default="lognormal:1,0.5",
+                        help="Mock workflow duration: fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--workflow-error-rate", type=float, default=0.0, help="Fraction of mock workflows that fail")
+    parser.add_argument("--output-size", type=int, default=2000, help="Characters of output per mock agent")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Seconds between status polls of a session")
+    parser.add_argument("--max-wait", type=float, default=60.0, help="Seconds a session waits for its workflow")
+    parser.add_argument("--delete", action="store_true", help="Delete each execution record once it finished")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Request timeout in seconds")
+    parser.add_argument("--max-connections", type=int, default=500, help="Client connection pool size")
+    parser.add_argument("--port", type=int, default=8099, help="Port for the in-process API server")
+    parser.add_argument("--url", help="Load an already running API server instead (no mock, no store measurements)")
+    parser.add_argument("--seed", type=int, default=0, help="Arrival and latency sampling seed")
+    parser.add_argument("--verbose", action="store_true", help="Keep the API's per-workflow log output")
+    parser.add_argument("--save", help="Write results to a JSON baseline file")
+    parser.add_argument("--baseline", help="Compare against a JSON baseline file")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed growth of p95 request latency against the baseline (fraction)")
+    args = parser.parse_args()
+
+    rates = [float(r) for r in args.rates.split(",") if r.strip()]
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    server = None
+    workflow_executions = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        install_mock_workflow(LatencyModel.parse(args.workflow_latency), args.workflow_error_rate,
+                              args.output_size, args.seed)
+        from api.orchestrator_api import app, workflow_executions
+        if not args.verbose:
+            logging.getLogger("api.orchestrator_api").setLevel(logging.WARNING)
+        server = ApiServerThread(app, args.port)
+        if not server.start():
+            print(f"❌ API server did not start on port {args.port}")
+            sys.exit(1)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    print("=" * 60)
+    print("Orchestrator API Load Benchmark")
+    print("=" * 60)
+    print(f"Target: {base_url}" + ("" if args.url else f" (mock workflow latency {args.workflow_latency})"))
+    print(f"Rates: {', '.join(f'{r:g}/s' for r in rates)} for {args.duration:g}s each, "
+          f"poll every {args.poll_interval:g}s{', deleting finished records' if args.delete else ''}")
+
+    results = {}
+    regressions = []
+    rng = random.Random(args.seed)
+    store_bytes = deep_sizeof(workflow_executions) if workflow_executions is not None else 0
+    try:
+        for rate in rates:
+            stats = asyncio.run(run_rate(base_url, rate, args, rng))
+            result = summarize(rate, stats, args.duration)
+            if workflow_executions is not None:
+                previous_bytes = store_bytes
+                store_bytes = deep_sizeof(workflow_executions)
+                result["store_entries"] = len(workflow_executions)
+                result["store_mb"] = store_bytes / (1024 * 1024)
+                result["store_growth_kb_per_session"] = (store_bytes - previous_bytes) / 1024 / max(stats.sessions, 1)
+                result["peak_rss_mb"] = peak_rss_mb()
+            key = f"{rate:g}"
+            results[key] = result
+
+            print(f"\n{rate:g}/s offered, {result['achieved_rate']:.1f}/s achieved ({result['sessions']} sessions)")
+            for endpoint in ("execute", "status", "delete"):
+                if endpoint in result:
+                    r = result[endpoint]
+                    print(f"  {endpoint + ':':<10} p50 {r['p50_ms']:7.1f}ms  p95 {r['p95_ms']:7.1f}ms  "
+                          f"p99 {r['p99_ms']:7.1f}ms  max {r['max_ms']:7.1f}ms  "
+                          f"({r['requests']} requests, {r['errors']} errors)")
+            print(f"  error rate: {result['error_rate']:.2%} ({result['failed_workflows']} failed workflows, "
+                  f"{result['incomplete']} unfinished)")
+            print(f"  completion: p50 {result['completion_p50_s']:.2f}s, p95 {result['completion_p95_s']:.2f}s")
+            if "store_entries" in result:
+                print(f"  store:      {result['store_entries']} executions, {result['store_mb']:.2f} MB "
+                      f"(+{result['store_growth_kb_per_session']:.1f} KB per session), "
+                      f"{result['peak_rss_mb']:.0f} MB peak RSS")
+
+            for endpoint in ("execute", "status"):
+                previous = baseline.get(key, {}).get(endpoint, {}).get("p95_ms")
+                current = result.get(endpoint, {}).get("p95_ms")
+                if previous and current is not None:
+                    change = (current - previous) / previous
+                    print(f"  vs baseline: {endpoint} p95 {previous:.1f}ms ({change:+.0%})")
+                    if change > args.max_regression:
+                        regressions.append(f"{endpoint} at {key}/s")
+    finally:
+        if server:
+            server.stop()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+    if regressions:
+        print(f"\nRequest latency regressed for: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
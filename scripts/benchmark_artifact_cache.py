@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Build Artifact Cache
+
+Compares the previous copytree-based artifact cache with the
+content-addressed ArtifactStore on synthetic but realistically shaped
+projects:
+
+- node: dist/ bundle plus a vendored node_modules/ tree (many small files)
+- python: build/ and dist/ with a wheel and copied package sources
+
+For each project it measures storing a build, looking up its file list,
+restoring it into a clean directory, and storing a second build in which
+only a few files changed (where deduplication applies).
+"""
+
+import sys
+import os
+import time
+import shutil
+import random
+import tempfile
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.executor.artifact_store import ArtifactStore
+
+
+def make_node_project(path: Path, packages: int = 150, files_per_package: int = 12):
+    """Create a node project with a bundle and a vendored dependency tree."""
+    rng = random.Random(1)
+    for p in range(packages):
+        package_dir = path / "node_modules" / f"pkg-{p}"
+        (package_dir / "lib").mkdir(parents=True)
+        (package_dir / "package.json").write_text(f'{{"name": "pkg-{p}", "version": "1.0.{p}"}}')
+        for f in range(files_per_package):
+            size = rng.choice([200, 800, 2_000, 8_000, 30_000])
+            (package_dir / "lib" / f"mod{f}.js").write_text(f"// pkg-{p} mod{f}\n" + "x" * size)
+    (path / "dist" / "assets").mkdir(parents=True)
+    (path / "dist" / "main.js").write_text("/* app */" + "a" * 400_000)
+    (path / "dist" / "assets" / "vendor.js").write_text("/* vendor */" + "v" * 1_500_000)
+    (path / "dist" / "index.html").write_text("<html></html>")
+    return ["dist/", "node_modules/"]
+
+
+def make_python_project(path: Path, modules: int = 300):
+    """Create a python project with build/ output and a wheel."""
+    for m in range(modules):
+        module = path / "build" / "lib" / "app" / f"module_{m}.py"
+        module.parent.mkdir(parents=True, exist_ok=True)
+        module.write_text(f"def handler_{m}():\n    return {m}\n" * 40)
+    (path / "dist").mkdir()
+    (path / "dist" / "app-1.0-py3-none-any.whl").write_bytes(os.urandom(2_000_000))
+    return ["build/", "dist/"]
+
+
+def touch_some_files(path: Path, artifacts):
+    """Simulate an incremental rebuild that changes a few outputs."""
+    for artifact in artifacts:
+        files = sorted(p for p in (path / artifact).rglob("*") if p.is_file())
+        for changed in files[:3]:
+            changed.write_bytes(changed.read_bytes() + b"\n// rebuilt")
+
+
+def copytree_cache(cache_dir: Path, key: str, project: Path, artifacts):
+    """The previous BuildManager._cache_artifacts behavior."""
+    cache_path = cache_dir / key
+    cache_path.mkdir(parents=True, exist_ok=True)
+    for artifact in artifacts:
+        src = project / artifact
+        if src.is_dir():
+            shutil.copytree(src, cache_path / artifact, dirs_exist_ok=True)
+
+
+def copytree_lookup(cache_dir: Path, key: str):
+    """The previous BuildManager.get_cached_artifacts behavior."""
+    cache_path = cache_dir / key
+    return [str(p.relative_to(cache_path)) for p in cache_path.rglob("*") if p.is_file()]
+
+
+def copytree_restore(cache_dir: Path, key: str, dest: Path):
+    shutil.copytree(cache_dir / key, dest, dirs_exist_ok=True)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def disk_usage(path: Path) -> int:
+    """Bytes used on disk, counting hardlinked inodes once."""
+    seen, total = set(), 0
+    for p in path.rglob("*"):
+        if p.is_file():
+            st = p.stat()
+            if (st.st_dev, st.st_ino) not in seen:
+                seen.add((st.st_dev, st.st_ino))
+                total += st.st_size
+    return total
+
+
+def bench_project(name: str, make_project, workdir: Path):
+    project = workdir / f"{name}-project"
+    project.mkdir()
+    artifacts = make_project(project)
+    file_count = sum(1 for a in artifacts for p in (project / a).rglob("*") if p.is_file())
+
+    # Previous implementation
+    old_cache = workdir / f"{name}-copytree-cache"
+    old = {}
+    old["store"], _ = timed(copytree_cache, old_cache, "build1", project, artifacts)
+    old["lookup"], _ = timed(copytree_lookup, old_cache, "build1")
+    old["restore"], _ = timed(copytree_restore, old_cache, "build1", workdir / f"{name}-old-restore")
+
+    # Content-addressed store
+    store = ArtifactStore(workdir / f"{name}-cas-cache")
+    new = {}
+    new["store"], _ = timed(store.put, "build1", project, artifacts)
+    new["lookup"], _ = timed(store.list_files, "build1")
+    new["restore"], _ = timed(store.restore, "build1", workdir / f"{name}-new-restore")
+
+    # Incremental rebuild: a handful of files change
+    touch_some_files(project, artifacts)
+    old["rebuild_store"], _ = timed(copytree_cache, old_cache, "build2", project, artifacts)
+    new["rebuild_store"], _ = timed(store.put, "build2", project, artifacts)
+
+    print(f"\n{name}: {file_count} artifact files")
+    print(f"  {'operation':<16}{'copytree':>12}{'content-addr':>14}{'speedup':>10}")
+    for op in ["store", "lookup", "restore", "rebuild_store"]:
+        speedup = old[op] / new[op] if new[op] else float("inf")
+        print(f"  {op:<16}{old[op] * 1000:>10.1f}ms{new[op] * 1000:>12.1f}ms{speedup:>9.1f}x")
+    print(f"  cache size: copytree {disk_usage(old_cache) / 1e6:.1f}MB, "
+          f"content-addressed {store.total_size() / 1e6:.1f}MB")
+    restores = store.get_stats()["restores"]
+    print(f"  restore methods: {restores}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the build artifact cache")
+    parser.add_argument("--workdir", type=Path, help="Directory for benchmark files (temp dir if omitted)")
+    parser.add_argument("--keep", action="store_true", help="Keep benchmark files")
+    args = parser.parse_args()
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="artifact-cache-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    print("=" * 60)
+    print("Build Artifact Cache Benchmark")
+    print("=" * 60)
+    print(f"Working directory: {workdir}")
+
+    try:
+        bench_project("node", make_node_project, workdir)
+        bench_project("python", make_python_project, workdir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Code Block Parser
+
+Compares the per-workflow regex parsers that used to extract files from
+coder output with the shared single-pass parser, on synthetic coder
+outputs of a few hundred KB:
+
+- cold: one parse of a fresh output (all previous regexes vs one pass)
+- workflow: every parser re-reading the same output over several
+  retries/phases (regexes re-scan each time, the shared parser hits its
+  content-hash cache)
+- streaming: feeding the output to CodeBlockParser in small chunks
+"""
+
+import sys
+import re
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.code_block_parser import (
+    CodeBlockParser, parse_code_blocks, extract_files, clear_cache,
+    FILENAME, HASH_FILENAME, HASH_SECTION, HASH_HEADER, FILE, MARKDOWN
+)
+
+
+# The patterns previously used by mvp_incremental, TDDFeatureImplementer,
+# feature_orchestrator, TDDFileManager, docker_manager and validator_agent
+OLD_PATTERNS = [
+    (r'FILENAME:\s*(\S+)\s*\n```(?:\w+)?\n(.*?)```', re.DOTALL),
+    (r'```(?:python|py|javascript|js)\s*\n#\s*filename:\s*(\S+)\n(.*?)```', re.DOTALL),
+    (r'```(?:python|py|javascript|js)\s*(?:# )?(\S+\.(?:py|js))?\n(.*?)```', re.DOTALL),
+    (r'FILENAME:\s*([^\n]+)\n```(?:\w+)?\n(.*?)```', re.DOTALL),
+    (r'#\s*([^\n]+\.py)\n```python\n(.*?)```', re.DOTALL),
+    (r'FILENAME:\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', re.MULTILINE | re.DOTALL),
+    (r'#\s*filename:\s*(\S+)\n(.*?)(?=#\s*filename:|$)', re.MULTILINE | re.DOTALL),
+    (r'File:\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', re.MULTILINE | re.DOTALL),
+    (r'###\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', re.MULTILINE | re.DOTALL),
+    (r'FILENAME:\s*(.+?)\n```(?:\w*)\n(.*?)\n```', re.DOTALL),
+]
+
+
+def make_coder_output(target_kb: int, seed: int = 1) -> str:
+    """Create coder output with FILENAME blocks, prose and # filename blocks."""
+    rng = random.Random(seed)
+    parts = ["--- IMPLEMENTATION DETAILS ---\n"]
+    size = 0
+    index = 0
+    while size < target_kb * 1024:
+        lines = [f"def handler_{index}_{n}(request):\n    return {{'id': {n}, 'ok': True}}\n"
+                 for n in range(rng.randint(20, 120))]
+        body = "".join(lines)
+        if index % 3 == 0:
+            block = f"```python\n# filename: app/module_{index}.py\n{body}```\n"
+        else:
+            block = f"FILENAME: app/module_{index}.py\n```python\n{body}```\n"
+        parts.append(f"The module below implements part {index}.\n\n{block}\n")
+        size += len(block)
+        index += 1
+    return "".join(parts)
+
+
+def old_parse_all(text: str) -> int:
+    """Run every previous parser's regex once."""
+    return sum(len(re.findall(pattern, text, flags)) for pattern, flags in OLD_PATTERNS)
+
+
+def new_parse_all(text: str) -> int:
+    """Run every caller's selection on the shared parser."""
+    selections = [
+        (FILENAME,), (HASH_FILENAME,), None, (HASH_HEADER,),
+        (FILENAME, HASH_FILENAME, HASH_SECTION, FILE, MARKDOWN), (HASH_FILENAME, HASH_SECTION)
+    ]
+    return sum(len(extract_files(text, styles=styles)) for styles in selections)
+
+
+def stream_parse(text: str, chunk_size: int) -> int:
+    parser = CodeBlockParser()
+    count = 0
+    for start in range(0, len(text), chunk_size):
+        count += len(parser.feed(text[start:start + chunk_size]))
+    return count + len(parser.close())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_size(size_kb: int, rounds: int, chunk_size: int):
+    text = make_coder_output(size_kb)
+
+    # Cold: nothing cached
+    clear_cache()
+    old_cold, _ = timed(old_parse_all, text)
+    new_cold, _ = timed(new_parse_all, text)
+
+    # Workflow: the same output parsed again per retry/phase
+    def old_workflow():
+        for _ in range(rounds):
+            old_parse_all(text)
+
+    def new_workflow():
+        clear_cache()
+        for _ in range(rounds):
+            new_parse_all(text)
+
+    old_rounds, _ = timed(old_workflow)
+    new_rounds, _ = timed(new_workflow)
+    stream_time, blocks = timed(stream_parse, text, chunk_size)
+
+    print(f"\n{len(text) / 1024:.0f}KB output, {len(parse_code_blocks(text))} files")
+    print(f"  {'scenario':<22}{'regexes':>12}{'shared':>12}{'speedup':>10}")
+    for name, old, new in [("cold (all parsers)", old_cold, new_cold),
+                           (f"workflow ({rounds} rounds)", old_rounds, new_rounds)]:
+        speedup = old / new if new else float("inf")
+        print(f"  {name:<22}{old * 1000:>10.1f}ms{new * 1000:>10.1f}ms{speedup:>9.1f}x")
+    print(f"  streaming in {chunk_size}B chunks: {stream_time * 1000:.1f}ms "
+          f"({len(text) / 1e6 / stream_time:.1f}MB/s, {blocks} blocks)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared code block parser")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 800],
+                        help="Coder output sizes in KB")
+    parser.add_argument("--rounds", type=int, default=5,
+                        help="Times each output is re-parsed (retries and phases)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Streaming chunk size in bytes")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Code Block Parser Benchmark")
+    print("=" * 60)
+
+    for size_kb in args.sizes:
+        bench_size(size_kb, args.rounds, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
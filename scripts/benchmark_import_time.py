@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Import Time
+
+Measures how long it takes to import the system's entry points (the
+workflow manager, the API and run.py) using `python -X importtime` in a
+fresh interpreter, and lists the packages that contribute most. It also
+reports heavy dependencies (Docker SDK, agent frameworks) that were loaded
+even though no workflow ran.
+
+Save a baseline with --save and compare later runs with --baseline to catch
+startup regressions; the script exits non-zero when an entry point got
+slower than --max-regression.
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+DEFAULT_MODULES = ["workflows.workflow_manager", "api.orchestrator_api", "run"]
+
+# Packages that should only be imported once a workflow actually needs them
+HEAVY_PACKAGES = ["docker", "beeai_framework", "acp_sdk", "networkx"]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse -X importtime output into (module, depth, self_us, cumulative_us) entries."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def run_importtime(statement: str) -> List[Tuple[str, int, int, int]]:
+    """Run a statement in a fresh interpreter with -X importtime."""
+    env = dict(os.environ, PYTHONPATH=str(project_root), PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True, cwd=str(project_root), env=env
+    )
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "unknown error"
+        raise RuntimeError(error)
+    return parse_importtime(proc.stderr)
+
+
+def measure(module: str, startup: Set[str]) -> Dict:
+    """Import cost of one module beyond interpreter startup."""
+    entries = run_importtime(f"import {module}")
+    new_entries = [e for e in entries if e[0] not in startup]
+    total_us = sum(cumulative for _, depth, _, cumulative in new_entries if depth == 0)
+
+    # Attribute self time to top-level packages
+    by_package: Dict[str, int] = {}
+    for name, _, self_us, _ in new_entries:
+        package = name.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + self_us
+
+    loaded = {name.split(".")[0] for name, _, _, _ in new_entries}
+    return {
+        "total_ms": total_us / 1000,
+        "modules": len(new_entries),
+        "packages": by_package,
+        "heavy": [p for p in HEAVY_PACKAGES if p in loaded]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the system's entry points")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages to list per module")
+    parser.add_argument("--save", help="Write results to a JSON baseline file")
+    parser.add_argument("--baseline", help="Compare against a JSON baseline file")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline (fraction)")
+    args = parser.parse_args()
+
+    startup = {name for name, _, _, _ in run_importtime("pass")}
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print("=" * 60)
+    print("Import Time Benchmark")
+    print("=" * 60)
+
+    results = {}
+    regressions = []
+    for module in args.modules:
+        try:
+            runs = [measure(module, startup) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"\n{module}: import failed ({e})")
+            results[module] = {"error": str(e)}
+            continue
+
+        median_ms = statistics.median(r["total_ms"] for r in runs)
+        last = runs[-1]
+        results[module] = {"total_ms": round(median_ms, 1), "modules": last["modules"], "heavy": last["heavy"]}
+
+        print(f"\n{module}: {median_ms:.1f} ms, {last['modules']} modules")
+        if last["heavy"]:
+            print(f"  heavy dependencies loaded: {', '.join(last['heavy'])}")
+        heaviest = sorted(last["packages"].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        for package, self_us in heaviest:
+            print(f"  {package:<30} {self_us / 1000:8.1f} ms")
+
+        previous = baseline.get(module, {}).get("total_ms")
+        if previous:
+            change = (median_ms - previous) / previous
+            print(f"  vs baseline: {previous:.1f} ms ({change:+.0%})")
+            if change > args.max_regression:
+                regressions.append(module)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+    if regressions:
+        print(f"\nImport time regressed for: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
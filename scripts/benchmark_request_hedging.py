@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Request Hedging
+
+Simulates agent calls with a long-tailed latency distribution (most calls
+fast, a few stuck far longer) and runs the same call sequence with and
+without RequestHedger, printing latency percentiles and the number of
+duplicate requests sent.
+
+Latencies are scaled down (--scale) so the benchmark runs in seconds.
+"""
+
+import sys
+import time
+import random
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.request_hedger import RequestHedger, percentile
+
+
+def make_latencies(calls: int, slow_fraction: float, seed: int = 1):
+    """Per-call latencies in seconds of an LLM call: lognormal body, heavy stragglers."""
+    rng = random.Random(seed)
+    latencies = []
+    for _ in range(calls):
+        latency = rng.lognormvariate(1.5, 0.3)  # ~4.5s median
+        if rng.random() < slow_fraction:
+            latency *= rng.uniform(4, 10)  # Provider queueing, retries, long generations
+        latencies.append(latency)
+    return latencies
+
+
+async def run_calls(latencies, hedger, scale, seed=2):
+    """Run the calls one after another, returning observed latencies."""
+    rng = random.Random(seed)
+    observed = []
+
+    for latency in latencies:
+        async def request(attempt, latency=latency):
+            # A duplicate is an independent draw from the same distribution
+            duration = latency if attempt == 0 else make_latencies(1, 0.05, rng.random())[0]
+            await asyncio.sleep(duration * scale)
+            return duration
+
+        start = time.perf_counter()
+        if hedger:
+            await hedger.run("reviewer_agent", "reviewer_agent/default", request)
+        else:
+            await request(0)
+        observed.append((time.perf_counter() - start) / scale)
+    return observed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hedged agent requests")
+    parser.add_argument("--calls", type=int, default=300, help="Agent calls to simulate")
+    parser.add_argument("--slow-fraction", type=float, default=0.05, help="Fraction of straggler calls")
+    parser.add_argument("--budget", type=float, default=0.1, help="Fraction of calls that may be hedged")
+    parser.add_argument("--scale", type=float, default=0.001, help="Real seconds per simulated second")
+    args = parser.parse_args()
+
+    latencies = make_latencies(args.calls, args.slow_fraction)
+    hedger = RequestHedger({
+        "enabled": True,
+        "budget": args.budget,
+        "agents": {"reviewer_agent": {}}
+    })
+
+    print("=" * 60)
+    print("Request Hedging Benchmark")
+    print("=" * 60)
+
+    baseline = asyncio.run(run_calls(latencies, None, args.scale))
+    hedged = asyncio.run(run_calls(latencies, hedger, args.scale))
+    stats = hedger.get_report()["reviewer_agent/default"]
+
+    print(f"\n{args.calls} calls, {args.slow_fraction:.0%} stragglers, hedge budget {args.budget:.0%}")
+    print(f"  {'':<12}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for name, values in [("unhedged", baseline), ("hedged", hedged)]:
+        print(f"  {name:<12}" + "".join(
+            f"{percentile(values, p):>9.1f}s" for p in (50, 90, 99, 100)
+        ))
+    improvement = 1 - percentile(hedged, 99) / percentile(baseline, 99)
+    print(f"  p99 improvement: {improvement:.0%}")
+    print(f"  duplicate requests: {stats['hedged']} ({stats['hedged'] / args.calls:.1%} extra calls), "
+          f"{stats['hedge_wins']} won")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Workflow Engine
+
+Runs the tdd, full, incremental and mvp_incremental workflows end to end
+against the mock agent server (orchestrator/mock_agent_server.py), so the
+numbers reflect the workflow engine rather than live LLM latency. For each
+workflow it reports:
+
+- wall time per run and the part spent waiting on agent calls
+- orchestration overhead (wall time outside agent calls: parsing, prompt
+  building, test execution, checkpoints, reporting)
+- throughput in workflows per minute (--concurrency runs at a time)
+- memory: peak RSS and, with --trace-memory, the Python allocation peak
+
+No network access is needed: the feature reviewer, which the MVP workflow
+runs in-process, is routed to the mock server as well. Save a baseline with
+--save and compare later runs with --baseline; the script exits non-zero
+when the overhead of a workflow grew by more than --max-regression.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import resource
+import tempfile
+import importlib
+import subprocess
+import statistics
+import tracemalloc
+import contextvars
+from pathlib import Path
+from typing import Dict, List
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from orchestrator import server_lifecycle
+from orchestrator.mock_agent_server import MOCK_SERVER_AGENTS
+from shared.data_models import CodingTeamInput
+from workflows.workflow_config import ORCHESTRATOR_SERVER_CONFIG
+
+DEFAULT_WORKFLOWS = ["tdd", "full", "incremental", "mvp_incremental"]
+
+REQUIREMENTS = "Create a small Python library of utility modules, each with a function and a pytest test."
+
+# Agent call time of the workflow run in the current task
+_agent_seconds: contextvars.ContextVar = contextvars.ContextVar("agent_seconds")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def timed(call):
+    """Await an agent call, adding its duration to the current run's totals"""
+    start = time.perf_counter()
+    try:
+        return await call
+    finally:
+        totals = _agent_seconds.get(None)
+        if totals is not None:
+            totals["seconds"] += time.perf_counter() - start
+            totals["calls"] += 1
+
+
+def instrument_agent_calls():
+    """Accumulate the time each workflow run spends in agent calls"""
+    import core.orchestrator_client as orchestrator_client
+    import orchestrator.orchestrator_agent as orchestrator_agent
+    run_team_member = orchestrator_agent.run_team_member
+    call_agent_via_orchestrator = orchestrator_client.call_agent_via_orchestrator
+
+    async def timed_run_team_member(agent, input):
+        return await timed(run_team_member(agent, input))
+
+    async def timed_call_agent_via_orchestrator(agent_name, requirements, context=""):
+        return await timed(call_agent_via_orchestrator(agent_name, requirements, context))
+
+    # Workflows reach the agents through either of the two
+    orchestrator_agent.run_team_member = timed_run_team_member
+    orchestrator_client.call_agent_via_orchestrator = timed_call_agent_via_orchestrator
+
+
+def route_feature_reviewer():
+    """
+    Send feature reviews of the MVP workflows to the mock server.
+
+    ReviewIntegration runs the feature reviewer in-process, where it would
+    call a live LLM; the reviews go through run_team_member instead.
+    """
+    import orchestrator.orchestrator_agent as orchestrator_agent
+    # The package re-exports the function under the module's name
+    feature_reviewer = importlib.import_module("agents.feature_reviewer.feature_reviewer_agent")
+
+    async def mock_feature_reviewer_agent(input):
+        review_prompt = "".join(part.content for message in input for part in message.parts)
+        for message in await orchestrator_agent.run_team_member("feature_reviewer_agent", review_prompt):
+            for part in message.parts:
+                yield part
+
+    feature_reviewer.feature_reviewer_agent = mock_feature_reviewer_agent
+
+
+async def run_once(workflow_type: str) -> Dict:
+    """Run one workflow and time it"""
+    from workflows.workflow_manager import execute_workflow
+
+    totals = {"seconds": 0.0, "calls": 0}
+    _agent_seconds.set(totals)
+    input_data = CodingTeamInput(
+        requirements=REQUIREMENTS,
+        workflow_type=workflow_type,
+        skip_docker_cleanup=True
+    )
+
+    error = None
+    start = time.perf_counter()
+    try:
+        await execute_workflow(input_data)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start
+
+    return {
+        "wall": wall,
+        "agent": totals["seconds"],
+        "overhead": max(0.0, wall - totals["seconds"]),
+        "agent_calls": totals["calls"],
+        "error": error
+    }
+
+
+async def benchmark_workflow(workflow_type: str, runs: int, concurrency: int) -> Dict:
+    """Run a workflow runs times, concurrency at a time"""
+    results = []
+    start = time.perf_counter()
+    while len(results) < runs:
+        batch = min(concurrency, runs - len(results))
+        results.extend(await asyncio.gather(*(run_once(workflow_type) for _ in range(batch))))
+    elapsed = time.perf_counter() - start
+
+    overhead = [r["overhead"] for r in results]
+    return {
+        "runs": runs,
+        "succeeded": sum(1 for r in results if not r["error"]),
+        "errors": sorted({r["error"] for r in results if r["error"]}),
+        "wall_mean": statistics.mean(r["wall"] for r in results),
+        "agent_mean": statistics.mean(r["agent"] for r in results),
+        "overhead_mean": statistics.mean(overhead),
+        "overhead_p95": percentile(overhead, 95),
+        "agent_calls": statistics.mean(r["agent_calls"] for r in results),
+        "throughput_per_min": runs / elapsed * 60 if elapsed > 0 else 0.0
+    }
+
+
+def start_mock_server(args, log_file) -> subprocess.Popen:
+    """Start the mock agent server in the background"""
+    command = [
+        sys.executable, str(project_root / "orchestrator" / "mock_agent_server.py"),
+        "--port", str(args.port),
+        "--latency", args.latency,
+        "--features", str(args.features),
+        "--seed", str(args.seed)
+    ]
+    if args.recordings:
+        command += ["--recordings", args.recordings]
+    # Output goes to a file: an unread pipe would block the server once it fills up
+    return subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the workflow engine against mock agents")
+    parser.add_argument("workflows", nargs="*", default=DEFAULT_WORKFLOWS, help="Workflow types to run")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per workflow")
+    parser.add_argument("--concurrency", type=int, default=1, help="Runs executed at the same time")
+    parser.add_argument("--port", type=int, default=8090, help="Port for the mock agent server")
+    parser.add_argument("--latency", default="fixed:0", help="Mock agent latency (see mock_agent_server.py)")
+    parser.add_argument("--features", type=int, default=3, help="Features in the mock design")
+    parser.add_argument("--recordings", help="Recorded agent outputs to serve instead of templates")
+    parser.add_argument("--seed", type=int, default=0, help="Latency sampling seed")
+    parser.add_argument("--trace-memory", action="store_true", help="Track the Python allocation peak (slower)")
+    parser.add_argument("--save", help="Write results to a JSON baseline file")
+    parser.add_argument("--baseline", help="Compare against a JSON baseline file")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="Allowed growth of mean orchestration overhead against the baseline (fraction)")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    save_path = Path(args.save).resolve() if args.save else None
+
+    base_url = server_lifecycle.get_server_url(args.port)
+    server_log = tempfile.TemporaryFile(mode="w+")
+    server = start_mock_server(args, server_log)
+    try:
+        if not server_lifecycle.wait_until_ready(base_url, process=server, timeout=30, agents=MOCK_SERVER_AGENTS):
+            server_log.seek(0)
+            output = "".join(server_log.readlines()[-20:])
+            print(f"❌ Mock agent server did not start on port {args.port}\n{output}")
+            sys.exit(1)
+
+        # Agent calls of the workflows go to the mock server
+        ORCHESTRATOR_SERVER_CONFIG["port"] = args.port
+        instrument_agent_calls()
+        route_feature_reviewer()
+
+        print("=" * 60)
+        print("Workflow Engine Benchmark")
+        print("=" * 60)
+        print(f"Mock latency: {args.latency}, features: {args.features}, "
+              f"runs: {args.runs}, concurrency: {args.concurrency}")
+
+        results = {}
+        regressions = []
+        # Generated code, test runs and reports go to a scratch directory
+        with tempfile.TemporaryDirectory(prefix="workflow_benchmark_") as work_dir:
+            os.chdir(work_dir)
+            if args.trace_memory:
+                tracemalloc.start()
+            for workflow_type in args.workflows:
+                if args.trace_memory:
+                    tracemalloc.reset_peak()
+                result = asyncio.run(benchmark_workflow(workflow_type, args.runs, args.concurrency))
+                result["peak_rss_mb"] = peak_rss_mb()
+                if args.trace_memory:
+                    result["python_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                results[workflow_type] = result
+
+                print(f"\n{workflow_type}: {result['succeeded']}/{result['runs']} succeeded")
+                print(f"  wall time:      {result['wall_mean']:.3f}s per run "
+                      f"({result['agent_calls']:.0f} agent calls, {result['agent_mean']:.3f}s in agents)")
+                print(f"  overhead:       {result['overhead_mean']:.3f}s mean, {result['overhead_p95']:.3f}s p95")
+                print(f"  throughput:     {result['throughput_per_min']:.1f} workflows/min")
+                memory = f"  memory:         {result['peak_rss_mb']:.0f} MB peak RSS"
+                if "python_peak_mb" in result:
+                    memory += f", {result['python_peak_mb']:.1f} MB Python peak"
+                print(memory)
+                for error in result["errors"]:
+                    print(f"  error: {error}")
+
+                previous = baseline.get(workflow_type, {}).get("overhead_mean")
+                if previous:
+                    change = (result["overhead_mean"] - previous) / previous
+                    print(f"  vs baseline:    {previous:.3f}s overhead ({change:+.0%})")
+                    if change > args.max_regression:
+                        regressions.append(workflow_type)
+            os.chdir(project_root)
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=5)
+        except Exception:
+            server.kill()
+        server_log.close()
+
+    if save_path:
+        with open(save_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {save_path}")
+
+    if regressions:
+        print(f"\nOrchestration overhead regressed for: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
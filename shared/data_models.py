@@ -82,6 +82,8 @@ class CodingTeamInput:
     output_path: Optional[str] = None  # Custom output directory for generated files
     # Docker cleanup control
     skip_docker_cleanup: bool = False  # Skip Docker container cleanup after workflow execution
+    # Checkpoint session to resume (set by workflows that checkpoint their progress)
+    session_id: Optional[str] = None
     
     def __post_init__(self):
         # Handle backward compatibility between workflow and workflow_type
@@ -7,15 +7,22 @@ automatic retry logic, connection pooling, and error handling.
 """
 
 import asyncio
+import base64
+import hashlib
 import json
 import logging
+import threading
+import time
+import weakref
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Awaitable, TypeVar, AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import datetime
 import aiohttp
+import anyio
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.types import CONNECTION_CLOSED
 
 # Import configuration
 from config.mcp_config import MCP_CLIENT_CONFIG, MCP_FILESYSTEM_CONFIG
@@ -24,6 +31,236 @@ from config.mcp_config import MCP_CLIENT_CONFIG, MCP_FILESYSTEM_CONFIG
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Errors raised when the server's stdio transport is closed or broken
+_TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream,
+    ConnectionError, EOFError
+)
+
+
+def _is_connection_lost(error: Exception) -> bool:
+    """Whether a tool call failed because the server connection went away."""
+    if isinstance(error, _TRANSPORT_ERRORS):
+        return True
+    return getattr(getattr(error, "error", None), "code", None) == CONNECTION_CLOSED
+
+
+def _filesystem_server_params() -> StdioServerParameters:
+    """Parameters for spawning the filesystem server over stdio."""
+    return StdioServerParameters(
+        command="python",
+        args=["-m", "mcp.filesystem_server"],
+        cwd=str(Path(__file__).parent.parent)
+    )
+
+
+class SharedMCPConnection:
+    """
+    Long-lived, reference-counted connection to the MCP filesystem server.
+    
+    The server process, MCP handshake and tool listing happen once per event
+    loop instead of once per ``connect()`` block. The stdio transport and
+    session are owned by a background task so they can outlive any single
+    caller. A connection whose transport failed during a tool call is
+    dropped (see ``connection_lost``) and re-established on the next acquire.
+    """
+    
+    def __init__(self, max_concurrent_calls: int = 8):
+        """
+        Initialize the shared connection (connects lazily on first acquire).
+        
+        Args:
+            max_concurrent_calls: Maximum tool calls in flight on the session
+        """
+        self.session: Optional[ClientSession] = None
+        self.call_semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._references = 0
+        self._metrics = {
+            "connects": 0,
+            "reconnects": 0,
+            "connect_failures": 0,
+            "acquisitions": 0,
+            "handshake_seconds_total": 0.0,
+            "last_handshake_seconds": 0.0,
+            "connected_since": None
+        }
+    
+    def is_alive(self) -> bool:
+        """Whether the server connection is up."""
+        return self.session is not None and self._task is not None and not self._task.done()
+    
+    async def acquire(self) -> ClientSession:
+        """Get the shared session, connecting or reconnecting if needed."""
+        async with self._lock:
+            if not self.is_alive():
+                await self._connect()
+            self._references += 1
+            self._metrics["acquisitions"] += 1
+            return self.session
+    
+    async def release(self):
+        """Drop a reference. The connection stays open for later users."""
+        self._references = max(0, self._references - 1)
+    
+    def connection_lost(self, session: Optional[ClientSession]):
+        """
+        Drop a session whose transport failed.
+        
+        The server process can exit without the connection-holding task
+        noticing, so callers report closed or broken streams here.
+        """
+        if session is not None and session is self.session:
+            logger.warning("Filesystem server connection lost")
+            self.session = None
+            if self._closing:
+                self._closing.set()
+    
+    async def reconnect(self, failed: Optional[ClientSession] = None) -> ClientSession:
+        """
+        Tear down a failed connection and establish a new one.
+        
+        Args:
+            failed: Session the caller saw fail. If another caller already
+                replaced it, the live session is returned without reconnecting.
+        """
+        async with self._lock:
+            if failed is not None and failed is not self.session and self.is_alive():
+                return self.session
+            await self._disconnect()
+            await self._connect()
+            return self.session
+    
+    async def close(self):
+        """Close the connection and stop the server process."""
+        async with self._lock:
+            await self._disconnect()
+    
+    async def _connect(self):
+        """Spawn the server and complete the MCP handshake."""
+        if self._metrics["connects"] > 0:
+            self._metrics["reconnects"] += 1
+        
+        start_time = time.monotonic()
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._closing = asyncio.Event()
+        self._task = asyncio.create_task(self._hold_connection(ready, self._closing))
+        
+        try:
+            self.session = await ready
+        except Exception:
+            self._metrics["connect_failures"] += 1
+            self._task = None
+            raise
+        
+        handshake = time.monotonic() - start_time
+        self._metrics["connects"] += 1
+        self._metrics["last_handshake_seconds"] = handshake
+        self._metrics["handshake_seconds_total"] += handshake
+        self._metrics["connected_since"] = time.time()
+    
+    async def _hold_connection(self, ready: asyncio.Future, closing: asyncio.Event):
+        """Keep the transport and session open until asked to close."""
+        session = None
+        try:
+            async with stdio_client(_filesystem_server_params()) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    
+                    tools = await session.list_tools()
+                    logger.info(f"Connected to filesystem server. Available tools: {[t.name for t in tools]}")
+                    
+                    ready.set_result(session)
+                    await closing.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"Filesystem server connection lost: {e}")
+        finally:
+            # A lost connection may already have been replaced by a new one
+            if session is not None and self.session is session:
+                self.session = None
+    
+    async def _disconnect(self):
+        """Stop the connection-holding task."""
+        if self._task and not self._task.done():
+            self._closing.set()
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except Exception as e:
+                logger.debug(f"Error closing filesystem server connection: {e}")
+                self._task.cancel()
+        self._task = None
+        self.session = None
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get connection metrics."""
+        metrics = dict(self._metrics)
+        metrics["alive"] = self.is_alive()
+        metrics["active_references"] = self._references
+        metrics["uptime_seconds"] = (
+            time.time() - metrics["connected_since"]
+            if self.is_alive() and metrics["connected_since"] else 0.0
+        )
+        return metrics
+
+
+# One shared connection per event loop (sessions cannot cross loops)
+_shared_connections: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SharedMCPConnection]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_connection() -> SharedMCPConnection:
+    """Get the shared filesystem server connection for the running event loop."""
+    loop = asyncio.get_running_loop()
+    connection = _shared_connections.get(loop)
+    if connection is None:
+        connection = SharedMCPConnection(
+            MCP_CLIENT_CONFIG.get("batching", {}).get("max_concurrent_calls", 8)
+        )
+        _shared_connections[loop] = connection
+    return connection
+
+
+class _BackgroundLoop:
+    """Process-wide event loop on a daemon thread for synchronous callers."""
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+    
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="mcp-filesystem-loop",
+                    daemon=True
+                )
+                thread.start()
+            return self._loop
+
+
+_background_loop = _BackgroundLoop()
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine on the shared background loop and wait for its result.
+    
+    Synchronous code paths use this instead of creating a fresh event loop
+    per call, so they keep reusing the loop's warm server connection.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop.get_loop())
+    return future.result()
+
 
 class MCPFileSystemClient:
     """
@@ -32,6 +269,7 @@ class MCPFileSystemClient:
     Features:
     - Automatic retry with exponential backoff
     - Connection pooling
+    - Batch operations and pipelined concurrent tool calls
     - Comprehensive error handling
     - Performance monitoring
     - Agent-specific permissions
@@ -51,19 +289,38 @@ class MCPFileSystemClient:
         self._retry_config = self.config["connection"]
         self._monitoring_enabled = self.config["monitoring"]["enable_metrics"]
         self._metrics: Dict[str, List[float]] = {}
+        self._batch_config = self.config.get("batching", {})
+        self._chunk_size = self.config.get("transfer", {}).get("chunk_size", 1024 * 1024)
+        self._call_semaphore: Optional[asyncio.Semaphore] = None
+        self._shared: Optional[SharedMCPConnection] = None
     
     @asynccontextmanager
     async def connect(self):
-        """Connect to the MCP filesystem server."""
-        server_params = StdioServerParameters(
-            command="python",
-            args=["-m", "mcp.filesystem_server"],
-            cwd=str(Path(__file__).parent.parent)
-        )
+        """Connect to the MCP filesystem server.
         
-        async with stdio_client(server_params) as (read, write):
+        By default this borrows the shared, already-initialized connection
+        for the running event loop (``connection.shared_connection``);
+        otherwise a dedicated server process is spawned for this block.
+        """
+        if self._retry_config.get("shared_connection", True):
+            shared = get_shared_connection()
+            previous = (self.session, self._call_semaphore, self._shared)
+            self.session = await shared.acquire()
+            self._call_semaphore = shared.call_semaphore
+            self._shared = shared
+            try:
+                yield self
+            finally:
+                self.session, self._call_semaphore, self._shared = previous
+                await shared.release()
+            return
+        
+        async with stdio_client(_filesystem_server_params()) as (read, write):
             async with ClientSession(read, write) as session:
                 self.session = session
+                self._call_semaphore = asyncio.Semaphore(
+                    self._batch_config.get("max_concurrent_calls", 8)
+                )
                 # Initialize the session
                 await session.initialize()
                 
@@ -75,6 +332,7 @@ class MCPFileSystemClient:
                     yield self
                 finally:
                     self.session = None
+                    self._call_semaphore = None
     
     async def _call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -92,6 +350,7 @@ class MCPFileSystemClient:
         
         last_error = None
         retry_count = 0
+        reconnected = False
         max_retries = self._retry_config["max_retries"]
         retry_delay = self._retry_config["retry_delay"]
         backoff = self._retry_config["retry_backoff"]
@@ -101,8 +360,12 @@ class MCPFileSystemClient:
                 # Record start time for metrics
                 start_time = datetime.now()
                 
-                # Call the tool
-                result = await self.session.call_tool(tool_name, arguments)
+                # Call the tool, bounding the number of requests in flight
+                if self._call_semaphore:
+                    async with self._call_semaphore:
+                        result = await self.session.call_tool(tool_name, arguments)
+                else:
+                    result = await self.session.call_tool(tool_name, arguments)
                 
                 # Record metrics
                 if self._monitoring_enabled:
@@ -125,11 +388,30 @@ class MCPFileSystemClient:
                 
             except Exception as e:
                 last_error = e
+                
+                # The shared server went away: drop its session and reconnect once
+                if self._shared and not reconnected and _is_connection_lost(e):
+                    reconnected = True
+                    failed = self.session
+                    self._shared.connection_lost(failed)
+                    try:
+                        self.session = await self._shared.reconnect(failed)
+                        continue
+                    except Exception as reconnect_error:
+                        logger.warning(f"Reconnect to filesystem server failed: {reconnect_error}")
+                
                 if retry_count < max_retries:
                     wait_time = retry_delay * (backoff ** retry_count)
                     logger.warning(f"Tool call failed, retrying in {wait_time}s: {e}")
                     await asyncio.sleep(wait_time)
                     retry_count += 1
+                    
+                    # Re-establish a shared connection whose server went away
+                    if self._shared and not self._shared.is_alive():
+                        try:
+                            self.session = await self._shared.reconnect()
+                        except Exception as reconnect_error:
+                            logger.warning(f"Reconnect to filesystem server failed: {reconnect_error}")
                 else:
                     break
         
@@ -175,7 +457,12 @@ class MCPFileSystemClient:
         else:
             raise FileNotFoundError(f"Failed to read file: {result.get('error', 'Unknown error')}")
     
-    async def write_file(self, path: str, content: str, encoding: str = "utf-8") -> bool:
+    async def write_file(self,
+                         path: str,
+                         content: str,
+                         encoding: str = "utf-8",
+                         append: bool = False,
+                         if_changed: bool = False) -> bool:
         """
         Write content to a file.
         
@@ -183,18 +470,138 @@ class MCPFileSystemClient:
             path: File path relative to sandbox root
             content: Content to write
             encoding: File encoding (default: utf-8)
+            append: Append to the file instead of overwriting it
+            if_changed: Leave the file untouched if it already has this content
             
         Returns:
             True if successful
         """
-        result = await self._call_tool("write_file", {
+        arguments = {
             "path": path,
             "content": content,
             "encoding": encoding
-        })
+        }
+        if append:
+            arguments["mode"] = "append"
+        if if_changed:
+            arguments["if_changed"] = True
+        
+        result = await self._call_tool("write_file", arguments)
         
         return result.get("success", False)
     
+    async def read_file_range(self,
+                              path: str,
+                              offset: int = 0,
+                              length: Optional[int] = None,
+                              encoding: str = "utf-8") -> Dict[str, Any]:
+        """
+        Read a byte range of a file.
+        
+        Args:
+            path: File path relative to sandbox root
+            offset: Byte offset to start at
+            length: Maximum bytes to read (default: transfer chunk size)
+            encoding: File encoding, or "base64" for raw bytes as base64 text
+            
+        Returns:
+            Dictionary with content, length (bytes consumed), next_offset,
+            total_size and eof
+        """
+        result = await self._call_tool("read_file", {
+            "path": path,
+            "encoding": encoding,
+            "offset": offset,
+            "length": length if length is not None else self._chunk_size
+        })
+        
+        if result.get("success"):
+            return result
+        else:
+            raise FileNotFoundError(f"Failed to read file: {result.get('error', 'Unknown error')}")
+    
+    async def iter_file_chunks(self,
+                               path: str,
+                               chunk_size: Optional[int] = None,
+                               encoding: str = "utf-8") -> AsyncIterator[str]:
+        """
+        Stream a file in chunks of roughly chunk_size bytes.
+        
+        Args:
+            path: File path relative to sandbox root
+            chunk_size: Bytes per request (default: transfer chunk size)
+            encoding: File encoding, or "base64" for raw bytes as base64 text
+            
+        Yields:
+            Decoded chunks, in order
+        """
+        offset = 0
+        while True:
+            result = await self.read_file_range(path, offset, chunk_size, encoding)
+            if result["content"]:
+                yield result["content"]
+            if result.get("eof") or result.get("next_offset") is None:
+                break
+            offset = result["next_offset"]
+    
+    async def write_file_chunked(self,
+                                 path: str,
+                                 content: str,
+                                 chunk_size: Optional[int] = None,
+                                 encoding: str = "utf-8",
+                                 if_changed: bool = True) -> bool:
+        """
+        Write a large file as a sequence of appends.
+        
+        The first chunk overwrites the file and the rest are appended, so a
+        failure part way through leaves a truncated file; callers should
+        rewrite it.
+        
+        Args:
+            path: File path relative to sandbox root
+            content: Content to write
+            chunk_size: Characters per request (default: transfer chunk size)
+            encoding: File encoding, or "base64" for raw bytes as base64 text
+            if_changed: Skip the write if the file already has this content
+            
+        Returns:
+            True if the file has the content afterwards
+        """
+        if if_changed and await self._has_content(path, content, encoding):
+            return True
+        
+        chunk_size = chunk_size or self._chunk_size
+        if encoding == "base64":
+            # Every 4 base64 characters decode on their own
+            chunk_size = max(4, chunk_size - chunk_size % 4)
+        chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)] or [""]
+        for index, chunk in enumerate(chunks):
+            if not await self.write_file(path, chunk, encoding, append=index > 0):
+                return False
+        return True
+    
+    async def read_bytes(self, path: str) -> bytes:
+        """Read a file's raw bytes, chunk by chunk."""
+        chunks = [base64.b64decode(chunk) async for chunk in self.iter_file_chunks(path, encoding="base64")]
+        return b"".join(chunks)
+    
+    async def write_bytes(self, path: str, data: bytes, if_changed: bool = True) -> bool:
+        """Write raw bytes, chunk by chunk."""
+        return await self.write_file_chunked(
+            path, base64.b64encode(data).decode("ascii"), encoding="base64", if_changed=if_changed
+        )
+    
+    async def _has_content(self, path: str, content: str, encoding: str) -> bool:
+        """Whether the file on the server already holds exactly this content."""
+        data = base64.b64decode(content) if encoding == "base64" else content.encode(encoding)
+        try:
+            info = await self._call_tool("get_file_info", {"path": path, "include_hash": True})
+        except Exception:
+            return False
+        return (info.get("success", False)
+                and info.get("size") == len(data)
+                and info.get("sha256") == hashlib.sha256(data).hexdigest())
+    
     async def delete_file(self, path: str) -> bool:
         """
         Delete a file or directory.
@@ -212,6 +619,8 @@ class MCPFileSystemClient:
         """
         List contents of a directory.
         
+        Pages through the server's paginated listing and returns all items.
+        
         Args:
             path: Directory path relative to sandbox root
             recursive: Whether to list recursively
@@ -219,15 +628,43 @@ class MCPFileSystemClient:
         Returns:
             List of items with path, type, and size information
         """
-        result = await self._call_tool("list_directory", {
-            "path": path,
-            "recursive": recursive
-        })
+        items = []
+        async for page in self.iter_directory(path, recursive):
+            items.extend(page)
+        return items
+    
+    async def iter_directory(self,
+                             path: str,
+                             recursive: bool = False,
+                             page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterate over a directory listing one page at a time.
         
-        if result.get("success"):
-            return result["items"]
-        else:
-            raise FileNotFoundError(f"Failed to list directory: {result.get('error', 'Unknown error')}")
+        Args:
+            path: Directory path relative to sandbox root
+            recursive: Whether to list recursively
+            page_size: Items per page (server limit if None)
+            
+        Yields:
+            Lists of items with path, type, and size information
+        """
+        offset = 0
+        while True:
+            arguments = {"path": path, "recursive": recursive}
+            if offset:
+                arguments["offset"] = offset
+            if page_size:
+                arguments["limit"] = page_size
+            
+            result = await self._call_tool("list_directory", arguments)
+            if not result.get("success"):
+                raise FileNotFoundError(f"Failed to list directory: {result.get('error', 'Unknown error')}")
+            
+            yield result["items"]
+            
+            if not result.get("has_more") or result.get("next_offset") is None:
+                break
+            offset = result["next_offset"]
     
     async def create_directory(self, path: str, parents: bool = True) -> bool:
         """
@@ -277,6 +714,142 @@ class MCPFileSystemClient:
         else:
             raise FileNotFoundError(f"Failed to get file info: {result.get('error', 'Unknown error')}")
     
+    async def call_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Pipeline several tool calls over the session concurrently.
+        
+        Requests are sent without waiting for earlier responses (bounded by
+        ``batching.max_concurrent_calls``), so N calls cost roughly one
+        round-trip instead of N.
+        
+        Args:
+            calls: List of (tool_name, arguments) pairs
+            
+        Returns:
+            Results in the same order as calls
+        """
+        return list(await asyncio.gather(
+            *(self._call_tool(tool_name, arguments) for tool_name, arguments in calls)
+        ))
+    
+    def _chunk_files(self, files: List[Dict[str, str]]) -> List[List[Dict[str, str]]]:
+        """Split files into batches bounded by count and content size."""
+        max_files = self._batch_config.get("max_batch_files", 100)
+        max_bytes = self._batch_config.get("max_batch_bytes", 4 * 1024 * 1024)
+        
+        batches = []
+        current: List[Dict[str, str]] = []
+        current_bytes = 0
+        for item in files:
+            size = len(item.get("content", ""))
+            if current and (len(current) >= max_files or current_bytes + size > max_bytes):
+                batches.append(current)
+                current = []
+                current_bytes = 0
+            current.append(item)
+            current_bytes += size
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def write_files(self,
+                          files: Dict[str, str],
+                          encoding: str = "utf-8",
+                          if_changed: bool = False) -> Dict[str, bool]:
+        """
+        Write multiple files using batched, pipelined write_files calls.
+        
+        Args:
+            files: Dictionary mapping paths (relative to sandbox root) to content
+            encoding: File encoding (default: utf-8)
+            if_changed: Leave files that already have this content untouched
+            
+        Returns:
+            Dictionary mapping each path to whether it was written
+        """
+        if not files:
+            return {}
+        
+        items = [{"path": path, "content": content} for path, content in files.items()]
+        batches = self._chunk_files(items)
+        arguments = {"encoding": encoding}
+        if if_changed:
+            arguments["if_changed"] = True
+        responses = await self.call_tools([
+            ("write_files", {"files": batch, **arguments})
+            for batch in batches
+        ])
+        
+        written = {path: False for path in files}
+        for batch, response in zip(batches, responses):
+            for item, result in zip(batch, response.get("results", [])):
+                if result.get("success"):
+                    written[item["path"]] = True
+                else:
+                    logger.error(f"Failed to write {item['path']}: {result.get('error')}")
+        return written
+    
+    async def read_files(self, paths: List[str], encoding: str = "utf-8") -> Dict[str, Optional[str]]:
+        """
+        Read multiple files using batched, pipelined read_files calls.
+        
+        Args:
+            paths: File paths relative to sandbox root
+            encoding: File encoding (default: utf-8)
+            
+        Returns:
+            Dictionary mapping each path to its content (None if it could not be read)
+        """
+        if not paths:
+            return {}
+        
+        max_files = self._batch_config.get("max_batch_files", 100)
+        batches = [paths[i:i + max_files] for i in range(0, len(paths), max_files)]
+        responses = await self.call_tools([
+            ("read_files", {"paths": batch, "encoding": encoding})
+            for batch in batches
+        ])
+        
+        contents: Dict[str, Optional[str]] = {}
+        for batch, response in zip(batches, responses):
+            for path, result in zip(batch, response.get("files", [])):
+                contents[path] = result["content"] if result.get("success") else None
+        return contents
+    
+    async def stat_many(self, paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get existence, type and size of multiple paths.
+        
+        Args:
+            paths: Paths relative to sandbox root
+            
+        Returns:
+            Dictionary mapping each path to its stat information
+        """
+        if not paths:
+            return {}
+        
+        max_files = self._batch_config.get("max_batch_files", 100)
+        batches = [paths[i:i + max_files] for i in range(0, len(paths), max_files)]
+        responses = await self.call_tools([("stat_many", {"paths": batch}) for batch in batches])
+        
+        stats: Dict[str, Dict[str, Any]] = {}
+        for batch, response in zip(batches, responses):
+            for path, item in zip(batch, response.get("items", [])):
+                stats[path] = item
+        return stats
+    
+    def get_connection_metrics(self) -> Dict[str, Any]:
+        """
+        Get metrics of the shared server connection in use.
+        
+        Returns:
+            Dictionary with connect/reconnect counts and handshake timings
+        """
+        if self._shared:
+            return self._shared.get_metrics()
+        return {}
+    
     def get_metrics(self) -> Dict[str, Dict[str, float]]:
         """
         Get performance metrics.
@@ -307,4 +880,10 @@ async def get_filesystem_client(agent_name: str = "default") -> MCPFileSystemCli
     Returns:
         Configured MCPFileSystemClient instance
     """
-    return MCPFileSystemClient(agent_name)
\ No newline at end of file
+    return MCPFileSystemClient(agent_name)
+
+async def close_shared_connection():
+    """Close the shared filesystem server connection of the running event loop."""
+    connection = _shared_connections.pop(asyncio.get_running_loop(), None)
+    if connection:
+        await connection.close()
@@ -0,0 +1,285 @@
+"""
+Record and replay of agent calls.
+
+In record mode every team member call a workflow makes is appended to a
+replay archive: the agent, a hash of its normalized input, the output and
+how long the call took. In replay mode the calls are answered from the
+archive instead of the agent server, so a recorded run can be reproduced
+offline at full speed and the non-LLM parts of a workflow (parsing, Docker,
+test runs, reporting) profiled in isolation.
+
+Inputs are normalized before hashing: the PRIORITY directive, session ids,
+timestamps, UUIDs and temporary directories differ between runs without
+changing what is asked. Repeated identical calls are served in recorded
+order. A call without a recording is handled according to on_miss:
+"sequence" serves the agent's next unserved recording, "live" calls the
+agent and "error" raises ReplayMiss.
+
+Calls are hooked where workflows make them, in the workflow process:
+orchestrator_agent.run_team_member, core.orchestrator_client (the path of
+the tdd, full, enhanced_full, incremental and individual workflows) and the
+in-process feature reviewer of the MVP incremental workflows. Replay
+therefore needs no orchestrator server unless on_miss is "live".
+
+The archive is gzip-compressed JSON lines (a header, then one line per
+call) and is appended to as calls complete, so an interrupted recording
+keeps everything up to the interruption.
+"""
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from shared.utils.rate_limiter import PRIORITY_DIRECTIVE
+from workflows.workflow_config import AGENT_REPLAY_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT = "agent_replay"
+ARCHIVE_VERSION = 1
+
+# Run-specific parts of agent inputs, replaced before hashing
+_NORMALIZATIONS = [
+    (re.compile(r'SESSION_ID:[ \t]*\S+'), 'SESSION_ID: <session>'),
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.IGNORECASE), '<uuid>'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?'), '<timestamp>'),
+    (re.compile(r'\d{8}_\d{6}(?:_\d+)?'), '<timestamp>'),
+    (re.compile(r'(?:/tmp|/private/var/folders|/var/folders)/[^\s\'"`]+'), '<tmpdir>'),
+    (re.compile(r'[ \t]+$', re.MULTILINE), ''),
+]
+
+
+class ReplayMiss(LookupError):
+    """A replayed agent call has no recording"""
+
+
+def normalize_input(input_text: str) -> str:
+    """Agent input with the parts that change between runs replaced"""
+    text = input_text.replace("\r\n", "\n")
+    if text.startswith(PRIORITY_DIRECTIVE):
+        text = text.partition("\n")[2]
+    for pattern, replacement in _NORMALIZATIONS:
+        text = pattern.sub(replacement, text)
+    return text.strip()
+
+
+def input_key(agent: str, input_text: str) -> str:
+    """Replay key of an agent call"""
+    return hashlib.sha256(f"{agent}\n{normalize_input(input_text)}".encode()).hexdigest()[:24]
+
+
+def output_text(output: List[List[str]]) -> str:
+    """Text of a recorded output (the contents of all message parts)"""
+    return "".join(part for message in output for part in message)
+
+
+def load_archive(path: str) -> List[Dict[str, Any]]:
+    """
+    Read the calls in a replay archive.
+
+    Returns:
+        Entries in recorded order with agent, key, output (a list of
+        messages, each a list of part contents), duration and error
+    """
+    entries = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "format" in entry:
+                if entry["format"] != ARCHIVE_FORMAT or entry.get("version", 0) > ARCHIVE_VERSION:
+                    raise ValueError(f"{path} is not a supported replay archive")
+                continue
+            entries.append(entry)
+    return entries
+
+
+def archive_execution_report(report_path: str, archive_path: str) -> int:
+    """
+    Convert the agent exchanges of a saved execution report
+    (WorkflowExecutionTracer.record_agent_exchange) to a replay archive.
+
+    Returns:
+        Number of calls written
+    """
+    with open(report_path, 'r') as f:
+        report = json.load(f)
+    replay = AgentReplay({"mode": "record", "archive": archive_path})
+    for exchange in report.get("all_agent_exchanges", []):
+        replay.record(
+            exchange["agent_name"],
+            exchange["input_raw"],
+            [[exchange["output_raw"]]],
+            exchange.get("duration_seconds", 0.0)
+        )
+    return replay.stats["recorded"]
+
+
+class AgentReplay:
+    """Records agent calls to a replay archive, or serves them from one"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize record/replay.
+
+        Args:
+            config: Settings in the shape of AGENT_REPLAY_CONFIG
+        """
+        self.config = {**AGENT_REPLAY_CONFIG, **(config or {})}
+        self.mode = self.config["mode"]
+        if self.mode not in ("off", "record", "replay"):
+            raise ValueError(f"Unknown agent replay mode: {self.mode}")
+        if self.mode != "off" and not self.config["archive"]:
+            raise ValueError(f"Agent replay mode '{self.mode}' needs an archive path")
+
+        self.path = Path(self.config["archive"]) if self.config["archive"] else None
+        self.stats = {"recorded": 0, "matched": 0, "sequence": 0, "live": 0, "missed": 0}
+        self._lock = threading.Lock()
+        self._started = False
+
+        # Replay indexes: recordings per input key and per agent, in recorded order
+        self._entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, Deque[int]] = defaultdict(deque)
+        self._by_agent: Dict[str, Deque[int]] = defaultdict(deque)
+        self._last_by_key: Dict[str, int] = {}
+        self._served = set()
+        if self.mode == "replay":
+            self._entries = load_archive(str(self.path))
+            for index, entry in enumerate(self._entries):
+                self._by_key[entry["key"]].append(index)
+                self._by_agent[entry["agent"]].append(index)
+            logger.info(f"Replaying {len(self._entries)} agent calls from {self.path}")
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def offline(self) -> bool:
+        """Whether replay can run without the agent server"""
+        return self.replaying and self.config["on_miss"] != "live"
+
+    def record(self, agent: str, input_text: str, output: List[List[str]],
+               duration: float, error: bool = False):
+        """
+        Append a completed call to the archive.
+
+        Args:
+            agent: Agent called
+            input_text: Input sent to the agent
+            output: Messages returned, each a list of part contents
+            duration: Seconds the call took
+            error: Whether the call failed (output is the error message)
+        """
+        entry = {
+            "agent": agent,
+            "key": input_key(agent, input_text),
+            "output": output,
+            "duration": round(duration, 3)
+        }
+        if error:
+            entry["error"] = True
+
+        with self._lock:
+            if not self._started:
+                # A new recording replaces an earlier archive at the same path
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+                    f.write(json.dumps({
+                        "format": ARCHIVE_FORMAT,
+                        "version": ARCHIVE_VERSION,
+                        "created_at": datetime.now().isoformat()
+                    }) + "\n")
+                self._started = True
+            # Each call is its own gzip member, so a partial archive stays readable
+            with gzip.open(self.path, 'at', encoding='utf-8') as f:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.stats["recorded"] += 1
+
+    def lookup(self, agent: str, input_text: str) -> Optional[Dict[str, Any]]:
+        """
+        Find the recording answering a call.
+
+        Returns:
+            The recorded entry, or None if the call should go to the agent
+
+        Raises:
+            ReplayMiss: No recording matches and on_miss is "error"
+        """
+        key = input_key(agent, input_text)
+        with self._lock:
+            index = self._next_unserved(self._by_key[key])
+            if index is not None:
+                self.stats["matched"] += 1
+            elif key in self._last_by_key:
+                # Called more often than recorded: repeat the last answer
+                index = self._last_by_key[key]
+                self.stats["matched"] += 1
+            elif self.config["on_miss"] == "sequence":
+                index = self._next_unserved(self._by_agent[agent])
+                if index is not None:
+                    self.stats["sequence"] += 1
+
+            if index is None:
+                if self.config["on_miss"] == "live":
+                    self.stats["live"] += 1
+                    return None
+                self.stats["missed"] += 1
+                raise ReplayMiss(f"No recorded {agent} call for input {key}")
+
+            self._served.add(index)
+            self._last_by_key[key] = index
+            return self._entries[index]
+
+    async def serve(self, agent: str, input_text: str) -> Optional[Dict[str, Any]]:
+        """lookup(), waiting for the recorded duration if replay_timing is "recorded" """
+        entry = self.lookup(agent, input_text)
+        if entry and self.config["replay_timing"] == "recorded":
+            await asyncio.sleep(entry.get("duration", 0.0))
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats["mode"] = self.mode
+        if self.replaying:
+            stats["unserved"] = len(self._entries) - len(self._served)
+        return stats
+
+    def _next_unserved(self, indexes: Deque[int]) -> Optional[int]:
+        while indexes and indexes[0] in self._served:
+            indexes.popleft()
+        return indexes.popleft() if indexes else None
+
+
+# Global instance with lazy initialization
+_agent_replay = None
+
+
+def get_agent_replay() -> AgentReplay:
+    """Get the global agent record/replay (configured by AGENT_REPLAY_CONFIG)"""
+    global _agent_replay
+    if _agent_replay is None:
+        _agent_replay = AgentReplay()
+    return _agent_replay
+
+
+def configure_agent_replay(mode: str, archive: Optional[str] = None, **settings) -> AgentReplay:
+    """Switch agent record/replay mode for subsequent calls"""
+    global _agent_replay
+    AGENT_REPLAY_CONFIG.update(mode=mode, archive=archive, **settings)
+    _agent_replay = AgentReplay()
+    return _agent_replay
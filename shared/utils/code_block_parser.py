@@ -0,0 +1,341 @@
+"""
+Code block parser for extracting files from agent output.
+
+Agents emit files in a handful of formats:
+
+    FILENAME: app/main.py          File: app/main.py        ### app/main.py
+    ```python                      ```python                ```python
+    ...                            ...                      ...
+    ```                            ```                      ```
+
+    ```python                      # filename: app/main.py
+    # filename: app/main.py        ...  (unfenced, runs until the next marker)
+    ...
+    ```
+
+CodeBlockParser recognises all of them in a single line-by-line pass, so
+parsing is linear in the output size and can be fed chunks as they stream
+in. parse_code_blocks() memoizes complete parses by content hash, so the
+retries and workflow phases that re-parse the same coder output only pay
+for it once. Callers select the formats they accept with extract_files().
+"""
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Block styles, named after the marker that supplied the filename
+FILENAME = "FILENAME"            # FILENAME: path line before a fence
+HASH_FILENAME = "hash_filename"  # "# filename: path" line inside or right before a fence
+HASH_SECTION = "hash_section"    # "# filename: path" line followed by unfenced code
+FILE = "File"                    # File: path line before a fence
+MARKDOWN = "markdown"            # ### path header before a fence
+HASH_HEADER = "hash_header"      # "# path.ext" line before a fence
+FENCE_INFO = "fence_info"        # ```python path.ext
+COMMENT_HEADER = "comment_header"  # "# path.ext" as the first line inside a fence
+ANONYMOUS = "anonymous"          # fence without any filename
+
+# Fence languages the workflows treat as source files
+SCRIPT_LANGUAGES = ("python", "py", "javascript", "js")
+
+_FILENAME_RE = re.compile(r'FILENAME:\s*(.+?)\s*$')
+_HASH_FILENAME_RE = re.compile(r'^\s*(?:#|//)\s*filename:\s*(\S+)')
+_FILE_RE = re.compile(r'^\s*(?:#+\s*)?(?:\*\*)?File:(?:\*\*)?\s*(.+?)\s*$')
+_MARKDOWN_RE = re.compile(r'^\s*###\s*(.+?)\s*$')
+_HASH_HEADER_RE = re.compile(r'^\s*#\s*(\S+\.\w+)\s*$')
+_COMMENT_HEADER_RE = re.compile(r'^\s*(?:#|//)\s*(\S+\.\w+)\s*$')
+_FENCE_RE = re.compile(r'^\s*```\s*([\w+#.-]*)\s*(.*?)\s*$')
+
+# Characters trimmed from filenames (markdown emphasis and quoting)
+_NAME_TRIM = " \t`*'\""
+
+
+@dataclass(frozen=True)
+class CodeBlock:
+    """A file extracted from agent output"""
+    filename: Optional[str]
+    content: str
+    style: str
+    language: str = ""
+
+
+def _clean_name(name: str) -> str:
+    return name.strip(_NAME_TRIM)
+
+
+def _is_closing_fence(line: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith("```") and not stripped.strip("`")
+
+
+class CodeBlockParser:
+    """
+    Incremental single-pass parser for code blocks.
+
+    Usage:
+        parser = CodeBlockParser()
+        for chunk in stream:
+            for block in parser.feed(chunk):
+                ...
+        blocks = parser.close()
+
+    Fenced blocks are emitted when their closing fence arrives; a fence
+    left open at close() is dropped as truncated output.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pending: Optional[Tuple[str, str]] = None  # (filename, style) awaiting a fence
+        self._block: Optional[Dict] = None  # open fence or unfenced section
+        self._closed = False
+
+    def feed(self, chunk: str) -> List[CodeBlock]:
+        """
+        Parse a chunk of output.
+
+        Returns:
+            Blocks completed by this chunk
+        """
+        if self._closed:
+            raise ValueError("Parser is closed")
+        self._buffer += chunk
+        if "\n" not in chunk:
+            return []
+        lines = self._buffer.split("\n")
+        self._buffer = lines.pop()
+        completed: List[CodeBlock] = []
+        for line in lines:
+            self._process_line(line, completed)
+        return completed
+
+    def close(self) -> List[CodeBlock]:
+        """
+        Finish parsing.
+
+        Returns:
+            Blocks completed by the remaining input
+        """
+        if self._closed:
+            return []
+        completed: List[CodeBlock] = []
+        if self._buffer:
+            self._process_line(self._buffer, completed)
+            self._buffer = ""
+        if self._block and not self._block["fenced"]:
+            self._emit(completed)
+        self._block = None
+        self._closed = True
+        return completed
+
+    def _emit(self, completed: List[CodeBlock]):
+        block = self._block
+        self._block = None
+        completed.append(CodeBlock(
+            filename=block["filename"],
+            content="\n".join(block["lines"]),
+            style=block["style"],
+            language=block["language"]
+        ))
+
+    def _open_fence(self, match, filename: Optional[str], style: Optional[str]):
+        language, info = match.group(1).lower(), match.group(2)
+        if filename is None and info:
+            name = _clean_name(info.split()[0].lstrip("#"))
+            if "." in name:
+                filename, style = name, FENCE_INFO
+        self._block = {
+            "filename": filename,
+            "style": style or ANONYMOUS,
+            "language": language,
+            "lines": [],
+            "fenced": True,
+            "seen_code": False
+        }
+
+    def _process_line(self, line: str, completed: List[CodeBlock]):
+        block = self._block
+
+        # Inside a fence only the closing fence and a leading filename comment matter
+        if block is not None and block["fenced"]:
+            if _is_closing_fence(line):
+                self._emit(completed)
+                return
+            if not block["seen_code"] and line.strip():
+                block["seen_code"] = True
+                if block["filename"] is None:
+                    match = _HASH_FILENAME_RE.match(line)
+                    if match:
+                        block["filename"], block["style"] = match.group(1), HASH_FILENAME
+                        return
+                    match = _COMMENT_HEADER_RE.match(line)
+                    if match:
+                        block["filename"], block["style"] = match.group(1), COMMENT_HEADER
+                        return
+            block["lines"].append(line)
+            return
+
+        stripped = line.lstrip()
+        first = stripped[:1]
+
+        # Unfenced "# filename:" section: runs until the next file marker
+        if block is not None:
+            if first == "`" and not block["lines"]:
+                match = _FENCE_RE.match(line)
+                if match:
+                    # The marker was a header for the fence that follows
+                    self._block = None
+                    self._open_fence(match, block["filename"], HASH_FILENAME)
+                    return
+            if (first in "#/" and _HASH_FILENAME_RE.match(line)) or "FILENAME:" in line:
+                self._emit(completed)
+            else:
+                if block["lines"] or line.strip():
+                    block["lines"].append(line)
+                return
+
+        if not stripped:
+            return  # Blank lines keep a pending header alive
+
+        if first == "`":
+            match = _FENCE_RE.match(line)
+            if match:
+                pending, self._pending = self._pending, None
+                filename, style = pending if pending else (None, None)
+                self._open_fence(match, filename, style)
+                return
+
+        self._pending = None
+        if "FILENAME:" in line:
+            match = _FILENAME_RE.search(line)
+            if match:
+                self._pending = (_clean_name(match.group(1)), FILENAME)
+            return
+        if first in "#/":
+            match = _HASH_FILENAME_RE.match(line)
+            if match:
+                self._block = {
+                    "filename": match.group(1),
+                    "style": HASH_SECTION,
+                    "language": "",
+                    "lines": [],
+                    "fenced": False
+                }
+                return
+        if "File:" in line:
+            match = _FILE_RE.match(line)
+            if match:
+                self._pending = (_clean_name(match.group(1)), FILE)
+                return
+        if first == "#":
+            match = _MARKDOWN_RE.match(line)
+            if match:
+                self._pending = (_clean_name(match.group(1)), MARKDOWN)
+                return
+            match = _HASH_HEADER_RE.match(line)
+            if match:
+                self._pending = (match.group(1), HASH_HEADER)
+
+
+# Memoized parses of complete outputs, keyed by content hash
+_CACHE_SIZE = 128
+_cache: "OrderedDict[str, Tuple[CodeBlock, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+# Most recent parse by object identity: callers usually re-parse the very same string
+_last: Tuple[Optional[str], Tuple[CodeBlock, ...]] = (None, ())
+
+
+def _text_key(text: str) -> str:
+    digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    return f"{len(text)}:{digest}"
+
+
+def parse_code_blocks(text: str) -> Tuple[CodeBlock, ...]:
+    """
+    Parse every code block in a complete output.
+
+    Results are cached by content hash, so parsing the same output again
+    (another workflow phase, a retry, a different caller) is a lookup.
+    """
+    global _last
+    if not text:
+        return ()
+    with _cache_lock:
+        last_text, last_blocks = _last
+        if text is last_text:
+            _cache_stats["hits"] += 1
+            return last_blocks
+
+    key = _text_key(text)
+    with _cache_lock:
+        blocks = _cache.get(key)
+        if blocks is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            _last = (text, blocks)
+            return blocks
+        _cache_stats["misses"] += 1
+
+    parser = CodeBlockParser()
+    parsed = parser.feed(text)
+    parsed.extend(parser.close())
+    blocks = tuple(parsed)
+
+    with _cache_lock:
+        _cache[key] = blocks
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+        _last = (text, blocks)
+    return blocks
+
+
+def extract_files(text: str,
+                  styles: Optional[Iterable[str]] = None,
+                  languages: Optional[Iterable[str]] = None,
+                  strip: bool = True) -> Dict[str, str]:
+    """
+    Extract filename -> content from agent output.
+
+    Args:
+        text: Agent output
+        styles: Block styles to accept (default: any block with a filename)
+        languages: Fence languages to accept (default: any)
+        strip: Strip surrounding whitespace from contents
+
+    Returns:
+        Files in output order; a repeated filename keeps its last content
+    """
+    styles = set(styles) if styles is not None else None
+    languages = set(languages) if languages is not None else None
+    files = {}
+    for block in parse_code_blocks(text):
+        if not block.filename:
+            continue
+        if styles is not None and block.style not in styles:
+            continue
+        if languages is not None and block.language not in languages:
+            continue
+        files[block.filename] = block.content.strip() if strip else block.content
+    return files
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Hit/miss counts of the parse cache"""
+    with _cache_lock:
+        return {**_cache_stats, "entries": len(_cache)}
+
+
+def clear_cache():
+    """Drop memoized parses"""
+    global _last
+    with _cache_lock:
+        _cache.clear()
+        _last = (None, ())
+        _cache_stats["hits"] = 0
+        _cache_stats["misses"] = 0
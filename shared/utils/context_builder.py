@@ -0,0 +1,348 @@
+"""
+Token-budgeted context builder for agent prompts.
+
+Coder and test writer prompts used to paste the whole accumulated codebase,
+so prompts grew with every completed feature. ContextBuilder ranks the
+existing files by relevance to the current task and renders them within a
+token budget:
+
+- files named in failing test output, files the task targets and files
+  imported by the test code rank first
+- files defining symbols the task mentions come next
+- relevance spreads along the import graph to the files those import
+- the most relevant files are shown in full, the rest as signature stubs,
+  and whatever still does not fit is only listed by name
+
+Per-file analysis (symbols, imports, stub) is cached by content hash, so
+unchanged files are summarized once per workflow.
+"""
+import ast
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOKEN_BUDGET = 8000
+
+# Relevance weights
+FOCUS_FILE_SCORE = 10.0
+FAILING_FILE_SCORE = 8.0
+IMPORTED_BY_FOCUS_SCORE = 5.0
+SYMBOL_SCORE = 2.0
+MAX_SYMBOL_SCORE = 6.0
+IMPORT_DECAY = 0.5
+IMPORT_HOPS = 2
+
+_IDENTIFIER_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+_TRACEBACK_FILE_RE = re.compile(r'File "([^"]+)", line \d+')
+_LOCATION_RE = re.compile(r'([\w./\\-]+\.(?:py|js|jsx|ts|tsx|mjs|cjs))(?::\d+|::)')
+_PY_IMPORT_RE = re.compile(r'^\s*(?:from\s+(\.*[\w.]*)\s+import\s+([\w, ]+)|import\s+([\w.]+))', re.MULTILINE)
+_JS_IMPORT_RE = re.compile(r'''(?:require\(\s*|from\s+|import\s+)['"]([^'"]+)['"]''')
+_JS_SYMBOL_RE = re.compile(
+    r'^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?'
+    r'(?:function\*?\s+(\w+)|class\s+(\w+)|(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?(?:function|\(|\w+\s*=>))'
+)
+_JS_STUB_RE = re.compile(
+    r'^\s*(?:export\s|module\.exports|exports\.|(?:async\s+)?function\b|class\b|'
+    r'(?:const|let|var)\s+\w+\s*=\s*(?:async\s*)?(?:function|\(|\w+\s*=>|require\()|import\b)'
+)
+_PY_EXTENSIONS = (".py",)
+_JS_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
+_TEXT_PREVIEW_LINES = 10
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+
+@dataclass(frozen=True)
+class FileSummary:
+    """Cached analysis of one file's content"""
+    symbols: FrozenSet[str]
+    imports: Tuple[str, ...]
+    stub: str
+    tokens: int
+    stub_tokens: int
+
+
+def _python_stub_lines(nodes, lines: List[str], indent: str = "") -> List[str]:
+    stub = []
+    for node in nodes:
+        if isinstance(node, (ast.Import, ast.ImportFrom)) and not indent:
+            stub.extend(lines[node.lineno - 1:node.end_lineno])
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            start = min([d.lineno for d in node.decorator_list] + [node.lineno]) - 1
+            body_start = node.body[0].lineno - 1
+            if body_start < node.lineno:
+                # Body on the signature line
+                stub.extend(lines[start:node.lineno])
+                continue
+            stub.extend(lines[start:body_start])
+            docstring = ast.get_docstring(node)
+            inner = indent + "    "
+            if docstring:
+                stub.append(f'{inner}"""{docstring.strip().splitlines()[0]}"""')
+            if isinstance(node, ast.ClassDef):
+                members = _python_stub_lines(node.body, lines, inner)
+                stub.extend(members or [f"{inner}..."])
+            else:
+                stub.append(f"{inner}...")
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and node.lineno == node.end_lineno:
+            line = lines[node.lineno - 1]
+            if len(line) <= 120:
+                stub.append(line)
+    return stub
+
+
+def _summarize_python(content: str) -> Tuple[Set[str], List[str], str]:
+    tree = ast.parse(content)
+    lines = content.splitlines()
+    symbols, imports = set(), []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            symbols.add(node.name)
+        elif isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            imports.append(module)
+            imports.extend(f"{module}.{alias.name}" if module else alias.name for alias in node.names)
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            symbols.update(t.id for t in node.targets if isinstance(t, ast.Name))
+    return symbols, imports, "\n".join(_python_stub_lines(tree.body, lines))
+
+
+def _summarize_js(content: str) -> Tuple[Set[str], List[str], str]:
+    symbols, stub = set(), []
+    for line in content.splitlines():
+        match = _JS_SYMBOL_RE.match(line)
+        if match:
+            symbols.update(name for name in match.groups() if name)
+        if _JS_STUB_RE.match(line):
+            stub.append(line.rstrip().rstrip("{").rstrip() + (" { ... }" if line.rstrip().endswith("{") else ""))
+    return symbols, _JS_IMPORT_RE.findall(content), "\n".join(stub)
+
+
+def _summarize(filename: str, content: str) -> FileSummary:
+    symbols, imports, stub = set(), [], ""
+    try:
+        if filename.endswith(_PY_EXTENSIONS):
+            symbols, imports, stub = _summarize_python(content)
+        elif filename.endswith(_JS_EXTENSIONS):
+            symbols, imports, stub = _summarize_js(content)
+    except (SyntaxError, ValueError) as e:
+        logger.debug(f"Could not analyze {filename}: {e}")
+    if not stub:
+        lines = content.splitlines()
+        stub = "\n".join(lines[:_TEXT_PREVIEW_LINES])
+        if len(lines) > _TEXT_PREVIEW_LINES:
+            stub += "\n..."
+    return FileSummary(
+        symbols=frozenset(symbols),
+        imports=tuple(imports),
+        stub=stub,
+        tokens=estimate_tokens(content),
+        stub_tokens=estimate_tokens(stub)
+    )
+
+
+# File summaries, keyed by extension and content hash
+_SUMMARY_CACHE_SIZE = 2048
+_summaries: "OrderedDict[Tuple[str, str], FileSummary]" = OrderedDict()
+_summaries_lock = threading.Lock()
+
+
+def summarize_file(filename: str, content: str) -> FileSummary:
+    """Analyze a file, reusing the result for identical content"""
+    extension = filename.rsplit(".", 1)[-1] if "." in filename else ""
+    key = (extension, hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest())
+    with _summaries_lock:
+        summary = _summaries.get(key)
+        if summary is not None:
+            _summaries.move_to_end(key)
+            return summary
+
+    summary = _summarize(filename, content)
+    with _summaries_lock:
+        _summaries[key] = summary
+        while len(_summaries) > _SUMMARY_CACHE_SIZE:
+            _summaries.popitem(last=False)
+    return summary
+
+
+def _module_keys(filename: str) -> List[str]:
+    """Names under which other files may import a file"""
+    path = filename.replace("\\", "/")
+    stem = path.rsplit(".", 1)[0] if "." in path.rsplit("/", 1)[-1] else path
+    if filename.endswith(_PY_EXTENSIONS):
+        parts = [p for p in stem.split("/") if p]
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        return [".".join(parts[i:]) for i in range(len(parts))]
+    parts = [p for p in stem.split("/") if p]
+    if parts and parts[-1] == "index":
+        parts = parts[:-1]
+    return ["/".join(parts[i:]) for i in range(len(parts))]
+
+
+def _normalize_import(spec: str) -> str:
+    spec = spec.replace("\\", "/")
+    while spec.startswith(("./", "../")):
+        spec = spec.split("/", 1)[1]
+    spec = spec.lstrip(".")
+    for extension in _JS_EXTENSIONS:
+        if spec.endswith(extension):
+            return spec[:-len(extension)]
+    return spec
+
+
+def _text_imports(text: str) -> List[str]:
+    """Modules imported by code embedded in free text (e.g. fenced test code)"""
+    imports = _JS_IMPORT_RE.findall(text)
+    for module, names, plain in _PY_IMPORT_RE.findall(text):
+        if plain:
+            imports.append(plain)
+        else:
+            imports.append(module)
+            imports.extend(f"{module}.{name.strip()}" for name in names.split(",") if name.strip())
+    return imports
+
+
+def failing_files(output: str) -> List[str]:
+    """File paths mentioned in test/traceback output, in order of appearance"""
+    found = _TRACEBACK_FILE_RE.findall(output) + _LOCATION_RE.findall(output)
+    return list(dict.fromkeys(path.replace("\\", "/") for path in found))
+
+
+class ContextBuilder:
+    """Renders existing code for a prompt within a token budget"""
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 header_format: str = "=== {filename} ==="):
+        """
+        Initialize the builder.
+
+        Args:
+            token_budget: Maximum tokens of code to include
+            header_format: Header line above each file
+        """
+        self.token_budget = token_budget
+        self.header_format = header_format
+
+    def rank_files(self,
+                   code: Dict[str, str],
+                   focus_text: str = "",
+                   failing_output: str = "",
+                   focus_files: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """
+        Rank files by relevance to the current task.
+
+        Args:
+            code: Existing filename -> content
+            focus_text: Feature description, test code or other task text
+            failing_output: Test or validation output with failure locations
+            focus_files: Files the task creates or modifies
+
+        Returns:
+            (filename, score) pairs, most relevant first
+        """
+        summaries = {name: summarize_file(name, content) for name, content in code.items()}
+        module_index: Dict[str, Set[str]] = defaultdict(set)
+        for name in code:
+            for key in _module_keys(name):
+                module_index[key].add(name)
+
+        def resolve(spec: str) -> Set[str]:
+            key = _normalize_import(spec)
+            return module_index.get(key) or module_index.get(key.replace(".", "/")) or set()
+
+        def match_paths(paths: Iterable[str]) -> Set[str]:
+            matched = set()
+            for path in paths:
+                path = path.replace("\\", "/")
+                matched.update(name for name in code
+                               if path.endswith(name.replace("\\", "/")) or name.endswith(path))
+            return matched
+
+        scores: Dict[str, float] = defaultdict(float)
+        for name in match_paths(focus_files):
+            scores[name] += FOCUS_FILE_SCORE
+        for name in match_paths(failing_files(failing_output)):
+            scores[name] += FAILING_FILE_SCORE
+
+        task_text = f"{focus_text}\n{failing_output}"
+        for spec in _text_imports(focus_text):
+            for name in resolve(spec):
+                scores[name] += IMPORTED_BY_FOCUS_SCORE
+
+        # Case-insensitive so prose ("start the server") matches code (start)
+        words = {word.lower() for word in _IDENTIFIER_RE.findall(task_text)}
+        for name, summary in summaries.items():
+            hits = sum(1 for symbol in summary.symbols if symbol.lower() in words)
+            if hits:
+                scores[name] += min(hits * SYMBOL_SCORE, MAX_SYMBOL_SCORE)
+
+        # Spread relevance to the files relevant files import
+        for _ in range(IMPORT_HOPS):
+            spread: Dict[str, float] = defaultdict(float)
+            for name, score in scores.items():
+                for spec in summaries[name].imports:
+                    for dependency in resolve(spec) - {name}:
+                        spread[dependency] = max(spread[dependency], score * IMPORT_DECAY)
+            for name, score in spread.items():
+                scores[name] = max(scores[name], score)
+
+        order = {name: i for i, name in enumerate(code)}
+        return sorted(((name, scores.get(name, 0.0)) for name in code),
+                      key=lambda item: (-item[1], order[item[0]]))
+
+    def build(self,
+              code: Dict[str, str],
+              focus_text: str = "",
+              failing_output: str = "",
+              focus_files: Iterable[str] = (),
+              token_budget: Optional[int] = None,
+              empty_message: str = "No existing code yet.") -> str:
+        """
+        Render existing code for a prompt.
+
+        Files are added in relevance order: in full while they fit the
+        budget, then as signature stubs, then only by name.
+
+        Returns:
+            Formatted code context
+        """
+        if not code:
+            return empty_message
+
+        budget = self.token_budget if token_budget is None else token_budget
+        used = 0
+        sections, listed = [], []
+        full_count = stub_count = 0
+        for name, _ in self.rank_files(code, focus_text, failing_output, focus_files):
+            summary = summarize_file(name, code[name])
+            header = self.header_format.format(filename=name)
+            if used + summary.tokens <= budget:
+                sections.append(f"{header}\n{code[name]}\n")
+                used += summary.tokens
+                full_count += 1
+            elif used + summary.stub_tokens <= budget:
+                sections.append(f"{header} (signatures only)\n{summary.stub}\n")
+                used += summary.stub_tokens
+                stub_count += 1
+            else:
+                listed.append(name)
+
+        if listed:
+            sections.append("Other existing files (not shown): " + ", ".join(listed))
+        logger.debug(f"Code context: {full_count} full, {stub_count} stubbed, {len(listed)} listed, "
+                     f"~{used}/{budget} tokens")
+        return "\n".join(sections)
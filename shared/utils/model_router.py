@@ -0,0 +1,320 @@
+"""
+Model cascade routing for agent calls.
+
+Each agent config pins a single model, and retries used to resend the same
+prompt to it. The router instead picks a model per call from a ladder of
+increasingly capable (and expensive) models:
+
+- the starting tier depends on feature complexity, and moves down to a
+  cheaper tier once that tier has proven to succeed on the route (agent and
+  complexity), or up past tiers that have proven to fail
+- every retry escalates one tier
+- outcomes and latencies are persisted per route and model, so later runs
+  start at the tier that has worked before
+
+The chosen model is passed to the agent as a "MODEL: <name>" first line of
+its input (like the executor's SESSION_ID line); agents read it with
+resolve_model and fall back to their configured model otherwise.
+"""
+import json
+import logging
+import os
+import random
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from agents.agent_configs import model_ladder
+from shared.utils.feature_parser import ComplexityLevel
+from workflows.workflow_config import MODEL_ROUTING_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+MODEL_DIRECTIVE = "MODEL:"
+
+# Starting tier per complexity before any history exists
+COMPLEXITY_START_TIER = {
+    ComplexityLevel.LOW: 0,
+    ComplexityLevel.MEDIUM: 1,
+    ComplexityLevel.HIGH: 1,
+}
+
+
+def add_model_directive(input_text: str, model: str) -> str:
+    """Prefix agent input with the model to use"""
+    return f"{MODEL_DIRECTIVE} {model}\n{input_text}"
+
+
+def requested_model(input_text: str) -> Optional[str]:
+    """The model named by a MODEL directive at the start of agent input"""
+    if not input_text.startswith(MODEL_DIRECTIVE):
+        return None
+    return input_text.partition("\n")[0][len(MODEL_DIRECTIVE):].strip() or None
+
+
+def resolve_model(input: List[Any], default: str) -> str:
+    """
+    Get the model requested for an agent call.
+
+    Looks for a MODEL directive on the first line of the message parts and
+    strips it from the part so it doesn't reach the prompt. Models that are
+    not on the ladder are ignored.
+
+    Args:
+        input: ACP messages received by the agent
+        default: The agent's configured model
+    """
+    for message in input:
+        for part in getattr(message, "parts", []):
+            content = getattr(part, "content", None)
+            if not content or not content.startswith(MODEL_DIRECTIVE):
+                continue
+            first_line, _, rest = content.partition("\n")
+            model = first_line[len(MODEL_DIRECTIVE):].strip()
+            part.content = rest
+            if model in model_ladder:
+                return model
+            logger.warning(f"Ignoring unknown model {model!r}, using {default}")
+            return default
+    return default
+
+
+@dataclass
+class RouteDecision:
+    """Model chosen for one agent call"""
+    agent: str
+    route: str
+    model: str
+    tier: int
+    start_tier: int
+    reason: str
+
+
+@dataclass
+class RouteStats:
+    """Outcomes of one model on one route"""
+    calls: float = 0.0
+    successes: float = 0.0
+    total_latency: float = 0.0
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.calls if self.calls else 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.calls if self.calls else 0.0
+
+
+class ModelRouter:
+    """Picks a model per call from the ladder and learns from outcomes"""
+
+    def __init__(self,
+                 ladder: Optional[List[str]] = None,
+                 stats_path: Optional[Union[str, Path]] = None,
+                 min_samples: int = 3,
+                 success_threshold: float = 0.7,
+                 explore_rate: float = 0.1,
+                 max_samples: int = 50,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize the router.
+
+        Args:
+            ladder: Models from cheapest to strongest
+            stats_path: JSON file the route statistics are persisted to
+            min_samples: Calls before a tier's success rate is trusted
+            success_threshold: Success rate at which a tier counts as good enough
+            explore_rate: Chance of trying one tier cheaper on a first attempt
+            max_samples: Samples per route and model before older ones are decayed
+        """
+        self.ladder = list(ladder or model_ladder)
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.min_samples = min_samples
+        self.success_threshold = success_threshold
+        self.explore_rate = explore_rate
+        self.max_samples = max_samples
+        self._rng = rng or random.Random()
+        self._stats: Dict[str, Dict[str, RouteStats]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        if self.stats_path and self.stats_path.exists():
+            self._load()
+
+    @property
+    def top_tier(self) -> int:
+        return len(self.ladder) - 1
+
+    def select(self,
+               agent: str,
+               complexity: Union[ComplexityLevel, str, None] = None,
+               retry_count: int = 0) -> RouteDecision:
+        """
+        Choose the model for a call.
+
+        Args:
+            agent: Agent being called
+            complexity: Complexity of the feature being worked on
+            retry_count: Failed attempts so far (each escalates one tier)
+        """
+        complexity = self._complexity(complexity)
+        route = f"{agent}:{complexity.value}"
+
+        with self._lock:
+            start = min(COMPLEXITY_START_TIER[complexity], self.top_tier)
+            reason = f"{complexity.value} complexity"
+
+            # Drop to the cheapest tier that has proven itself on this route
+            for tier in range(start):
+                if self._proven(route, tier):
+                    start = tier
+                    reason = f"{self.ladder[tier]} succeeds on this route"
+                    break
+            # Skip tiers that have proven to fail
+            while start < self.top_tier and self._failing(route, start):
+                reason = f"{self.ladder[start]} fails on this route"
+                start += 1
+            # Occasionally try one tier cheaper so lower tiers keep getting data
+            if retry_count == 0 and start > 0 and self._rng.random() < self.explore_rate:
+                start -= 1
+                reason = f"exploring {self.ladder[start]}"
+
+        tier = min(start + retry_count, self.top_tier)
+        if retry_count and tier > start:
+            reason = f"escalated after {retry_count} failure(s)"
+
+        return RouteDecision(
+            agent=agent,
+            route=route,
+            model=self.ladder[tier],
+            tier=tier,
+            start_tier=start,
+            reason=reason
+        )
+
+    def record(self, decision: RouteDecision, success: bool, latency: float):
+        """
+        Record the outcome of a routed call.
+
+        Args:
+            decision: The route the call used
+            success: Whether the attempt passed validation
+            latency: Seconds the attempt took (generation and validation)
+        """
+        with self._lock:
+            stats = self._stats.setdefault(decision.route, {}).setdefault(decision.model, RouteStats())
+            if stats.calls >= self.max_samples:
+                # Halve old samples so the router adapts to model changes
+                stats.calls /= 2
+                stats.successes /= 2
+                stats.total_latency /= 2
+            stats.calls += 1
+            stats.successes += 1 if success else 0
+            stats.total_latency += latency
+            self._dirty = True
+
+    def record_candidates(self, decision: RouteDecision, candidates: List[Any]):
+        """
+        Record the candidates of a speculative round that used the route.
+
+        Every candidate that was generated and validated is one call of the
+        model, so each gets its own outcome; candidates that failed before
+        validation or were cancelled are left out.
+
+        Args:
+            decision: The route all candidates used
+            candidates: Finished speculation.Candidate objects
+        """
+        for candidate in candidates:
+            if candidate.result is not None:
+                self.record(decision, candidate.success, candidate.duration)
+
+    def get_stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Calls, success rate and average latency per route and model"""
+        with self._lock:
+            return {
+                route: {
+                    model: {
+                        "calls": round(stats.calls, 1),
+                        "success_rate": round(stats.success_rate, 3),
+                        "avg_latency": round(stats.avg_latency, 2)
+                    }
+                    for model, stats in models.items()
+                }
+                for route, models in self._stats.items()
+            }
+
+    def save(self):
+        """Persist route statistics atomically if they changed"""
+        if not self.stats_path or not self._dirty:
+            return
+
+        try:
+            self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                data = {
+                    "version": 1,
+                    "routes": {
+                        route: {model: asdict(stats) for model, stats in models.items()}
+                        for route, models in self._stats.items()
+                    }
+                }
+                self._dirty = False
+            tmp_path = self.stats_path.with_suffix(self.stats_path.suffix + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.stats_path)
+        except Exception as e:
+            logger.error(f"Failed to save model route statistics: {e}")
+
+    def _load(self):
+        try:
+            with open(self.stats_path, 'r') as f:
+                data = json.load(f)
+            for route, models in data.get("routes", {}).items():
+                self._stats[route] = {model: RouteStats(**stats) for model, stats in models.items()}
+        except Exception as e:
+            logger.error(f"Failed to load model route statistics: {e}")
+
+    def _tier_stats(self, route: str, tier: int) -> Optional[RouteStats]:
+        stats = self._stats.get(route, {}).get(self.ladder[tier])
+        return stats if stats and stats.calls >= self.min_samples else None
+
+    def _proven(self, route: str, tier: int) -> bool:
+        stats = self._tier_stats(route, tier)
+        return bool(stats) and stats.success_rate >= self.success_threshold
+
+    def _failing(self, route: str, tier: int) -> bool:
+        stats = self._tier_stats(route, tier)
+        return bool(stats) and stats.success_rate < self.success_threshold
+
+    @staticmethod
+    def _complexity(complexity: Union[ComplexityLevel, str, None]) -> ComplexityLevel:
+        if isinstance(complexity, ComplexityLevel):
+            return complexity
+        try:
+            return ComplexityLevel(str(complexity).lower())
+        except ValueError:
+            return ComplexityLevel.MEDIUM
+
+
+# Global instance with lazy initialization
+_model_router = None
+
+
+def get_model_router() -> ModelRouter:
+    """Get the global model router configured from MODEL_ROUTING_CONFIG"""
+    global _model_router
+    if _model_router is None:
+        stats_path = MODEL_ROUTING_CONFIG["stats_path"] or \
+            Path.home() / ".cache" / "agent_blackwell" / "model_routes.json"
+        _model_router = ModelRouter(
+            stats_path=stats_path,
+            min_samples=MODEL_ROUTING_CONFIG["min_samples"],
+            success_threshold=MODEL_ROUTING_CONFIG["success_threshold"],
+            explore_rate=MODEL_ROUTING_CONFIG["explore_rate"]
+        )
+    return _model_router
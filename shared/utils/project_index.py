@@ -0,0 +1,322 @@
+"""
+Project index shared by the project analyzers.
+
+Walks a generated project once and keeps, per file, its size, mtime, content
+hash and (for source files) decoded text. The configuration, environment,
+deployment and build analyzers query the index instead of each running
+their own rglob, re-reading package.json/requirements.txt and re-running
+their regexes over every file.
+
+Refreshing re-stats the tree and only re-reads files whose size or mtime
+changed, so re-analysis after a feature touches just the changed files.
+"""
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Directories that hold dependencies, build output or tool state, not project code
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    "node_modules", ".git", "__pycache__", ".venv", "venv",
+    ".pytest_cache", ".mypy_cache", ".cache", ".next", ".angular",
+    "dist", "build", "coverage", "htmlcov", ".nyc_output", ".tox", ".turbo"
+})
+
+# Files larger than this are hashed but their text is not kept in memory
+MAX_TEXT_SIZE = 1024 * 1024
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Project indexes kept by get_project_index, least recently used dropped first
+MAX_INDEXES = 16
+
+# First capturing "(" of a pattern: not escaped and not starting a (?...) group
+_CAPTURE_GROUP = re.compile(r'(?<!\\)\((?!\?)')
+
+
+def _combine_patterns(patterns: Iterable[str]) -> re.Pattern:
+    """
+    One alternation of single-group patterns, each group named p<index>.
+
+    A pattern without a capture group captures its whole match.
+    """
+    alternatives = []
+    for index, pattern in enumerate(patterns):
+        name = f"(?P<p{index}>"
+        if re.compile(pattern).groups:
+            alternatives.append(_CAPTURE_GROUP.sub(name, pattern, count=1))
+        else:
+            alternatives.append(f"{name}{pattern})")
+    return re.compile("|".join(alternatives))
+
+
+@dataclass
+class IndexedFile:
+    """A file in the project index."""
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    text: Optional[str] = None
+    # Memoized pattern scan results, keyed by pattern tuple
+    matches: Dict[Tuple[str, ...], Set[str]] = field(default_factory=dict, repr=False)
+    parsed_json: Any = field(default=None, repr=False)
+    json_parsed: bool = field(default=False, repr=False)
+
+
+class ProjectIndex:
+    """
+    Single-pass index of a project tree.
+
+    Paths are relative to the project root and use the platform separator,
+    matching what ``Path.relative_to`` returns.
+    """
+
+    def __init__(self,
+                 root: Path,
+                 exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+                 max_text_size: int = MAX_TEXT_SIZE):
+        """
+        Initialize and build the index.
+
+        Args:
+            root: Project root directory
+            exclude_dirs: Directory names that are not descended into
+            max_text_size: Largest file whose text is kept for scanning
+        """
+        self.root = Path(root)
+        self.exclude_dirs = frozenset(exclude_dirs)
+        self.max_text_size = max_text_size
+        self.files: Dict[str, IndexedFile] = {}
+        self.directories: Set[str] = set()
+        self.files_read = 0
+        self._lock = threading.RLock()
+        self.refresh()
+
+    def refresh(self) -> Set[str]:
+        """
+        Bring the index up to date with the file system.
+
+        Returns:
+            Relative paths of files that were added, changed or removed
+        """
+        with self._lock:
+            changed: Set[str] = set()
+            seen: Set[str] = set()
+            directories: Set[str] = set()
+
+            for rel_path, entry_stat in self._walk(directories):
+                seen.add(rel_path)
+                current = self.files.get(rel_path)
+                if (current and current.size == entry_stat.st_size
+                        and current.mtime_ns == entry_stat.st_mtime_ns):
+                    continue
+
+                indexed = self._read(rel_path, entry_stat)
+                if indexed is None:
+                    continue
+                if current and current.content_hash == indexed.content_hash:
+                    # Touched but unchanged: keep memoized results
+                    current.mtime_ns = indexed.mtime_ns
+                    continue
+                self.files[rel_path] = indexed
+                changed.add(rel_path)
+
+            for rel_path in set(self.files) - seen:
+                del self.files[rel_path]
+                changed.add(rel_path)
+
+            self.directories = directories
+            if changed:
+                logger.debug(f"Project index {self.root}: {len(changed)} file(s) changed")
+            return changed
+
+    def _walk(self, directories: Set[str]):
+        """Yield (relative path, stat) for every file under root, using os.scandir."""
+        if not self.root.is_dir():
+            return
+        stack = [str(self.root)]
+        root = str(self.root)
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as scanner:
+                    entries = list(scanner)
+            except OSError as e:
+                logger.warning(f"Failed to scan {directory}: {e}")
+                continue
+            for entry in entries:
+                rel_path = os.path.relpath(entry.path, root)
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in self.exclude_dirs:
+                            directories.add(rel_path)
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield rel_path, entry.stat()
+                except OSError:
+                    continue
+
+    def _read(self, rel_path: str, entry_stat: os.stat_result) -> Optional[IndexedFile]:
+        """
+        Hash and (if small and textual) decode a file.
+
+        The file is hashed in chunks; only files up to max_text_size are
+        held in memory as a whole.
+        """
+        digest = hashlib.sha1()
+        keep = entry_stat.st_size <= self.max_text_size
+        chunks = []
+        try:
+            with open(self.root / rel_path, "rb") as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    if keep:
+                        chunks.append(chunk)
+        except OSError as e:
+            logger.warning(f"Failed to read {rel_path}: {e}")
+            return None
+        self.files_read += 1
+
+        text = None
+        data = b"".join(chunks)
+        # The file may have grown since it was stat'ed
+        if keep and len(data) <= self.max_text_size:
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+
+        return IndexedFile(
+            path=rel_path,
+            size=entry_stat.st_size,
+            mtime_ns=entry_stat.st_mtime_ns,
+            content_hash=digest.hexdigest(),
+            text=text
+        )
+
+    def exists(self, rel_path: str) -> bool:
+        """Whether a file is in the index."""
+        return os.path.normpath(rel_path) in self.files
+
+    def read_text(self, rel_path: str) -> Optional[str]:
+        """Text of a file, or None if it is missing, binary or too large."""
+        indexed = self.files.get(os.path.normpath(rel_path))
+        return indexed.text if indexed else None
+
+    def read_json(self, rel_path: str) -> Optional[Any]:
+        """Parsed JSON content of a file (cached until it changes), or None."""
+        indexed = self.files.get(os.path.normpath(rel_path))
+        if not indexed or indexed.text is None:
+            return None
+        if not indexed.json_parsed:
+            try:
+                indexed.parsed_json = json.loads(indexed.text)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Failed to parse {rel_path}: {e}")
+                indexed.parsed_json = None
+            indexed.json_parsed = True
+        return indexed.parsed_json
+
+    def package_dependencies(self, rel_dir: str = "") -> Dict[str, str]:
+        """Merged dependencies and devDependencies of a package.json."""
+        package = self.read_json(os.path.join(rel_dir, "package.json"))
+        if not isinstance(package, dict):
+            return {}
+        return {**package.get("dependencies", {}), **package.get("devDependencies", {})}
+
+    def glob(self, rel_dir: str, pattern: str) -> List[str]:
+        """Files directly inside rel_dir whose name matches a glob pattern."""
+        rel_dir = os.path.normpath(rel_dir) if rel_dir else "."
+        return sorted(
+            rel_path for rel_path in self.files
+            if os.path.dirname(rel_path) == ("" if rel_dir == "." else rel_dir)
+            and fnmatch.fnmatch(os.path.basename(rel_path), pattern)
+        )
+
+    def iter_files(self, extensions: Optional[Iterable[str]] = None) -> List[IndexedFile]:
+        """Indexed files, optionally filtered by suffix."""
+        if extensions is None:
+            return list(self.files.values())
+        extensions = set(extensions)
+        return [f for f in self.files.values() if os.path.splitext(f.path)[1] in extensions]
+
+    def find_matches(self,
+                     patterns: Iterable[str],
+                     extensions: Optional[Iterable[str]] = None) -> Dict[str, Set[str]]:
+        """
+        Run a set of single-group regexes over the indexed source files.
+
+        All patterns are combined into one alternation with a named group
+        per pattern, so each file is scanned in a single pass and every
+        match is attributed to its pattern through ``lastgroup``. Where
+        matches of two patterns overlap, the earlier pattern's is kept.
+        Results are memoized per file and pattern set until the file changes.
+
+        Args:
+            patterns: Regexes with one capture group each
+            extensions: File suffixes to scan (all text files if None)
+
+        Returns:
+            Mapping of relative path to the captured values found in it
+        """
+        key = tuple(patterns)
+        compiled = None
+        results: Dict[str, Set[str]] = {}
+
+        with self._lock:
+            for indexed in self.iter_files(extensions):
+                if indexed.text is None:
+                    continue
+                if key not in indexed.matches:
+                    if compiled is None:
+                        compiled = _combine_patterns(key)
+                    indexed.matches[key] = {
+                        match.group(match.lastgroup) for match in compiled.finditer(indexed.text)
+                    }
+                if indexed.matches[key]:
+                    results[indexed.path] = indexed.matches[key]
+
+        return results
+
+
+# Indexes per project root, in least recently used order
+_indexes: "OrderedDict[str, ProjectIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_project_index(root: Path, refresh: bool = True) -> ProjectIndex:
+    """
+    Get the shared index for a project root.
+
+    Args:
+        root: Project root directory
+        refresh: Re-stat the tree so changes since the last call are picked up
+
+    Returns:
+        The ProjectIndex for this root
+    """
+    key = str(Path(root).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ProjectIndex(Path(root))
+            while len(_indexes) > MAX_INDEXES:
+                _indexes.popitem(last=False)
+            return index
+        _indexes.move_to_end(key)
+
+    if refresh:
+        index.refresh()
+    return index
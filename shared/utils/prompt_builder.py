@@ -0,0 +1,166 @@
+"""
+Prompt assembly with a stable prefix and a volatile suffix.
+
+Providers cache prompts by exact prefix (OpenAI from 1024 tokens, in
+128-token increments), so content that stays the same across calls to an
+agent (instructions, output format, requirements, design) has to come
+first and content that changes per call (feature, code under review, retry
+count, feedback) last. PromptBuilder makes that split explicit, and
+PromptCacheTracker measures how much of each agent's prompts is a prefix
+already sent before, i.e. what the provider can serve from its cache.
+Workflows run inside prompt_cache_scope, so each workflow's statistics
+start empty and concurrent workflows don't count each other's prompts.
+"""
+import contextvars
+import logging
+import os
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from shared.utils.context_builder import estimate_tokens
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Provider prompt caching granularity
+MIN_CACHEABLE_TOKENS = 1024
+CACHE_BLOCK_TOKENS = 128
+
+
+class PromptBuilder:
+    """
+    Builds a prompt from stable sections followed by volatile sections.
+
+    Usage:
+        prompt = (PromptBuilder()
+                  .stable(INSTRUCTIONS, f"REQUIREMENTS:\\n{requirements}")
+                  .volatile(f"FEATURE: {feature}", f"Retry attempt {retry}")
+                  .build())
+    """
+
+    def __init__(self, separator: str = "\n\n"):
+        self.separator = separator
+        self._stable: List[str] = []
+        self._volatile: List[str] = []
+
+    def stable(self, *sections: str) -> "PromptBuilder":
+        """Add sections that are identical across calls to the agent"""
+        self._stable.extend(s for s in sections if s)
+        return self
+
+    def volatile(self, *sections: str) -> "PromptBuilder":
+        """Add sections that change between calls"""
+        self._volatile.extend(s for s in sections if s)
+        return self
+
+    @property
+    def prefix(self) -> str:
+        """The stable part of the prompt"""
+        return self.separator.join(self._stable)
+
+    def build(self) -> str:
+        """The full prompt, stable sections first"""
+        return self.separator.join(self._stable + self._volatile)
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    return len(os.path.commonprefix([a, b]))
+
+
+def cacheable_tokens(prefix_tokens: int) -> int:
+    """Tokens a provider can serve from cache for a reused prefix"""
+    if prefix_tokens < MIN_CACHEABLE_TOKENS:
+        return 0
+    return prefix_tokens - prefix_tokens % CACHE_BLOCK_TOKENS
+
+
+class PromptCacheTracker:
+    """Measures prompt prefix reuse per agent"""
+
+    def __init__(self, history: int = 8):
+        """
+        Initialize the tracker.
+
+        Args:
+            history: Recent prompts per agent to compare against
+        """
+        self.history = history
+        self._recent: Dict[str, Deque[str]] = defaultdict(lambda: deque(maxlen=self.history))
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "prompt_tokens": 0, "reused_prefix_tokens": 0, "cache_hit_tokens": 0}
+        )
+        self._lock = threading.Lock()
+
+    def record(self, agent: str, prompt: str) -> int:
+        """
+        Record a prompt sent to an agent.
+
+        Returns:
+            Estimated cache-hit tokens for this prompt
+        """
+        with self._lock:
+            recent = self._recent[agent]
+            reused_chars = max((_common_prefix_length(prompt, previous) for previous in recent), default=0)
+            recent.append(prompt)
+
+            reused = estimate_tokens(prompt[:reused_chars]) if reused_chars else 0
+            hit = cacheable_tokens(reused)
+            stats = self._stats[agent]
+            stats["calls"] += 1
+            stats["prompt_tokens"] += estimate_tokens(prompt)
+            stats["reused_prefix_tokens"] += reused
+            stats["cache_hit_tokens"] += hit
+        return hit
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-agent and total prefix reuse"""
+        with self._lock:
+            agents = {agent: dict(stats) for agent, stats in self._stats.items()}
+        totals = {"calls": 0, "prompt_tokens": 0, "reused_prefix_tokens": 0, "cache_hit_tokens": 0}
+        for stats in agents.values():
+            for key in totals:
+                totals[key] += stats[key]
+        for stats in list(agents.values()) + [totals]:
+            prompt_tokens = max(stats["prompt_tokens"], 1)
+            stats["prefix_reuse_ratio"] = round(stats["reused_prefix_tokens"] / prompt_tokens, 3)
+            stats["cache_hit_ratio"] = round(stats["cache_hit_tokens"] / prompt_tokens, 3)
+        return {"agents": agents, "total": totals}
+
+    def reset(self):
+        """Forget recorded prompts and stats"""
+        with self._lock:
+            self._recent.clear()
+            self._stats.clear()
+
+
+# Global instance with lazy initialization
+_prompt_cache_tracker = None
+
+# Tracker of the workflow running in the current context
+_scoped_tracker: contextvars.ContextVar[Optional[PromptCacheTracker]] = contextvars.ContextVar(
+    "prompt_cache_tracker", default=None
+)
+
+
+def get_prompt_cache_tracker() -> PromptCacheTracker:
+    """Get the prompt cache tracker of the current workflow (the global one outside workflows)"""
+    tracker = _scoped_tracker.get()
+    if tracker is not None:
+        return tracker
+    global _prompt_cache_tracker
+    if _prompt_cache_tracker is None:
+        _prompt_cache_tracker = PromptCacheTracker()
+    return _prompt_cache_tracker
+
+
+@contextmanager
+def prompt_cache_scope() -> Iterator[PromptCacheTracker]:
+    """Track the prompts sent inside the block with a fresh tracker"""
+    tracker = PromptCacheTracker()
+    token = _scoped_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _scoped_tracker.reset(token)
@@ -0,0 +1,344 @@
+"""
+Adaptive concurrency and rate limiting for LLM provider calls.
+
+Every agent model call goes through the limiter of its provider (the part of
+the model name before the colon, e.g. "openai"):
+
+- token buckets cap requests and tokens per minute
+- the number of calls in flight adapts with AIMD: it grows by one per
+  window of successful calls and is cut multiplicatively on 429s, 5xx
+  errors and latency above the target
+- waiting calls are served by priority, so interactive API sessions go
+  ahead of batch regression runs
+
+Callers mark their priority with call_priority(); run_team_member passes it
+to the agent server as a "PRIORITY: <name>" first line of the input, which
+agents read with resolve_priority.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+from shared.utils.context_builder import estimate_tokens
+from workflows.workflow_config import LLM_RATE_LIMIT_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+PRIORITY_DIRECTIVE = "PRIORITY:"
+
+
+class Priority(IntEnum):
+    """Scheduling class of a model call (lower is served first)"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BATCH = 2
+
+
+_call_priority = contextvars.ContextVar("call_priority", default=Priority.NORMAL)
+
+
+def get_call_priority() -> Priority:
+    """Priority of agent calls made from the current context"""
+    return _call_priority.get()
+
+
+def set_call_priority(priority: Priority) -> contextvars.Token:
+    """Set the priority of agent calls made from the current context"""
+    return _call_priority.set(priority)
+
+
+@contextmanager
+def call_priority(priority: Priority):
+    """Run agent calls inside the block with the given priority"""
+    token = _call_priority.set(priority)
+    try:
+        yield
+    finally:
+        _call_priority.reset(token)
+
+
+def add_priority_directive(input_text: str, priority: Priority) -> str:
+    """Prefix agent input with the call priority"""
+    return f"{PRIORITY_DIRECTIVE} {priority.name.lower()}\n{input_text}"
+
+
+def resolve_priority(input: List[Any]) -> Priority:
+    """
+    Get the priority requested for an agent call.
+
+    Looks for a PRIORITY directive on the first line of the message parts
+    and strips it from the part so it doesn't reach the prompt.
+    """
+    for message in input:
+        for part in getattr(message, "parts", []):
+            content = getattr(part, "content", None)
+            if not content or not content.startswith(PRIORITY_DIRECTIVE):
+                continue
+            first_line, _, rest = content.partition("\n")
+            part.content = rest
+            name = first_line[len(PRIORITY_DIRECTIVE):].strip().upper()
+            return Priority.__members__.get(name, Priority.NORMAL)
+    return Priority.NORMAL
+
+
+_STATUS_PATTERN = re.compile(r"\b(429|5\d\d)\b")
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """Classify a provider error as "rate_limit", "server_error" or None"""
+    status = getattr(error, "status_code", None) or getattr(error, "status", None)
+    text = str(error).lower()
+    if status is None:
+        match = _STATUS_PATTERN.search(text)
+        status = int(match.group(1)) if match else None
+    if status == 429 or "rate limit" in text or "too many requests" in text:
+        return "rate_limit"
+    if (isinstance(status, int) and 500 <= status < 600) or "overloaded" in text:
+        return "server_error"
+    return None
+
+
+class TokenBucket:
+    """Refills continuously at a per-minute rate up to one minute of capacity"""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (requests larger than capacity wait for a full bucket)"""
+        self._refill()
+        needed = min(amount, self.capacity) - self.level
+        return max(0.0, needed / self.rate)
+
+    def consume(self, amount: float):
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def drain(self):
+        """Empty the bucket (after the provider reports a rate limit)"""
+        self._refill()
+        self.level = min(self.level, 0.0)
+
+
+class ProviderLimiter:
+    """Rate limits and adaptive concurrency for one provider"""
+
+    def __init__(self,
+                 provider: str,
+                 requests_per_minute: float = 500,
+                 tokens_per_minute: float = 200000,
+                 initial_concurrency: int = 4,
+                 min_concurrency: int = 1,
+                 max_concurrency: int = 32,
+                 latency_target: float = 60.0,
+                 decrease_factor: float = 0.5):
+        """
+        Initialize the limiter.
+
+        Args:
+            provider: Provider name for logs and metrics
+            requests_per_minute: Request rate limit
+            tokens_per_minute: Prompt plus completion token rate limit
+            initial_concurrency: Calls in flight to start with
+            min_concurrency: Lower bound of the adaptive limit
+            max_concurrency: Upper bound of the adaptive limit
+            latency_target: Seconds per call above which concurrency is reduced
+            decrease_factor: Multiplier applied to the limit on 429s and 5xx errors
+        """
+        self.provider = provider
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.limit = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self._waiters: List = []  # heap of (priority, seq, tokens, future)
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {
+            "calls": 0, "rate_limited": 0, "server_errors": 0, "slow_calls": 0,
+            "max_queue_depth": 0, "queue_wait": {p.name.lower(): [] for p in Priority}
+        }
+
+    @property
+    def concurrency(self) -> int:
+        """Calls currently allowed in flight"""
+        return max(self.min_concurrency, int(self.limit))
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.NORMAL) -> float:
+        """
+        Wait for a slot. Returns the seconds spent waiting.
+
+        Args:
+            tokens: Estimated prompt plus completion tokens of the call
+            priority: Scheduling class of the call
+        """
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        future = loop.create_future()
+        with self._lock:
+            heapq.heappush(self._waiters, (int(priority), next(self._seq), tokens, future))
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], len(self._waiters))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if future.done() and not future.cancelled():
+                    # Granted just before cancellation: give the slot back
+                    self.in_flight -= 1
+                else:
+                    self._waiters = [w for w in self._waiters if w[3] is not future]
+                    heapq.heapify(self._waiters)
+            self._dispatch()
+            raise
+
+        waited = time.monotonic() - start
+        with self._lock:
+            samples = self._metrics["queue_wait"][priority.name.lower()]
+            samples.append(waited)
+            del samples[:-500]
+        return waited
+
+    def release(self, latency: float, error: Optional[str] = None):
+        """
+        Free a slot and adapt the concurrency limit.
+
+        Args:
+            latency: Seconds the call took
+            error: classify_error result for failed calls
+        """
+        with self._lock:
+            self.in_flight -= 1
+            self._metrics["calls"] += 1
+            if error == "rate_limit":
+                self._metrics["rate_limited"] += 1
+                self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+                self.requests.drain()
+                logger.warning(f"{self.provider} rate limited the agents, concurrency cut to {self.concurrency}")
+            elif error == "server_error":
+                self._metrics["server_errors"] += 1
+                self.limit = max(self.min_concurrency, self.limit * self.decrease_factor)
+            elif latency > self.latency_target:
+                self._metrics["slow_calls"] += 1
+                self.limit = max(self.min_concurrency, self.limit * 0.9)
+            else:
+                # Additive increase: one more slot per window of successful calls
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, tokens: int, priority: Priority = Priority.NORMAL):
+        """Hold a slot for the duration of a model call"""
+        await self.acquire(tokens, priority)
+        start = time.monotonic()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = classify_error(e)
+            raise
+        finally:
+            self.release(time.monotonic() - start, error)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Limit, queue and queue-wait statistics"""
+        with self._lock:
+            waits = {name: list(samples) for name, samples in self._metrics["queue_wait"].items()}
+            metrics = {key: value for key, value in self._metrics.items() if key != "queue_wait"}
+            metrics.update({
+                "concurrency_limit": round(self.limit, 2),
+                "in_flight": self.in_flight,
+                "queued": len(self._waiters)
+            })
+        metrics["queue_wait"] = {
+            name: {
+                "count": len(samples),
+                "avg": round(sum(samples) / len(samples), 3) if samples else 0.0,
+                "max": round(max(samples), 3) if samples else 0.0
+            }
+            for name, samples in waits.items()
+        }
+        return metrics
+
+    def _dispatch(self):
+        """Grant slots to waiters in priority order while limits allow"""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            while self._waiters and self.in_flight < self.concurrency:
+                priority, seq, tokens, future = self._waiters[0]
+                if future.done():
+                    heapq.heappop(self._waiters)
+                    continue
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait > 0:
+                    # Retry when the buckets have refilled enough for the head of the queue
+                    self._timer = future.get_loop().call_later(wait, self._dispatch)
+                    return
+                heapq.heappop(self._waiters)
+                self.requests.consume(1)
+                self.tokens.consume(tokens)
+                self.in_flight += 1
+                future.set_result(None)
+
+
+# Limiters per provider, created on first use
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: str) -> ProviderLimiter:
+    """Get the limiter for the provider of a model name like "openai:gpt-4o-mini" """
+    provider = model.split(":", 1)[0] if ":" in model else "default"
+    with _limiters_lock:
+        if provider not in _limiters:
+            settings = {**LLM_RATE_LIMIT_CONFIG["default"], **LLM_RATE_LIMIT_CONFIG["providers"].get(provider, {})}
+            _limiters[provider] = ProviderLimiter(provider, **settings)
+        return _limiters[provider]
+
+
+def get_rate_limit_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics of every provider limiter"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.get_metrics() for provider, limiter in limiters.items()}
+
+
+@asynccontextmanager
+async def llm_call_slot(model: str, prompt: str, priority: Priority = Priority.NORMAL):
+    """
+    Hold a provider slot around an agent's model call.
+
+    Usage:
+        async with llm_call_slot(coder_config["model"], prompt, priority):
+            response = await agent.run(prompt=prompt)
+    """
+    if not LLM_RATE_LIMIT_CONFIG["enabled"]:
+        yield
+        return
+    tokens = estimate_tokens(prompt) + LLM_RATE_LIMIT_CONFIG["completion_tokens_estimate"]
+    async with get_rate_limiter(model).slot(tokens, priority):
+        yield
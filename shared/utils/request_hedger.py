@@ -0,0 +1,191 @@
+"""
+Request hedging for agent calls.
+
+LLM-backed agent calls have a long latency tail, and one slow call holds up
+the whole feature it belongs to. With hedging, a call that has not
+returned by the historical p90 latency of its agent and model gets a
+duplicate request (to another replica when one is configured); whichever
+finishes first is used and the other is cancelled.
+
+Hedges are limited by a per-agent budget (the fraction of calls that may be
+duplicated), and only agents without side effects should be hedged.
+
+The report compares the tail latency of calls made with a hedge armed
+against calls made without one (before enough samples exist, or once the
+budget is spent), which are plain samples of the unhedged latency.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+
+from workflows.workflow_config import REQUEST_HEDGING_CONFIG
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile of values with linear interpolation"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (pct / 100) * (len(ordered) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class RequestHedger:
+    """Fires a duplicate request when a call runs past its p90 latency"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the hedger.
+
+        Args:
+            config: Settings in the shape of REQUEST_HEDGING_CONFIG
+        """
+        self.config = {**REQUEST_HEDGING_CONFIG, **(config or {})}
+        window = self.config["window"]
+        # Latency samples per agent/model key: primary request latencies for
+        # the hedge delay (a primary cancelled after losing counts with the
+        # time it had run), and call latencies without and with a hedge armed
+        self._primary: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._unhedged: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._hedged: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._counts: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"calls": 0, "hedged": 0, "hedge_wins": 0}
+        )
+        self._lock = threading.Lock()
+
+    def agent_settings(self, agent: str) -> Dict[str, Any]:
+        """Hedging settings for an agent (defaults merged with its overrides)"""
+        overrides = self.config["agents"].get(agent)
+        if overrides is None:
+            return {"enabled": False}
+        return {
+            "enabled": self.config["enabled"],
+            "percentile": self.config["percentile"],
+            "budget": self.config["budget"],
+            "replicas": [],
+            **overrides
+        }
+
+    def hedge_delay(self, agent: str, key: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None if the call shouldn't be hedged"""
+        settings = self.agent_settings(agent)
+        if not settings["enabled"]:
+            return None
+        with self._lock:
+            samples = list(self._primary[key])
+            counts = self._counts[key]
+            if len(samples) < self.config["min_samples"]:
+                return None
+            if counts["hedged"] >= settings["budget"] * max(counts["calls"], 1):
+                return None
+        return percentile(samples, settings["percentile"])
+
+    async def run(self, agent: str, key: str, request: Callable[[int], Awaitable[T]]) -> T:
+        """
+        Run a request, hedging it if it runs past the p90 latency.
+
+        Args:
+            agent: Agent being called (selects the hedging settings)
+            key: Latency key, usually "<agent>/<model>"
+            request: Coroutine function taking the attempt number
+                (0 = primary, 1 = hedge) and performing the call
+
+        Returns:
+            The result of whichever request finished first
+        """
+        delay = self.hedge_delay(agent, key)
+        start = time.perf_counter()
+        primary = asyncio.ensure_future(request(0))
+
+        if delay is None:
+            try:
+                return await primary
+            finally:
+                self._record(key, time.perf_counter() - start, armed=False, hedged=False, hedge_won=False)
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            self._record(key, time.perf_counter() - start, armed=True, hedged=False, hedge_won=False)
+            return primary.result()
+
+        logger.info(f"Hedging {agent} call after {delay:.1f}s")
+        hedge = asyncio.ensure_future(request(1))
+        pending = {primary, hedge}
+        winner = None
+        error: Optional[BaseException] = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        self._record(key, time.perf_counter() - start, armed=True, hedged=True, hedge_won=winner is hedge)
+        if winner is None:
+            raise error
+        return winner.result()
+
+    def get_report(self) -> Dict[str, Any]:
+        """Per agent/model hedge counts and tail latency with and without hedging"""
+        with self._lock:
+            keys = list(self._counts)
+            report = {}
+            for key in keys:
+                unhedged = list(self._unhedged[key])
+                hedged = list(self._hedged[key])
+                observed = unhedged + hedged
+                p99_before = percentile(unhedged, 99)
+                p99_after = percentile(hedged, 99)
+                report[key] = {
+                    **self._counts[key],
+                    "p50": round(percentile(observed, 50), 2),
+                    "p90": round(percentile(observed, 90), 2),
+                    "p99_unhedged": round(p99_before, 2),
+                    "p99_hedged": round(p99_after, 2),
+                    "p99_improvement": round(1 - p99_after / p99_before, 3) if p99_before and hedged else None
+                }
+        return report
+
+    def reset(self):
+        """Forget latency samples and counts"""
+        with self._lock:
+            self._primary.clear()
+            self._unhedged.clear()
+            self._hedged.clear()
+            self._counts.clear()
+
+    def _record(self, key: str, latency: float, armed: bool, hedged: bool, hedge_won: bool):
+        with self._lock:
+            counts = self._counts[key]
+            counts["calls"] += 1
+            counts["hedged"] += 1 if hedged else 0
+            counts["hedge_wins"] += 1 if hedge_won else 0
+            self._primary[key].append(latency)
+            (self._hedged if armed else self._unhedged)[key].append(latency)
+
+
+# Global instance with lazy initialization
+_request_hedger = None
+
+
+def get_request_hedger() -> RequestHedger:
+    """Get the global request hedger"""
+    global _request_hedger
+    if _request_hedger is None:
+        _request_hedger = RequestHedger()
+    return _request_hedger
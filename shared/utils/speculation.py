@@ -0,0 +1,215 @@
+"""
+Speculative candidate generation for feature retries.
+
+Instead of the serial retry loop (call coder, validate, analyze the error,
+call coder again), a speculative round asks for several candidate
+implementations at once, each with a different approach, validates them
+concurrently and keeps the first one that passes. The remaining candidates
+are cancelled as soon as a winner is known.
+
+SpeculationMetrics records time-to-green per feature for both modes so the
+speculative loop can be compared against the serial one.
+"""
+import asyncio
+import logging
+import statistics
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Approach hints that make concurrent candidates differ from each other.
+# The first candidate gets no hint so it matches the serial attempt.
+CANDIDATE_APPROACHES = [
+    "",
+    "Prefer the simplest implementation that satisfies the validation criteria.",
+    "Rewrite the affected files from scratch instead of patching the previous attempt.",
+    "Be explicit and defensive: validate inputs and handle edge cases and errors directly.",
+    "Follow the structure of the existing code closely and keep changes minimal."
+]
+
+
+def candidate_approach(index: int) -> str:
+    """Approach hint for the candidate at index"""
+    return CANDIDATE_APPROACHES[index % len(CANDIDATE_APPROACHES)]
+
+
+@dataclass
+class Candidate:
+    """One speculative candidate and its validation outcome"""
+    index: int
+    variant: str
+    result: Any = None
+    success: bool = False
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class SpeculationOutcome:
+    """Result of a speculative round"""
+    winner: Optional[Candidate]
+    finished: List[Candidate] = field(default_factory=list)
+    launched: int = 0
+    cancelled: int = 0
+    elapsed: float = 0.0
+
+
+async def race_candidates(
+    variants: Sequence[str],
+    attempt: Callable[[int, str], Awaitable[Tuple[Any, bool]]],
+    timeout: Optional[float] = None
+) -> SpeculationOutcome:
+    """
+    Run one attempt per variant concurrently and return the first success.
+
+    Args:
+        variants: Labels of the candidates to launch
+        attempt: Coroutine function taking (index, variant) that generates
+            and validates a candidate, returning (result, success)
+        timeout: Seconds before unfinished candidates are cancelled
+
+    Returns:
+        SpeculationOutcome with the winning candidate (None if no candidate
+        passed) and every candidate that finished
+    """
+    start = time.perf_counter()
+    candidates = [Candidate(index=i, variant=v) for i, v in enumerate(variants)]
+
+    async def run(candidate: Candidate) -> Candidate:
+        candidate_start = time.perf_counter()
+        try:
+            candidate.result, candidate.success = await attempt(candidate.index, candidate.variant)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Candidate {candidate.index} ({candidate.variant}) failed: {e}")
+            candidate.error = str(e)
+        candidate.duration = time.perf_counter() - candidate_start
+        return candidate
+
+    pending = {asyncio.ensure_future(run(c)) for c in candidates}
+    outcome = SpeculationOutcome(winner=None, launched=len(candidates))
+    deadline = start + timeout if timeout else None
+
+    try:
+        while pending and outcome.winner is None:
+            remaining = deadline - time.perf_counter() if deadline else None
+            if remaining is not None and remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                candidate = task.result()
+                outcome.finished.append(candidate)
+                if candidate.success and outcome.winner is None:
+                    outcome.winner = candidate
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        outcome.cancelled = len(pending)
+
+    outcome.elapsed = time.perf_counter() - start
+    return outcome
+
+
+def select_candidate(outcome: SpeculationOutcome,
+                     progress: Callable[[Any], Tuple[int, int]]) -> Optional[Candidate]:
+    """
+    The winning candidate, or the failed one that got furthest.
+
+    Args:
+        outcome: Result of a speculative round
+        progress: Maps a candidate's result to (tests passed, tests failed)
+    """
+    if outcome.winner:
+        return outcome.winner
+    tested = [c for c in outcome.finished if c.result is not None]
+    if not tested:
+        return None
+
+    def furthest(candidate: Candidate) -> Tuple[int, int]:
+        passed, failed = progress(candidate.result)
+        return passed, -failed
+
+    return max(tested, key=furthest)
+
+
+class SpeculationMetrics:
+    """Time-to-green per feature for serial and speculative retries"""
+
+    def __init__(self):
+        self._features: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record_feature(self, feature_id: str, mode: str, success: bool,
+                       time_to_green: float, coder_calls: int, rounds: int,
+                       cancelled: int = 0):
+        """
+        Record how a feature finished.
+
+        Args:
+            mode: "serial" or "speculative"
+            time_to_green: Seconds from the first coder call to passing
+                validation (or to giving up)
+            coder_calls: Candidates generated for the feature
+            rounds: Retry rounds (each speculative round counts once)
+            cancelled: Candidates cancelled after a winner was found
+        """
+        with self._lock:
+            self._features.append({
+                "feature_id": feature_id,
+                "mode": mode,
+                "success": success,
+                "time_to_green": time_to_green,
+                "coder_calls": coder_calls,
+                "rounds": rounds,
+                "cancelled": cancelled
+            })
+
+    def get_report(self) -> Dict[str, Any]:
+        """Per-mode time-to-green and cost, plus the speculative speedup"""
+        with self._lock:
+            features = list(self._features)
+
+        report: Dict[str, Any] = {}
+        for mode in ("serial", "speculative"):
+            entries = [f for f in features if f["mode"] == mode]
+            green = [f["time_to_green"] for f in entries if f["success"]]
+            report[mode] = {
+                "features": len(entries),
+                "succeeded": len(green),
+                "avg_time_to_green": round(statistics.mean(green), 2) if green else None,
+                "median_time_to_green": round(statistics.median(green), 2) if green else None,
+                "coder_calls": sum(f["coder_calls"] for f in entries),
+                "rounds": sum(f["rounds"] for f in entries),
+                "cancelled": sum(f["cancelled"] for f in entries)
+            }
+
+        serial = report["serial"]["avg_time_to_green"]
+        speculative = report["speculative"]["avg_time_to_green"]
+        report["speedup"] = round(serial / speculative, 2) if serial and speculative else None
+        return report
+
+    def reset(self):
+        """Forget recorded features"""
+        with self._lock:
+            self._features.clear()
+
+
+# Global instance with lazy initialization
+_speculation_metrics = None
+
+
+def get_speculation_metrics() -> SpeculationMetrics:
+    """Get the global speculation metrics"""
+    global _speculation_metrics
+    if _speculation_metrics is None:
+        _speculation_metrics = SpeculationMetrics()
+    return _speculation_metrics
@@ -0,0 +1,48 @@
+"""
+Unit tests for versioned code snapshots.
+"""
+
+import pytest
+
+from workflows.mvp_incremental.code_snapshot import CodeSnapshot, CodeSnapshotStore
+
+
+class TestCodeSnapshotStore:
+    """Test copy-on-write snapshot versions."""
+    
+    def test_snapshot_is_not_affected_by_later_updates(self):
+        """Test a snapshot keeps the code it was taken with."""
+        store = CodeSnapshotStore({"base.py": "# base"})
+        before = store.snapshot()
+        
+        store.apply({"app.py": "print('app')", "base.py": "# base v2"}, source="feature_1")
+        after = store.snapshot()
+        
+        assert dict(before) == {"base.py": "# base"}
+        assert dict(after) == {"base.py": "# base v2", "app.py": "print('app')"}
+        assert after.version == before.version + 1
+        assert after.source == "feature_1"
+        assert after.changed_since(before) == ["base.py", "app.py"]
+    
+    def test_snapshot_behaves_like_dict(self):
+        """Test snapshots work where a code dict is expected."""
+        snapshot = CodeSnapshot.from_dict({"a.py": "x = 1"})
+        
+        assert snapshot == {"a.py": "x = 1"}
+        assert "a.py" in snapshot
+        assert list(snapshot.items()) == [("a.py", "x = 1")]
+        with pytest.raises(TypeError):
+            snapshot["b.py"] = "y = 2"
+        
+        copy = snapshot.copy()
+        copy["b.py"] = "y = 2"
+        assert "b.py" not in snapshot
+    
+    def test_identical_content_is_stored_once(self):
+        """Test unchanged files do not create a new version."""
+        store = CodeSnapshotStore()
+        first = store.apply({"a.py": "same", "b.py": "same"}, source="f1")
+        
+        assert first.file_hash("a.py") == first.file_hash("b.py")
+        assert store.apply({"a.py": "same"}, source="f2") is first
+        assert [version for version, _, _ in store.history] == [0, 1]
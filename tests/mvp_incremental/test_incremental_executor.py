@@ -39,6 +39,7 @@ class TestIncrementalExecutorMVP:
         return Feature(
             id="feat_calc",
             title="Calculator Operations",
+            short_name="Calculator",
             description="Basic math operations",
             complexity=ComplexityLevel.LOW,
             files=["calculator.py"],
@@ -189,4 +190,39 @@ def divide(a, b):
             # Verify tracer called correctly for failure
             mock_tracer.complete_step.assert_called_once()
             complete_call = mock_tracer.complete_step.call_args
-            assert complete_call[1]["output_data"]["success"] is False
\ No newline at end of file
+            assert complete_call[1]["output_data"]["success"] is False
+    
+    @pytest.mark.asyncio
+    async def test_validate_candidate_uses_own_session(self, executor, sample_feature, sample_files):
+        """Test speculative candidates are validated in separate sessions without touching state"""
+        executor.codebase_state = {"main.py": "print('hello')"}
+        
+        with patch('orchestrator.orchestrator_agent.run_team_member',
+                   new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = "✅ All validation criteria met\nTests: 4 passed, 0 failed"
+            
+            result = await executor.validate_feature(
+                feature=sample_feature,
+                new_files=sample_files,
+                candidate_id="c1"
+            )
+            
+            executor_input = mock_run.call_args[0][1]
+            assert "SESSION_ID: test_session_123_c1" in executor_input
+            # The candidate session starts empty, so it gets the whole codebase
+            assert "FILENAME: main.py" in executor_input
+            assert "FILENAME: calculator.py" in executor_input
+            assert result.success is True
+            assert executor.codebase_state == {"main.py": "print('hello')"}
+            assert executor.validated_features == []
+            
+            # Accepted files reach the main session with its next validation
+            executor.accept_candidate(sample_feature, sample_files)
+            assert "calculator.py" in executor.codebase_state
+            assert executor.validated_features == ["feat_calc"]
+            
+            await executor.validate_feature(feature=sample_feature, new_files={"extra.py": "x = 1"})
+            executor_input = mock_run.call_args[0][1]
+            assert "SESSION_ID: test_session_123\n" in executor_input
+            assert "FILENAME: calculator.py" in executor_input
+            assert "FILENAME: main.py" not in executor_input
@@ -98,17 +98,40 @@ class TestParallelFeatureProcessor:
         assert "feature1" in deps["feature2"].depends_on
         assert "feature2" in deps["feature1"].dependents
     
-    def test_analyze_dependencies_implicit(self, processor, sample_features):
-        """Test analyzing implicit dependencies from descriptions."""
-        deps = processor.analyze_dependencies(sample_features)
+    @pytest.fixture
+    def design_output(self):
+        """Design output declaring FEATURE[n] dependencies."""
+        return """
+FEATURE[1]: Feature 1
+Description: First feature
+Dependencies: None
+
+FEATURE[3]: Feature 3
+Description: Third feature
+Dependencies: None
+
+FEATURE[4]: Feature 4
+Description: Builds on feature 3
+Dependencies: FEATURE[3]
+"""
+    
+    def test_analyze_dependencies_from_design(self, processor, sample_features, design_output):
+        """Test dependencies parsed from the design's FEATURE blocks."""
+        deps = processor.analyze_dependencies(sample_features, design_output)
         
-        # feature4 should depend on feature3 due to reference in description
-        assert "feature3" in deps["feature4"].depends_on
+        # feature4 depends on feature3 as declared in the design
+        assert deps["feature4"].depends_on == {"feature3"}
         assert "feature4" in deps["feature3"].dependents
     
-    def test_get_processable_features_initial(self, processor, sample_features):
-        """Test getting initial processable features."""
+    def test_analyze_dependencies_ignores_description_mentions(self, processor, sample_features):
+        """Test titles mentioned in descriptions are not treated as dependencies."""
         deps = processor.analyze_dependencies(sample_features)
+        
+        assert deps["feature4"].is_independent
+    
+    def test_get_processable_features_initial(self, processor, sample_features, design_output):
+        """Test getting initial processable features."""
+        deps = processor.analyze_dependencies(sample_features, design_output)
         processable = processor.get_processable_features(sample_features, deps)
         
         # Should get feature1 and feature3 (independents)
@@ -116,7 +139,7 @@ class TestParallelFeatureProcessor:
         assert "feature1" in processable_ids
         assert "feature3" in processable_ids
         assert "feature2" not in processable_ids  # Has dependency
-        assert "feature4" not in processable_ids  # Has implicit dependency
+        assert "feature4" not in processable_ids  # Depends on feature3 in the design
     
     def test_get_processable_features_after_completion(self, processor, sample_features):
         """Test getting processable features after some are completed."""
@@ -286,6 +309,61 @@ class TestParallelFeatureProcessor:
         assert processing_order.index("f1") < processing_order.index("f2")
         assert processing_order.index("f2") < processing_order.index("f3")
     
+    @pytest.mark.asyncio
+    async def test_dependents_start_without_waiting_for_batch(self, processor):
+        """Test a feature starts once its own dependency completes."""
+        mock_implementer = Mock()
+        mock_implementer._parse_code_files = Mock(return_value={})
+        started = {}
+        
+        async def mock_implement(feature, **kwargs):
+            started[feature["id"]] = time.monotonic()
+            await asyncio.sleep({"fast": 0.05, "slow": 0.3, "after_fast": 0.05}[feature["id"]])
+            return TDDFeatureResult(
+                feature_id=feature["id"],
+                feature_title=feature["title"],
+                test_code="test",
+                implementation_code="impl",
+                initial_test_result=Mock(),
+                final_test_result=Mock(),
+                success=True
+            )
+        
+        mock_implementer.implement_feature_tdd = mock_implement
+        
+        features = [
+            {"id": "slow", "title": "Slow"},
+            {"id": "fast", "title": "Fast"},
+            {"id": "after_fast", "title": "After fast", "depends_on": ["fast"]}
+        ]
+        
+        await processor.process_features_parallel(
+            features=features,
+            implementer=mock_implementer,
+            existing_code={},
+            requirements="req",
+            design_output="design"
+        )
+        
+        # after_fast starts while slow is still running
+        assert started["after_fast"] - started["slow"] < 0.2
+        assert processor.metrics.parallel_batches == 2
+        assert processor.metrics.speedup_factor > 1.0
+    
+    def test_critical_path_prioritization(self, processor):
+        """Test features on the longest dependency chain are preferred."""
+        features = [
+            {"id": "leaf", "title": "Leaf"},
+            {"id": "root", "title": "Root"},
+            {"id": "middle", "title": "Middle", "depends_on": ["root"]},
+            {"id": "top", "title": "Top", "depends_on": ["middle"]}
+        ]
+        deps = processor.analyze_dependencies(features)
+        
+        lengths = processor.critical_path_lengths(features, deps)
+        
+        assert lengths == {"leaf": 1.0, "root": 3.0, "middle": 2.0, "top": 1.0}
+    
     @pytest.mark.asyncio
     async def test_process_features_with_timeout(self, processor):
         """Test handling of batch timeout."""
@@ -410,6 +488,60 @@ class TestParallelFeatureProcessor:
         # f2 should have initial code + f1's code
         assert "base.py" in accumulated_code_by_feature["f2"]
         assert "f1.py" in accumulated_code_by_feature["f2"]
+        
+        # Each completed feature's output is parsed once
+        assert mock_implementer._parse_code_files.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_completed_results_are_not_rerun(self, processor):
+        """Test features restored from a checkpoint count as done and feed their code to dependents."""
+        mock_implementer = Mock()
+        accumulated_code_by_feature = {}
+
+        async def mock_implement(feature, existing_code, **kwargs):
+            accumulated_code_by_feature[feature["id"]] = existing_code.copy()
+            return TDDFeatureResult(
+                feature_id=feature["id"],
+                feature_title=feature["title"],
+                test_code="test",
+                implementation_code=f"# Code for {feature['id']}",
+                initial_test_result=Mock(),
+                final_test_result=Mock(),
+                success=True
+            )
+
+        mock_implementer.implement_feature_tdd = mock_implement
+        mock_implementer._parse_code_files = Mock(
+            side_effect=lambda code: {f"{code.split()[-1]}.py": code}
+        )
+
+        features = [
+            {"id": "f1", "title": "Feature 1", "description": "First"},
+            {"id": "f2", "title": "Feature 2", "description": "Second", "depends_on": ["f1"]}
+        ]
+        restored = TDDFeatureResult(
+            feature_id="f1",
+            feature_title="Feature 1",
+            test_code="test",
+            implementation_code="# Code for f1",
+            initial_test_result=Mock(),
+            final_test_result=Mock(),
+            success=True
+        )
+
+        results = await processor.process_features_parallel(
+            features=features,
+            implementer=mock_implementer,
+            existing_code={},
+            requirements="req",
+            design_output="design",
+            completed_results={"f1": restored}
+        )
+
+        assert list(accumulated_code_by_feature) == ["f2"]
+        assert "f1.py" in accumulated_code_by_feature["f2"]
+        assert [r.feature_id for r in results] == ["f1", "f2"]
+        assert results[0] is restored
 
 
 class TestUtilityFunctions:
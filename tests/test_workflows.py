@@ -33,6 +33,7 @@ from workflows.monitoring import (
     StepStatus, ReviewDecision
 )
 from workflows.workflow_manager import get_available_workflows, get_workflow_description
+from shared.utils.rate_limiter import Priority, set_call_priority
 
 
 # ============================================================================
@@ -793,6 +794,9 @@ async def main():
     selected_complexity = complexity_map[args.complexity]
     complexities = [selected_complexity] if selected_complexity else list(TestComplexity)
     
+    # Regression runs queue behind interactive sessions for model calls
+    set_call_priority(Priority.BATCH)
+    
     # Initialize tester
     tester = ModernWorkflowTester()
     
@@ -12,11 +12,15 @@ from datetime import datetime
 import tempfile
 from pathlib import Path
 
+import anyio
+
 # Add project root to path
 import sys
 sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
-from shared.filesystem_client import MCPFileSystemClient, get_filesystem_client
+from shared.filesystem_client import (
+    MCPFileSystemClient, SharedMCPConnection, get_filesystem_client, run_sync
+)
 from mcp.types import TextContent
 
 
@@ -346,6 +350,296 @@ class TestMCPFileSystemClient(unittest.TestCase):
         self.assertEqual(client.agent_name, "test_agent")
 
 
+
+class TestMCPFileSystemClientAsync(unittest.IsolatedAsyncioTestCase):
+    """Test client operations that await the mocked session."""
+    
+    def setUp(self):
+        """Set up a client with a mocked session."""
+        self.client = MCPFileSystemClient("test_agent")
+        self.mock_session = Mock()
+        self.client.session = self.mock_session
+        self.mock_response = Mock()
+        self.mock_response.content = [Mock(text=json.dumps({
+            "success": True,
+            "path": "test.txt",
+            "content": "Test content"
+        }))]
+    
+    async def test_write_files_batched(self):
+        """Test batch writes are split by size limits and sent as write_files calls."""
+        self.client._batch_config = {"max_batch_files": 2, "max_batch_bytes": 1024}
+        
+        async def write_files_response(tool_name, arguments):
+            return Mock(content=[Mock(text=json.dumps({
+                "success": True,
+                "results": [{"success": True, "path": f["path"]} for f in arguments["files"]]
+            }))])
+        
+        self.mock_session.call_tool = AsyncMock(side_effect=write_files_response)
+        
+        files = {f"src/file{i}.py": f"print({i})" for i in range(5)}
+        result = await self.client.write_files(files)
+        
+        # Verify
+        self.assertEqual(result, {path: True for path in files})
+        self.assertEqual(self.mock_session.call_tool.call_count, 3)  # 2 + 2 + 1 files
+        for call in self.mock_session.call_tool.call_args_list:
+            self.assertEqual(call.args[0], "write_files")
+    
+    async def test_write_files_partial_failure(self):
+        """Test per-file failures are reported without failing the batch."""
+        self.mock_session.call_tool = AsyncMock(return_value=Mock(
+            content=[Mock(text=json.dumps({
+                "success": False,
+                "results": [
+                    {"success": True, "path": "a.py"},
+                    {"success": False, "path": "../b.py", "error": "outside the sandbox"}
+                ]
+            }))]
+        ))
+        
+        result = await self.client.write_files({"a.py": "a", "../b.py": "b"})
+        
+        self.assertEqual(result, {"a.py": True, "../b.py": False})
+    
+    async def test_read_files_and_stat_many(self):
+        """Test batched reads and stats map results back to requested paths."""
+        responses = {
+            "read_files": {"success": False, "files": [
+                {"success": True, "content": "A"},
+                {"success": False, "error": "File not found"}
+            ]},
+            "stat_many": {"success": True, "items": [
+                {"path": "a.txt", "exists": True, "type": "file", "size": 1},
+                {"path": "missing.txt", "exists": False, "type": None, "size": None}
+            ]}
+        }
+        self.mock_session.call_tool = AsyncMock(side_effect=lambda name, args: Mock(
+            content=[Mock(text=json.dumps(responses[name]))]
+        ))
+        
+        contents = await self.client.read_files(["a.txt", "missing.txt"])
+        stats = await self.client.stat_many(["a.txt", "missing.txt"])
+        
+        self.assertEqual(contents, {"a.txt": "A", "missing.txt": None})
+        self.assertTrue(stats["a.txt"]["exists"])
+        self.assertFalse(stats["missing.txt"]["exists"])
+    
+    async def test_call_tools_pipelined(self):
+        """Test multiple tool calls are in flight at the same time."""
+        in_flight = 0
+        max_in_flight = 0
+        
+        async def slow_response(*args, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return self.mock_response
+        
+        self.mock_session.call_tool = slow_response
+        self.client._call_semaphore = asyncio.Semaphore(3)
+        
+        results = await self.client.call_tools([
+            ("read_file", {"path": f"file{i}.txt"}) for i in range(6)
+        ])
+        
+        self.assertEqual(len(results), 6)
+        self.assertEqual(max_in_flight, 3)
+    
+    async def test_write_file_chunked_appends(self):
+        """Test large writes are sent as one overwrite followed by appends."""
+        self.mock_session.call_tool = AsyncMock(return_value=Mock(
+            content=[Mock(text=json.dumps({"success": True}))]
+        ))
+        
+        result = await self.client.write_file_chunked("big.txt", "abcdefg", chunk_size=3, if_changed=False)
+        
+        self.assertTrue(result)
+        calls = self.mock_session.call_tool.call_args_list
+        self.assertEqual([c.args[1]["content"] for c in calls], ["abc", "def", "g"])
+        self.assertNotIn("mode", calls[0].args[1])
+        self.assertEqual(calls[1].args[1]["mode"], "append")
+    
+    async def test_write_file_chunked_skips_unchanged(self):
+        """Test nothing is written when the server already has the content."""
+        import hashlib
+        self.mock_session.call_tool = AsyncMock(return_value=Mock(
+            content=[Mock(text=json.dumps({
+                "success": True,
+                "size": 3,
+                "sha256": hashlib.sha256(b"abc").hexdigest()
+            }))]
+        ))
+        
+        result = await self.client.write_file_chunked("big.txt", "abc")
+        
+        self.assertTrue(result)
+        self.mock_session.call_tool.assert_called_once_with(
+            "get_file_info", {"path": "big.txt", "include_hash": True}
+        )
+    
+    async def test_iter_file_chunks(self):
+        """Test range reads continue from next_offset until eof."""
+        ranges = [
+            {"success": True, "content": "abc", "next_offset": 3, "eof": False},
+            {"success": True, "content": "de", "next_offset": None, "eof": True}
+        ]
+        self.mock_session.call_tool = AsyncMock(side_effect=[
+            Mock(content=[Mock(text=json.dumps(r))]) for r in ranges
+        ])
+        
+        chunks = [chunk async for chunk in self.client.iter_file_chunks("big.txt", chunk_size=3)]
+        
+        self.assertEqual(chunks, ["abc", "de"])
+        self.assertEqual(self.mock_session.call_tool.call_args.args[1]["offset"], 3)
+    
+    async def test_write_bytes_splits_on_base64_boundaries(self):
+        """Test every chunk of a binary write is valid base64 on its own."""
+        import base64
+        self.mock_session.call_tool = AsyncMock(return_value=Mock(
+            content=[Mock(text=json.dumps({"success": True}))]
+        ))
+        self.client._chunk_size = 6
+        data = bytes(range(20))
+        
+        result = await self.client.write_bytes("blob.bin", data, if_changed=False)
+        
+        self.assertTrue(result)
+        chunks = [c.args[1]["content"] for c in self.mock_session.call_tool.call_args_list]
+        self.assertEqual(b"".join(base64.b64decode(chunk, validate=True) for chunk in chunks), data)
+    
+    async def test_list_directory_pages(self):
+        """Test listing follows next_offset until all pages are read."""
+        pages = [
+            {"success": True, "items": [{"path": "dir/a.txt"}], "has_more": True, "next_offset": 1},
+            {"success": True, "items": [{"path": "dir/b.txt"}], "has_more": False, "next_offset": None}
+        ]
+        self.mock_session.call_tool = AsyncMock(side_effect=[
+            Mock(content=[Mock(text=json.dumps(page))]) for page in pages
+        ])
+        
+        result = await self.client.list_directory("dir")
+        
+        self.assertEqual([item["path"] for item in result], ["dir/a.txt", "dir/b.txt"])
+        self.mock_session.call_tool.assert_called_with("list_directory", {
+            "path": "dir",
+            "recursive": False,
+            "offset": 1
+        })
+
+
+
+class TestSharedMCPConnection(unittest.IsolatedAsyncioTestCase):
+    """Test the shared, reference-counted server connection."""
+    
+    def setUp(self):
+        """Patch the stdio transport and session with counting fakes."""
+        self.spawn_count = 0
+        self.write_streams = []
+        self.session = AsyncMock()
+        self.session.list_tools = AsyncMock(return_value=[])
+        
+        test_case = self
+        
+        class FakeStdio:
+            async def __aenter__(self):
+                test_case.spawn_count += 1
+                write, read = anyio.create_memory_object_stream(100)
+                test_case.write_streams.append(write)
+                return (read, write)
+            
+            async def __aexit__(self, *args):
+                return False
+        
+        class FakeSession:
+            def __init__(self, read, write):
+                pass
+            
+            async def __aenter__(self):
+                return test_case.session
+            
+            async def __aexit__(self, *args):
+                return False
+        
+        self.patches = [
+            patch('shared.filesystem_client.stdio_client', lambda params: FakeStdio()),
+            patch('shared.filesystem_client.ClientSession', FakeSession)
+        ]
+        for p in self.patches:
+            p.start()
+    
+    def tearDown(self):
+        """Remove patches."""
+        for p in self.patches:
+            p.stop()
+    
+    async def test_connection_reused_across_connect_blocks(self):
+        """Test the server is spawned once for several connect() blocks."""
+        client = MCPFileSystemClient("test_agent")
+        
+        for _ in range(3):
+            async with client.connect():
+                self.assertIs(client.session, self.session)
+            self.assertIsNone(client.session)
+        
+        self.assertEqual(self.spawn_count, 1)
+    
+    async def test_reference_counting_and_metrics(self):
+        """Test references are tracked and the connection stays open."""
+        connection = SharedMCPConnection()
+        
+        await connection.acquire()
+        await connection.acquire()
+        self.assertEqual(connection.get_metrics()["active_references"], 2)
+        
+        await connection.release()
+        await connection.release()
+        metrics = connection.get_metrics()
+        self.assertEqual(metrics["active_references"], 0)
+        self.assertTrue(metrics["alive"])
+        self.assertEqual(metrics["connects"], 1)
+        self.assertEqual(metrics["acquisitions"], 2)
+        
+        await connection.close()
+        self.assertFalse(connection.is_alive())
+    
+    async def test_reconnect_after_failure(self):
+        """Test a call on a closed transport drops the session and reconnects."""
+        async def call_tool(tool_name, arguments):
+            # Like the real session, send the request over the current transport
+            await self.write_streams[-1].send(tool_name)
+            return Mock(content=[Mock(text=json.dumps({"success": True, "exists": True}))])
+        
+        self.session.call_tool = call_tool
+        client = MCPFileSystemClient("test_agent")
+        
+        async with client.connect():
+            connection = client._shared
+            self.assertTrue(await client.exists("a.txt"))
+            
+            # Simulate the server going away
+            await self.write_streams[-1].aclose()
+            self.assertTrue(await client.exists("a.txt"))
+        
+        self.assertTrue(connection.is_alive())
+        self.assertEqual(self.spawn_count, 2)
+        self.assertEqual(connection.get_metrics()["reconnects"], 1)
+        
+        connection.connection_lost(connection.session)
+        self.assertFalse(connection.is_alive())
+        await connection.close()
+    
+    def test_run_sync_reuses_background_loop(self):
+        """Test synchronous callers share one event loop."""
+        async def current_loop():
+            return asyncio.get_running_loop()
+        
+        self.assertIs(run_sync(current_loop()), run_sync(current_loop()))
+
+
 if __name__ == "__main__":
     # Run async tests
     unittest.main()
\ No newline at end of file
@@ -6,6 +6,7 @@ Tests core functionality, error handling, sandboxing, and audit logging.
 
 import unittest
 import asyncio
+import base64
 import json
 import tempfile
 import shutil
@@ -178,6 +179,37 @@ class TestFileSystemServer(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertEqual(result["count"], 4)  # 2 files + 1 dir + 1 nested file
     
+    async def test_list_directory_pagination(self):
+        """Test directory listings are returned in pages."""
+        (self.test_dir_path / "file3.txt").write_text("Content 3")
+        
+        first = await self.server._list_directory(self.test_dir_path, limit=2)
+        self.assertEqual(first["count"], 2)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(first["next_offset"], 2)
+        
+        second = await self.server._list_directory(self.test_dir_path, offset=2, limit=2)
+        self.assertEqual(second["count"], 1)
+        self.assertFalse(second["has_more"])
+        self.assertIsNone(second["next_offset"])
+        
+        paths = [item["path"] for item in first["items"] + second["items"]]
+        self.assertEqual(paths, ["testdir/file1.txt", "testdir/file2.txt", "testdir/file3.txt"])
+    
+    async def test_list_directory_pages_resume_walk(self):
+        """Test the next page continues the previous page's walk instead of rescanning."""
+        (self.test_dir_path / "file3.txt").write_text("Content 3")
+        
+        with patch.object(self.server, "_iter_directory", wraps=self.server._iter_directory) as walk:
+            first = await self.server._list_directory(self.test_dir_path, limit=1)
+            second = await self.server._list_directory(self.test_dir_path, offset=1, limit=1)
+            third = await self.server._list_directory(self.test_dir_path, offset=2, limit=1)
+        
+        self.assertEqual(walk.call_count, 1)
+        paths = [page["items"][0]["path"] for page in (first, second, third)]
+        self.assertEqual(paths, ["testdir/file1.txt", "testdir/file2.txt", "testdir/file3.txt"])
+        self.assertFalse(third["has_more"])
+    
     async def test_list_directory_not_found(self):
         """Test listing non-existent directory."""
         with self.assertRaises(FileNotFoundError):
@@ -236,6 +268,121 @@ class TestFileSystemServer(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             await self.server._get_file_info(self.sandbox_root / "nonexistent.txt")
     
+    async def test_read_file_range(self):
+        """Test reading a byte range reports where the next range starts."""
+        result = await self.server._read_file(self.test_file, offset=0, length=4)
+        
+        self.assertEqual(result["content"], "Hell")
+        self.assertEqual(result["next_offset"], 4)
+        self.assertFalse(result["eof"])
+        
+        rest = await self.server._read_file(self.test_file, offset=4)
+        self.assertEqual(rest["content"], self.test_file.read_text()[4:])
+        self.assertTrue(rest["eof"])
+        self.assertIsNone(rest["next_offset"])
+    
+    async def test_read_file_range_keeps_multibyte_characters_whole(self):
+        """Test a range ending inside a UTF-8 character stops before it."""
+        path = self.sandbox_root / "unicode.txt"
+        path.write_text("a\u00e9b", encoding="utf-8")  # 'é' is two bytes
+        
+        result = await self.server._read_file(path, offset=0, length=2)
+        
+        self.assertEqual(result["content"], "a")
+        self.assertEqual(result["next_offset"], 1)
+    
+    async def test_write_file_append_mode(self):
+        """Test append mode adds to an existing file."""
+        path = self.sandbox_root / "log.txt"
+        await self.server._write_file(path, "one\n")
+        await self.server._write_file(path, "two\n", mode="append")
+        
+        self.assertEqual(path.read_text(), "one\ntwo\n")
+    
+    async def test_write_file_if_changed(self):
+        """Test unchanged content is not rewritten."""
+        path = self.sandbox_root / "same.txt"
+        await self.server._write_file(path, "content")
+        mtime = path.stat().st_mtime_ns
+        
+        result = await self.server._write_file(path, "content", if_changed=True)
+        self.assertFalse(result["changed"])
+        self.assertEqual(path.stat().st_mtime_ns, mtime)
+        
+        result = await self.server._write_file(path, "new content", if_changed=True)
+        self.assertTrue(result["changed"])
+        self.assertEqual(path.read_text(), "new content")
+    
+    async def test_base64_round_trip(self):
+        """Test the base64 encoding transfers arbitrary bytes unchanged."""
+        path = self.sandbox_root / "blob.bin"
+        data = bytes(range(256))
+        
+        await self.server._write_file(path, base64.b64encode(data[:100]).decode("ascii"), encoding="base64")
+        await self.server._write_file(path, base64.b64encode(data[100:]).decode("ascii"),
+                                      encoding="base64", mode="append")
+        result = await self.server._read_file(path, encoding="base64")
+        chunk = await self.server._read_file(path, encoding="base64", offset=250, length=10)
+        
+        self.assertEqual(path.read_bytes(), data)
+        self.assertEqual(base64.b64decode(result["content"]), data)
+        self.assertEqual(result["size"], 256)
+        self.assertEqual(base64.b64decode(chunk["content"]), data[250:])
+        self.assertTrue(chunk["eof"])
+    
+    async def test_write_files_batch(self):
+        """Test writing several files in one call."""
+        result = await self.server._write_files([
+            {"path": "batch/a.py", "content": "a = 1"},
+            {"path": "batch/nested/b.py", "content": "b = 2"}
+        ])
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual((self.sandbox_root / "batch" / "nested" / "b.py").read_text(), "b = 2")
+    
+    async def test_write_files_reports_per_file_errors(self):
+        """Test a bad path fails only its own entry."""
+        result = await self.server._write_files([
+            {"path": "ok.txt", "content": "ok"},
+            {"path": "../escape.txt", "content": "bad"}
+        ])
+        
+        self.assertFalse(result["success"])
+        self.assertEqual(result["failed"], 1)
+        self.assertTrue(result["results"][0]["success"])
+        self.assertIn("outside the sandbox", result["results"][1]["error"])
+        self.assertTrue((self.sandbox_root / "ok.txt").exists())
+    
+    async def test_read_files_batch(self):
+        """Test reading several files in one call."""
+        result = await self.server._read_files(["test.txt", "testdir/file1.txt", "missing.txt"])
+        
+        self.assertEqual(result["count"], 3)
+        self.assertEqual(result["failed"], 1)
+        self.assertEqual(result["files"][0]["content"], "Hello, World!")
+        self.assertEqual(result["files"][1]["content"], "File 1")
+        self.assertFalse(result["files"][2]["success"])
+    
+    async def test_stat_many(self):
+        """Test stat of several paths in one call."""
+        result = await self.server._stat_many(["test.txt", "testdir", "missing.txt"])
+        
+        items = result["items"]
+        self.assertTrue(result["success"])
+        self.assertEqual(items[0]["type"], "file")
+        self.assertEqual(items[0]["size"], 13)
+        self.assertEqual(items[1]["type"], "directory")
+        self.assertFalse(items[2]["exists"])
+    
+    async def test_batch_size_limit(self):
+        """Test oversized batches are rejected."""
+        self.server.config = {"limits": {"max_batch_files": 1}}
+        
+        with self.assertRaises(ValueError):
+            await self.server._stat_many(["a.txt", "b.txt"])
+    
     def test_audit_logging(self):
         """Test audit logging functionality."""
         # Clear any existing audit log
@@ -246,6 +393,10 @@ class TestFileSystemServer(unittest.TestCase):
         self.server._audit_log("test_action", {"detail": "test detail"})
         self.server._audit_log("another_action", {"value": 42})
         
+        # Entries are buffered until flushed
+        self.assertFalse(self.server.audit_log_path.exists())
+        self.server._audit_writer.flush()
+        
         # Read and verify audit log
         self.assertTrue(self.server.audit_log_path.exists())
         
@@ -265,6 +416,35 @@ class TestFileSystemServer(unittest.TestCase):
         self.assertEqual(entry2["action"], "another_action")
         self.assertEqual(entry2["details"]["value"], 42)
     
+    def test_audit_log_flushes_when_buffer_full(self):
+        """Test a full audit buffer is written without an explicit flush."""
+        self.server._audit_writer.max_buffer_entries = 2
+        
+        self.server._audit_log("first", {})
+        self.server._audit_log("second", {})
+        
+        with open(self.server.audit_log_path) as f:
+            self.assertEqual(len(f.readlines()), 2)
+    
+    def test_audit_log_keeps_entries_of_failed_flush(self):
+        """Test entries are not lost when writing the audit log fails."""
+        self.server._audit_log("kept", {})
+        self.server.audit_log_path = Path(self.test_dir) / "missing" / "audit.log"
+        
+        with self.assertRaises(OSError):
+            self.server._audit_writer.flush()
+        
+        self.server.audit_log_path = Path(self.test_dir) / "audit.log"
+        self.server._audit_writer.flush()
+        with open(self.server.audit_log_path) as f:
+            self.assertEqual(json.loads(f.readline())["action"], "kept")
+    
+    def test_summarize_arguments_omits_content(self):
+        """Test tool call audit entries record content size, not content."""
+        summary = FileSystemServer._summarize_arguments({"path": "a.txt", "content": "hello"})
+        
+        self.assertEqual(summary, {"path": "a.txt", "content_size": 5})
+    
     @patch('mcp.filesystem_server.FileSystemServer._audit_log')
     async def test_call_tool_logging(self, mock_audit_log):
         """Test that tool calls are properly logged."""
@@ -0,0 +1,148 @@
+"""
+Unit tests for Test Timing History
+"""
+
+import pytest
+from workflows.mvp_incremental.test_timing_history import (
+    TestTimingHistory, get_test_timing_history, hash_code,
+    parse_pytest_durations, parse_pytest_outcomes
+)
+
+
+PYTEST_OUTPUT = """
+tests/test_api.py::test_create PASSED                                    [ 33%]
+tests/test_api.py::test_delete FAILED                                    [ 66%]
+tests/test_math.py::test_add PASSED                                      [100%]
+
+============================= slowest durations ==============================
+1.50s call     tests/test_api.py::test_create
+0.25s setup    tests/test_api.py::test_create
+0.40s call     tests/test_api.py::test_delete
+0.01s call     tests/test_math.py::test_add
+0.00s teardown tests/test_math.py::test_add
+========================= 1 failed, 2 passed in 2.20s =========================
+"""
+
+
+class TestPytestOutputParsing:
+
+    def test_parse_durations_sums_phases(self):
+        """Test setup/call/teardown durations are summed per node id."""
+        durations = parse_pytest_durations(PYTEST_OUTPUT)
+
+        assert durations["tests/test_api.py::test_create"] == pytest.approx(1.75)
+        assert durations["tests/test_api.py::test_delete"] == pytest.approx(0.40)
+        assert durations["tests/test_math.py::test_add"] == pytest.approx(0.01)
+
+    def test_parse_outcomes(self):
+        """Test verbose outcome lines are parsed."""
+        outcomes = parse_pytest_outcomes(PYTEST_OUTPUT)
+
+        assert outcomes["tests/test_api.py::test_create"] == "passed"
+        assert outcomes["tests/test_api.py::test_delete"] == "failed"
+
+    def test_hash_code_is_order_independent_for_dicts(self):
+        """Test hashing a file mapping does not depend on insertion order."""
+        assert hash_code({"a.py": "1", "b.py": "2"}) == hash_code({"b.py": "2", "a.py": "1"})
+        assert hash_code("x = 1") != hash_code("x = 2")
+
+
+class TestTestTimingHistory:
+
+    def test_record_run(self):
+        """Test recording all tests from pytest output."""
+        history = TestTimingHistory()
+
+        recorded = history.record_run(PYTEST_OUTPUT, code_hash="abc")
+
+        assert recorded == 3
+        assert history.expected_duration("tests/test_api.py::test_create") == pytest.approx(1.75)
+        assert history.expected_duration("tests/test_unknown.py::test_x") is None
+
+    def test_expected_duration_prefers_matching_code_hash(self):
+        """Test estimates use samples for the same code hash when available."""
+        history = TestTimingHistory()
+        history.record("test_a.py::test_one", 1.0, code_hash="old")
+        history.record("test_a.py::test_one", 5.0, code_hash="new")
+
+        assert history.expected_duration("test_a.py::test_one", "new") == 5.0
+        assert history.expected_duration("test_a.py::test_one", "other") == pytest.approx(3.0)
+
+    def test_max_samples_per_test(self):
+        """Test old samples are dropped."""
+        history = TestTimingHistory(max_samples_per_test=3)
+        for duration in [10.0, 10.0, 1.0, 1.0, 1.0]:
+            history.record("test_a.py::test_one", duration)
+
+        assert history.expected_duration("test_a.py::test_one") == 1.0
+
+    def test_order_slowest_first(self):
+        """Test files are ordered by expected duration, unknown files first."""
+        history = TestTimingHistory()
+        history.record_run(PYTEST_OUTPUT)
+
+        ordered = history.order_slowest_first(
+            ["tests/test_math.py", "./tests/test_api.py", "tests/test_new.py"]
+        )
+
+        assert ordered == ["tests/test_new.py", "./tests/test_api.py", "tests/test_math.py"]
+
+    def test_order_for_red_phase(self):
+        """Test RED phase ordering puts new tests, then fast tests, first."""
+        history = TestTimingHistory()
+        history.record_run(PYTEST_OUTPUT)
+
+        ordered = history.order_for_red_phase(
+            ["tests/test_api.py", "tests/test_math.py", "tests/test_new.py"]
+        )
+
+        assert ordered == ["tests/test_new.py", "tests/test_math.py", "tests/test_api.py"]
+
+    def test_timing_report(self):
+        """Test percentile report contents."""
+        history = TestTimingHistory()
+        for duration in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            history.record("test_a.py::test_one", duration)
+        history.record("test_b.py::test_two", 0.5)
+
+        report = history.get_timing_report()
+
+        assert report["tests_tracked"] == 2
+        assert report["samples"] == 6
+        assert report["tests"]["test_a.py::test_one"]["p50"] == 3.0
+        assert report["tests"]["test_a.py::test_one"]["p90"] == pytest.approx(4.6)
+        assert report["slowest_tests"][0]["node_id"] == "test_a.py::test_one"
+        assert list(report["files"]) == ["test_a.py", "test_b.py"]
+
+    def test_persistence(self, tmp_path):
+        """Test history is saved and reloaded."""
+        path = tmp_path / "timings.json"
+        history = TestTimingHistory(history_path=path)
+        history.record("test_a.py::test_one", 2.0, code_hash="abc")
+        history.save()
+
+        reloaded = TestTimingHistory(history_path=path)
+        assert reloaded.expected_duration("test_a.py::test_one", "abc") == 2.0
+
+    def test_get_test_timing_history_per_project(self, tmp_path):
+        """Test one history instance per project directory."""
+        first = get_test_timing_history(tmp_path / "one")
+        second = get_test_timing_history(tmp_path / "two")
+
+        assert first is get_test_timing_history(tmp_path / "one")
+        assert first is not second
+        assert first.history_path == (tmp_path / "one" / ".cache" / "test_timing_history.json").resolve()
+
+    def test_executors_use_project_history(self, tmp_path):
+        """Test both test executors keep timing history with the project, not the cwd."""
+        from workflows.mvp_incremental.test_execution import TestExecutionConfig, TestExecutor
+        from workflows.mvp_incremental.validator import CodeValidator
+        from workflows.tdd.test_executor import TestExecutor as TDDTestExecutor
+
+        project = get_test_timing_history(tmp_path)
+        mvp_executor = TestExecutor(CodeValidator(), TestExecutionConfig(timing_history_dir=tmp_path))
+        tdd_executor = TDDTestExecutor(history_dir=tmp_path)
+
+        assert mvp_executor._timing_history is project
+        assert tdd_executor._timing_history(None) is project
+        assert tdd_executor._timing_history(tmp_path / "other") is not project
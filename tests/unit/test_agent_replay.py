@@ -0,0 +1,184 @@
+"""
+Unit tests for recording agent calls and replaying them from an archive
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.migration import run_team_member_with_tracking
+from workflows.workflow_config import AGENT_REPLAY_CONFIG
+from shared.utils.agent_replay import (
+    AgentReplay, ReplayMiss, archive_execution_report, configure_agent_replay, input_key, load_archive
+)
+
+
+class TestInputKey(unittest.TestCase):
+    """Test normalizing inputs so reruns of the same call match"""
+
+    def test_run_specific_parts_ignored(self):
+        """Test session ids, timestamps, temp dirs and priority don't change the key"""
+        first = "SESSION_ID: tdd_20250101_101010\nRun tests in /tmp/abc123/app at 2025-01-01T10:10:10.5"
+        second = "PRIORITY: batch\nSESSION_ID: tdd_20250302_090000\nRun tests in /tmp/xyz/app at 2025-03-02 09:00:00  "
+
+        self.assertEqual(input_key("executor_agent", first), input_key("executor_agent", second))
+
+    def test_content_and_agent_matter(self):
+        """Test different requests or agents get different keys"""
+        self.assertNotEqual(input_key("coder_agent", "Build a calculator"), input_key("coder_agent", "Build a parser"))
+        self.assertNotEqual(input_key("coder_agent", "Build a calculator"), input_key("reviewer_agent", "Build a calculator"))
+
+
+class TestRecordAndReplay(unittest.TestCase):
+    """Test the archive roundtrip and how replayed calls are matched"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.archive = str(Path(tmp.name) / "run.jsonl.gz")
+
+    def record(self, calls):
+        recorder = AgentReplay({"mode": "record", "archive": self.archive})
+        for agent, input_text, output in calls:
+            recorder.record(agent, input_text, [[output]], 0.5)
+        return recorder
+
+    def test_roundtrip(self):
+        """Test recorded calls are read back in order"""
+        recorder = self.record([("planner_agent", "plan it", "the plan"), ("coder_agent", "code it", "the code")])
+
+        entries = load_archive(self.archive)
+
+        self.assertEqual(recorder.get_stats()["recorded"], 2)
+        self.assertEqual([e["agent"] for e in entries], ["planner_agent", "coder_agent"])
+        self.assertEqual(entries[1]["output"], [["the code"]])
+        self.assertEqual(entries[1]["duration"], 0.5)
+
+    def test_identical_calls_served_in_recorded_order(self):
+        """Test retries of the same call get the answers recorded for each attempt"""
+        self.record([("coder_agent", "code it", "attempt 1"), ("coder_agent", "code it", "attempt 2")])
+        replay = AgentReplay({"mode": "replay", "archive": self.archive})
+
+        outputs = [replay.lookup("coder_agent", "code it")["output"][0][0] for _ in range(3)]
+
+        self.assertEqual(outputs, ["attempt 1", "attempt 2", "attempt 2"])
+
+    def test_miss_policies(self):
+        """Test unmatched calls fall back to agent order, a live call or an error"""
+        self.record([("coder_agent", "code it", "the code")])
+
+        sequence = AgentReplay({"mode": "replay", "archive": self.archive, "on_miss": "sequence"})
+        self.assertEqual(sequence.lookup("coder_agent", "code it differently")["output"], [["the code"]])
+        self.assertEqual(sequence.get_stats()["sequence"], 1)
+
+        live = AgentReplay({"mode": "replay", "archive": self.archive, "on_miss": "live"})
+        self.assertIsNone(live.lookup("reviewer_agent", "review it"))
+        self.assertFalse(live.offline)
+
+        strict = AgentReplay({"mode": "replay", "archive": self.archive, "on_miss": "error"})
+        with self.assertRaises(ReplayMiss):
+            strict.lookup("coder_agent", "code it differently")
+
+    def test_replay_is_instant_by_default(self):
+        """Test replay skips the recorded latency unless asked to keep it"""
+        self.record([("coder_agent", "code it", "the code")])
+        replay = AgentReplay({"mode": "replay", "archive": self.archive})
+
+        start = time.perf_counter()
+        asyncio.run(replay.serve("coder_agent", "code it"))
+
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_execution_report_converted(self):
+        """Test agent exchanges of a saved execution report become an archive"""
+        report_path = Path(self.archive).with_name("report.json")
+        report_path.write_text(json.dumps({"all_agent_exchanges": [
+            {"agent_name": "planner_agent", "input_raw": "plan it", "output_raw": "the plan", "duration_seconds": 2.0}
+        ]}))
+
+        self.assertEqual(archive_execution_report(str(report_path), self.archive), 1)
+        replay = AgentReplay({"mode": "replay", "archive": self.archive, "on_miss": "error"})
+        self.assertEqual(replay.lookup("planner_agent", "plan it")["output"], [["the plan"]])
+
+    def test_archive_required(self):
+        """Test record and replay modes need an archive path"""
+        with self.assertRaises(ValueError):
+            AgentReplay({"mode": "record", "archive": None})
+
+
+class FakeClient:
+    """Stands in for the ACP client of core.orchestrator_client"""
+    calls = []
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run_sync(self, agent, input):
+        FakeClient.calls.append(agent)
+        return SimpleNamespace(output=[SimpleNamespace(parts=[SimpleNamespace(content=f"live {agent}")])])
+
+
+class TestWorkflowCallPath(unittest.TestCase):
+    """Test record and replay through the call path of the tdd/full/incremental workflows"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.archive = str(Path(tmp.name) / "run.jsonl.gz")
+        self.addCleanup(configure_agent_replay, "off")
+        config = patch.dict(AGENT_REPLAY_CONFIG)
+        config.start()
+        self.addCleanup(config.stop)
+        FakeClient.calls = []
+
+    def call(self, agent, requirements):
+        return asyncio.run(run_team_member_with_tracking(agent, requirements, "tdd_planning"))
+
+    def test_recorded_run_replays_without_server(self):
+        """Test calls recorded through the orchestrator client are replayed without contacting it"""
+        configure_agent_replay("record", self.archive)
+        with patch("core.orchestrator_client.Client", FakeClient):
+            recorded = self.call("planner_agent", "Build a calculator")
+
+        self.assertEqual(recorded["content"], "live planner_agent_wrapper")
+        self.assertEqual(len(load_archive(self.archive)), 1)
+
+        configure_agent_replay("replay", self.archive, on_miss="error")
+        with patch("core.orchestrator_client.Client", side_effect=AssertionError("agent server called")):
+            replayed = self.call("planner_agent", "Build a calculator")
+
+        self.assertEqual(replayed["content"], recorded["content"])
+        self.assertTrue(replayed["metadata"]["replayed"])
+        self.assertEqual(FakeClient.calls, ["planner_agent_wrapper"])
+
+    def test_live_fallback_calls_server(self):
+        """Test an unrecorded call goes to the agent server when on_miss is "live" """
+        configure_agent_replay("record", self.archive)
+        with patch("core.orchestrator_client.Client", FakeClient):
+            self.call("planner_agent", "Build a calculator")
+        configure_agent_replay("replay", self.archive, on_miss="live")
+
+        with patch("core.orchestrator_client.Client", FakeClient):
+            result = self.call("designer_agent", "Design a calculator")
+
+        self.assertEqual(result["content"], "live designer_agent_wrapper")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for the content-addressed ArtifactStore
+"""
+
+import os
+import time
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.executor.artifact_store import ArtifactStore
+
+
+class TestArtifactStore(unittest.TestCase):
+    """Test ArtifactStore storage, restore and eviction"""
+
+    def setUp(self):
+        """Set up a store and a built project"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.store = ArtifactStore(self.temp_dir / "cache", link_mode="hardlink")
+
+        self.project = self.temp_dir / "project"
+        (self.project / "dist" / "assets").mkdir(parents=True)
+        (self.project / "dist" / "index.js").write_text("console.log('app');")
+        (self.project / "dist" / "assets" / "vendor.js").write_text("/* vendor */" * 100)
+
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_put_records_manifest(self):
+        """Test stored builds are listed from their manifest"""
+        self.store.put("node_abc", self.project, ["dist/"])
+
+        self.assertTrue(self.store.has("node_abc"))
+        self.assertEqual(self.store.list_files("node_abc"),
+                         ["dist/assets/vendor.js", "dist/index.js"])
+
+    def test_identical_files_are_stored_once(self):
+        """Test deduplication across builds"""
+        other = self.temp_dir / "other"
+        (other / "build").mkdir(parents=True)
+        shutil.copy(self.project / "dist" / "assets" / "vendor.js", other / "build" / "vendor.js")
+
+        self.store.put("node_abc", self.project, ["dist/"])
+        self.store.put("react_def", other, ["build/"])
+
+        self.assertEqual(self.store.stats["files_stored"], 2)
+        self.assertEqual(self.store.stats["files_deduplicated"], 1)
+
+    def test_restore_hardlinks_blobs(self):
+        """Test restore links files into a fresh project"""
+        self.store.put("node_abc", self.project, ["dist/"])
+        target = self.temp_dir / "restored"
+
+        restored = self.store.restore("node_abc", target)
+
+        self.assertEqual(restored, ["dist/assets/vendor.js", "dist/index.js"])
+        self.assertEqual((target / "dist" / "index.js").read_text(), "console.log('app');")
+        self.assertGreater(os.stat(target / "dist" / "index.js").st_nlink, 1)
+
+    def test_modified_blob_invalidates_build(self):
+        """Test a blob changed through a hardlink is not restored"""
+        self.store.put("node_abc", self.project, ["dist/"])
+        target = self.temp_dir / "restored"
+        self.store.restore("node_abc", target)
+
+        time.sleep(0.01)
+        with open(target / "dist" / "index.js", "a") as f:
+            f.write("// edited in place")
+
+        self.assertIsNone(self.store.restore("node_abc", self.temp_dir / "again"))
+        self.assertFalse(self.store.has("node_abc"))
+
+    def test_lru_eviction(self):
+        """Test least recently used builds are evicted first"""
+        for i, key in enumerate(["old", "recent", "new"]):
+            project = self.temp_dir / key
+            (project / "dist").mkdir(parents=True)
+            (project / "dist" / "bundle.js").write_text(str(i) * 1000)
+
+        self.store.put("old", self.temp_dir / "old", ["dist/"])
+        self.store.put("recent", self.temp_dir / "recent", ["dist/"])
+        self.store.restore("old", self.temp_dir / "old")  # old becomes most recently used
+        self.store.max_size_bytes = 2500
+        self.store.put("new", self.temp_dir / "new", ["dist/"])
+
+        self.assertTrue(self.store.has("old"))
+        self.assertFalse(self.store.has("recent"))
+        self.assertTrue(self.store.has("new"))
+        self.assertEqual(self.store.total_size(), 2000)
+
+
+    def test_eviction_keeps_shared_blobs(self):
+        """Test evicting a build keeps blobs another build still references"""
+        other = self.temp_dir / "other"
+        (other / "build").mkdir(parents=True)
+        shutil.copy(self.project / "dist" / "assets" / "vendor.js", other / "build" / "vendor.js")
+        self.store.put("node_abc", self.project, ["dist/"])
+        self.store.put("react_def", other, ["build/"])
+        manifest = self.store.get_manifest("node_abc")
+        manifest["last_used"] = 0
+        self.store._write_manifest("node_abc", manifest)
+        self.store._load_index(reload=True)
+
+        evicted = self.store.evict(max_size_bytes=self.store.total_size() - 1)
+
+        self.assertEqual(evicted, ["node_abc"])
+        self.assertEqual(self.store.restore("react_def", self.temp_dir / "restored"), ["build/vendor.js"])
+
+    def test_legacy_trees_removed_once(self):
+        """Test only build trees of the copytree cache are deleted, on the first open"""
+        cache = self.temp_dir / "legacy_cache"
+        (cache / "node_0123456789ab" / "dist").mkdir(parents=True)
+        (cache / "notes").mkdir()
+
+        ArtifactStore(cache)
+        (cache / "react_ba9876543210").mkdir()
+        ArtifactStore(cache)
+
+        self.assertFalse((cache / "node_0123456789ab").exists())
+        self.assertTrue((cache / "notes").exists())
+        self.assertTrue((cache / "react_ba9876543210").exists())
+
+    def test_restore_does_not_share_inodes_by_default(self):
+        """Test projects restored without opting into hardlinks get their own files"""
+        store = ArtifactStore(self.temp_dir / "default_cache")
+        store.put("node_abc", self.project, ["dist/"])
+        target = self.temp_dir / "restored"
+
+        store.restore("node_abc", target)
+
+        self.assertEqual(os.stat(target / "dist" / "index.js").st_nlink, 1)
+        with open(target / "dist" / "index.js", "a") as f:
+            f.write("// rebuilt in place")
+        self.assertIsNotNone(store.restore("node_abc", self.temp_dir / "again"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Unit tests for durable workflow checkpoints
+"""
+
+import json
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.data_models import CodingTeamInput, TeamMember
+from workflows.checkpoint_store import WorkflowCheckpoint, list_checkpoints
+from workflows.full.enhanced_full_workflow import WorkflowStateManager
+from workflows.mvp_incremental.tdd_feature_implementer import TDDFeatureResult
+from workflows.mvp_incremental.tdd_phase_tracker import TDDPhase, TDDPhaseTracker
+from workflows.mvp_incremental.test_execution import TestFailureDetail, TestResult
+
+
+def make_input(**kwargs):
+    return CodingTeamInput(
+        requirements="Build a calculator",
+        workflow_type="mvp_incremental",
+        team_members=[TeamMember.planner, TeamMember.coder],
+        **kwargs
+    )
+
+
+class TestWorkflowCheckpoint(unittest.TestCase):
+    """Test persisting and resuming runs"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_restores_progress(self):
+        """Test a reopened session sees phases, data and features of the earlier run"""
+        input_data = make_input()
+        checkpoint = WorkflowCheckpoint.open(input_data, "mvp_incremental", self.dir)
+        checkpoint.save_phase("planning", "the plan", {"review_approved": True})
+        checkpoint.set_data("features", [{"id": "feature_1"}])
+        checkpoint.save_feature("feature_1", {"result": {"final_phase": "GREEN"}})
+
+        self.assertFalse(checkpoint.resumed)
+        self.assertEqual(input_data.session_id, checkpoint.session_id)
+
+        resumed = WorkflowCheckpoint.open(checkpoint.load(checkpoint.session_id, self.dir).get_input(),
+                                          "mvp_incremental", self.dir)
+
+        self.assertTrue(resumed.resumed)
+        self.assertEqual(resumed.get_phase("planning")["output"], "the plan")
+        self.assertEqual(resumed.get_data("features"), [{"id": "feature_1"}])
+        self.assertEqual(resumed.get_feature("feature_1")["result"]["final_phase"], "GREEN")
+        self.assertIsNone(resumed.get_phase("design"))
+
+    def test_input_round_trip(self):
+        """Test the stored input rebuilds the original CodingTeamInput"""
+        checkpoint = WorkflowCheckpoint.create(make_input(max_retries=5, output_path="/tmp/out"),
+                                               "mvp_incremental", self.dir)
+
+        restored = WorkflowCheckpoint.load(checkpoint.session_id, self.dir).get_input()
+
+        self.assertEqual(restored.requirements, "Build a calculator")
+        self.assertEqual(restored.team_members, [TeamMember.planner, TeamMember.coder])
+        self.assertEqual((restored.max_retries, restored.output_path), (5, "/tmp/out"))
+        self.assertEqual(restored.session_id, checkpoint.session_id)
+
+    def test_save_is_atomic_and_complete_removes_file(self):
+        """Test saves leave no temporary file and finished runs are cleaned up"""
+        checkpoint = WorkflowCheckpoint.create(make_input(), "enhanced_full", self.dir)
+        checkpoint.save_phase("design", "the design")
+
+        self.assertEqual([p.name for p in self.dir.iterdir()], [checkpoint.path.name])
+        with open(checkpoint.path) as f:
+            self.assertEqual(json.load(f)["phases"]["design"]["output"], "the design")
+        self.assertEqual([c["session_id"] for c in list_checkpoints(self.dir)], [checkpoint.session_id])
+
+        checkpoint.complete()
+
+        self.assertFalse(checkpoint.path.exists())
+
+    def test_disabled(self):
+        """Test no checkpoint is opened when checkpoints are disabled"""
+        with patch.dict("workflows.checkpoint_store.CHECKPOINT_CONFIG", {"enabled": False}):
+            self.assertIsNone(WorkflowCheckpoint.open(make_input(), "mvp_incremental", self.dir))
+
+    def test_state_manager_restores_phases(self):
+        """Test the enhanced full workflow persists phases and restores them on resume"""
+        input_data = make_input()
+        manager = WorkflowStateManager(WorkflowCheckpoint.open(input_data, "enhanced_full", self.dir))
+        manager.save_checkpoint("planning", "the plan", {"agent": "planner_agent"})
+
+        self.assertIsNone(manager.get_restored_output("planning"))
+
+        resumed = WorkflowStateManager(WorkflowCheckpoint.open(input_data, "enhanced_full", self.dir))
+
+        self.assertEqual(resumed.get_restored_output("planning"), "the plan")
+        self.assertIsNone(resumed.get_restored_output("design"))
+
+
+class TestFeatureState(unittest.TestCase):
+    """Test serializing feature results and TDD phases"""
+
+    def test_feature_result_round_trip(self):
+        """Test a TDD feature result survives JSON serialization"""
+        failure = TestFailureDetail("test_add", "tests/test_calc.py", "AssertionError", "1 != 2")
+        result = TDDFeatureResult(
+            feature_id="feature_1",
+            feature_title="Add numbers",
+            test_code="def test_add(): ...",
+            implementation_code="def add(a, b): return a + b",
+            initial_test_result=TestResult(False, 0, 1, [], "1 failed", ["tests/test_calc.py"],
+                                           failure_details=[failure], expected_failure=True),
+            final_test_result=TestResult(True, 1, 0, [], "1 passed", ["tests/test_calc.py"]),
+            success=True,
+            final_phase=TDDPhase.GREEN
+        )
+
+        restored = TDDFeatureResult.from_dict(json.loads(json.dumps(result.to_dict())))
+
+        self.assertEqual(restored, result)
+
+    def test_phase_tracker_export_and_restore(self):
+        """Test a feature's phase and history move between trackers"""
+        tracker = TDDPhaseTracker()
+        tracker.start_feature("feature_1")
+        tracker.transition_to("feature_1", TDDPhase.YELLOW, "tests pass")
+        tracker.transition_to("feature_1", TDDPhase.GREEN, "approved")
+
+        restored = TDDPhaseTracker()
+        restored.restore_feature("feature_1", json.loads(json.dumps(tracker.export_feature("feature_1"))))
+
+        self.assertTrue(restored.is_feature_complete("feature_1"))
+        self.assertEqual([t.to_phase for t in restored.get_phase_history("feature_1")],
+                         [TDDPhase.RED, TDDPhase.YELLOW, TDDPhase.GREEN])
+
+
+if __name__ == '__main__':
+    unittest.main()
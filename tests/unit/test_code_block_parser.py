@@ -0,0 +1,121 @@
+"""
+Unit tests for the shared code block parser
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.code_block_parser import (
+    CodeBlockParser, parse_code_blocks, extract_files, get_cache_stats, clear_cache,
+    FILENAME, HASH_FILENAME, HASH_SECTION, FILE, MARKDOWN, FENCE_INFO, ANONYMOUS
+)
+
+
+MIXED_OUTPUT = """Here is the implementation.
+
+FILENAME: app/main.py
+```python
+def main():
+    return "```"
+```
+
+```javascript
+# filename: web/server.js
+const app = express();
+```
+
+File: README.md
+```markdown
+# Title
+```
+
+### config.yaml
+
+```yaml
+debug: true
+```
+
+```python tools.py
+x = 1
+```
+
+```
+plain text
+```
+
+```python
+# filename: broken.py
+never closed
+"""
+
+
+class TestCodeBlockParser(unittest.TestCase):
+    """Test block recognition"""
+
+    def setUp(self):
+        clear_cache()
+
+    def test_all_formats_in_one_pass(self):
+        """Test each marker style is recognised"""
+        blocks = parse_code_blocks(MIXED_OUTPUT)
+        found = [(block.filename, block.style) for block in blocks]
+
+        self.assertEqual(found, [
+            ("app/main.py", FILENAME),
+            ("web/server.js", HASH_FILENAME),
+            ("README.md", FILE),
+            ("config.yaml", MARKDOWN),
+            ("tools.py", FENCE_INFO),
+            (None, ANONYMOUS)
+        ])
+        # Backticks inside a line do not close the fence; the unclosed fence is dropped
+        self.assertEqual(blocks[0].content, 'def main():\n    return "```"')
+        self.assertEqual(blocks[1].language, "javascript")
+
+    def test_unfenced_sections(self):
+        """Test "# filename:" sections without fences run to the next marker"""
+        output = "# filename: a.py\nimport os\n\n# filename: b.py\n```python\nprint(1)\n```\n"
+
+        files = extract_files(output, styles=(HASH_FILENAME, HASH_SECTION))
+
+        self.assertEqual(files, {"a.py": "import os", "b.py": "print(1)"})
+        self.assertEqual(extract_files(output, styles=(HASH_FILENAME,)), {"b.py": "print(1)"})
+
+    def test_streaming_matches_whole_parse(self):
+        """Test feeding arbitrary chunks gives the same blocks"""
+        expected = list(parse_code_blocks(MIXED_OUTPUT))
+
+        for size in (1, 7, 64):
+            parser = CodeBlockParser()
+            blocks = []
+            for start in range(0, len(MIXED_OUTPUT), size):
+                blocks.extend(parser.feed(MIXED_OUTPUT[start:start + size]))
+            blocks.extend(parser.close())
+            self.assertEqual(blocks, expected)
+
+    def test_parse_is_memoized(self):
+        """Test re-parsing the same output hits the cache"""
+        first = parse_code_blocks(MIXED_OUTPUT)
+        second = parse_code_blocks(MIXED_OUTPUT)
+
+        self.assertIs(first, second)
+        stats = get_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_extract_files_filters(self):
+        """Test filtering by style and language"""
+        self.assertEqual(
+            extract_files(MIXED_OUTPUT, languages=("python",)),
+            {"app/main.py": 'def main():\n    return "```"', "tools.py": "x = 1"}
+        )
+        self.assertEqual(list(extract_files(MIXED_OUTPUT, styles=(FILE, MARKDOWN))),
+                         ["README.md", "config.yaml"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the token-budgeted context builder
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.context_builder import (
+    ContextBuilder, summarize_file, failing_files, estimate_tokens
+)
+
+
+CODE = {
+    "app/db.py": "import sqlite3\n\n\ndef connect(url):\n    \"\"\"Open a connection\"\"\"\n    return sqlite3.connect(url)\n",
+    "app/models/user.py": (
+        "from app.db import connect\n\n\n"
+        "class User:\n"
+        "    table = 'users'\n\n"
+        "    def save(self):\n"
+        "        connect('db').execute('insert')\n"
+    ),
+    "app/reports.py": "def monthly_report(rows):\n" + "    total = sum(rows)\n" * 200 + "    return total\n",
+    "web/server.js": "const express = require('express');\nfunction start(port) {\n  return express().listen(port);\n}\n",
+}
+
+
+class TestRanking(unittest.TestCase):
+    """Test relevance ranking"""
+
+    def setUp(self):
+        self.builder = ContextBuilder()
+
+    def test_test_imports_and_import_graph(self):
+        """Test files imported by the tests rank first and pull in their imports"""
+        ranked = self.builder.rank_files(CODE, focus_text="```python\nfrom app.models.user import User\n```")
+        names = [name for name, _ in ranked]
+
+        self.assertEqual(names[:2], ["app/models/user.py", "app/db.py"])
+        self.assertEqual(dict(ranked)["app/reports.py"], 0.0)
+
+    def test_failing_locations_and_symbols(self):
+        """Test traceback locations and referenced symbols raise relevance"""
+        output = 'File "/code/app/reports.py", line 3, in monthly_report'
+        self.assertEqual(failing_files(output), ["/code/app/reports.py"])
+
+        ranked = self.builder.rank_files(CODE, focus_text="Start the server", failing_output=output)
+        names = [name for name, _ in ranked]
+
+        self.assertEqual(names[0], "app/reports.py")
+        self.assertIn("web/server.js", names[:2])
+
+
+class TestBuild(unittest.TestCase):
+    """Test budgeted rendering"""
+
+    def test_everything_fits(self):
+        """Test small codebases are shown in full"""
+        context = ContextBuilder(token_budget=100000).build(CODE)
+
+        for content in CODE.values():
+            self.assertIn(content, context)
+        self.assertNotIn("signatures only", context)
+
+    def test_budget_uses_stubs_and_listing(self):
+        """Test irrelevant large files are reduced to stubs or names"""
+        budget = 150
+        context = ContextBuilder(token_budget=budget).build(
+            CODE, focus_text="from app.models.user import User"
+        )
+
+        self.assertIn(CODE["app/models/user.py"], context)
+        self.assertIn("=== app/reports.py === (signatures only)\ndef monthly_report(rows):\n    ...", context)
+        self.assertNotIn("total = sum(rows)", context)
+        self.assertLessEqual(estimate_tokens(context), budget + 50)
+
+    def test_empty(self):
+        """Test the message for no existing code"""
+        self.assertEqual(ContextBuilder().build({}), "No existing code yet.")
+
+
+class TestSummaries(unittest.TestCase):
+    """Test file analysis"""
+
+    def test_python_summary(self):
+        """Test symbols, imports and stubs of a Python file"""
+        summary = summarize_file("app/models/user.py", CODE["app/models/user.py"])
+
+        self.assertEqual(summary.symbols, {"User", "save"})
+        self.assertIn("app.db", summary.imports)
+        self.assertIn("    def save(self):\n        ...", summary.stub)
+
+    def test_summary_cached_by_content(self):
+        """Test identical content is analyzed once"""
+        first = summarize_file("a.py", "def f():\n    return 1\n")
+        second = summarize_file("b.py", "def f():\n    return 1\n")
+
+        self.assertIs(first, second)
+
+    def test_unparseable_file_falls_back_to_preview(self):
+        """Test files with syntax errors still get a stub"""
+        summary = summarize_file("broken.py", "def broken(:\n" + "x\n" * 20)
+
+        self.assertTrue(summary.stub.startswith("def broken(:"))
+        self.assertTrue(summary.stub.endswith("..."))
+
+
+if __name__ == '__main__':
+    unittest.main()
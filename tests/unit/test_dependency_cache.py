@@ -0,0 +1,223 @@
+"""
+Unit tests for the shared DependencyCache
+"""
+
+import json
+import os
+import unittest
+import tempfile
+import shutil
+from pathlib import Path
+import sys
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents.executor.dependency_cache import (
+    DependencyCache, normalize_requirements, requirement_names, wheel_supported
+)
+
+
+class TestDependencyCache(unittest.TestCase):
+    """Test dependency normalization, install environment and snapshots"""
+
+    def setUp(self):
+        """Set up a cache and a Node.js project"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = DependencyCache(self.temp_dir / "cache")
+        self.cache._node_version = "v20.0.0"
+
+        self.project = self.temp_dir / "project"
+        self.project.mkdir()
+        (self.project / "package.json").write_text(json.dumps({
+            "dependencies": {"express": "^4.18.0"},
+            "devDependencies": {"jest": "^29.0.0"}
+        }))
+
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir)
+
+    def _install_node_modules(self, project: Path):
+        (project / "node_modules" / "express" / "lib").mkdir(parents=True)
+        (project / "node_modules" / "express" / "lib" / "index.js").write_text("module.exports = {};")
+        (project / "node_modules" / ".bin").mkdir()
+        os.symlink("../express/lib/index.js", project / "node_modules" / ".bin" / "express")
+
+    def test_normalize_requirements(self):
+        """Test formatting differences map to the same dependency set"""
+        first = "FastAPI==0.104.1\n# web\nuvicorn[standard] >= 0.24\n"
+        second = "uvicorn[standard]>=0.24  # server\n\nfastapi==0.104.1\nfastapi==0.104.1\n"
+
+        self.assertEqual(normalize_requirements(first), normalize_requirements(second))
+        self.assertEqual(self.cache.python_key(first), self.cache.python_key(second))
+        self.assertEqual(requirement_names("Flask_SQLAlchemy>=3\n--index-url x\n"), ["flask-sqlalchemy"])
+
+    def test_install_env(self):
+        """Test installs are pointed at the shared caches"""
+        self.assertEqual(DependencyCache.detect_ecosystem("pip install -r requirements.txt"), "python")
+        self.assertEqual(DependencyCache.detect_ecosystem("npm ci"), "node")
+        self.assertIsNone(DependencyCache.detect_ecosystem("mvn package"))
+
+        self.assertEqual(self.cache.install_env("node")["npm_config_cache"], str(self.cache.npm_cache_dir))
+        self.assertNotIn("PIP_NO_INDEX", self.cache.install_env("python"))
+        self.cache.offline = True
+        self.assertEqual(self.cache.install_env("python")["PIP_NO_INDEX"], "1")
+
+    def test_node_snapshot_round_trip(self):
+        """Test a saved node_modules snapshot is restored into a matching project"""
+        self._install_node_modules(self.project)
+        self.assertIsNotNone(self.cache.save_node_snapshot(self.project))
+
+        other = self.temp_dir / "other"
+        other.mkdir()
+        shutil.copy(self.project / "package.json", other / "package.json")
+
+        self.assertTrue(self.cache.restore_node_snapshot(other))
+        restored = other / "node_modules" / "express" / "lib" / "index.js"
+        self.assertEqual(restored.read_text(), "module.exports = {};")
+        self.assertTrue((other / "node_modules" / ".bin" / "express").is_symlink())
+        self.assertEqual(self.cache.stats["snapshot_hits"], 1)
+
+    def test_changed_dependencies_miss_snapshot(self):
+        """Test a different dependency set does not reuse a snapshot"""
+        self._install_node_modules(self.project)
+        self.cache.save_node_snapshot(self.project)
+
+        other = self.temp_dir / "other"
+        other.mkdir()
+        (other / "package.json").write_text(json.dumps({"dependencies": {"express": "^5.0.0"}}))
+
+        self.assertFalse(self.cache.restore_node_snapshot(other))
+        self.assertFalse((other / "node_modules").exists())
+
+    def test_snapshot_eviction(self):
+        """Test least recently used snapshots are removed"""
+        self.cache.max_snapshots = 1
+        for version in ["1.0.0", "2.0.0"]:
+            project = self.temp_dir / version
+            project.mkdir()
+            (project / "package.json").write_text(json.dumps({"dependencies": {"lodash": version}}))
+            self._install_node_modules(project)
+            self.cache.save_node_snapshot(project)
+
+        self.assertEqual(self.cache.get_stats()["snapshots"], 1)
+        self.assertIsNotNone(self.cache.node_snapshot_for({"dependencies": {"lodash": "2.0.0"}}))
+
+    def test_modified_snapshot_discarded(self):
+        """Test a project writing to a hardlinked file invalidates the snapshot"""
+        self._install_node_modules(self.project)
+        self.cache.save_node_snapshot(self.project)
+
+        for name in ["other", "third"]:
+            (self.temp_dir / name).mkdir()
+            shutil.copy(self.project / "package.json", self.temp_dir / name / "package.json")
+        self.assertTrue(self.cache.restore_node_snapshot(self.temp_dir / "other"))
+        with open(self.temp_dir / "other" / "node_modules" / "express" / "lib" / "index.js", "a") as f:
+            f.write("// patched")
+
+        self.assertFalse(self.cache.restore_node_snapshot(self.temp_dir / "third"))
+        self.assertEqual(self.cache.get_stats()["snapshots"], 0)
+
+    def test_split_requirements_install(self):
+        """Test only the pip requirements step of an install command is served by a snapshot"""
+        split = DependencyCache.split_requirements_install
+
+        self.assertEqual(split("pip install -r requirements.txt"), "")
+        self.assertEqual(split("pip install -q -r requirements.txt && pip install -e ."), "pip install -e .")
+        self.assertIsNone(split("pip install -r requirements.txt; pytest"))
+        self.assertIsNone(split("pip install -r requirements.txt || true"))
+        self.assertIsNone(split("pip install flask -r requirements.txt"))
+        self.assertIsNone(split("npm ci"))
+
+    def test_python_snapshot_fills_wheelhouse(self):
+        """Test building a Python snapshot downloads wheels before installing"""
+        commands = []
+
+        def run(command, env):
+            commands.append(command)
+            return True
+
+        with patch.object(self.cache, "_run", side_effect=run):
+            self.assertIsNotNone(self.cache.python_snapshot("flask==3.0.0\n"))
+
+        self.assertEqual(commands[0][1:4], ["-m", "pip", "wheel"])
+        self.assertEqual(commands[-1][-3:-1], ["install", "-r"])
+
+        self.cache.offline = True
+        commands.clear()
+        with patch.object(self.cache, "_run", side_effect=run):
+            self.cache.python_snapshot("requests==2.31.0\n")
+        self.assertFalse(any("wheel" in command for command in commands))
+
+    def test_layered_venv_keeps_snapshot_read_only(self):
+        """Test extra install steps get a project venv layered on the snapshot"""
+        snapshot = self.temp_dir / "snapshot" / "venv"
+        commands = []
+
+        def run(command, env):
+            commands.append(command)
+            return True
+
+        with patch.object(self.cache, "_run", side_effect=run):
+            venv = self.cache.layered_venv(snapshot, self.project / ".venv")
+
+        self.assertEqual(venv, self.project / ".venv")
+        self.assertEqual(commands, [[sys.executable, "-m", "venv", str(venv)]])
+        pth = DependencyCache.venv_site_packages(venv) / "_dependency_snapshot.pth"
+        self.assertEqual(pth.read_text().strip(), str(DependencyCache.venv_site_packages(snapshot).resolve()))
+
+        environment = DependencyCache.venv_environment(venv, snapshot)
+        self.assertEqual(environment["VIRTUAL_ENV"], str(venv))
+        bin_dirs = environment["PATH"].split(os.pathsep)[:2]
+        self.assertEqual([Path(d).parent for d in bin_dirs], [venv, snapshot])
+
+        with patch.object(self.cache, "_run", return_value=False):
+            self.assertIsNone(self.cache.layered_venv(snapshot, self.project / ".venv"))
+
+    def test_wheels_for_stages_resolved_set(self):
+        """Test the wheels pip resolved, dependencies included, are staged"""
+        resolved = [
+            "flask-3.0.0-py3-none-any.whl",
+            "werkzeug-3.0.1-py3-none-any.whl",
+            "markupsafe-2.1.3-cp311-cp311-macosx_11_0_arm64.whl",
+        ]
+
+        def run(command, env):
+            wheel_dir = Path(command[command.index("-w") + 1])
+            for name in resolved:
+                (wheel_dir / name).write_text("wheel")
+            return True
+
+        self.assertEqual(self.cache.wheels_for("flask==3.0.0\n"), [])
+        with patch.object(self.cache, "_run", side_effect=run):
+            self.assertTrue(self.cache.populate_wheelhouse("flask==3.0.0\n"))
+
+        names = [wheel.name for wheel in self.cache.wheels_for("flask==3.0.0\n")]
+        self.assertEqual(names, sorted(resolved))
+        self.assertTrue(all((self.cache.wheelhouse / name).exists() for name in resolved))
+        # The host-built macOS wheel cannot be installed in a Linux container
+        names = [wheel.name for wheel in self.cache.wheels_for("flask==3.0.0\n", python_version="3.11")]
+        self.assertEqual(names, ["flask-3.0.0-py3-none-any.whl", "werkzeug-3.0.1-py3-none-any.whl"])
+        self.assertEqual(self.cache.wheels_for("django==5.0\n"), [])
+
+    def test_wheel_supported(self):
+        """Test wheel tags are matched against the container's Python"""
+        with patch("agents.executor.dependency_cache.platform.machine", return_value="x86_64"):
+            self.assertTrue(wheel_supported("six-1.16.0-py2.py3-none-any.whl", "3.9"))
+            self.assertTrue(wheel_supported("pkg-1.0-py38-none-any.whl", "3.9"))
+            self.assertFalse(wheel_supported("pkg-1.0-py310-none-any.whl", "3.9"))
+            glibc = "markupsafe-2.1.3-cp39-cp39-manylinux_2_17_x86_64.manylinux2014_x86_64.whl"
+            self.assertTrue(wheel_supported(glibc, "3.9"))
+            self.assertFalse(wheel_supported(glibc, "3.11"))
+            self.assertFalse(wheel_supported(glibc, "3.9", musl=True))
+            self.assertTrue(wheel_supported("pkg-1.0-cp39-cp39-musllinux_1_1_x86_64.whl", "3.9", musl=True))
+            self.assertTrue(wheel_supported("pkg-1.0-cp38-abi3-manylinux2014_x86_64.whl", "3.11"))
+            self.assertFalse(wheel_supported("pkg-1.0-cp39-cp39-manylinux2014_aarch64.whl", "3.9"))
+            self.assertFalse(wheel_supported("pkg-1.0-cp39-cp39-win_amd64.whl", "3.9"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Unit tests for the mock agent server used by the workflow engine benchmark
+"""
+
+import asyncio
+import random
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from orchestrator.mock_agent_server import LatencyModel, MockAgentBackend
+from shared.utils.code_block_parser import extract_files
+from workflows.mvp_incremental.testable_feature_parser import TestableFeatureParser
+
+
+class TestLatencyModel(unittest.TestCase):
+    """Test parsing and sampling latency distributions"""
+
+    def test_parse(self):
+        """Test the supported spec formats"""
+        self.assertEqual(LatencyModel.parse("0.5"), LatencyModel("fixed", [0.5]))
+        self.assertEqual(LatencyModel.parse("uniform:0.1,0.3"), LatencyModel("uniform", [0.1, 0.3]))
+        self.assertEqual(LatencyModel.parse("lognormal:1,0.4"), LatencyModel("lognormal", [1.0, 0.4]))
+        with self.assertRaises(ValueError):
+            LatencyModel.parse("lognormal:1")
+
+    def test_sampling_is_seeded(self):
+        """Test the same seed gives the same latencies"""
+        model = LatencyModel.parse("lognormal:0.5,0.3")
+        first = [model.sample(random.Random(7)) for _ in range(3)]
+        second = [model.sample(random.Random(7)) for _ in range(3)]
+
+        self.assertEqual(first, second)
+        self.assertTrue(all(latency > 0 for latency in first))
+
+    def test_per_agent_latency(self):
+        """Test agent overrides take precedence over the default"""
+        backend = MockAgentBackend(latency=LatencyModel.parse("fixed:0"),
+                                   agent_latency={"coder_agent": LatencyModel.parse("fixed:0.02")})
+
+        self.assertEqual(backend.sample_latency("planner_agent"), 0)
+        self.assertEqual(backend.sample_latency("coder_agent"), 0.02)
+
+
+class TestResponses(unittest.TestCase):
+    """Test the templated responses work with the workflow parsers"""
+
+    def setUp(self):
+        self.backend = MockAgentBackend(features=3)
+
+    def test_design_parses_into_features(self):
+        """Test the design yields one testable feature per module"""
+        features = TestableFeatureParser.parse_features_with_criteria(self.backend.respond("designer_agent", ""))
+
+        self.assertEqual([f.title for f in features], ["Mock Module 1", "Mock Module 2", "Mock Module 3"])
+
+    def test_feature_tests_fail_until_implemented(self):
+        """Test a feature's tests import only that feature's module, which the coder provides"""
+        context = "DESIGN CONTEXT:\nFEATURE[1]: Mock Module 1\n...\nFEATURE TO TEST:\nTitle: Mock Module 2\n"
+        tests = extract_files(self.backend.respond("test_writer_agent", context))
+        code = extract_files(self.backend.respond("coder_agent", context.replace("TEST", "IMPLEMENT")))
+
+        self.assertEqual(list(tests), ["tests/test_mock_module_2.py"])
+        self.assertIn("mock_app/module_2.py", code)
+        self.assertNotIn("mock_app/module_1.py", code)
+
+        namespace = {}
+        exec(code["mock_app/module_2.py"], namespace)
+        self.assertEqual(namespace["module_2"](42), 42)
+
+    def test_whole_design_implemented_at_once(self):
+        """Test a coder call without a single feature implements every module"""
+        design = self.backend.respond("designer_agent", "")
+
+        code = extract_files(self.backend.respond("coder_agent", design))
+
+        self.assertEqual(sorted(f for f in code if "module_" in f),
+                         ["mock_app/module_1.py", "mock_app/module_2.py", "mock_app/module_3.py"])
+
+    def test_reviews_and_validation_pass(self):
+        """Test review and validation markers the workflows look for"""
+        self.assertIn("APPROVED", self.backend.respond("reviewer_agent", ""))
+        self.assertIn("APPROVED", self.backend.respond("feature_reviewer_agent", ""))
+        self.assertIn("VALIDATION_RESULT: PASS", self.backend.respond("validator_agent", ""))
+
+    def test_recordings_replayed_in_order(self):
+        """Test recorded outputs are served in turn and counted"""
+        backend = MockAgentBackend(recordings={"planner_agent": ["plan A", "plan B"]})
+
+        async def calls():
+            return [await backend.handle("planner_agent", "") for _ in range(3)]
+
+        self.assertEqual(asyncio.run(calls()), ["plan A", "plan B", "plan A"])
+        self.assertEqual(backend.get_stats()["calls"], {"planner_agent": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
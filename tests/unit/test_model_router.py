@@ -0,0 +1,110 @@
+"""
+Unit tests for model cascade routing
+"""
+
+import unittest
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.feature_parser import ComplexityLevel
+from shared.utils.model_router import ModelRouter, add_model_directive, resolve_model
+from shared.utils.speculation import Candidate
+
+
+LADDER = ["cheap", "mid", "strong"]
+
+
+def make_router(**kwargs):
+    kwargs.setdefault("explore_rate", 0.0)
+    return ModelRouter(ladder=LADDER, **kwargs)
+
+
+class TestSelection(unittest.TestCase):
+    """Test tier selection"""
+
+    def test_start_by_complexity_and_escalate_on_retries(self):
+        """Test complexity picks the starting tier and retries climb the ladder"""
+        router = make_router()
+
+        self.assertEqual(router.select("coder_agent", ComplexityLevel.LOW).model, "cheap")
+        self.assertEqual(router.select("coder_agent", "high").model, "mid")
+        self.assertEqual(router.select("coder_agent", ComplexityLevel.LOW, retry_count=1).model, "mid")
+        self.assertEqual(router.select("coder_agent", ComplexityLevel.LOW, retry_count=5).model, "strong")
+
+    def test_learns_starting_tier(self):
+        """Test a failing cheap tier is skipped and a proven one is preferred"""
+        router = make_router(min_samples=3)
+        low = router.select("coder_agent", ComplexityLevel.LOW)
+        for _ in range(3):
+            router.record(low, success=False, latency=5.0)
+
+        self.assertEqual(router.select("coder_agent", ComplexityLevel.LOW).model, "mid")
+
+        medium = router.select("coder_agent", ComplexityLevel.MEDIUM)
+        cheap_medium = replace(medium, model="cheap", tier=0)
+        for _ in range(3):
+            router.record(cheap_medium, success=True, latency=2.0)
+
+        self.assertEqual(router.select("coder_agent", ComplexityLevel.MEDIUM).model, "cheap")
+        # Other agents have their own routes
+        self.assertEqual(router.select("test_writer_agent", ComplexityLevel.LOW).model, "cheap")
+
+    def test_stats_persist(self):
+        """Test route statistics survive a new router"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "routes.json"
+            router = make_router(stats_path=path)
+            decision = router.select("coder_agent", ComplexityLevel.LOW)
+            router.record(decision, success=True, latency=3.0)
+            router.record(decision, success=False, latency=1.0)
+            router.save()
+
+            stats = make_router(stats_path=path).get_stats()
+
+        self.assertEqual(stats["coder_agent:low"]["cheap"],
+                         {"calls": 2, "success_rate": 0.5, "avg_latency": 2.0})
+
+    def test_speculative_round_records_each_candidate(self):
+        """Test every validated candidate counts as a call, failed generations don't"""
+        router = make_router()
+        decision = router.select("coder_agent", ComplexityLevel.LOW)
+
+        router.record_candidates(decision, [
+            Candidate(index=0, variant="a", result="code", success=False, duration=4.0),
+            Candidate(index=1, variant="b", result="code", success=True, duration=2.0),
+            Candidate(index=2, variant="c", error="coder unavailable")
+        ])
+
+        self.assertEqual(router.get_stats()["coder_agent:low"]["cheap"],
+                         {"calls": 2, "success_rate": 0.5, "avg_latency": 3.0})
+
+
+class TestDirective(unittest.TestCase):
+    """Test passing the model to agents"""
+
+    def test_resolve_strips_directive(self):
+        """Test agents get the routed model and a prompt without the directive"""
+        part = SimpleNamespace(content=add_model_directive("Implement X", "openai:gpt-4o"))
+        message = SimpleNamespace(parts=[part])
+
+        self.assertEqual(resolve_model([message], "openai:gpt-4o-mini"), "openai:gpt-4o")
+        self.assertEqual(part.content, "Implement X")
+
+    def test_unknown_or_missing_model_uses_default(self):
+        """Test only ladder models are accepted"""
+        unknown = SimpleNamespace(parts=[SimpleNamespace(content="MODEL: made-up\nImplement X")])
+        plain = SimpleNamespace(parts=[SimpleNamespace(content="Implement X")])
+
+        self.assertEqual(resolve_model([unknown], "default"), "default")
+        self.assertEqual(resolve_model([plain], "default"), "default")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Unit tests for the shared ProjectIndex
+"""
+
+import os
+import pytest
+from shared.utils import project_index
+from shared.utils.project_index import ProjectIndex, get_project_index
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a small Node.js + Python project"""
+    (tmp_path / "package.json").write_text('{"dependencies": {"express": "^4"}, "devDependencies": {"jest": "^29"}}')
+    (tmp_path / "requirements.txt").write_text("fastapi\nredis\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "server.js").write_text("const port = process.env.PORT;\n")
+    (tmp_path / "src" / "util.js").write_text("module.exports = {};\n")
+    (tmp_path / "node_modules" / "express").mkdir(parents=True)
+    (tmp_path / "node_modules" / "express" / "index.js").write_text("process.env.NODE_ENV\n")
+    return tmp_path
+
+
+class TestProjectIndex:
+
+    def test_index_skips_dependency_directories(self, project):
+        """Test files are indexed once, without node_modules"""
+        index = ProjectIndex(project)
+
+        assert index.exists("package.json")
+        assert index.exists(os.path.join("src", "server.js"))
+        assert not any(path.startswith("node_modules") for path in index.files)
+        assert "src" in index.directories
+        assert index.files["requirements.txt"].size == len("fastapi\nredis\n")
+
+    def test_index_skips_build_output(self, project):
+        """Test build and coverage output directories are not indexed"""
+        for name in ("dist", "build", "coverage"):
+            (project / name).mkdir()
+            (project / name / "bundle.js").write_text("process.env.BUNDLED\n")
+
+        index = ProjectIndex(project)
+
+        assert set(index.files) == {
+            "package.json", "requirements.txt", os.path.join("src", "server.js"), os.path.join("src", "util.js")
+        }
+        assert not {"dist", "build", "coverage"} & index.directories
+
+    def test_large_files_hashed_in_chunks(self, project, monkeypatch):
+        """Test files over the text limit are hashed without keeping their text"""
+        monkeypatch.setattr(project_index, "HASH_CHUNK_SIZE", 4)
+        (project / "asset.bin").write_bytes(b"x" * 64)
+        index = ProjectIndex(project, max_text_size=16)
+
+        asset = index.files["asset.bin"]
+        assert asset.text is None
+        assert index.read_text("requirements.txt") == "fastapi\nredis\n"
+
+        (project / "asset.bin").write_bytes(b"y" * 64)
+        assert index.refresh() == {"asset.bin"}
+        assert index.files["asset.bin"].content_hash != asset.content_hash
+
+    def test_manifests(self, project):
+        """Test parsed package.json and requirements text"""
+        index = ProjectIndex(project)
+
+        assert index.package_dependencies() == {"express": "^4", "jest": "^29"}
+        assert "fastapi" in index.read_text("requirements.txt")
+        assert index.read_json("missing.json") is None
+
+    def test_find_matches(self, project):
+        """Test pattern scans return captures per file"""
+        index = ProjectIndex(project)
+
+        matches = index.find_matches([r'process\.env\.(\w+)'], ['.js'])
+
+        assert matches == {os.path.join("src", "server.js"): {"PORT"}}
+
+    def test_find_matches_combines_patterns(self, project):
+        """Test captures of every pattern are found in one scan"""
+        (project / "app.py").write_text("os.getenv('DB_URL')\nos.environ.get(\"SECRET\")\nTODO\n")
+        index = ProjectIndex(project)
+
+        matches = index.find_matches([
+            r'os\.getenv\(["\'](\w+)["\']',
+            r'os\.environ\.get\(["\'](?:\w+_)?(\w+)["\']',
+            r'TODO'
+        ], ['.py'])
+
+        assert matches == {"app.py": {"DB_URL", "SECRET", "TODO"}}
+
+    def test_refresh_only_rereads_changed_files(self, project):
+        """Test incremental refresh"""
+        index = ProjectIndex(project)
+        index.find_matches([r'process\.env\.(\w+)'], ['.js'])
+        files_read = index.files_read
+
+        server = project / "src" / "server.js"
+        server.write_text("const port = process.env.PORT;\nconst url = process.env.API_URL;\n")
+        (project / "src" / "util.js").unlink()
+
+        changed = index.refresh()
+
+        assert changed == {os.path.join("src", "server.js"), os.path.join("src", "util.js")}
+        assert index.files_read == files_read + 1
+        assert index.find_matches([r'process\.env\.(\w+)'], ['.js']) == {
+            os.path.join("src", "server.js"): {"PORT", "API_URL"}
+        }
+
+    def test_get_project_index_is_shared(self, project):
+        """Test one index per project root"""
+        first = get_project_index(project)
+        (project / "new.py").write_text("import os\n")
+
+        second = get_project_index(project)
+
+        assert first is second
+        assert second.exists("new.py")
+
+    def test_get_project_index_drops_least_recently_used(self, tmp_path, monkeypatch):
+        """Test the number of shared indexes is bounded"""
+        monkeypatch.setattr(project_index, "MAX_INDEXES", 2)
+        monkeypatch.setattr(project_index, "_indexes", project_index.OrderedDict())
+        roots = [tmp_path / name for name in ("one", "two", "three")]
+        for root in roots:
+            root.mkdir()
+
+        first = get_project_index(roots[0])
+        get_project_index(roots[1])
+        get_project_index(roots[0])
+        get_project_index(roots[2])
+
+        assert get_project_index(roots[0]) is first
+        assert str(roots[1].resolve()) not in project_index._indexes
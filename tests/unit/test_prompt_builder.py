@@ -0,0 +1,104 @@
+"""
+Unit tests for stable-prefix prompt building and prefix reuse tracking
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.prompt_builder import (
+    PromptBuilder, PromptCacheTracker, cacheable_tokens, get_prompt_cache_tracker, prompt_cache_scope
+)
+
+
+INSTRUCTIONS = "Follow the rules.\n" * 400  # ~1800 tokens
+
+
+class TestPromptBuilder(unittest.TestCase):
+    """Test prompt assembly"""
+
+    def test_stable_sections_come_first(self):
+        """Test volatile sections are placed after stable ones regardless of call order"""
+        builder = PromptBuilder()
+        builder.volatile("Retry attempt 2")
+        builder.stable("INSTRUCTIONS", "")
+        builder.volatile("Feedback: fix it")
+        builder.stable("REQUIREMENTS")
+
+        self.assertEqual(builder.build(), "INSTRUCTIONS\n\nREQUIREMENTS\n\nRetry attempt 2\n\nFeedback: fix it")
+        self.assertEqual(builder.prefix, "INSTRUCTIONS\n\nREQUIREMENTS")
+
+
+class TestPromptCacheTracker(unittest.TestCase):
+    """Test prefix reuse measurement"""
+
+    def test_shared_prefix_counts_as_cache_hit(self):
+        """Test a second prompt with the same stable prefix is mostly cacheable"""
+        tracker = PromptCacheTracker()
+
+        first = PromptBuilder().stable(INSTRUCTIONS).volatile("Feature A").build()
+        second = PromptBuilder().stable(INSTRUCTIONS).volatile("Feature B, retry 1").build()
+
+        self.assertEqual(tracker.record("coder_agent", first), 0)
+        hit = tracker.record("coder_agent", second)
+
+        self.assertGreaterEqual(hit, 1024)
+        self.assertEqual(hit % 128, 0)
+        stats = tracker.get_stats()
+        self.assertEqual(stats["agents"]["coder_agent"]["calls"], 2)
+        self.assertGreater(stats["agents"]["coder_agent"]["prefix_reuse_ratio"], 0.4)
+        self.assertEqual(stats["total"]["cache_hit_tokens"], hit)
+
+    def test_volatile_prefix_defeats_caching(self):
+        """Test prompts starting with changing content get no cache hits"""
+        tracker = PromptCacheTracker()
+
+        tracker.record("reviewer", f"Retry attempt 1\n{INSTRUCTIONS}")
+        hit = tracker.record("reviewer", f"Retry attempt 2\n{INSTRUCTIONS}")
+
+        self.assertEqual(hit, 0)
+
+    def test_agents_tracked_separately(self):
+        """Test prefixes are only compared within one agent"""
+        tracker = PromptCacheTracker()
+
+        tracker.record("coder_agent", INSTRUCTIONS)
+        self.assertEqual(tracker.record("test_writer_agent", INSTRUCTIONS), 0)
+
+    def test_cacheable_tokens_threshold(self):
+        """Test short prefixes are not cached and long ones round to blocks"""
+        self.assertEqual(cacheable_tokens(1000), 0)
+        self.assertEqual(cacheable_tokens(1100), 1024)
+        self.assertEqual(cacheable_tokens(2000), 1920)
+
+
+class TestPromptCacheScope(unittest.TestCase):
+    """Test per-workflow prompt cache tracking"""
+
+    def test_scope_isolates_workflow_prompts(self):
+        """Test prompts sent inside a scope are tracked apart from the global tracker"""
+        outside = get_prompt_cache_tracker()
+        calls_before = outside.get_stats()["total"]["calls"]
+
+        with prompt_cache_scope() as tracker:
+            self.assertIs(get_prompt_cache_tracker(), tracker)
+            get_prompt_cache_tracker().record("coder_agent", INSTRUCTIONS)
+            self.assertEqual(tracker.get_stats()["total"]["calls"], 1)
+
+        self.assertIs(get_prompt_cache_tracker(), outside)
+        self.assertEqual(outside.get_stats()["total"]["calls"], calls_before)
+
+    def test_scopes_start_empty(self):
+        """Test a second workflow gets no cache hits from the first one's prompts"""
+        with prompt_cache_scope():
+            get_prompt_cache_tracker().record("coder_agent", INSTRUCTIONS)
+        with prompt_cache_scope():
+            self.assertEqual(get_prompt_cache_tracker().record("coder_agent", INSTRUCTIONS), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Unit tests for provider rate limiting of agent LLM calls
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.rate_limiter import (
+    Priority, ProviderLimiter, TokenBucket, add_priority_directive, call_priority,
+    classify_error, get_call_priority, resolve_priority
+)
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestScheduling(unittest.TestCase):
+    """Test slot ordering and limits"""
+
+    def test_interactive_calls_skip_queued_batch_calls(self):
+        """Test waiting calls are served by priority, then arrival"""
+        limiter = ProviderLimiter("test", initial_concurrency=1, max_concurrency=1)
+        order = []
+
+        async def call(name, priority):
+            async with limiter.slot(10, priority):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        async def run_all():
+            first = asyncio.ensure_future(call("first", Priority.BATCH))
+            await asyncio.sleep(0)
+            rest = [
+                asyncio.ensure_future(call("batch 1", Priority.BATCH)),
+                asyncio.ensure_future(call("batch 2", Priority.BATCH)),
+                asyncio.ensure_future(call("interactive", Priority.INTERACTIVE))
+            ]
+            await asyncio.gather(first, *rest)
+
+        asyncio.run(run_all())
+
+        self.assertEqual(order, ["first", "interactive", "batch 1", "batch 2"])
+        metrics = limiter.get_metrics()
+        self.assertEqual(metrics["calls"], 4)
+        self.assertEqual(metrics["queue_wait"]["batch"]["count"], 3)
+        self.assertGreater(metrics["queue_wait"]["batch"]["max"], metrics["queue_wait"]["interactive"]["max"])
+
+    def test_request_bucket_delays_calls(self):
+        """Test calls past the requests-per-minute budget wait for a refill"""
+        # 600 per minute: a full bucket of 600, then one request every 0.1s
+        limiter = ProviderLimiter("test", requests_per_minute=600, initial_concurrency=8)
+        limiter.requests.level = 1
+
+        async def run_all():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for _ in range(3):
+                async with limiter.slot(1):
+                    pass
+            return loop.time() - start
+
+        elapsed = asyncio.run(run_all())
+
+        self.assertGreaterEqual(elapsed, 0.15)
+
+    def test_cancelled_waiter_leaves_queue(self):
+        """Test a cancelled call neither holds a slot nor blocks the queue"""
+        limiter = ProviderLimiter("test", initial_concurrency=1, max_concurrency=1)
+
+        async def run_all():
+            await limiter.acquire(10)
+            waiter = asyncio.ensure_future(limiter.acquire(10))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            limiter.release(0.1)
+            await asyncio.wait_for(limiter.acquire(10), timeout=1)
+
+        asyncio.run(run_all())
+
+        self.assertEqual(limiter.in_flight, 1)
+        self.assertEqual(limiter.get_metrics()["queued"], 0)
+
+    def test_token_bucket_caps_oversized_requests(self):
+        """Test a request larger than the bucket waits for a full bucket rather than forever"""
+        bucket = TokenBucket(60)
+        bucket.level = 0
+
+        self.assertAlmostEqual(bucket.wait_time(600), 60, delta=0.1)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    """Test AIMD adjustment of the concurrency limit"""
+
+    def test_increase_on_success_and_cut_on_errors(self):
+        """Test fast successes raise the limit and 429s halve it"""
+        limiter = ProviderLimiter("test", initial_concurrency=4, max_concurrency=8, latency_target=10)
+
+        for _ in range(4):
+            limiter.in_flight += 1
+            limiter.release(1.0)
+        self.assertEqual(limiter.concurrency, 4)
+        self.assertGreater(limiter.limit, 4.9)
+
+        limiter.in_flight += 1
+        limiter.release(1.0, error="rate_limit")
+        self.assertEqual(limiter.concurrency, 2)
+        self.assertLessEqual(limiter.requests.level, 0)
+
+        limiter.in_flight += 1
+        limiter.release(30.0)
+        self.assertLess(limiter.limit, 2.5)
+        metrics = limiter.get_metrics()
+        self.assertEqual((metrics["rate_limited"], metrics["slow_calls"]), (1, 1))
+
+    def test_limit_stays_within_bounds(self):
+        """Test the limit never leaves the configured range"""
+        limiter = ProviderLimiter("test", initial_concurrency=2, min_concurrency=1, max_concurrency=3)
+        for _ in range(20):
+            limiter.in_flight += 1
+            limiter.release(0.1, error="server_error")
+        self.assertEqual(limiter.concurrency, 1)
+
+        for _ in range(200):
+            limiter.in_flight += 1
+            limiter.release(0.1)
+        self.assertEqual(limiter.concurrency, 3)
+
+    def test_slot_classifies_provider_errors(self):
+        """Test errors raised inside a slot feed back into the limit"""
+        limiter = ProviderLimiter("test", initial_concurrency=4)
+
+        async def failing_call():
+            async with limiter.slot(10):
+                raise ProviderError(503)
+
+        with self.assertRaises(ProviderError):
+            asyncio.run(failing_call())
+
+        self.assertEqual(limiter.get_metrics()["server_errors"], 1)
+        self.assertEqual(limiter.concurrency, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_classify_error(self):
+        """Test rate limit and server errors are told apart from other failures"""
+        self.assertEqual(classify_error(ProviderError(429)), "rate_limit")
+        self.assertEqual(classify_error(Exception("Rate limit reached for gpt-4o-mini")), "rate_limit")
+        self.assertEqual(classify_error(Exception("Error code: 502 - bad gateway")), "server_error")
+        self.assertIsNone(classify_error(ValueError("could not parse response")))
+
+
+class TestPriorityDirective(unittest.TestCase):
+    """Test passing the caller's priority to agents"""
+
+    def test_resolve_strips_directive(self):
+        """Test agents get the priority and the rest of the input untouched"""
+        part = SimpleNamespace(content=add_priority_directive("MODEL: openai:gpt-4o\nImplement X", Priority.BATCH))
+        message = SimpleNamespace(parts=[part])
+
+        self.assertEqual(resolve_priority([message]), Priority.BATCH)
+        self.assertEqual(part.content, "MODEL: openai:gpt-4o\nImplement X")
+        self.assertEqual(resolve_priority([message]), Priority.NORMAL)
+
+    def test_call_priority_context(self):
+        """Test the caller's priority is scoped to the block"""
+        self.assertEqual(get_call_priority(), Priority.NORMAL)
+        with call_priority(Priority.INTERACTIVE):
+            self.assertEqual(get_call_priority(), Priority.INTERACTIVE)
+        self.assertEqual(get_call_priority(), Priority.NORMAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Unit tests for hedged agent requests
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.request_hedger import RequestHedger, percentile
+
+
+def make_hedger(**overrides):
+    config = {
+        "enabled": True,
+        "min_samples": 3,
+        "budget": 0.5,
+        "agents": {"reviewer_agent": {}},
+        **overrides
+    }
+    return RequestHedger(config)
+
+
+def warm_up(hedger, latency=0.01, calls=3):
+    """Record fast calls so the hedge delay is known"""
+    async def fast(attempt):
+        await asyncio.sleep(latency)
+        return "ok"
+
+    async def run_all():
+        for _ in range(calls):
+            await hedger.run("reviewer_agent", "reviewer_agent/default", fast)
+
+    asyncio.run(run_all())
+
+
+class TestHedging(unittest.TestCase):
+    """Test duplicate requests"""
+
+    def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test a call past the p90 gets a duplicate and the slow primary is cancelled"""
+        hedger = make_hedger()
+        warm_up(hedger)
+        cancelled = []
+
+        async def request(attempt):
+            try:
+                await asyncio.sleep(5.0 if attempt == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(attempt)
+                raise
+            return f"response {attempt}"
+
+        result = asyncio.run(asyncio.wait_for(
+            hedger.run("reviewer_agent", "reviewer_agent/default", request), timeout=2
+        ))
+
+        self.assertEqual(result, "response 1")
+        self.assertEqual(cancelled, [0])
+        report = hedger.get_report()["reviewer_agent/default"]
+        self.assertEqual((report["calls"], report["hedged"], report["hedge_wins"]), (4, 1, 1))
+        self.assertIsNotNone(report["p99_improvement"])
+
+    def test_failed_request_falls_back_to_other(self):
+        """Test an error from one request doesn't fail the call while the other can succeed"""
+        hedger = make_hedger()
+        warm_up(hedger)
+
+        async def request(attempt):
+            await asyncio.sleep(0.05)
+            if attempt == 1:
+                raise ConnectionError("replica down")
+            return "primary"
+
+        result = asyncio.run(hedger.run("reviewer_agent", "reviewer_agent/default", request))
+
+        self.assertEqual(result, "primary")
+
+    def test_unlisted_agents_and_budget_are_respected(self):
+        """Test agents not configured for hedging and spent budgets send a single request"""
+        hedger = make_hedger(budget=0.0)
+        warm_up(hedger)
+
+        self.assertIsNone(hedger.hedge_delay("reviewer_agent", "reviewer_agent/default"))
+        self.assertIsNone(hedger.hedge_delay("executor_agent", "executor_agent/default"))
+        self.assertIsNone(make_hedger(enabled=False).hedge_delay("reviewer_agent", "x"))
+
+    def test_percentile(self):
+        """Test interpolated percentiles"""
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertAlmostEqual(percentile([1, 2, 3, 4, 5], 90), 4.6)
+        self.assertEqual(percentile([], 99), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
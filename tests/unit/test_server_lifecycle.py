@@ -0,0 +1,153 @@
+"""
+Unit tests for orchestrator server readiness probing and reuse
+"""
+
+import json
+import threading
+import time
+import unittest
+import sys
+import tempfile
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from orchestrator import server_lifecycle
+from orchestrator.server_lifecycle import (
+    ORCHESTRATOR_AGENTS, build_health, code_fingerprint, find_reusable_server, wait_until_ready
+)
+
+
+class FakeAgentServer:
+    """ACP-like server answering /agents and the health agent"""
+
+    def __init__(self):
+        self.agents = []
+        self.health = None
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self._reply({"agents": [{"name": name} for name in fake.agents]})
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers["Content-Length"]))
+                content = json.dumps(fake.health)
+                self._reply({"output": [{"parts": [{"content": content}]}]})
+
+            def _reply(self, body):
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("localhost", 0), Handler)
+        self.url = f"http://localhost:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        if self.httpd.socket.fileno() != -1:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+class TestReadiness(unittest.TestCase):
+    """Test probing the server until its agents are registered"""
+
+    def setUp(self):
+        self.server = FakeAgentServer()
+        self.addCleanup(self.server.close)
+
+    def test_ready_as_soon_as_agents_registered(self):
+        """Test the probe returns shortly after registration instead of after a fixed delay"""
+        threading.Timer(0.2, lambda: setattr(self.server, "agents", list(ORCHESTRATOR_AGENTS))).start()
+
+        start = time.monotonic()
+        self.assertTrue(wait_until_ready(self.server.url, timeout=5))
+
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_stops_waiting_when_process_exits(self):
+        """Test a server process that died is reported without waiting for the timeout"""
+        self.server.agents = ["planner_agent_wrapper"]
+        process = Mock()
+        process.poll.return_value = 1
+
+        start = time.monotonic()
+        self.assertFalse(wait_until_ready(self.server.url, process=process, timeout=5))
+
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_unreachable_server_times_out(self):
+        """Test nothing listening is not ready"""
+        url = self.server.url
+        self.server.close()
+
+        self.assertFalse(wait_until_ready(url, timeout=0.3))
+
+
+class TestReuse(unittest.TestCase):
+    """Test deciding whether a running server can be reused"""
+
+    def setUp(self):
+        self.server = FakeAgentServer()
+        self.addCleanup(self.server.close)
+        self.server.agents = list(ORCHESTRATOR_AGENTS)
+
+    def test_reuses_server_running_current_code(self):
+        """Test a ready server with the current code fingerprint is reused"""
+        self.server.health = build_health(list(ORCHESTRATOR_AGENTS), datetime.now().isoformat(), code_fingerprint())
+
+        health = find_reusable_server(self.server.url)
+
+        self.assertEqual(health["status"], "ready")
+
+    def test_restarts_server_running_old_code(self):
+        """Test a server started before the code changed is not reused"""
+        self.server.health = build_health(list(ORCHESTRATOR_AGENTS), datetime.now().isoformat(), "stale")
+
+        self.assertIsNone(find_reusable_server(self.server.url))
+
+    def test_reuse_disabled(self):
+        """Test reuse can be turned off"""
+        self.server.health = build_health(list(ORCHESTRATOR_AGENTS), datetime.now().isoformat(), code_fingerprint())
+
+        with patch.dict(server_lifecycle.ORCHESTRATOR_SERVER_CONFIG, {"reuse_running": False}):
+            self.assertIsNone(find_reusable_server(self.server.url))
+
+
+class TestHealth(unittest.TestCase):
+    """Test the health report and code fingerprint"""
+
+    def test_missing_agents_not_ready(self):
+        """Test the server reports missing agents"""
+        health = build_health(["planner_agent_wrapper"], datetime.now().isoformat(), "abc")
+
+        self.assertEqual(health["status"], "starting")
+        self.assertIn("health", health["missing_agents"])
+
+    def test_fingerprint_changes_with_code(self):
+        """Test editing a server source file changes the fingerprint"""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "agents").mkdir()
+            source = root / "agents" / "coder_agent.py"
+            source.write_text("x = 1\n")
+            before = code_fingerprint(root)
+
+            source.write_text("x = 22\n")
+
+            self.assertNotEqual(code_fingerprint(root), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+"""
+Unit tests for speculative candidate generation
+"""
+
+import asyncio
+import unittest
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.utils.feature_parser import ComplexityLevel, Feature
+from shared.utils.speculation import (
+    SpeculationMetrics, SpeculationOutcome, Candidate, race_candidates, candidate_approach, select_candidate
+)
+from workflows.incremental.feature_orchestrator import run_speculative_round
+from workflows.incremental.retry_strategies import RetryOrchestrator, RetryContext
+
+
+class TestRaceCandidates(unittest.TestCase):
+    """Test concurrent candidate validation"""
+
+    def test_first_passing_candidate_wins_and_rest_are_cancelled(self):
+        """Test the fastest passing candidate is kept and slower ones are cancelled"""
+        cancelled = []
+
+        async def attempt(index, variant):
+            delays = {0: 0.05, 1: 0.01, 2: 5.0}
+            try:
+                await asyncio.sleep(delays[index])
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return f"code {index}", index != 1
+
+        outcome = asyncio.run(race_candidates(["a", "b", "c"], attempt))
+
+        self.assertEqual(outcome.winner.index, 0)
+        self.assertEqual(outcome.winner.result, "code 0")
+        self.assertEqual([c.index for c in outcome.finished], [1, 0])
+        self.assertEqual(outcome.launched, 3)
+        self.assertEqual(outcome.cancelled, 1)
+        self.assertEqual(cancelled, [2])
+        self.assertLess(outcome.elapsed, 1.0)
+
+    def test_no_winner_keeps_all_failures(self):
+        """Test every candidate is awaited when none passes, and errors are captured"""
+        async def attempt(index, variant):
+            if index == 0:
+                raise RuntimeError("coder unavailable")
+            return index, False
+
+        outcome = asyncio.run(race_candidates(["a", "b"], attempt))
+
+        self.assertIsNone(outcome.winner)
+        self.assertEqual(len(outcome.finished), 2)
+        errors = [c.error for c in outcome.finished if c.error]
+        self.assertEqual(errors, ["coder unavailable"])
+
+    def test_timeout_cancels_unfinished(self):
+        """Test candidates still running at the timeout are cancelled"""
+        async def attempt(index, variant):
+            await asyncio.sleep(0.01 if index == 0 else 5.0)
+            return index, False
+
+        outcome = asyncio.run(race_candidates(["a", "b"], attempt, timeout=0.2))
+
+        self.assertIsNone(outcome.winner)
+        self.assertEqual(len(outcome.finished), 1)
+        self.assertEqual(outcome.cancelled, 1)
+
+    def test_candidate_approaches_differ(self):
+        """Test the first candidate matches the serial prompt and others get hints"""
+        self.assertEqual(candidate_approach(0), "")
+        self.assertNotEqual(candidate_approach(1), candidate_approach(2))
+
+
+class TestSelectCandidate(unittest.TestCase):
+    """Test picking the candidate to continue from"""
+
+    def test_winner_or_furthest_failure(self):
+        """Test the winner is kept, otherwise the failure with most passing then fewest failing tests"""
+        progress = lambda result: result
+        failures = [
+            Candidate(index=0, variant="a", result=(2, 3)),
+            Candidate(index=1, variant="b", result=(2, 1)),
+            Candidate(index=2, variant="c", error="coder unavailable")
+        ]
+
+        self.assertEqual(select_candidate(SpeculationOutcome(winner=None, finished=failures), progress).index, 1)
+        winner = Candidate(index=3, variant="d", result=(0, 5), success=True)
+        self.assertIs(select_candidate(SpeculationOutcome(winner=winner, finished=failures), progress), winner)
+        self.assertIsNone(select_candidate(SpeculationOutcome(winner=None, finished=failures[2:]), progress))
+
+
+class TestSpeculativeRound(unittest.TestCase):
+    """Test the speculative round of the incremental workflow"""
+
+    def test_candidate_sessions_released(self):
+        """Test every candidate session is cleaned up once the round is over"""
+        feature = Feature(
+            id="F1", title="Calculator", short_name="Calculator", description="Add numbers",
+            files=["calc.py"], validation_criteria="add works", dependencies=[], complexity=ComplexityLevel.LOW
+        )
+        executor = Mock()
+        executor.validate_feature = AsyncMock(side_effect=lambda feature, files, tests, candidate_id: SimpleNamespace(
+            success=candidate_id.endswith("c1"), tests_passed=1, tests_failed=0
+        ))
+        executor.release_candidate = AsyncMock()
+
+        with patch('orchestrator.orchestrator_agent.run_team_member_with_tracking',
+                   new_callable=AsyncMock, return_value="# filename: calc.py\nx = 1"):
+            outcome = asyncio.run(run_speculative_round(feature, "implement", [], 3, executor, None, "F1_r2"))
+
+        self.assertEqual(outcome.winner.index, 1)
+        released = sorted(call.args[0] for call in executor.release_candidate.await_args_list)
+        self.assertEqual(released, ["F1_r2_c0", "F1_r2_c1", "F1_r2_c2"])
+
+
+class TestSpeculationMetrics(unittest.TestCase):
+    """Test time-to-green reporting"""
+
+    def test_report_compares_modes(self):
+        """Test averages per mode and the speculative speedup"""
+        metrics = SpeculationMetrics()
+        metrics.record_feature("F1", "serial", True, 90.0, coder_calls=3, rounds=3)
+        metrics.record_feature("F2", "serial", False, 200.0, coder_calls=3, rounds=3)
+        metrics.record_feature("F3", "speculative", True, 30.0, coder_calls=4, rounds=2, cancelled=2)
+
+        report = metrics.get_report()
+
+        self.assertEqual(report["serial"]["features"], 2)
+        self.assertEqual(report["serial"]["avg_time_to_green"], 90.0)
+        self.assertEqual(report["speculative"]["cancelled"], 2)
+        self.assertEqual(report["speedup"], 3.0)
+
+
+class TestRankDecisions(unittest.TestCase):
+    """Test per-candidate retry strategies"""
+
+    def test_distinct_strategies_best_first(self):
+        """Test candidates get different strategies ordered by score"""
+        orchestrator = RetryOrchestrator()
+        context = RetryContext(
+            feature_id="F1",
+            attempt_number=3,
+            total_attempts=5,
+            error_history=["SyntaxError", "SyntaxError", "SyntaxError"],
+            error_categories=["syntax_error"] * 3,
+            time_spent=10.0,
+            code_changes_size=[10],
+            test_progress=[],
+            complexity_level="high"
+        )
+
+        decisions = orchestrator.rank_decisions(context, 3)
+        strategies = [d.strategy for d in decisions]
+
+        self.assertEqual(len(set(strategies)), 3)
+        self.assertEqual(strategies[0], orchestrator.decide_retry(context).strategy)
+        self.assertTrue(all(d.delay_seconds == 0 for d in decisions))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for the lazy workflow registry
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+from types import ModuleType
+from unittest.mock import patch
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from shared.data_models import CodingTeamInput
+from workflows import workflow_manager
+from workflows.workflow_manager import get_workflow_function, resolve_workflow_name
+
+
+class TestWorkflowRegistry(unittest.TestCase):
+    """Test resolving workflow types to their implementations"""
+
+    def setUp(self):
+        self.registry = patch.dict(workflow_manager.WORKFLOW_REGISTRY)
+        self.aliases = patch.dict(workflow_manager.WORKFLOW_ALIASES)
+        self.resolved = patch.dict(workflow_manager._resolved_workflows, clear=True)
+        for p in (self.registry, self.aliases, self.resolved):
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_import_does_not_load_workflows(self):
+        """Test importing the workflow manager leaves implementations and Docker unloaded"""
+        code = (
+            "import sys, json; import workflows.workflow_manager; "
+            "print(json.dumps(sorted(m for m in sys.modules if m.startswith("
+            "('workflows.tdd', 'workflows.full', 'workflows.incremental', 'workflows.individual', "
+            "'workflows.mvp_incremental', 'agents.executor', 'docker')))))"
+        )
+        with tempfile.TemporaryDirectory() as cwd:
+            proc = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=cwd,
+                                  env=dict(os.environ, PYTHONPATH=str(project_root)))
+
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(json.loads(proc.stdout.strip().splitlines()[-1]), [])
+
+    def test_resolve_workflow_name(self):
+        """Test aliases and individual steps map to registered workflows"""
+        self.assertEqual(resolve_workflow_name("mvp_tdd"), "mvp_incremental_tdd")
+        self.assertEqual(resolve_workflow_name("tdd_workflow"), "tdd")
+        self.assertEqual(resolve_workflow_name("design"), "individual")
+        self.assertIsNone(resolve_workflow_name("flagship"))
+
+    def test_entry_point_resolved_once(self):
+        """Test a registered workflow is imported on first use and cached"""
+        module = ModuleType("fake_workflow")
+
+        async def execute_fake_workflow(input_data, tracer=None):
+            return []
+
+        module.execute_fake_workflow = execute_fake_workflow
+        workflow_manager.register_workflow("fake", "fake_workflow:execute_fake_workflow", aliases=["fake_workflow"])
+
+        with patch.dict(sys.modules, {"fake_workflow": module}), \
+                patch("workflows.workflow_manager.importlib.import_module",
+                      wraps=workflow_manager.importlib.import_module) as import_module:
+            self.assertIs(get_workflow_function("fake"), execute_fake_workflow)
+            self.assertIs(get_workflow_function("fake_workflow"), execute_fake_workflow)
+
+        self.assertEqual(import_module.call_count, 1)
+
+    def test_unknown_workflow_type(self):
+        """Test unknown workflow types are rejected before anything is imported"""
+        with self.assertRaises(ValueError):
+            get_workflow_function("flagship")
+
+        input_data = CodingTeamInput(requirements="Build a calculator", workflow_type="flagship",
+                                     skip_docker_cleanup=True)
+        with self.assertRaises(ValueError):
+            asyncio.run(workflow_manager.execute_workflow(input_data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Unit tests for ComposeStackPool
+"""
+
+import unittest
+from unittest.mock import Mock, patch
+from pathlib import Path
+import tempfile
+import shutil
+
+from agents.validator.compose_stack_pool import (
+    ComposeStackPool, stack_key, reset_stack_state
+)
+from agents.validator.docker_compose_manager import ComposeConfig, ServiceDefinition
+
+
+COMPOSE_FILE = """
+version: '3.8'
+services:
+  mongo:
+    image: mongo:6
+  redis:
+    image: redis:7
+  backend:
+    build: ./backend
+    depends_on:
+      - mongo
+      - redis
+"""
+
+
+class TestStackKey(unittest.TestCase):
+    """Test stack keys"""
+
+    def test_key_depends_on_service_definitions(self):
+        """Test identical definitions share a key"""
+        def config(image):
+            return ComposeConfig(version="3", services={
+                "db": ServiceDefinition(name="db", image=image)
+            })
+
+        self.assertEqual(stack_key(config("mongo:6")), stack_key(config("mongo:6")))
+        self.assertNotEqual(stack_key(config("mongo:6")), stack_key(config("mongo:7")))
+
+
+class TestResetStackState(unittest.TestCase):
+    """Test per-validation state reset"""
+
+    def test_reset_runs_hooks_for_database_services(self):
+        """Test databases are reset and built services are left alone"""
+        manager = Mock()
+        manager.execute_in_service.return_value = (0, "")
+        manager.compose_config = ComposeConfig(version="3", services={
+            "db": ServiceDefinition(name="db", image="postgres:15", environment={"POSTGRES_USER": "app"}),
+            "cache": ServiceDefinition(name="cache", image="library/redis:7"),
+            "web": ServiceDefinition(name="web", image="nginx"),
+            "api": ServiceDefinition(name="api", build={"context": "."}),
+            "search": ServiceDefinition(name="search", image="elastic", labels={"validator.reset": "./reset.sh"})
+        })
+
+        reset_stack_state(manager)
+
+        commands = {call.args[0]: call.args[1][-1] for call in manager.execute_in_service.call_args_list}
+        self.assertEqual(set(commands), {"db", "cache", "search"})
+        self.assertIn("psql -U app -d app", commands["db"])
+        self.assertEqual(commands["cache"], "redis-cli FLUSHALL")
+        self.assertEqual(commands["search"], "./reset.sh")
+
+    def test_failed_reset_raises(self):
+        """Test a failing reset command is reported"""
+        manager = Mock()
+        manager.execute_in_service.return_value = (1, "connection refused")
+        manager.compose_config = ComposeConfig(version="3", services={
+            "cache": ServiceDefinition(name="cache", image="redis")
+        })
+
+        with self.assertRaises(RuntimeError):
+            reset_stack_state(manager)
+
+
+class TestComposeStackPool(unittest.TestCase):
+    """Test stack reuse, release and idle teardown"""
+
+    def setUp(self):
+        """Set up a compose project"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.compose_path = self.temp_dir / "docker-compose.yml"
+        self.compose_path.write_text(COMPOSE_FILE)
+        self.pool = ComposeStackPool(idle_timeout=600, max_stacks=2)
+
+        patcher = patch('agents.validator.docker_compose_manager.docker.from_env')
+        self.mock_docker = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up"""
+        shutil.rmtree(self.temp_dir)
+
+    def _acquire(self, context_path=None):
+        with patch('agents.validator.docker_compose_manager.DockerComposeManager.start_services'), \
+             patch('agents.validator.docker_compose_manager.DockerComposeManager.refresh_build_services') as refresh, \
+             patch('agents.validator.compose_stack_pool.reset_stack_state') as reset:
+            manager, reused = self.pool.acquire("session", self.compose_path, context_path or self.temp_dir)
+        return manager, reused, refresh, reset
+
+    def test_second_validation_reuses_stack(self):
+        """Test a released stack is reset and reused"""
+        first, reused, _, _ = self._acquire()
+        self.assertFalse(reused)
+        self.pool.release(first)
+
+        second, reused, refresh, reset = self._acquire()
+
+        self.assertTrue(reused)
+        self.assertIs(second, first)
+        reset.assert_called_once_with(first)
+        refresh.assert_called_once_with(self.temp_dir)
+        metrics = self.pool.get_metrics()
+        self.assertEqual(metrics["cold_starts"], 1)
+        self.assertEqual(metrics["reuses"], 1)
+
+    def test_busy_stack_is_not_shared(self):
+        """Test a stack in use is not handed out twice and the transient one gets its own names"""
+        first, _, _, _ = self._acquire()
+        second, reused, _, _ = self._acquire()
+
+        self.assertFalse(reused)
+        self.assertIsNot(first, second)
+
+        self.assertNotEqual(first.project_name, second.project_name)
+
+        with patch.object(second, 'cleanup') as cleanup:
+            self.pool.release(second)
+        cleanup.assert_called_once()
+        self.pool.release(first)
+        third, reused, _, _ = self._acquire()
+        self.assertTrue(reused)
+        self.assertIs(third, first)
+
+    def test_unhealthy_stack_is_torn_down(self):
+        """Test stacks released as unhealthy are not reused"""
+        first, _, _, _ = self._acquire()
+        with patch.object(first, 'cleanup') as cleanup:
+            self.pool.release(first, healthy=False)
+        cleanup.assert_called_once()
+
+        _, reused, _, _ = self._acquire()
+        self.assertFalse(reused)
+
+    def test_stack_with_other_bind_mounts_is_not_reused(self):
+        """Test a stack is only reused while it mounts the same host paths"""
+        self.compose_path.write_text(COMPOSE_FILE + "    volumes:\n      - ./backend:/app\n")
+        other_project = self.temp_dir / "other"
+        for context in (self.temp_dir, other_project):
+            (context / "backend").mkdir(parents=True)
+
+        first, _, _, _ = self._acquire()
+        self.pool.release(first)
+        second, reused, _, _ = self._acquire()
+        self.assertTrue(reused)
+        self.pool.release(second)
+
+        with patch.object(first, 'cleanup') as cleanup:
+            third, reused, _, _ = self._acquire(other_project)
+
+        self.assertFalse(reused)
+        self.assertIsNot(third, first)
+        cleanup.assert_called_once()
+        self.assertEqual(self.pool.get_metrics()["stale_mounts"], 1)
+
+    def test_reap_idle(self):
+        """Test idle stacks are torn down after the timeout"""
+        manager, _, _, _ = self._acquire()
+        self.pool.release(manager)
+        self.pool.idle_timeout = 0
+
+        with patch.object(manager, 'cleanup') as cleanup:
+            self.assertEqual(self.pool.reap_idle(), 1)
+        cleanup.assert_called_once()
+        self.assertEqual(self.pool.get_metrics()["pooled_stacks"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,9 +8,11 @@ from pathlib import Path
 import yaml
 import tempfile
 import os
+import queue
+import threading
 
 from agents.validator.docker_compose_manager import (
-    DockerComposeManager, ServiceDefinition, ComposeConfig
+    DockerComposeManager, HealthEventWatcher, ServiceDefinition, ComposeConfig
 )
 
 
@@ -34,6 +36,36 @@ class TestServiceDefinition(unittest.TestCase):
         self.assertIsNone(service.healthcheck)
 
 
+class TestHealthEventWatcher(unittest.TestCase):
+    """Test waiting for container health through Docker events"""
+    
+    def test_wait_sleeps_until_status_changes(self):
+        """Test a non-final status does not wake the waiter until the next event"""
+        events = queue.Queue()
+        client = Mock()
+        client.events.return_value = iter(events.get, None)
+        watcher = HealthEventWatcher(client, {"project": "test"})
+        watcher.start()
+        self.addCleanup(watcher.close)
+        self.addCleanup(events.put, None)
+        
+        container = Mock(id="c1")
+        container.attrs = {"State": {"Status": "running", "Health": {"Status": "starting"}}}
+        wait_for = watcher._condition.wait_for
+        wakeups = []
+        
+        def counting_wait_for(predicate, timeout=None):
+            wakeups.append(timeout)
+            return wait_for(predicate, timeout)
+        
+        watcher._condition.wait_for = counting_wait_for
+        events.put({"Action": "health_status: starting", "id": "c1"})
+        threading.Timer(0.2, events.put, [{"Action": "health_status: healthy", "id": "c1"}]).start()
+        
+        self.assertEqual(watcher.wait(container, timeout=5), "healthy")
+        self.assertLessEqual(len(wakeups), 3)
+
+
 class TestComposeConfig(unittest.TestCase):
     """Test ComposeConfig dataclass"""
     
@@ -230,7 +262,95 @@ class TestDockerComposeManager(unittest.TestCase):
             self.manager._resolve_dependency_order()
         
         self.assertIn("Circular dependencies detected", str(cm.exception))
-    
+
+    def test_resolve_dependency_waves(self):
+        """Test services are grouped into parallel startup waves"""
+        self.manager.compose_config = ComposeConfig(
+            version="3",
+            services={
+                "frontend": ServiceDefinition(name="frontend", image="nginx", depends_on=["backend"]),
+                "backend": ServiceDefinition(name="backend", image="node", depends_on=["mongo", "redis"]),
+                "mongo": ServiceDefinition(name="mongo", image="mongo"),
+                "redis": ServiceDefinition(name="redis", image="redis"),
+                "worker": ServiceDefinition(name="worker", image="node", depends_on=["redis"])
+            }
+        )
+
+        waves = self.manager._resolve_dependency_waves()
+
+        self.assertEqual(waves, [["mongo", "redis"], ["backend", "worker"], ["frontend"]])
+
+    @patch('docker.from_env')
+    def test_start_services_in_waves(self, mock_docker):
+        """Test images are prepared once and services start wave by wave"""
+        mock_client = Mock()
+        mock_docker.return_value = mock_client
+        mock_client.events.return_value = iter([])
+
+        manager = DockerComposeManager("test_session")
+        manager.compose_config = ComposeConfig(
+            version="3",
+            services={
+                "api": ServiceDefinition(name="api", image="node:18", depends_on=["db"]),
+                "worker": ServiceDefinition(name="worker", image="node:18", depends_on=["db"]),
+                "db": ServiceDefinition(name="db", image="mongo:6")
+            }
+        )
+
+        started = []
+        def create_container(service, image):
+            container = Mock()
+            container.start.side_effect = lambda: started.append(service.name)
+            return container
+
+        with patch.object(manager, '_create_networks'), \
+             patch.object(manager, '_connect_container_networks'), \
+             patch.object(manager, '_create_container', side_effect=create_container):
+            containers = manager.start_services(Path("/tmp"))
+
+        self.assertEqual(set(containers), {"api", "worker", "db"})
+        self.assertEqual(started[0], "db")
+        # Both services share node:18, which is looked up once
+        self.assertEqual(mock_client.images.get.call_count, 2)
+
+        timings = manager.get_startup_timings()
+        self.assertEqual(timings["db"]["wave"], 0)
+        self.assertEqual(timings["api"]["wave"], 1)
+        self.assertEqual(timings["api"]["image_source"], "cached")
+
+    @patch('docker.from_env')
+    def test_start_services_waits_for_health_events(self, mock_docker):
+        """Test unhealthy services reported by Docker events fail startup"""
+        mock_client = Mock()
+        mock_docker.return_value = mock_client
+        mock_client.events.return_value = iter([
+            {"id": "db-id", "Action": "health_status: unhealthy"}
+        ])
+
+        db = Mock(id="db-id", attrs={"State": {"Status": "running", "Health": {"Status": "starting"}}})
+        db.logs.return_value = b"connection refused"
+
+        manager = DockerComposeManager("test_session")
+        manager.compose_config = ComposeConfig(
+            version="3",
+            services={
+                "db": ServiceDefinition(name="db", image="mongo:6", healthcheck={"test": ["CMD", "true"]}),
+                "api": ServiceDefinition(name="api", image="node:18", depends_on=["db"])
+            }
+        )
+
+        with patch.object(manager, '_create_networks'), \
+             patch.object(manager, '_connect_container_networks'), \
+             patch.object(manager, '_create_container', return_value=db) as create:
+            with self.assertRaises(RuntimeError) as cm:
+                manager.start_services(Path("/tmp"))
+
+        self.assertIn("unhealthy", str(cm.exception))
+        # api is never started and db is cleaned up
+        self.assertEqual(create.call_count, 1)
+        db.stop.assert_called_once()
+        self.assertEqual(manager.containers, {})
+
     @patch('docker.from_env')
     def test_create_networks(self, mock_docker):
         """Test network creation"""
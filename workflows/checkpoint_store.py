@@ -0,0 +1,216 @@
+"""
+Durable Workflow Checkpoints
+
+Persists the progress of long-running workflows so a crash or redeploy
+doesn't throw away completed LLM work. Each run is identified by a session
+id and stored as one JSON file, rewritten atomically after every completed
+phase or feature:
+
+- the workflow input (to restart the run without the original command line)
+- phase outputs (plan, design, coding, review, ...)
+- arbitrary workflow data (e.g. the parsed feature list)
+- per-feature results, including the feature's TDD phase history
+
+Workflows open their checkpoint with WorkflowCheckpoint.open(); when the input
+carries the session id of an existing checkpoint, completed phases and
+features are restored instead of being run again.
+"""
+
+import json
+import os
+import threading
+import uuid
+from dataclasses import asdict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from shared.data_models import CodingTeamInput, TeamMember
+from workflows.logger import workflow_logger as logger
+from workflows.workflow_config import CHECKPOINT_CONFIG
+
+
+def get_checkpoint_dir() -> Path:
+    """Directory holding checkpoint files"""
+    if CHECKPOINT_CONFIG["checkpoint_dir"]:
+        return Path(CHECKPOINT_CONFIG["checkpoint_dir"])
+    return Path.home() / ".cache" / "agent_blackwell" / "checkpoints"
+
+
+def _input_to_dict(input_data: CodingTeamInput) -> Dict[str, Any]:
+    data = asdict(input_data)
+    data.pop("workflow", None)  # Derived from workflow_type
+    data["team_members"] = [member.value for member in input_data.team_members or []]
+    return {key: value.value if isinstance(value, Enum) else value for key, value in data.items()}
+
+
+class WorkflowCheckpoint:
+    """Persistent progress of one workflow run"""
+
+    def __init__(self, session_id: str, state: Dict[str, Any], checkpoint_dir: Optional[Path] = None):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            session_id: Id of the workflow run
+            state: Checkpoint contents (as written by save)
+            checkpoint_dir: Directory for the checkpoint file
+        """
+        self.session_id = session_id
+        self.state = state
+        self.path = (checkpoint_dir or get_checkpoint_dir()) / f"{session_id}.json"
+        self.resumed = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, input_data: CodingTeamInput, workflow_type: str,
+               checkpoint_dir: Optional[Path] = None) -> "WorkflowCheckpoint":
+        """Start a checkpoint for a new run (uses input_data.session_id if set)"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        session_id = input_data.session_id or f"{workflow_type}_{timestamp}_{uuid.uuid4().hex[:6]}"
+        input_data.session_id = session_id
+        state = {
+            "version": 1,
+            "session_id": session_id,
+            "workflow_type": workflow_type,
+            "status": "running",
+            "created_at": datetime.now().isoformat(),
+            "input": _input_to_dict(input_data),
+            "phases": {},
+            "data": {},
+            "features": {}
+        }
+        checkpoint = cls(session_id, state, checkpoint_dir)
+        checkpoint.save()
+        return checkpoint
+
+    @classmethod
+    def load(cls, session_id: str, checkpoint_dir: Optional[Path] = None) -> Optional["WorkflowCheckpoint"]:
+        """Load the checkpoint of a run, or None if there is none"""
+        path = (checkpoint_dir or get_checkpoint_dir()) / f"{session_id}.json"
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to load checkpoint {path}: {e}")
+            return None
+        return cls(session_id, state, checkpoint_dir)
+
+    @classmethod
+    def open(cls, input_data: CodingTeamInput, workflow_type: str,
+             checkpoint_dir: Optional[Path] = None) -> Optional["WorkflowCheckpoint"]:
+        """
+        Open the checkpoint for a workflow run.
+
+        Resumes the checkpoint named by input_data.session_id if it exists and
+        starts a new one otherwise. Returns None when checkpoints are disabled.
+        """
+        if not CHECKPOINT_CONFIG["enabled"]:
+            return None
+        if input_data.session_id:
+            checkpoint = cls.load(input_data.session_id, checkpoint_dir)
+            if checkpoint:
+                checkpoint.resumed = True
+                checkpoint.state["status"] = "running"
+                checkpoint.save()
+                logger.info(f"Resuming {workflow_type} session {checkpoint.session_id}: "
+                            f"{len(checkpoint.state['phases'])} phases and "
+                            f"{len(checkpoint.state['features'])} features checkpointed")
+                return checkpoint
+        checkpoint = cls.create(input_data, workflow_type, checkpoint_dir)
+        logger.info(f"Checkpointing {workflow_type} session {checkpoint.session_id} to {checkpoint.path}")
+        return checkpoint
+
+    @property
+    def workflow_type(self) -> str:
+        return self.state["workflow_type"]
+
+    @property
+    def status(self) -> str:
+        return self.state["status"]
+
+    def get_input(self) -> CodingTeamInput:
+        """Rebuild the workflow input of the run"""
+        data = dict(self.state["input"])
+        data["team_members"] = [TeamMember(value) for value in data.get("team_members", [])]
+        data["session_id"] = self.session_id
+        return CodingTeamInput(**data)
+
+    def get_phase(self, phase: str) -> Optional[Dict[str, Any]]:
+        """Checkpointed phase ({"output", "metadata", "timestamp"}), or None"""
+        return self.state["phases"].get(phase)
+
+    def save_phase(self, phase: str, output: Any, metadata: Optional[Dict[str, Any]] = None):
+        """Record a completed phase"""
+        with self._lock:
+            self.state["phases"][phase] = {
+                "output": output,
+                "metadata": metadata or {},
+                "timestamp": datetime.now().isoformat()
+            }
+        self.save()
+
+    def get_data(self, key: str, default: Any = None) -> Any:
+        return self.state["data"].get(key, default)
+
+    def set_data(self, key: str, value: Any):
+        """Record workflow data needed to resume (e.g. the parsed feature list)"""
+        with self._lock:
+            self.state["data"][key] = value
+        self.save()
+
+    def get_feature(self, feature_id: str) -> Optional[Dict[str, Any]]:
+        return self.state["features"].get(feature_id)
+
+    def save_feature(self, feature_id: str, data: Dict[str, Any]):
+        """Record a finished feature"""
+        with self._lock:
+            self.state["features"][feature_id] = data
+        self.save()
+
+    def complete(self):
+        """Mark the run finished (the file is removed unless configured to keep it)"""
+        self.state["status"] = "completed"
+        if CHECKPOINT_CONFIG["keep_completed"]:
+            self.save()
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def save(self):
+        """Write the checkpoint atomically"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self.state["updated_at"] = datetime.now().isoformat()
+                tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.state, f, default=str)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Failed to save checkpoint {self.path}: {e}")
+
+
+def list_checkpoints(checkpoint_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Summaries of stored checkpoints, most recently updated first"""
+    directory = checkpoint_dir or get_checkpoint_dir()
+    summaries = []
+    for path in directory.glob("*.json") if directory.exists() else []:
+        checkpoint = WorkflowCheckpoint.load(path.stem, directory)
+        if checkpoint is None:
+            continue
+        state = checkpoint.state
+        summaries.append({
+            "session_id": checkpoint.session_id,
+            "workflow_type": checkpoint.workflow_type,
+            "status": checkpoint.status,
+            "requirements": state["input"].get("requirements", ""),
+            "phases": list(state["phases"]),
+            "features": len(state["features"]),
+            "updated_at": state.get("updated_at")
+        })
+    return sorted(summaries, key=lambda s: s["updated_at"] or "", reverse=True)
@@ -20,6 +20,8 @@ from workflows.full.workflow_cache_manager import (
     WorkflowCacheManager, SmartCacheStrategy
 )
 from workflows.full.performance_monitor import PerformanceMonitor
+from shared.utils.prompt_builder import PromptBuilder
+from workflows.checkpoint_store import WorkflowCheckpoint
 
 
 class EnhancedFullWorkflowConfig:
@@ -40,23 +42,39 @@ class EnhancedFullWorkflowConfig:
 
 class WorkflowStateManager:
     """Manages workflow state for rollback and recovery."""
-    def __init__(self):
+    def __init__(self, checkpoint: Optional[WorkflowCheckpoint] = None):
         self.checkpoints = {}
         self.phase_outputs = {}
         self.error_history = []
+        # Durable checkpoint; phases it already holds were completed by an earlier run
+        self.checkpoint = checkpoint
+        self.restored_phases = set()
+        if checkpoint:
+            for phase, saved in checkpoint.state["phases"].items():
+                self.checkpoints[phase] = saved
+                self.phase_outputs[phase] = saved["output"]
+                self.restored_phases.add(phase)
         
     def save_checkpoint(self, phase: str, output: Any, metadata: Dict[str, Any] = None):
-        """Save a checkpoint for potential rollback."""
+        """Save a checkpoint for potential rollback and resume."""
         self.checkpoints[phase] = {
             "output": output,
             "metadata": metadata or {},
             "timestamp": datetime.now().isoformat()
         }
         self.phase_outputs[phase] = output
+        if self.checkpoint:
+            self.checkpoint.save_phase(phase, output, metadata)
         
     def get_checkpoint(self, phase: str) -> Optional[Dict[str, Any]]:
         """Retrieve a checkpoint."""
         return self.checkpoints.get(phase)
+    
+    def get_restored_output(self, phase: str) -> Optional[Any]:
+        """Output of a phase completed before the run was resumed, or None."""
+        if phase in self.restored_phases:
+            return self.checkpoints[phase]["output"]
+        return None
         
     def record_error(self, phase: str, error: Exception, context: Dict[str, Any]):
         """Record error for pattern analysis."""
@@ -87,21 +105,20 @@ class AgentCommunicationEnhancer:
                           previous_outputs: Dict[str, str],
                           feedback: Optional[str] = None) -> str:
         """Prepare enriched input for an agent."""
-        enriched_input = base_input
+        # Context and base input are the same on every retry; feedback goes last
+        builder = PromptBuilder()
         
         if self.enable_context and previous_outputs:
             # Add relevant context from previous agents
-            context_parts = []
             if agent == "designer" and "planner" in previous_outputs:
-                context_parts.append(f"Plan Context:\n{previous_outputs['planner'][:500]}")
+                builder.stable(f"Plan Context:\n{previous_outputs['planner'][:500]}")
             elif agent == "coder" and "designer" in previous_outputs:
-                context_parts.append(f"Design Context:\n{previous_outputs['designer'][:500]}")
-                
-            if context_parts:
-                enriched_input = "\n\n".join(context_parts) + "\n\n" + enriched_input
-                
+                builder.stable(f"Design Context:\n{previous_outputs['designer'][:500]}")
+        
+        builder.stable(base_input)
         if self.enable_feedback and feedback:
-            enriched_input += f"\n\nPrevious Feedback:\n{feedback}"
+            builder.volatile(f"Previous Feedback:\n{feedback}")
+        enriched_input = builder.build()
             
         self.conversation_history.append({
             "agent": agent,
@@ -136,8 +153,9 @@ async def execute_enhanced_full_workflow(
             execution_id=f"enhanced_full_{int(asyncio.get_event_loop().time())}"
         )
     
-    # Initialize state manager and communication enhancer
-    state_manager = WorkflowStateManager()
+    # Initialize state manager (resuming checkpointed phases) and communication enhancer
+    checkpoint = WorkflowCheckpoint.open(input_data, "enhanced_full")
+    state_manager = WorkflowStateManager(checkpoint)
     comm_enhancer = AgentCommunicationEnhancer(
         enable_feedback=config.enable_feedback_loop,
         enable_context=config.enable_context_enrichment
@@ -187,6 +205,9 @@ async def execute_enhanced_full_workflow(
             performance_monitor=performance_monitor
         )
         
+        if checkpoint:
+            checkpoint.complete()
+        
         # Complete performance monitoring
         performance_monitor.complete_workflow()
         performance_monitor.update_cache_stats(cache_manager.get_stats())
@@ -352,6 +373,16 @@ async def execute_phase_with_retry(
     """Execute a phase with retry logic and error recovery."""
     from core.migration import run_team_member_with_tracking
     
+    # Phases completed before the run was resumed are not run again
+    restored_output = state_manager.get_restored_output(phase_name)
+    if restored_output is not None:
+        print(f"⏭️ {phase_name.capitalize()} phase restored from checkpoint")
+        return TeamMemberResult(
+            team_member=team_member,
+            output=restored_output,
+            name=agent_name.replace("_agent", "")
+        )
+    
     # Start performance monitoring for this phase
     phase_metrics = None
     if performance_monitor:
@@ -497,6 +528,25 @@ async def execute_coding_phase(
     """Execute the coding phase with incremental orchestrator fallback."""
     from core.migration import run_team_member_with_tracking
     
+    restored_code = state_manager.get_restored_output("coding")
+    if restored_code is not None:
+        print("⏭️ Implementation phase restored from checkpoint")
+        results.append(TeamMemberResult(
+            team_member=TeamMember.coder,
+            output=restored_code,
+            name="coder"
+        ))
+        phase_outputs["coder"] = restored_code
+        if "executor" in team_members:
+            await execute_code_in_container(
+                code_output=restored_code,
+                requirements=requirements,
+                results=results,
+                tracer=tracer,
+                state_manager=state_manager
+            )
+        return
+    
     print("💻 Implementation phase...")
     
     step_id = tracer.start_step("implementation", "incremental_coding", {
@@ -622,6 +672,16 @@ async def execute_code_in_container(
     from core.migration import run_team_member_with_tracking
     from agents.executor.proof_reader import extract_proof_from_executor_output
     
+    restored_output = state_manager.get_restored_output("execution")
+    if restored_output is not None:
+        print("⏭️ Execution phase restored from checkpoint")
+        results.append(TeamMemberResult(
+            team_member=TeamMember.executor,
+            output=restored_output,
+            name="executor"
+        ))
+        return
+    
     print(f"🐳 Executing code in Docker container{' (fallback)' if fallback else ''}...")
     
     session_id = generate_session_id(requirements)
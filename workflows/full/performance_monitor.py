@@ -9,6 +9,9 @@ from dataclasses import dataclass, field
 from collections import defaultdict
 import statistics
 
+from shared.utils.prompt_builder import get_prompt_cache_tracker
+from shared.utils.request_hedger import get_request_hedger
+
 
 @dataclass
 class PhaseMetrics:
@@ -220,6 +223,8 @@ class PerformanceMonitor:
             "agent_calls": dict(workflow.agent_call_count),
             "cache_hit_rate": f"{cache_hit_rate:.1f}%",
             "cache_stats": workflow.cache_stats,
+            "prompt_cache": get_prompt_cache_tracker().get_stats(),
+            "request_hedging": get_request_hedger().get_report(),
             "recent_alerts": self.alerts[-10:],  # Last 10 alerts
             "phase_breakdown": self._get_phase_breakdown(workflow)
         }
@@ -277,4 +282,20 @@ class PerformanceMonitor:
         if total_memory_increase > 500 * 1024 * 1024:  # 500MB
             suggestions.append(f"High memory usage detected ({total_memory_increase / (1024*1024):.0f}MB increase)")
             
+        # Check provider prompt cache reuse
+        for agent, stats in get_prompt_cache_tracker().get_stats()["agents"].items():
+            if stats["calls"] >= 3 and stats["prefix_reuse_ratio"] < 0.2:
+                suggestions.append(
+                    f"Agent '{agent}' reuses only {stats['prefix_reuse_ratio']:.0%} of its prompt prefix - "
+                    "move volatile content after the stable instructions"
+                )
+        
+        # Check agent latency tails that hedging could cut
+        for key, stats in get_request_hedger().get_report().items():
+            if stats["calls"] >= 20 and stats["hedged"] == 0 and stats["p99_unhedged"] > 3 * stats["p50"] > 0:
+                suggestions.append(
+                    f"'{key}' p99 latency is {stats['p99_unhedged']:.1f}s vs p50 {stats['p50']:.1f}s - "
+                    "consider enabling request hedging for this agent"
+                )
+            
         return suggestions
\ No newline at end of file
@@ -9,11 +9,19 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from shared.utils.feature_parser import Feature, FeatureParser, ComplexityLevel
+from shared.utils.code_block_parser import FILENAME, HASH_HEADER, extract_files
+from shared.utils.context_builder import ContextBuilder
+from shared.utils.model_router import add_model_directive, get_model_router
+from shared.utils.speculation import (
+    SpeculationOutcome, race_candidates, candidate_approach, get_speculation_metrics, select_candidate
+)
+from agents.agent_configs import feature_coder_config
+from workflows.workflow_config import SPECULATIVE_RETRY_CONFIG, MODEL_ROUTING_CONFIG
 # No direct imports from incremental_executor to avoid circular imports
 from workflows.monitoring import WorkflowExecutionTracer
 from shared.data_models import TeamMemberResult, TeamMember
 from .stagnation_detector import StagnationDetector
-from .retry_strategies import RetryOrchestrator, RetryContext, RetryStrategy
+from .retry_strategies import RetryOrchestrator, RetryContext, RetryDecision, RetryStrategy
 from .progress_monitor import ProgressMonitor
 
 
@@ -257,6 +265,12 @@ class FeatureOrchestrator:
 # Integration helper for workflows
 # Helper functions moved from incremental_executor.py to avoid circular imports
 
+_context_builder = ContextBuilder(
+    token_budget=feature_coder_config.get("context_token_budget", 8000),
+    header_format="--- {filename} ---"
+)
+
+
 def prepare_feature_context(
     feature: Feature,
     requirements: str,
@@ -291,19 +305,16 @@ def prepare_feature_context(
         for filename in sorted(existing_code.keys()):
             context_parts.append(f"  - {filename}")
         
-        # Include relevant existing code based on dependencies
-        if feature.dependencies:
-            context_parts.extend(["", "Relevant existing code:"])
-            for dep_feature_id in feature.dependencies:
-                # Include interface/signatures from dependent features
-                # This is simplified - real implementation would be smarter
-                for filename, content in existing_code.items():
-                    if any(dep_file in filename for dep_file in ['__init__.py', 'base.py']):
-                        context_parts.extend([
-                            "",
-                            f"--- {filename} ---",
-                            content[:500] + "..." if len(content) > 500 else content
-                        ])
+        # Include the existing code most relevant to this feature, within budget
+        context_parts.extend([
+            "",
+            "Relevant existing code:",
+            _context_builder.build(
+                existing_code,
+                focus_text=f"{feature.title}\n{feature.description}\n{feature.validation_criteria}\n{tests or ''}",
+                focus_files=feature.files
+            )
+        ])
     
     # Add retry context if applicable
     if retry_attempt > 0:
@@ -341,28 +352,13 @@ def prepare_feature_context(
 
 def parse_code_files(code_output: str) -> Dict[str, str]:
     """Extract individual files from coder output"""
-    files = {}
-    
     # Pattern: FILENAME: path/to/file.py followed by code block
-    file_pattern = r'FILENAME:\s*([^\n]+)\n```(?:\w+)?\n(.*?)```'
-    
-    matches = re.finditer(file_pattern, code_output, re.DOTALL)
-    
-    for match in matches:
-        filename = match.group(1).strip()
-        content = match.group(2).strip()
-        files[filename] = content
+    files = extract_files(code_output, styles=(FILENAME,))
     
     # Fallback: look for standard file markers if FILENAME not used
     if not files:
-        # Try to parse markdown code blocks with file comments
-        alt_pattern = r'#\s*([^\n]+\.py)\n```python\n(.*?)```'
-        matches = re.finditer(alt_pattern, code_output, re.DOTALL)
-        
-        for match in matches:
-            filename = match.group(1).strip()
-            content = match.group(2).strip()
-            files[filename] = content
+        # Markdown code blocks preceded by a "# path/to/file.py" comment
+        files = extract_files(code_output, styles=(HASH_HEADER,), languages=("python",))
     
     return files
 
@@ -391,6 +387,68 @@ def extract_relevant_tests_for_feature(all_tests: str, feature: Feature) -> Opti
                 relevant_sections.append(f"# Tests for {file}")
     
     return "\n".join(relevant_sections) if relevant_sections else None
+
+
+async def run_speculative_round(
+    feature: Feature,
+    coder_input: str,
+    decisions: List[RetryDecision],
+    count: int,
+    executor: Any,
+    tests: Optional[str],
+    round_id: str,
+    timeout: Optional[float] = None
+) -> SpeculationOutcome:
+    """
+    Generate count candidate implementations concurrently and validate each
+    in its own executor session, keeping the first one that passes.
+    
+    Candidate i follows decisions[i] (best retry strategy first) and a
+    different approach hint. Each finished candidate's result is a tuple of
+    (code_output, new_files, validation_result). The candidate sessions are
+    released once the round is over; a winner's files reach the main session
+    through accept_candidate.
+    """
+    from orchestrator.orchestrator_agent import run_team_member_with_tracking
+    
+    variants = [
+        decisions[i].strategy.value if i < len(decisions) else f"approach_{i}"
+        for i in range(count)
+    ]
+    
+    async def attempt(index: int, variant: str):
+        candidate_input = coder_input
+        if index < len(decisions):
+            candidate_input = decisions[index].get_modified_context(candidate_input)
+        approach = candidate_approach(index)
+        if approach:
+            candidate_input += f"\n\nCANDIDATE APPROACH:\n{approach}"
+        
+        code_result = await run_team_member_with_tracking("coder_agent", candidate_input, "incremental_coding")
+        code_output = extract_content_from_message(code_result)
+        new_files = parse_code_files(code_output)
+        validation_result = await executor.validate_feature(
+            feature,
+            new_files,
+            tests,
+            candidate_id=f"{round_id}_c{index}"
+        )
+        return (code_output, new_files, validation_result), validation_result.success
+    
+    try:
+        return await race_candidates(variants, attempt, timeout=timeout)
+    finally:
+        await asyncio.gather(*(
+            executor.release_candidate(f"{round_id}_c{index}") for index in range(count)
+        ))
+
+
+def validation_progress(result: Tuple[str, Dict[str, str], Any]) -> Tuple[int, int]:
+    """Tests passed and failed by a validated candidate"""
+    validation_result = result[2]
+    return validation_result.tests_passed or 0, validation_result.tests_failed or 0
+
+
 async def execute_features_incrementally(
     features: List[Feature],
     requirements: str,
@@ -398,12 +456,20 @@ async def execute_features_incrementally(
     tests: Optional[str],
     tracer: WorkflowExecutionTracer,
     max_retries: int = 3,
-    stagnation_threshold: float = 0.7
+    stagnation_threshold: float = 0.7,
+    speculation: Optional[Dict[str, Any]] = None
 ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
     """
     Execute features incrementally with retry logic and stagnation detection.
     Follows ACP patterns for orchestrated execution.
+    
+    With speculation enabled (see SPECULATIVE_RETRY_CONFIG), retry rounds
+    after the first serial failures generate and validate several candidates
+    concurrently instead of one.
     """
+    speculation = {**SPECULATIVE_RETRY_CONFIG, **(speculation or {})}
+    speculation_metrics = get_speculation_metrics()
+    model_router = get_model_router() if MODEL_ROUTING_CONFIG["enabled"] else None
     try:
         from orchestrator.orchestrator_agent import run_team_member_with_tracking
     except ImportError as e:
@@ -463,6 +529,11 @@ async def execute_features_incrementally(
         
         success = False
         retry_count = 0
+        retry_context = None
+        feature_start_time = datetime.now()
+        coder_calls = 0
+        speculative_calls = 0
+        cancelled_candidates = 0
         
         # Check if we should skip this feature due to previous stagnation
         if stagnation_detector.should_skip_feature(feature.id):
@@ -506,30 +577,85 @@ async def execute_features_incrementally(
                     coder_input += "\n\nPREVIOUS ERRORS TO AVOID:\n"
                     for error in summary['most_recent_errors']:
                         coder_input += f"- {error['type']}: {error['message']}\n"
+            
+            # Pick the model tier for this attempt, escalating on retries
+            route = None
+            if model_router:
+                route = model_router.select("coder_agent", feature.complexity, retry_count)
+                coder_input = add_model_directive(coder_input, route.model)
+                print(f"   Model: {route.model} ({route.reason})")
+            coder_start_time = datetime.now()
+            
+            # Speculate once enough serial attempts failed and the budget allows two or more candidates
+            candidate_count = min(speculation["candidates"], speculation["max_candidates"] - speculative_calls)
+            candidate = None
+            outcome = None
+            if (speculation["enabled"] and retry_count >= speculation["start_after_failures"]
+                    and candidate_count >= 2):
+                decisions = retry_orchestrator.rank_decisions(retry_context, candidate_count) if retry_context else []
+                print(f"🔀 Generating {candidate_count} candidates concurrently")
+                outcome = await run_speculative_round(
+                    feature,
+                    coder_input,
+                    decisions,
+                    candidate_count,
+                    executor,
+                    tests,
+                    round_id=f"{feature.id}_r{retry_count}",
+                    timeout=speculation["round_timeout"]
+                )
+                speculative_calls += outcome.launched
+                coder_calls += outcome.launched
+                cancelled_candidates += outcome.cancelled
+                
+                # Feed strategy effectiveness back into the orchestrator
+                for finished in outcome.finished:
+                    if finished.index < len(decisions):
+                        retry_orchestrator.record_outcome(decisions[finished.index].strategy, finished.success)
                 
+                candidate = select_candidate(outcome, validation_progress)
+                if outcome.winner:
+                    print(f"   Candidate {outcome.winner.index} ({outcome.winner.variant}) passed in "
+                          f"{outcome.winner.duration:.1f}s, cancelled {outcome.cancelled}")
+            
+            if candidate:
+                code_output, new_files, validation_result = candidate.result
+                if validation_result.success:
+                    executor.accept_candidate(feature, new_files)
+            else:
                 # Apply retry strategy modifications if available
-                if 'retry_decision' in locals() and retry_decision.modifications:
+                if retry_count > 0 and 'retry_decision' in locals() and retry_decision.modifications:
                     coder_input = retry_decision.get_modified_context(coder_input)
+                
+                # Get code from coder agent
+                code_result = await run_team_member_with_tracking("coder_agent", coder_input, "incremental_coding")
+                coder_calls += 1
+                
+                # Extract content using helper function
+                code_output = extract_content_from_message(code_result)
+                
+                # Parse files from output
+                new_files = parse_code_files(code_output)
+                
+                # Validate with executor
+                validation_result = await executor.validate_feature(
+                    feature,
+                    new_files,
+                    tests
+                )
             
-            # Get code from coder agent
-            code_result = await run_team_member_with_tracking("coder_agent", coder_input, "incremental_coding")
-            
-            # Extract content using helper function
-            code_output = extract_content_from_message(code_result)
-            
-            # Parse files from output
-            new_files = parse_code_files(code_output)
+            if route and outcome:
+                model_router.record_candidates(route, outcome.finished)
+            elif route:
+                model_router.record(
+                    route,
+                    validation_result.success,
+                    (datetime.now() - coder_start_time).total_seconds()
+                )
             
             # Calculate code change size for stagnation detection
             code_diff_size = sum(len(content.split('\n')) for content in new_files.values())
             
-            # Validate with executor
-            validation_result = await executor.validate_feature(
-                feature,
-                new_files,
-                tests
-            )
-            
             # Record attempt for stagnation detection
             attempt_duration = (datetime.now() - attempt_start_time).total_seconds()
             test_results = None
@@ -640,6 +766,16 @@ async def execute_features_incrementally(
                         # Decision is not to retry
                         break
         
+        speculation_metrics.record_feature(
+            feature.id,
+            mode="speculative" if speculative_calls else "serial",
+            success=success,
+            time_to_green=(datetime.now() - feature_start_time).total_seconds(),
+            coder_calls=coder_calls,
+            rounds=retry_count + (1 if success else 0),
+            cancelled=cancelled_candidates
+        )
+        
         if not success:
             # Check if we should skip based on stagnation
             if stagnation_detector.should_skip_feature(feature.id):
@@ -721,6 +857,10 @@ async def execute_features_incrementally(
     # Export progress data to tracer metadata
     tracer.add_metadata("progress_report", progress_monitor.get_progress_summary())
     tracer.add_metadata("retry_strategies", retry_orchestrator.get_strategy_report())
+    tracer.add_metadata("speculation", speculation_metrics.get_report())
+    if model_router:
+        model_router.save()
+        tracer.add_metadata("model_routes", model_router.get_stats())
     
     return completed_features, executor.codebase_state
 
@@ -295,6 +295,55 @@ class RetryOrchestrator:
                 reason="Maximum retry attempts reached"
             )
         
+        strategy_scores = self._score_strategies(context)
+        
+        if not strategy_scores:
+            return RetryDecision(
+                should_retry=False,
+                strategy=RetryStrategy.SKIP_AND_CONTINUE,
+                reason="No suitable retry strategy found"
+            )
+        
+        # Select best strategy
+        best_strategy = max(strategy_scores.items(), key=lambda x: x[1])[0]
+        selected = self.strategies[best_strategy]
+        
+        # Track usage
+        self.strategy_usage_count[best_strategy] = self.strategy_usage_count.get(best_strategy, 0) + 1
+        
+        return RetryDecision(
+            should_retry=True,
+            strategy=best_strategy,
+            delay_seconds=selected.get_delay(context),
+            modifications=selected.get_modifications(context),
+            reason=f"Using {best_strategy.value} strategy"
+        )
+    
+    def rank_decisions(self, context: RetryContext, count: int) -> List[RetryDecision]:
+        """
+        Get up to count retry decisions, best strategy first.
+        
+        Used for speculative retries, where each concurrent candidate follows
+        a different strategy. Delays are dropped since the candidates run at
+        once. Returns an empty list when no strategy allows a retry.
+        """
+        if context.attempt_number >= context.total_attempts:
+            return []
+        
+        ranked = sorted(self._score_strategies(context).items(), key=lambda x: x[1], reverse=True)
+        decisions = []
+        for strategy_type, _ in ranked[:count]:
+            self.strategy_usage_count[strategy_type] = self.strategy_usage_count.get(strategy_type, 0) + 1
+            decisions.append(RetryDecision(
+                should_retry=True,
+                strategy=strategy_type,
+                modifications=self.strategies[strategy_type].get_modifications(context),
+                reason=f"Using {strategy_type.value} strategy"
+            ))
+        return decisions
+    
+    def _score_strategies(self, context: RetryContext) -> Dict[RetryStrategy, float]:
+        """Score the strategies that allow a retry in this context."""
         # Evaluate each strategy
         strategy_scores = {}
         
@@ -319,27 +368,7 @@ class RetryOrchestrator:
                 
                 strategy_scores[strategy_type] = score
         
-        if not strategy_scores:
-            return RetryDecision(
-                should_retry=False,
-                strategy=RetryStrategy.SKIP_AND_CONTINUE,
-                reason="No suitable retry strategy found"
-            )
-        
-        # Select best strategy
-        best_strategy = max(strategy_scores.items(), key=lambda x: x[1])[0]
-        selected = self.strategies[best_strategy]
-        
-        # Track usage
-        self.strategy_usage_count[best_strategy] = self.strategy_usage_count.get(best_strategy, 0) + 1
-        
-        return RetryDecision(
-            should_retry=True,
-            strategy=best_strategy,
-            delay_seconds=selected.get_delay(context),
-            modifications=selected.get_modifications(context),
-            reason=f"Using {best_strategy.value} strategy"
-        )
+        return strategy_scores
     
     def record_outcome(self, strategy: RetryStrategy, success: bool):
         """Record the outcome of a retry strategy."""
@@ -7,12 +7,11 @@ ensuring secure and auditable file operations with proper sandboxing.
 
 import os
 import json
-import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 from workflows.logger import workflow_logger as logger
-from shared.filesystem_client import MCPFileSystemClient, get_filesystem_client
+from shared.filesystem_client import MCPFileSystemClient, get_filesystem_client, run_sync
 
 
 class CodeSaverMCP:
@@ -56,6 +55,19 @@ class CodeSaverMCP:
         if self.use_mcp and hasattr(self, '_mcp_context'):
             await self._mcp_context.__aexit__(exc_type, exc_val, exc_tb)
     
+    def _run_mcp(self, operation):
+        """Run an MCP operation from synchronous code.
+        
+        Runs on the shared background event loop so every call reuses the
+        same warm filesystem server connection instead of spawning a new
+        server in a fresh event loop.
+        """
+        async def run_connected():
+            async with self.mcp_client.connect():
+                return await operation()
+        
+        return run_sync(run_connected())
+    
     def _get_relative_path(self, full_path: Path) -> str:
         """Get path relative to MCP sandbox root"""
         if self.use_mcp:
@@ -92,12 +104,7 @@ class CodeSaverMCP:
         # Create directory using appropriate method
         if self.use_mcp:
             # Run async operation synchronously
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self._create_directory_mcp(self.current_session_path))
-            finally:
-                loop.close()
+            self._run_mcp(lambda: self._create_directory_mcp(self.current_session_path))
         else:
             self.current_session_path.mkdir(parents=True, exist_ok=True)
         
@@ -138,14 +145,9 @@ class CodeSaverMCP:
         
         # Run async operations if using MCP
         if self.use_mcp:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                saved_paths = loop.run_until_complete(
-                    self._save_code_files_async(code_dict, feature_name, overwrite)
-                )
-            finally:
-                loop.close()
+            saved_paths = self._run_mcp(
+                lambda: self._save_code_files_async(code_dict, feature_name, overwrite)
+            )
         else:
             # Use direct file I/O
             for filename, content in code_dict.items():
@@ -167,58 +169,65 @@ class CodeSaverMCP:
                                    code_dict: Dict[str, str], 
                                    feature_name: Optional[str],
                                    overwrite: bool) -> List[Path]:
-        """Async version of save_code_files for MCP"""
-        saved_paths = []
+        """Async version of save_code_files for MCP.
         
-        for filename, content in code_dict.items():
-            try:
-                file_path = await self._save_single_file_mcp(filename, content, overwrite)
-                saved_paths.append(file_path)
-                self.files_saved.append(file_path)
-                
-                logger.info(f"Saved {filename} ({len(content)} chars) via MCP" + 
-                          (f" for feature: {feature_name}" if feature_name else ""))
-                          
-            except Exception as e:
-                logger.error(f"Failed to save {filename} via MCP: {str(e)}")
-                raise
-                
-        return saved_paths
-    
-    async def _save_single_file_mcp(self, filename: str, content: str, overwrite: bool) -> Path:
-        """Save a single file using MCP client"""
+        All files are written with batched write_files calls instead of one
+        round-trip (plus a create_directory call) per file.
+        """
         if not self.mcp_client:
             raise RuntimeError("MCP client not initialized")
-            
-        file_path = self.current_session_path / filename
-        relative_path = self._get_relative_path(file_path)
         
-        # Check if file exists and handle overwrite
+        targets = {filename: self.current_session_path / filename for filename in code_dict}
         if not overwrite:
-            exists = await self.mcp_client.exists(relative_path)
-            if exists:
-                # Find unique filename
-                base = Path(filename).stem
-                ext = Path(filename).suffix
-                counter = 1
-                while exists:
-                    new_filename = f"{base}_{counter}{ext}"
-                    file_path = self.current_session_path / new_filename
-                    relative_path = self._get_relative_path(file_path)
-                    exists = await self.mcp_client.exists(relative_path)
-                    counter += 1
+            targets = await self._resolve_unique_paths_mcp(targets)
         
-        # Create parent directories if needed
-        parent_dir = str(Path(relative_path).parent)
-        if parent_dir and parent_dir != ".":
-            await self.mcp_client.create_directory(parent_dir, parents=True)
+        relative_paths = {filename: self._get_relative_path(path) for filename, path in targets.items()}
+        written = await self.mcp_client.write_files({
+            relative_paths[filename]: content for filename, content in code_dict.items()
+        }, if_changed=True)
         
-        # Write the file
-        success = await self.mcp_client.write_file(relative_path, content)
-        if not success:
-            raise RuntimeError(f"Failed to write file via MCP: {filename}")
+        saved_paths = []
+        for filename, content in code_dict.items():
+            if not written.get(relative_paths[filename]):
+                logger.error(f"Failed to save {filename} via MCP")
+                raise RuntimeError(f"Failed to write file via MCP: {filename}")
             
-        return file_path
+            saved_paths.append(targets[filename])
+            self.files_saved.append(targets[filename])
+            logger.info(f"Saved {filename} ({len(content)} chars) via MCP" + 
+                      (f" for feature: {feature_name}" if feature_name else ""))
+                
+        return saved_paths
+    
+    async def _resolve_unique_paths_mcp(self, targets: Dict[str, Path]) -> Dict[str, Path]:
+        """Pick non-existing paths for files that must not be overwritten.
+        
+        Checks all candidates with one stat_many call per round. A path
+        already picked for another file counts as taken, so two files never
+        resolve to the same path.
+        """
+        resolved = dict(targets)
+        counters = {filename: 0 for filename in targets}
+        pending = list(targets)
+        claimed = set()
+        
+        while pending:
+            stats = await self.mcp_client.stat_many(
+                [self._get_relative_path(resolved[filename]) for filename in pending]
+            )
+            still_taken = []
+            for filename in pending:
+                relative_path = self._get_relative_path(resolved[filename])
+                if relative_path in claimed or stats.get(relative_path, {}).get("exists"):
+                    counters[filename] += 1
+                    original = targets[filename]
+                    resolved[filename] = original.parent / f"{original.stem}_{counters[filename]}{original.suffix}"
+                    still_taken.append(filename)
+                else:
+                    claimed.add(relative_path)
+            pending = still_taken
+        
+        return resolved
     
     def _save_single_file_direct(self, filename: str, content: str, overwrite: bool) -> Path:
         """Save a single file using direct I/O"""
@@ -269,12 +278,7 @@ class CodeSaverMCP:
         
         # Save using appropriate method
         if self.use_mcp:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self._save_file_mcp(metadata_path, content))
-            finally:
-                loop.close()
+            self._run_mcp(lambda: self._save_file_mcp(metadata_path, content))
         else:
             metadata_path.write_text(content)
             
@@ -310,12 +314,7 @@ class CodeSaverMCP:
         
         # Save using appropriate method
         if self.use_mcp:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self._save_file_mcp(req_path, content))
-            finally:
-                loop.close()
+            self._run_mcp(lambda: self._save_file_mcp(req_path, content))
         else:
             req_path.write_text(content)
         
@@ -381,12 +380,7 @@ class CodeSaverMCP:
         
         # Save using appropriate method
         if self.use_mcp:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self._save_file_mcp(readme_path, content))
-            finally:
-                loop.close()
+            self._run_mcp(lambda: self._save_file_mcp(readme_path, content))
         else:
             readme_path.write_text(content)
         
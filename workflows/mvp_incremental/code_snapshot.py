@@ -0,0 +1,117 @@
+"""
+Versioned Code Snapshots for MVP Incremental Workflow
+
+Features implemented in parallel each need the code accumulated from the
+features completed before they start. Instead of rebuilding that dict per
+feature, the code is kept as a series of immutable snapshots:
+
+- file contents are stored once, by content hash
+- each snapshot maps filename -> content hash and is never modified
+- applying a completed feature's files creates the next version
+  (copy-on-write of the filename map), so taking a snapshot is O(1)
+"""
+
+import hashlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def content_hash(content: str) -> str:
+    """Hash identifying file content."""
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class CodeSnapshot(Mapping):
+    """
+    Immutable filename -> content view of accumulated code.
+
+    Behaves like a read-only dict; copy() returns a regular mutable dict
+    for callers that build on top of it.
+    """
+
+    __slots__ = ("version", "source", "_files", "_blobs")
+
+    def __init__(self, files: Dict[str, str], blobs: Dict[str, str],
+                 version: int = 0, source: Optional[str] = None):
+        self.version = version
+        self.source = source  # Feature whose files produced this version
+        self._files = files  # filename -> content hash, never mutated
+        self._blobs = blobs  # content hash -> content, append-only and shared
+
+    @classmethod
+    def from_dict(cls, code: Dict[str, str]) -> "CodeSnapshot":
+        """Create a standalone snapshot of a code dict."""
+        return CodeSnapshotStore(code).snapshot()
+
+    def __getitem__(self, filename: str) -> str:
+        return self._blobs[self._files[filename]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def file_hash(self, filename: str) -> Optional[str]:
+        """Content hash of a file, without loading its content."""
+        return self._files.get(filename)
+
+    def copy(self) -> Dict[str, str]:
+        """Mutable dict copy of the snapshot."""
+        return {name: self._blobs[digest] for name, digest in self._files.items()}
+
+    def changed_since(self, other: "CodeSnapshot") -> List[str]:
+        """Files added or modified compared to an earlier snapshot."""
+        return [name for name, digest in self._files.items() if other._files.get(name) != digest]
+
+    def __repr__(self) -> str:
+        return f"CodeSnapshot(version={self.version}, files={len(self._files)}, source={self.source!r})"
+
+
+class CodeSnapshotStore:
+    """Produces successive CodeSnapshot versions as features complete."""
+
+    def __init__(self, initial_code: Optional[Dict[str, str]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            initial_code: Code the first snapshot starts from
+        """
+        self._blobs: Dict[str, str] = {}
+        self._current = CodeSnapshot(self._store_files(initial_code or {}), self._blobs)
+        self.history: List[Tuple[int, Optional[str], int]] = [(0, None, len(self._current))]
+
+    def _store_files(self, files: Dict[str, str]) -> Dict[str, str]:
+        hashes = {}
+        for name, content in files.items():
+            digest = content_hash(content)
+            self._blobs.setdefault(digest, content)
+            hashes[name] = digest
+        return hashes
+
+    def snapshot(self) -> CodeSnapshot:
+        """The current snapshot (O(1), never modified afterwards)."""
+        return self._current
+
+    def apply(self, files: Dict[str, str], source: Optional[str] = None) -> CodeSnapshot:
+        """
+        Create the next version with files added or replaced.
+
+        Args:
+            files: Parsed filename -> content of a completed feature
+            source: Identifier of the feature that produced the files
+
+        Returns:
+            The new current snapshot
+        """
+        updates = self._store_files(files)
+        current = self._current
+        if all(current._files.get(name) == digest for name, digest in updates.items()):
+            return current
+
+        merged = dict(current._files)
+        merged.update(updates)
+        self._current = CodeSnapshot(merged, self._blobs, current.version + 1, source)
+        self.history.append((self._current.version, source, len(updates)))
+        return self._current
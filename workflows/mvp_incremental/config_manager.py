@@ -12,6 +12,7 @@ from typing import Dict, List, Optional, Set, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from shared.utils.project_index import ProjectIndex, get_project_index
 from workflows.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -77,10 +78,18 @@ class ConfigManager:
         ConfigType.FILE_PATH: [r'PATH', r'FILE', r'DIRECTORY', r'DIR'],
     }
     
-    def __init__(self, project_path: Path):
+    # File extensions scanned for environment variables
+    SCAN_EXTENSIONS = ['.js', '.ts', '.py', '.java', '.rb', '.go', '.php', '.cs']
+    
+    def __init__(self, project_path: Path, project_index: Optional[ProjectIndex] = None):
         self.project_path = project_path
+        self.project_index = project_index
         self.config_vars: Dict[str, ConfigVariable] = {}
         self.secrets: Set[str] = set()
+    
+    def _get_index(self) -> ProjectIndex:
+        """Index passed in by the caller, or the refreshed shared index"""
+        return self.project_index or get_project_index(self.project_path)
         
     def analyze_project(self) -> ConfigurationReport:
         """Analyze project for configuration needs"""
@@ -115,16 +124,9 @@ class ConfigManager:
         """Scan codebase for environment variable usage"""
         logger.info("Scanning for environment variables...")
         
-        # File extensions to scan
-        extensions = ['.js', '.ts', '.py', '.java', '.rb', '.go', '.php', '.cs']
-        
-        for file_path in self.project_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in extensions:
-                try:
-                    content = file_path.read_text(encoding='utf-8')
-                    self._extract_env_vars(content, str(file_path.relative_to(self.project_path)))
-                except Exception as e:
-                    logger.warning(f"Failed to read {file_path}: {e}")
+        matches = self._get_index().find_matches(self.ENV_PATTERNS, self.SCAN_EXTENSIONS)
+        for source_file, found_vars in matches.items():
+            self._add_env_vars(found_vars, source_file)
     
     def _extract_env_vars(self, content: str, source_file: str):
         """Extract environment variables from file content"""
@@ -134,7 +136,10 @@ class ConfigManager:
             matches = re.findall(pattern, content, re.MULTILINE)
             found_vars.update(matches)
         
-        # Add found variables to config
+        self._add_env_vars(found_vars, source_file)
+    
+    def _add_env_vars(self, found_vars: Set[str], source_file: str):
+        """Add found variables to config"""
         for var_name in found_vars:
             if var_name not in self.config_vars:
                 self.config_vars[var_name] = ConfigVariable(name=var_name)
@@ -5,13 +5,13 @@ Generates deployment-ready configuration files for various platforms.
 """
 
 import os
-import json
 import yaml
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass, field
 from enum import Enum
 
+from shared.utils.project_index import ProjectIndex, get_project_index
 from workflows.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -60,10 +60,20 @@ class DeploymentConfig:
 class DeploymentConfigGenerator:
     """Generates deployment configurations for various platforms"""
     
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, project_index: Optional[ProjectIndex] = None):
         self.project_path = project_path
+        self.project_index = project_index
         self.detected_services: List[ServiceConfig] = []
         self.deployment_configs: Dict[DeploymentTarget, DeploymentConfig] = {}
+        self._index: Optional[ProjectIndex] = None
+    
+    def _get_index(self) -> ProjectIndex:
+        """Index for the current analysis (refreshed once per analyze_project)"""
+        if self.project_index:
+            return self.project_index
+        if self._index is None:
+            self._index = get_project_index(self.project_path)
+        return self._index
         
     def analyze_project(self) -> Dict[str, Any]:
         """Analyze project structure and detect services"""
@@ -78,16 +88,14 @@ class DeploymentConfigGenerator:
             'api_services': False
         }
         
+        # Pick up files changed since the last analysis
+        self._index = None
+        index = self._get_index()
+        
         # Detect frontend services
-        if (self.project_path / 'package.json').exists():
-            try:
-                package_json = json.loads((self.project_path / 'package.json').read_text())
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse package.json: {e}")
-                package_json = {}
-            
+        if index.exists('package.json'):
             # Check for frontend frameworks
-            deps = {**package_json.get('dependencies', {}), **package_json.get('devDependencies', {})}
+            deps = index.package_dependencies()
             
             if '@angular/core' in deps:
                 analysis['frameworks'].append('angular')
@@ -116,12 +124,8 @@ class DeploymentConfigGenerator:
                 self._add_fastify_service()
         
         # Detect Python services
-        if (self.project_path / 'requirements.txt').exists():
-            try:
-                requirements = (self.project_path / 'requirements.txt').read_text()
-            except Exception as e:
-                logger.warning(f"Failed to read requirements.txt: {e}")
-                requirements = ""
+        if index.exists('requirements.txt'):
+            requirements = index.read_text('requirements.txt') or ""
             
             if 'fastapi' in requirements:
                 analysis['frameworks'].append('fastapi')
@@ -166,17 +170,9 @@ class DeploymentConfigGenerator:
     
     def _check_for_database_usage(self, keywords: List[str]) -> bool:
         """Check if project uses specific database"""
-        # Check package.json
-        package_json_path = self.project_path / 'package.json'
-        if package_json_path.exists():
-            content = package_json_path.read_text().lower()
-            if any(keyword in content for keyword in keywords):
-                return True
-        
-        # Check requirements.txt
-        requirements_path = self.project_path / 'requirements.txt'
-        if requirements_path.exists():
-            content = requirements_path.read_text().lower()
+        index = self._get_index()
+        for manifest in ('package.json', 'requirements.txt'):
+            content = (index.read_text(manifest) or "").lower()
             if any(keyword in content for keyword in keywords):
                 return True
         
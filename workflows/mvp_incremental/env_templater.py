@@ -6,12 +6,12 @@ Handles creation and management of environment variable templates.
 
 import os
 import re
-import json
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Any
 from dataclasses import dataclass
 from string import Template
 
+from shared.utils.project_index import ProjectIndex, get_project_index
 from workflows.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -112,57 +112,61 @@ DOCKER_BUILDKIT=${DOCKER_BUILDKIT:-1}
         }
     }
     
-    def __init__(self, project_path: Path):
+    # Patterns for environment variable usage in source files
+    ENV_USAGE_PATTERNS = [
+        r'process\.env\.([A-Z_]+)',
+        r'os\.environ\[["\']([A-Z_]+)["\']\]',
+        r'os\.getenv\(["\']([A-Z_]+)["\']',
+        r'ENV\[["\']([A-Z_]+)["\']\]',
+    ]
+    
+    def __init__(self, project_path: Path, project_index: Optional[ProjectIndex] = None):
         self.project_path = project_path
+        self.project_index = project_index
         self.templates: Dict[str, EnvTemplate] = {}
         self.detected_frameworks: Set[str] = set()
+    
+    def _get_index(self) -> ProjectIndex:
+        """Index passed in by the caller, or the refreshed shared index"""
+        return self.project_index or get_project_index(self.project_path)
         
     def detect_frameworks(self) -> Set[str]:
         """Detect frameworks used in the project"""
         logger.info("🔍 Detecting project frameworks...")
         
+        index = self._get_index()
+        
         # Check package.json for Node.js frameworks
-        package_json = self.project_path / 'package.json'
-        if package_json.exists():
-            try:
-                with open(package_json, 'r') as f:
-                    package_data = json.load(f)
-                    dependencies = {**package_data.get('dependencies', {}), 
-                                    **package_data.get('devDependencies', {})}
-                    
-                    if 'express' in dependencies:
-                        self.detected_frameworks.add('express')
-                    if '@angular/core' in dependencies:
-                        self.detected_frameworks.add('angular')
-                    if 'react' in dependencies:
-                        self.detected_frameworks.add('react')
-                    if 'mongodb' in dependencies or 'mongoose' in dependencies:
-                        self.detected_frameworks.add('mongodb')
-                    if 'pg' in dependencies:
-                        self.detected_frameworks.add('postgresql')
-            except Exception as e:
-                logger.warning(f"Failed to parse package.json: {e}")
+        if index.exists('package.json'):
+            dependencies = index.package_dependencies()
+            
+            if 'express' in dependencies:
+                self.detected_frameworks.add('express')
+            if '@angular/core' in dependencies:
+                self.detected_frameworks.add('angular')
+            if 'react' in dependencies:
+                self.detected_frameworks.add('react')
+            if 'mongodb' in dependencies or 'mongoose' in dependencies:
+                self.detected_frameworks.add('mongodb')
+            if 'pg' in dependencies:
+                self.detected_frameworks.add('postgresql')
         
         # Check requirements.txt for Python frameworks
-        requirements = self.project_path / 'requirements.txt'
-        if requirements.exists():
-            try:
-                content = requirements.read_text()
-                if 'fastapi' in content:
-                    self.detected_frameworks.add('fastapi')
-                if 'redis' in content:
-                    self.detected_frameworks.add('redis')
-                if 'psycopg' in content or 'postgresql' in content:
-                    self.detected_frameworks.add('postgresql')
-                if 'pymongo' in content:
-                    self.detected_frameworks.add('mongodb')
-            except Exception as e:
-                logger.warning(f"Failed to read requirements.txt: {e}")
+        content = index.read_text('requirements.txt')
+        if content is not None:
+            if 'fastapi' in content:
+                self.detected_frameworks.add('fastapi')
+            if 'redis' in content:
+                self.detected_frameworks.add('redis')
+            if 'psycopg' in content or 'postgresql' in content:
+                self.detected_frameworks.add('postgresql')
+            if 'pymongo' in content:
+                self.detected_frameworks.add('mongodb')
         
         # Check for Docker files
-        if (self.project_path / 'docker-compose.yml').exists() or \
-           (self.project_path / 'docker-compose.yaml').exists() or \
-           (self.project_path / 'Dockerfile').exists():
+        if index.exists('docker-compose.yml') or \
+           index.exists('docker-compose.yaml') or \
+           index.exists('Dockerfile'):
             self.detected_frameworks.add('docker')
         
         logger.info(f"Detected frameworks: {', '.join(self.detected_frameworks)}")
@@ -245,22 +249,9 @@ DOCKER_BUILDKIT=${DOCKER_BUILDKIT:-1}
     def _scan_env_usage(self) -> Set[str]:
         """Scan codebase for environment variable usage"""
         env_vars = set()
-        patterns = [
-            r'process\.env\.([A-Z_]+)',
-            r'os\.environ\[["\']([A-Z_]+)["\']\]',
-            r'os\.getenv\(["\']([A-Z_]+)["\']',
-            r'ENV\[["\']([A-Z_]+)["\']\]',
-        ]
-        
-        for file_path in self.project_path.rglob('*'):
-            if file_path.is_file() and file_path.suffix in ['.js', '.ts', '.py', '.rb']:
-                try:
-                    content = file_path.read_text(encoding='utf-8')
-                    for pattern in patterns:
-                        matches = re.findall(pattern, content)
-                        env_vars.update(matches)
-                except Exception:
-                    pass
+        matches = self._get_index().find_matches(self.ENV_USAGE_PATTERNS, ['.js', '.ts', '.py', '.rb'])
+        for found in matches.values():
+            env_vars.update(found)
         
         return env_vars
     
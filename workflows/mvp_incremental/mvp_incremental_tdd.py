@@ -6,6 +6,7 @@ import re
 from typing import List, Dict, Optional
 from pathlib import Path
 from shared.data_models import CodingTeamInput, TeamMemberResult, TeamMember
+from shared.utils.code_block_parser import HASH_FILENAME, extract_files
 from workflows.monitoring import WorkflowExecutionTracer
 from workflows.mvp_incremental.retry_strategy import RetryStrategy, RetryConfig
 from workflows.mvp_incremental.progress_monitor import ProgressMonitor, StepStatus
@@ -14,6 +15,7 @@ from workflows.mvp_incremental.tdd_feature_implementer import TDDFeatureImplemen
 from workflows.mvp_incremental.test_accumulator import TestAccumulator
 from workflows.mvp_incremental.integration_verification import perform_integration_verification
 from workflows.mvp_incremental.tdd_phase_tracker import TDDPhaseTracker
+from workflows.workflow_config import GENERATED_CODE_PATH
 from workflows.logger import workflow_logger as logger
 
 
@@ -78,6 +80,7 @@ async def execute_mvp_incremental_tdd_workflow(
     # Initialize components
     progress_monitor = ProgressMonitor()
     review_integration = ReviewIntegration(feature_reviewer_agent)
+    review_integration.set_project_context(requirements=input_data.requirements)
     test_accumulator = TestAccumulator()
     phase_tracker = TDDPhaseTracker()  # Create phase tracker for RED-YELLOW-GREEN tracking
     
@@ -199,6 +202,8 @@ async def execute_mvp_incremental_tdd_workflow(
     else:
         print(f"\n✅ Design Review: APPROVED")
     
+    review_integration.set_project_context(design=design_output)
+    
     # Step 3: Parse features from design with testable criteria
     print("\n🔍 Parsing features with testable criteria...")
     from workflows.mvp_incremental.intelligent_feature_extractor import IntelligentFeatureExtractor
@@ -226,7 +231,10 @@ async def execute_mvp_incremental_tdd_workflow(
     
     if use_tdd:
         # Create TDD implementer with phase tracker
-        tdd_implementer = create_tdd_implementer(tracer, progress_monitor, review_integration, phase_tracker)
+        tdd_implementer = create_tdd_implementer(
+            tracer, progress_monitor, review_integration, phase_tracker,
+            project_dir=Path(input_data.output_path or GENERATED_CODE_PATH)
+        )
         
         # Implement each feature using TDD
         for i, feature in enumerate(features):
@@ -405,17 +413,8 @@ async def execute_mvp_incremental_tdd_workflow(
 
 def _parse_code_files(code_output: str) -> Dict[str, str]:
     """Extract files from coder output."""
-    files = {}
-    
     # Look for our standard format
-    file_pattern = r'```(?:python|py|javascript|js)\s*\n#\s*filename:\s*(\S+)\n(.*?)```'
-    matches = re.findall(file_pattern, code_output, re.DOTALL)
-    
-    if matches:
-        for filename, content in matches:
-            files[filename] = content.strip()
-    
-    return files
+    return extract_files(code_output, styles=(HASH_FILENAME,))
 
 
 def _consolidate_code(code_dict: Dict[str, str]) -> str:
@@ -3,16 +3,22 @@ Parallel Feature Processor for MVP Incremental Workflow
 
 Enables concurrent processing of independent features to improve performance,
 while respecting dependencies and maintaining correct execution order.
+
+Features are scheduled as a DAG: each feature starts as soon as its own
+dependencies have completed (rather than waiting for a whole batch), and
+ready features on the longest remaining dependency chain go first.
 """
 
 import asyncio
-from typing import Dict, List, Set, Optional, Tuple, Any
+import time
+from typing import Dict, List, Set, Optional, Tuple, Any, Callable
 from dataclasses import dataclass, field
 from collections import defaultdict
 import logging
-from datetime import datetime
 
 from workflows.mvp_incremental.tdd_feature_implementer import TDDFeatureImplementer, TDDFeatureResult
+from workflows.mvp_incremental.feature_dependency_parser import FeatureDependencyParser
+from workflows.mvp_incremental.code_snapshot import CodeSnapshot, CodeSnapshotStore
 from workflows.logger import workflow_logger as logger
 
 
@@ -33,11 +39,12 @@ class FeatureDependency:
 class ProcessingMetrics:
     """Metrics for parallel processing performance."""
     total_features: int = 0
-    parallel_batches: int = 0
+    parallel_batches: int = 0  # Dependency levels (longest dependency chain)
     max_concurrency: int = 0
     total_duration_seconds: float = 0.0
     average_feature_time: float = 0.0
     speedup_factor: float = 1.0  # Compared to sequential processing
+    sequential_estimate_seconds: float = 0.0  # Sum of individual feature durations
     
     def calculate_speedup(self, sequential_time: float):
         """Calculate speedup compared to sequential processing."""
@@ -52,33 +59,58 @@ class ParallelFeatureProcessor:
     
     def __init__(self,
                  max_workers: int = 3,
-                 batch_timeout: int = 300):
+                 batch_timeout: int = 300,
+                 prioritize_critical_path: bool = True,
+                 continue_on_failure: bool = False,
+                 duration_estimator: Optional[Callable[[Dict[str, Any]], float]] = None):
         """
         Initialize parallel processor.
         
         Args:
             max_workers: Maximum concurrent feature implementations
-            batch_timeout: Timeout for each batch of features (seconds)
+            batch_timeout: Timeout for each feature implementation (seconds)
+            prioritize_critical_path: Start ready features on the longest
+                remaining dependency chain first
+            continue_on_failure: Still process features whose dependencies
+                failed (as the sequential workflow does) instead of skipping them
+            duration_estimator: Estimated duration of a feature, used to weight
+                the critical path (default: the feature's "estimated_duration" or 1)
         """
         self.max_workers = max_workers
         self.batch_timeout = batch_timeout
+        self.prioritize_critical_path = prioritize_critical_path
+        self.continue_on_failure = continue_on_failure
+        self.duration_estimator = duration_estimator or (
+            lambda feature: float(feature.get('estimated_duration', 1.0))
+        )
         self.semaphore = asyncio.Semaphore(max_workers)
         self.completed_features: Set[str] = set()
         self.failed_features: Set[str] = set()
         self.feature_results: Dict[str, TDDFeatureResult] = {}
+        self.feature_durations: Dict[str, float] = {}
         self.metrics = ProcessingMetrics()
+        self._code_store: Optional[CodeSnapshotStore] = None
         
-    def analyze_dependencies(self, features: List[Dict[str, Any]]) -> Dict[str, FeatureDependency]:
+    def analyze_dependencies(self,
+                             features: List[Dict[str, Any]],
+                             design_output: Optional[str] = None) -> Dict[str, FeatureDependency]:
         """
         Analyze feature dependencies to determine processing order.
         
+        Dependencies come from the features' own depends_on/dependencies
+        fields and from the FEATURE[n] Dependencies: blocks of the design,
+        parsed by FeatureDependencyParser. Parsed features are matched to
+        features by id, then by title.
+        
         Args:
             features: List of feature dictionaries
+            design_output: Design phase output with FEATURE[n] blocks
             
         Returns:
             Dictionary mapping feature_id to dependency information
         """
         dependencies = {}
+        feature_ids = {feature['id'] for feature in features}
         
         for feature in features:
             feature_id = feature['id']
@@ -90,29 +122,101 @@ class ParallelFeatureProcessor:
             elif 'dependencies' in feature:
                 deps.depends_on = set(feature['dependencies'])
             
-            # Check for implicit dependencies in description
-            description = feature.get('description', '')
-            for other_feature in features:
-                if other_feature['id'] != feature_id:
-                    # Check if this feature references another
-                    if other_feature['id'] in description or other_feature['title'] in description:
-                        deps.depends_on.add(other_feature['id'])
-            
             dependencies[feature_id] = deps
         
+        # Dependencies declared in the design
+        if design_output:
+            parsed = FeatureDependencyParser.parse_dependencies(design_output)
+            by_title = {f.get('title', '').strip().lower(): f['id'] for f in features}
+            
+            def resolve(parsed_id: str, title: str) -> Optional[str]:
+                if parsed_id in feature_ids:
+                    return parsed_id
+                return by_title.get(title.strip().lower())
+            
+            parsed_ids = {p.id: resolve(p.id, p.title) for p in parsed}
+            for parsed_feature in parsed:
+                feature_id = parsed_ids[parsed_feature.id]
+                if feature_id is None:
+                    continue
+                for dep in parsed_feature.dependencies:
+                    dep_id = parsed_ids.get(dep) or (dep if dep in feature_ids else None)
+                    if dep_id and dep_id != feature_id:
+                        dependencies[feature_id].depends_on.add(dep_id)
+        
+        # Unknown dependencies could never be satisfied
+        for feature_id, deps in dependencies.items():
+            unknown = deps.depends_on - feature_ids
+            if unknown:
+                logger.warning(f"Feature {feature_id} depends on unknown features {sorted(unknown)}, ignoring them")
+                deps.depends_on -= unknown
+        
         # Build reverse dependencies (dependents)
         for feature_id, deps in dependencies.items():
             for dep_id in deps.depends_on:
-                if dep_id in dependencies:
-                    dependencies[dep_id].dependents.add(feature_id)
+                dependencies[dep_id].dependents.add(feature_id)
         
         return dependencies
     
+    def critical_path_lengths(self,
+                              features: List[Dict[str, Any]],
+                              dependencies: Dict[str, FeatureDependency]) -> Dict[str, float]:
+        """
+        Estimated length of the longest dependency chain starting at each feature.
+        
+        Args:
+            features: All features
+            dependencies: Dependency information
+            
+        Returns:
+            Dictionary mapping feature_id to its critical path length
+        """
+        estimates = {f['id']: self.duration_estimator(f) for f in features}
+        lengths: Dict[str, float] = {}
+        visiting: Set[str] = set()
+        
+        def length(feature_id: str) -> float:
+            if feature_id in lengths:
+                return lengths[feature_id]
+            if feature_id in visiting:
+                return 0.0  # Cycle; these features are never scheduled
+            visiting.add(feature_id)
+            downstream = [length(d) for d in dependencies[feature_id].dependents]
+            visiting.discard(feature_id)
+            lengths[feature_id] = estimates[feature_id] + max(downstream, default=0.0)
+            return lengths[feature_id]
+        
+        for feature_id in dependencies:
+            length(feature_id)
+        return lengths
+    
+    def _dependency_levels(self, dependencies: Dict[str, FeatureDependency]) -> int:
+        """Number of dependency levels (1 for fully independent features)."""
+        levels: Dict[str, int] = {}
+        
+        def level(feature_id: str, seen: frozenset) -> int:
+            if feature_id in levels:
+                return levels[feature_id]
+            if feature_id in seen:
+                return 0
+            deps = dependencies[feature_id].depends_on
+            value = 1 + max((level(d, seen | {feature_id}) for d in deps), default=0)
+            levels[feature_id] = value
+            return value
+        
+        return max((level(f, frozenset()) for f in dependencies), default=0)
+    
+    def _dependencies_done(self, deps: FeatureDependency) -> bool:
+        finished = self.completed_features
+        if self.continue_on_failure:
+            finished = finished | self.failed_features
+        return all(dep_id in finished for dep_id in deps.depends_on)
+    
     def get_processable_features(self,
                                features: List[Dict[str, Any]],
                                dependencies: Dict[str, FeatureDependency]) -> List[Dict[str, Any]]:
         """
-        Get features that can be processed in the current batch.
+        Get features whose dependencies have all completed.
         
         Args:
             features: All features
@@ -132,13 +236,22 @@ class ParallelFeatureProcessor:
             
             # Check if all dependencies are satisfied
             deps = dependencies.get(feature_id)
-            if deps and all(dep_id in self.completed_features for dep_id in deps.depends_on):
-                processable.append(feature)
-            elif deps and deps.is_independent:
+            if deps and self._dependencies_done(deps):
                 processable.append(feature)
         
         return processable
     
+    def _failed_result(self, feature: Dict[str, Any]) -> TDDFeatureResult:
+        return TDDFeatureResult(
+            feature_id=feature['id'],
+            feature_title=feature['title'],
+            test_code="",
+            implementation_code="",
+            initial_test_result=None,
+            final_test_result=None,
+            success=False
+        )
+    
     async def process_feature_with_semaphore(self,
                                            feature: Dict[str, Any],
                                            feature_index: int,
@@ -157,14 +270,11 @@ class ParallelFeatureProcessor:
             logger.info(f"🚀 Starting parallel processing of {feature['title']}")
             
             try:
-                # Get accumulated code from completed features
-                accumulated_code = existing_code.copy()
-                for completed_id in self.completed_features:
-                    if completed_id in self.feature_results:
-                        result = self.feature_results[completed_id]
-                        # Parse and add implementation code
-                        code_files = implementer._parse_code_files(result.implementation_code)
-                        accumulated_code.update(code_files)
+                # Immutable snapshot of the code of completed features
+                if self._code_store:
+                    accumulated_code = self._code_store.snapshot()
+                else:
+                    accumulated_code = CodeSnapshot.from_dict(existing_code)
                 
                 # Process the feature
                 result = await implementer.implement_feature_tdd(
@@ -185,106 +295,134 @@ class ParallelFeatureProcessor:
             except Exception as e:
                 logger.error(f"Error processing feature {feature_id}: {e}")
                 # Create a failed result
-                result = TDDFeatureResult(
-                    feature_id=feature_id,
-                    feature_title=feature['title'],
-                    test_code="",
-                    implementation_code="",
-                    initial_test_result=None,
-                    final_test_result=None,
-                    success=False
-                )
-                return feature_id, result
+                return feature_id, self._failed_result(feature)
+    
+    async def _run_feature(self, feature: Dict[str, Any], **kwargs) -> Tuple[str, TDDFeatureResult]:
+        """Process a feature with the per-feature timeout."""
+        try:
+            return await asyncio.wait_for(
+                self.process_feature_with_semaphore(feature=feature, **kwargs),
+                timeout=self.batch_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Feature {feature['id']} timed out after {self.batch_timeout}s")
+            return feature['id'], self._failed_result(feature)
     
     async def process_features_parallel(self,
                                       features: List[Dict[str, Any]],
                                       implementer: TDDFeatureImplementer,
                                       existing_code: Dict[str, str],
                                       requirements: str,
-                                      design_output: str) -> List[TDDFeatureResult]:
+                                      design_output: str,
+                                      on_feature_start: Optional[Callable[[Dict[str, Any], int], None]] = None,
+                                      on_feature_complete: Optional[Callable[[Dict[str, Any], int, TDDFeatureResult], None]] = None,
+                                      completed_results: Optional[Dict[str, TDDFeatureResult]] = None
+                                      ) -> List[TDDFeatureResult]:
         """
-        Process features in parallel batches respecting dependencies.
+        Process features as a dependency DAG.
+        
+        Each feature starts as soon as its dependencies have completed and a
+        worker is free; among ready features, those on the longest remaining
+        dependency chain start first.
         
         Args:
             features: List of features to implement
             implementer: TDD feature implementer instance
             existing_code: Base code to build upon
             requirements: Project requirements
-            design_output: Design phase output
+            design_output: Design phase output (also parsed for dependencies)
+            on_feature_start: Called with (feature, index) when a feature starts
+            on_feature_complete: Called with (feature, index, result) when it finishes
+            completed_results: Results of features finished earlier (e.g. restored
+                from a checkpoint); they count as done and are not run again
             
         Returns:
             List of feature results in original order
         """
-        start_time = datetime.now()
+        start_time = time.monotonic()
         self.metrics.total_features = len(features)
         
         # Analyze dependencies
-        dependencies = self.analyze_dependencies(features)
+        dependencies = self.analyze_dependencies(features, design_output)
+        self.metrics.parallel_batches = self._dependency_levels(dependencies)
         
         # Create feature index mapping
         feature_index_map = {f['id']: i for i, f in enumerate(features)}
+        feature_map = {f['id']: f for f in features}
+        critical_path = self.critical_path_lengths(features, dependencies)
         
-        results = []
-        batch_num = 0
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        started: Set[str] = set()
+        self._code_store = CodeSnapshotStore(existing_code)
         
-        while len(self.completed_features) + len(self.failed_features) < len(features):
-            batch_num += 1
-            
-            # Get features ready for processing
-            processable = self.get_processable_features(features, dependencies)
-            
-            if not processable:
-                # Check for circular dependencies
-                remaining = set(f['id'] for f in features) - self.completed_features - self.failed_features
-                logger.error(f"No processable features found. Remaining: {remaining}")
-                break
-            
-            logger.info(f"📦 Processing batch {batch_num} with {len(processable)} features")
-            self.metrics.parallel_batches = batch_num
-            self.metrics.max_concurrency = max(self.metrics.max_concurrency, len(processable))
+        for feature in features:
+            result = (completed_results or {}).get(feature['id'])
+            if result:
+                started.add(feature['id'])
+                self.feature_results[feature['id']] = result
+                self.completed_features.add(feature['id'])
+                self._code_store.apply(
+                    implementer._parse_code_files(result.implementation_code),
+                    source=feature['id']
+                )
+        
+        while True:
+            # Start ready features while workers are free
+            ready = [f for f in self.get_processable_features(features, dependencies)
+                     if f['id'] not in started]
+            if self.prioritize_critical_path:
+                ready.sort(key=lambda f: (-critical_path[f['id']], feature_index_map[f['id']]))
             
-            # Process batch in parallel
-            tasks = []
-            for feature in processable:
-                feature_index = feature_index_map[feature['id']]
-                task = self.process_feature_with_semaphore(
-                    feature=feature,
-                    feature_index=feature_index,
+            for feature in ready[:max(self.max_workers - len(running), 0)]:
+                feature_id = feature['id']
+                index = feature_index_map[feature_id]
+                started.add(feature_id)
+                if on_feature_start:
+                    on_feature_start(feature, index)
+                task = asyncio.create_task(self._run_feature(
+                    feature,
+                    feature_index=index,
                     implementer=implementer,
                     existing_code=existing_code,
                     requirements=requirements,
                     design_output=design_output
-                )
-                tasks.append(task)
+                ))
+                running[task] = (feature_id, time.monotonic())
             
-            # Wait for batch completion with timeout
-            try:
-                batch_results = await asyncio.wait_for(
-                    asyncio.gather(*tasks),
-                    timeout=self.batch_timeout
-                )
-            except asyncio.TimeoutError:
-                logger.error(f"Batch {batch_num} timed out after {self.batch_timeout}s")
-                # Mark timed out features as failed
-                for feature in processable:
-                    if feature['id'] not in self.completed_features:
-                        self.failed_features.add(feature['id'])
-                continue
+            self.metrics.max_concurrency = max(self.metrics.max_concurrency, len(running))
+            
+            if not running:
+                remaining = set(feature_map) - self.completed_features - self.failed_features
+                if remaining:
+                    # Circular dependencies, or dependencies that failed
+                    logger.error(f"No processable features found. Remaining: {remaining}")
+                break
             
-            # Process results
-            for feature_id, result in batch_results:
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                feature_id, task_start = running.pop(task)
+                _, result = task.result()
+                self.feature_durations[feature_id] = time.monotonic() - task_start
                 self.feature_results[feature_id] = result
                 if result.success:
                     self.completed_features.add(feature_id)
+                    # Parse each completed feature's output exactly once
+                    self._code_store.apply(
+                        implementer._parse_code_files(result.implementation_code),
+                        source=feature_id
+                    )
                 else:
                     self.failed_features.add(feature_id)
-                results.append(result)
+                if on_feature_complete:
+                    on_feature_complete(feature_map[feature_id], feature_index_map[feature_id], result)
         
         # Calculate metrics
-        end_time = datetime.now()
-        self.metrics.total_duration_seconds = (end_time - start_time).total_seconds()
+        self.metrics.total_duration_seconds = time.monotonic() - start_time
         if self.metrics.total_features > 0:
             self.metrics.average_feature_time = self.metrics.total_duration_seconds / self.metrics.total_features
+        self.metrics.sequential_estimate_seconds = sum(self.feature_durations.values())
+        if self.metrics.total_duration_seconds > 0:
+            self.metrics.calculate_speedup(self.metrics.sequential_estimate_seconds)
         
         # Sort results by original feature order
         sorted_results = []
@@ -294,8 +432,9 @@ class ParallelFeatureProcessor:
         
         logger.info(f"🏁 Parallel processing complete: {len(self.completed_features)} succeeded, {len(self.failed_features)} failed")
         logger.info(f"   Total time: {self.metrics.total_duration_seconds:.1f}s")
-        logger.info(f"   Batches: {self.metrics.parallel_batches}")
+        logger.info(f"   Dependency levels: {self.metrics.parallel_batches}")
         logger.info(f"   Max concurrency: {self.metrics.max_concurrency}")
+        logger.info(f"   Speedup vs sequential: {self.metrics.speedup_factor:.2f}x")
         
         return sorted_results
     
@@ -309,6 +448,7 @@ class ParallelFeatureProcessor:
             "max_concurrency": self.metrics.max_concurrency,
             "total_duration_seconds": self.metrics.total_duration_seconds,
             "average_feature_time": self.metrics.average_feature_time,
+            "sequential_estimate_seconds": self.metrics.sequential_estimate_seconds,
             "speedup_factor": self.metrics.speedup_factor
         }
 
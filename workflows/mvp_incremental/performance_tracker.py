@@ -14,6 +14,9 @@ from datetime import datetime
 from pathlib import Path
 import json
 
+from shared.utils.prompt_builder import get_prompt_cache_tracker
+from shared.utils.speculation import get_speculation_metrics
+from shared.utils.request_hedger import get_request_hedger
 from workflows.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -50,6 +53,9 @@ class PerformanceReport:
     resource_usage: Dict[str, Any]
     bottlenecks: List[str]
     recommendations: List[str]
+    prompt_cache: Dict[str, Any] = field(default_factory=dict)
+    speculation: Dict[str, Any] = field(default_factory=dict)
+    request_hedging: Dict[str, Any] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.now)
     
     def to_dict(self) -> Dict:
@@ -70,6 +76,9 @@ class PerformanceReport:
             "resource_usage": self.resource_usage,
             "bottlenecks": self.bottlenecks,
             "recommendations": self.recommendations,
+            "prompt_cache": self.prompt_cache,
+            "speculation": self.speculation,
+            "request_hedging": self.request_hedging,
             "timestamp": self.timestamp.isoformat()
         }
 
@@ -186,7 +195,10 @@ class PerformanceTracker:
             phase_metrics=list(self.phases.values()),
             resource_usage=resource_usage,
             bottlenecks=bottlenecks,
-            recommendations=recommendations
+            recommendations=recommendations,
+            prompt_cache=get_prompt_cache_tracker().get_stats(),
+            speculation=get_speculation_metrics().get_report(),
+            request_hedging=get_request_hedger().get_report()
         )
         
     def _identify_bottlenecks(self) -> List[str]:
@@ -307,6 +319,34 @@ class PerformanceTracker:
         logger.info(f"Memory Growth: {report.resource_usage['memory_growth_mb']:.1f}MB")
         logger.info(f"Average CPU: {report.resource_usage['cpu_average']:.1f}%")
         
+        prompt_totals = report.prompt_cache.get("total", {})
+        if prompt_totals.get("calls"):
+            logger.info(
+                f"Prompt Cache: {prompt_totals['cache_hit_tokens']}/{prompt_totals['prompt_tokens']} "
+                f"tokens cacheable ({prompt_totals['cache_hit_ratio']:.0%}), "
+                f"prefix reuse {prompt_totals['prefix_reuse_ratio']:.0%}"
+            )
+            for agent, stats in report.prompt_cache["agents"].items():
+                logger.info(f"  • {agent}: {stats['cache_hit_tokens']} cache-hit tokens over "
+                            f"{stats['calls']} calls (prefix reuse {stats['prefix_reuse_ratio']:.0%})")
+        
+        speculative = report.speculation.get("speculative", {})
+        if speculative.get("features"):
+            serial = report.speculation["serial"]
+            logger.info(
+                f"Time to Green: speculative {speculative['avg_time_to_green']}s over "
+                f"{speculative['features']} features ({speculative['coder_calls']} coder calls, "
+                f"{speculative['cancelled']} cancelled), serial {serial['avg_time_to_green']}s over "
+                f"{serial['features']} features"
+            )
+        
+        for key, stats in report.request_hedging.items():
+            if stats["hedged"]:
+                logger.info(
+                    f"Hedging {key}: {stats['hedged']}/{stats['calls']} calls hedged "
+                    f"({stats['hedge_wins']} won), p99 {stats['p99_unhedged']}s -> {stats['p99_hedged']}s"
+                )
+        
         if report.bottlenecks:
             logger.info("\n⚠️  Bottlenecks:")
             for bottleneck in report.bottlenecks:
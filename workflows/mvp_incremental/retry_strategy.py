@@ -5,6 +5,8 @@ Handles retrying failed feature implementations with TDD test-driven context
 from typing import Dict, Optional, Tuple, List, Set, Any
 from dataclasses import dataclass, field
 import re
+from agents.agent_configs import coder_config
+from shared.utils.context_builder import ContextBuilder
 from workflows.mvp_incremental.error_analyzer import SimplifiedErrorAnalyzer, ErrorCategory
 # Import TestFailureContext from red_phase if available
 try:
@@ -361,6 +363,13 @@ TEST-DRIVEN HINTS:
 {chr(10).join(f"- {hint}" for hint in hints)}
 {test_progression_info}"""
         
+        # Files named in the error come first, in full
+        current_code = _format_existing_code_for_retry(
+            accumulated_code,
+            focus_text=f"{feature['title']}\n{feature['description']}\n{test_specific_section}",
+            failing_output=f"{validation_output}\n{error_context.get('full_error', '')}"
+        )
+        
         retry_prompt = f"""
 You previously implemented a feature that FAILED validation. You need to FIX the implementation.
 
@@ -384,7 +393,7 @@ RECOVERY HINT:
 {error_context.get('recovery_hint', 'Review the error and fix the code')}
 
 CURRENT CODE THAT NEEDS FIXING:
-{_format_existing_code_for_retry(accumulated_code)}
+{current_code}
 
 CRITICAL INSTRUCTIONS FOR RETRY:
 1. CAREFULLY read the error message and understand what went wrong
@@ -419,14 +428,18 @@ FOCUS ON FIXING THE ERROR - do not add new features or change working code unnec
             return f"🔄 Retry attempt {retry_count}/{max_retries}..."
 
 
-def _format_existing_code_for_retry(code_dict: Dict[str, str]) -> str:
-    """Format existing code for retry context - show full files for error context."""
-    if not code_dict:
-        return "No existing code yet."
-    
-    formatted = []
-    for filename in sorted(code_dict.keys()):
-        formatted.append(f"\n--- {filename} ---")
-        formatted.append(code_dict[filename])
-    
-    return "\n".join(formatted)
\ No newline at end of file
+_retry_context_builder = ContextBuilder(
+    token_budget=coder_config.get("context_token_budget", 12000),
+    header_format="\n--- {filename} ---"
+)
+
+
+def _format_existing_code_for_retry(code_dict: Dict[str, str],
+                                    focus_text: str = "",
+                                    failing_output: str = "") -> str:
+    """Format existing code for retry context - full files where the error is, stubs for the rest."""
+    return _retry_context_builder.build(
+        dict(sorted(code_dict.items())),
+        focus_text=focus_text,
+        failing_output=failing_output
+    )
\ No newline at end of file
@@ -4,12 +4,27 @@ This module coordinates review checkpoints throughout the workflow,
 ensuring quality at each phase while managing the retry strategy.
 """
 
+import time
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 from acp_sdk import Message
 from acp_sdk.models import MessagePart
 
+from shared.utils.prompt_builder import PromptBuilder, get_prompt_cache_tracker
+from shared.utils.agent_replay import get_agent_replay, output_text
+
+
+# Response format shared by the review prompts
+REVIEW_FORMAT = """Provide your review in the format:
+REVIEW: APPROVED or NEEDS REVISION
+FEEDBACK: Your detailed feedback
+SUGGESTIONS: 
+- Suggestion 1
+- Suggestion 2
+MUST FIX:
+- Critical issue 1 (if any)"""
+
 
 class ReviewPhase(Enum):
     """Phases where review can occur."""
@@ -52,24 +67,49 @@ class ReviewIntegration:
         self.feature_reviewer_agent = feature_reviewer_agent
         self.review_history: Dict[str, List[ReviewResult]] = {}
         self.approval_cache: Dict[str, bool] = {}
+        # Requirements and design, the start of every review prompt
+        self.project_context: Dict[str, str] = {}
+    
+    def set_project_context(self, requirements: Optional[str] = None, design: Optional[str] = None):
+        """
+        Set the project requirements and design shared by all reviews.
+        
+        They open every review prompt, ahead of the phase instructions, so
+        the reviews of a run share a prefix long enough for provider
+        prompt caching.
+        """
+        if requirements is not None:
+            self.project_context["requirements"] = requirements
+        if design is not None:
+            self.project_context["design"] = design
         
     async def request_review(self, request: ReviewRequest) -> ReviewResult:
         """Request a review for a specific phase and content."""
         # Build review context
         review_prompt = self._build_review_prompt(request)
+        get_prompt_cache_tracker().record("feature_reviewer_agent", review_prompt)
         
-        # Call the feature reviewer agent
-        messages = [Message(parts=[MessagePart(
-            content=review_prompt,
-            content_type="text/plain"
-        )])]
-        
-        # Collect response
-        response_parts = []
-        async for part in self.feature_reviewer_agent(messages):
-            response_parts.append(part.content)
-        
-        response = ''.join(response_parts)
+        # Recorded runs are replayed from the archive instead of calling the reviewer
+        replay = get_agent_replay()
+        entry = await replay.serve("feature_reviewer_agent", review_prompt) if replay.replaying else None
+        if entry is not None:
+            response = output_text(entry["output"])
+        else:
+            # Call the feature reviewer agent
+            messages = [Message(parts=[MessagePart(
+                content=review_prompt,
+                content_type="text/plain"
+            )])]
+            
+            # Collect response
+            start_time = time.time()
+            response_parts = []
+            async for part in self.feature_reviewer_agent(messages):
+                response_parts.append(part.content)
+            
+            response = ''.join(response_parts)
+            if replay.recording:
+                replay.record("feature_reviewer_agent", review_prompt, [response_parts], time.time() - start_time)
         
         # Parse review result
         result = self._parse_review_response(response, request.phase, request.feature_id)
@@ -103,160 +143,122 @@ class ReviewIntegration:
             
         return builder(request)
     
+    def _prompt(self) -> PromptBuilder:
+        """A prompt builder starting with the project context."""
+        return PromptBuilder().stable(
+            f"PROJECT REQUIREMENTS:\n{self.project_context['requirements']}"
+            if self.project_context.get("requirements") else "",
+            f"PROJECT DESIGN:\n{self.project_context['design']}"
+            if self.project_context.get("design") else ""
+        )
+    
+    def _retry_section(self, request: ReviewRequest) -> str:
+        """Retry count and previous feedback, kept at the end of the prompt."""
+        if request.retry_count <= 0:
+            return ""
+        section = f"This is retry attempt {request.retry_count}."
+        if request.previous_feedback:
+            section += f"\nPrevious feedback: {request.previous_feedback}"
+        return section
+    
     def _build_planning_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing the planning phase."""
-        prompt = f"""Review this incremental development plan:
-
-{request.content}
-
-Context:
+        return self._prompt().stable(
+            "You are reviewing an incremental development plan.",
+            """Context:
 - This is an MVP incremental workflow
 - Features will be implemented one at a time
-- Each feature will be validated independently
-
-Please review for:
+- Each feature will be validated independently""",
+            """Please review for:
 1. Are the features properly broken down?
 2. Are dependencies clearly identified?
 3. Is the implementation order logical?
-4. Are there any missing features based on the requirements?
-
-Provide your review in the format:
-REVIEW: APPROVED or NEEDS REVISION
-FEEDBACK: Your detailed feedback
-SUGGESTIONS: 
-- Suggestion 1
-- Suggestion 2
-MUST FIX:
-- Critical issue 1 (if any)
-"""
-        
-        if request.retry_count > 0:
-            prompt += f"\n\nThis is retry attempt {request.retry_count}."
-            if request.previous_feedback:
-                prompt += f"\nPrevious feedback: {request.previous_feedback}"
-                
-        return prompt
+4. Are there any missing features based on the requirements?""",
+            REVIEW_FORMAT
+        ).volatile(
+            f"Review this incremental development plan:\n\n{request.content}",
+            self._retry_section(request)
+        ).build()
     
     def _build_design_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing the design phase."""
-        prompt = f"""Review this incremental design approach:
-
-{request.content}
-
-Context:
+        return self._prompt().stable(
+            "You are reviewing an incremental design approach.",
+            """Context:
 - This design will guide feature-by-feature implementation
 - Each feature should be independently testable
-- The design should support the planned implementation order
-
-Please review for:
+- The design should support the planned implementation order""",
+            """Please review for:
 1. Does the design support incremental implementation?
 2. Are interfaces between features well-defined?
 3. Will this design allow for independent feature validation?
-4. Are there any architectural concerns?
-
-Provide your review in the format:
-REVIEW: APPROVED or NEEDS REVISION
-FEEDBACK: Your detailed feedback
-SUGGESTIONS: 
-- Suggestion 1
-- Suggestion 2
-MUST FIX:
-- Critical issue 1 (if any)
-"""
-        
-        if request.retry_count > 0:
-            prompt += f"\n\nThis is retry attempt {request.retry_count}."
-            if request.previous_feedback:
-                prompt += f"\nPrevious feedback: {request.previous_feedback}"
-                
-        return prompt
+4. Are there any architectural concerns?""",
+            REVIEW_FORMAT
+        ).volatile(
+            f"Review this incremental design approach:\n\n{request.content}",
+            self._retry_section(request)
+        ).build()
     
     def _build_test_specification_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing TDD test specifications."""
         feature = request.context.get('feature', {})
         
-        prompt = f"""Review this test specification for Test-Driven Development:
-
-Feature: {feature.get('title', 'Unknown')}
-Description: {feature.get('description', 'No description')}
-
-Test Code:
-{request.content}
-
-Context:
+        return self._prompt().stable(
+            "You are reviewing a test specification for Test-Driven Development.",
+            """Context:
 - These tests are written BEFORE implementation (TDD Red Phase)
 - Tests should define the expected behavior clearly
-- Tests must fail initially since no implementation exists yet
-- {request.context.get('purpose', 'Ensure comprehensive test coverage')}
-
-Please review for:
+- Tests must fail initially since no implementation exists yet""",
+            """Please review for:
 1. Do the tests clearly define expected behavior?
 2. Are both positive and negative test cases included?
 3. Are edge cases and error conditions covered?
 4. Will these tests effectively guide the implementation?
-5. Are the test names descriptive and clear?
+5. Are the test names descriptive and clear?""",
+            REVIEW_FORMAT
+        ).volatile(
+            f"""Review this test specification for Test-Driven Development:
 
-Provide your review in the format:
-REVIEW: APPROVED or NEEDS REVISION
-FEEDBACK: Your detailed feedback
-SUGGESTIONS: 
-- Suggestion 1
-- Suggestion 2
-MUST FIX:
-- Critical issue 1 (if any)
-"""
-        
-        if request.retry_count > 0:
-            prompt += f"\n\nThis is retry attempt {request.retry_count}."
-            if request.previous_feedback:
-                prompt += f"\nPrevious feedback: {request.previous_feedback}"
-                
-        return prompt
+Feature: {feature.get('title', 'Unknown')}
+Description: {feature.get('description', 'No description')}
+Purpose: {request.context.get('purpose', 'Ensure comprehensive test coverage')}
+
+Test Code:
+{request.content}""",
+            self._retry_section(request)
+        ).build()
     
     def _build_implementation_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing TDD implementation (after tests pass)."""
         feature = request.context.get('feature', {})
         test_code = request.context.get('test_code', '')
         
-        prompt = f"""Review this TDD implementation (YELLOW → GREEN phase transition):
+        return self._prompt().stable(
+            "You are reviewing a TDD implementation (YELLOW → GREEN phase transition).",
+            """Context:
+- This implementation was written to make failing tests pass (TDD)
+- All tests are now passing (YELLOW phase)""",
+            """Please review for:
+1. Does the implementation satisfy all test requirements?
+2. Is the code minimal and focused (no over-engineering)?
+3. Is the code clean, readable, and maintainable?
+4. Are there any code quality issues?
+5. Should any refactoring be done?""",
+            REVIEW_FORMAT
+        ).volatile(
+            f"""Review this TDD implementation (YELLOW → GREEN phase transition):
 
 Feature: {feature.get('title', 'Unknown')}
 Description: {feature.get('description', 'No description')}
+Purpose: {request.context.get('purpose', 'Verify code quality and test compliance')}
 
 Implementation Code:
 {request.content}
 
 Tests (now passing):
-{test_code[:500] if test_code else 'No test code provided'}...
-
-Context:
-- This implementation was written to make failing tests pass (TDD)
-- All tests are now passing (YELLOW phase)
-- {request.context.get('purpose', 'Verify code quality and test compliance')}
-
-Please review for:
-1. Does the implementation satisfy all test requirements?
-2. Is the code minimal and focused (no over-engineering)?
-3. Is the code clean, readable, and maintainable?
-4. Are there any code quality issues?
-5. Should any refactoring be done?
-
-Provide your review in the format:
-REVIEW: APPROVED or NEEDS REVISION
-FEEDBACK: Your detailed feedback
-SUGGESTIONS: 
-- Suggestion 1
-- Suggestion 2
-MUST FIX:
-- Critical issue 1 (if any)
-"""
-        
-        if request.retry_count > 0:
-            prompt += f"\n\nThis is retry attempt {request.retry_count}."
-            if request.previous_feedback:
-                prompt += f"\nPrevious feedback: {request.previous_feedback}"
-                
-        return prompt
+{test_code[:500] if test_code else 'No test code provided'}...""",
+            self._retry_section(request)
+        ).build()
     
     def _build_feature_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing a feature implementation."""
@@ -264,109 +266,91 @@ MUST FIX:
         existing_code = request.context.get('existing_code', '')
         dependencies = request.context.get('dependencies', [])
         
-        prompt = f"""Review this feature implementation:
-
-Feature: {feature_context.get('name', 'Unknown')}
-Description: {feature_context.get('description', 'No description')}
-
-Implementation:
-{request.content}
-
-Existing Code Context:
-{existing_code if existing_code else 'No existing code yet'}
-
-Dependencies: {', '.join(dependencies) if dependencies else 'None'}
-
-Please review for:
+        # Existing code only grows between features, so it belongs to the prefix
+        return self._prompt().stable(
+            "You are reviewing a feature implementation.",
+            """Please review for:
 1. Does the implementation meet the feature requirements?
 2. Does it integrate well with existing code?
 3. Are all edge cases handled?
 4. Is error handling appropriate?
-5. Does it follow the established patterns?
+5. Does it follow the established patterns?""",
+            REVIEW_FORMAT.replace("APPROVED or", "FEATURE APPROVED or"),
+            f"Existing Code Context:\n{existing_code if existing_code else 'No existing code yet'}"
+        ).volatile(
+            f"""Review this feature implementation:
 
-Provide your review in the format:
-REVIEW: FEATURE APPROVED or NEEDS REVISION
-FEEDBACK: Your detailed feedback
-SUGGESTIONS: 
-- Suggestion 1
-- Suggestion 2
-MUST FIX:
-- Critical issue 1 (if any)
-"""
-        
-        if request.retry_count > 0:
-            prompt += f"\n\nThis is retry attempt {request.retry_count}."
-            if request.previous_feedback:
-                prompt += f"\nPrevious feedback: {request.previous_feedback}"
-                
-        return prompt
+Feature: {feature_context.get('name', 'Unknown')}
+Description: {feature_context.get('description', 'No description')}
+Dependencies: {', '.join(dependencies) if dependencies else 'None'}
+
+Implementation:
+{request.content}""",
+            self._retry_section(request)
+        ).build()
     
     def _build_validation_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing validation results."""
         validation_result = request.context.get('validation_result', {})
         error_info = request.context.get('error_info', '')
         
-        prompt = f"""Review this validation result and determine if retry is warranted:
-
-Feature: {request.feature_id}
-Validation Status: {'PASSED' if validation_result.get('success') else 'FAILED'}
-
-{request.content}
-
-{f'Error Details: {error_info}' if error_info else ''}
-
-Context:
-- Retry count: {request.retry_count}
-- Maximum retries: {request.context.get('max_retries', 3)}
-
-Please review and determine:
+        return self._prompt().stable(
+            "You are reviewing a validation result to determine if retry is warranted.",
+            """Please review and determine:
 1. If validation failed, is the error retryable?
 2. What specific changes would fix the issue?
-3. Should we retry or accept the current state?
-
-Provide your review in the format:
+3. Should we retry or accept the current state?""",
+            """Provide your review in the format:
 REVIEW: RETRY RECOMMENDED or ACCEPT CURRENT STATE
 FEEDBACK: Your detailed feedback
 SUGGESTIONS: 
 - Specific fix 1
 - Specific fix 2
 MUST FIX:
-- Critical issue that prevents retry (if any)
-"""
-        
-        return prompt
+- Critical issue that prevents retry (if any)"""
+        ).volatile(
+            f"""Review this validation result and determine if retry is warranted:
+
+Feature: {request.feature_id}
+Validation Status: {'PASSED' if validation_result.get('success') else 'FAILED'}
+
+{request.content}""",
+            f'Error Details: {error_info}' if error_info else '',
+            f"""Context:
+- Retry count: {request.retry_count}
+- Maximum retries: {request.context.get('max_retries', 3)}"""
+        ).build()
     
     def _build_final_review_prompt(self, request: ReviewRequest) -> str:
         """Build prompt for reviewing the final implementation."""
         feature_summary = request.context.get('feature_summary', {})
         
-        prompt = f"""Review this final implementation:
-
-{request.content}
-
-Implementation Summary:
-- Total features: {feature_summary.get('total', 0)}
-- Successful features: {feature_summary.get('successful', 0)}
-- Features with retries: {feature_summary.get('retried', 0)}
-- Failed features: {feature_summary.get('failed', 0)}
-
-Please provide a final review:
+        return self._prompt().stable(
+            "You are reviewing the final implementation.",
+            """Please provide a final review:
 1. Does the implementation meet all requirements?
 2. Is the code production-ready?
 3. Are there any remaining issues?
-4. Overall quality assessment
-
-Provide your review in the format:
+4. Overall quality assessment""",
+            """Provide your review in the format:
 REVIEW: APPROVED or NEEDS REVISION
 FEEDBACK: Your detailed feedback
 SUGGESTIONS: 
 - Future improvement 1
 - Future improvement 2
 MUST FIX:
-- Critical issue 1 (if any)
-"""
-        
-        return prompt
+- Critical issue 1 (if any)"""
+        ).volatile(
+            f"""Review this final implementation:
+
+{request.content}
+
+Implementation Summary:
+- Total features: {feature_summary.get('total', 0)}
+- Successful features: {feature_summary.get('successful', 0)}
+- Features with retries: {feature_summary.get('retried', 0)}
+- Failed features: {feature_summary.get('failed', 0)}"""
+        ).build()
     
     def _parse_review_response(self, response: str, phase: ReviewPhase, feature_id: Optional[str]) -> ReviewResult:
         """Parse the review response into a structured result."""
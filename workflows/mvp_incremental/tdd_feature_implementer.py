@@ -10,17 +10,27 @@ Uses the RED-YELLOW-GREEN phase tracking system from Operation Red Yellow.
 """
 
 import re
+import tempfile
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
 from datetime import datetime
 
 from shared.data_models import TeamMemberResult, TeamMember
+from agents.agent_configs import coder_config, test_writer_config
+from shared.utils.code_block_parser import HASH_FILENAME, extract_files
+from shared.utils.context_builder import ContextBuilder
+from shared.utils.prompt_builder import PromptBuilder
+from shared.utils.model_router import add_model_directive, get_model_router
+from shared.utils.speculation import (
+    SpeculationOutcome, race_candidates, candidate_approach, get_speculation_metrics, select_candidate
+)
 from workflows.monitoring import WorkflowExecutionTracer
 from workflows.mvp_incremental.retry_strategy import RetryStrategy, RetryConfig
 from workflows.mvp_incremental.progress_monitor import ProgressMonitor, StepStatus
 from workflows.mvp_incremental.review_integration import ReviewIntegration, ReviewPhase, ReviewRequest
-from workflows.mvp_incremental.test_execution import TestExecutionConfig, TestResult, execute_and_fix_tests, TestExecutor
+from workflows.mvp_incremental.test_execution import TestExecutionConfig, TestFailureDetail, TestResult, TestExecutor
 from workflows.mvp_incremental.validator import CodeValidator
 from workflows.mvp_incremental.coverage_validator import TestCoverageValidator, validate_tdd_test_coverage
 from workflows.mvp_incremental.tdd_phase_tracker import TDDPhase, TDDPhaseTracker
@@ -29,6 +39,7 @@ from workflows.mvp_incremental.yellow_phase import YellowPhaseOrchestrator, Yell
 from workflows.mvp_incremental.green_phase import GreenPhaseOrchestrator, GreenPhaseMetrics, GreenPhaseError
 from workflows.mvp_incremental.testable_feature_parser import TestableFeature, TestCriteria
 from workflows.mvp_incremental.code_storage_manager import CodeAccumulator
+from workflows.workflow_config import SPECULATIVE_RETRY_CONFIG, MODEL_ROUTING_CONFIG
 from workflows.logger import workflow_logger as logger
 
 
@@ -46,6 +57,70 @@ class TDDFeatureResult:
     success: bool = False
     final_phase: Optional[TDDPhase] = None
     green_phase_metrics: Optional[Dict[str, Any]] = None  # Metrics from GREEN phase completion
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary (for checkpoints)"""
+        data = asdict(self)
+        data["final_phase"] = self.final_phase.value if self.final_phase else None
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TDDFeatureResult":
+        """Rebuild a result converted with to_dict"""
+        def test_result(value: Optional[Dict[str, Any]]) -> Optional[TestResult]:
+            if value is None:
+                return None
+            details = [TestFailureDetail(**d) for d in value.get("failure_details", [])]
+            return TestResult(**{**value, "failure_details": details})
+        
+        return cls(**{
+            **data,
+            "initial_test_result": test_result(data.get("initial_test_result")),
+            "final_test_result": test_result(data.get("final_test_result")),
+            "final_phase": TDDPhase(data["final_phase"]) if data.get("final_phase") else None
+        })
+
+
+# Stable prompt sections, shared by every feature's test writer and coder calls
+TEST_WRITER_INSTRUCTIONS = """CRITICAL TDD INSTRUCTIONS:
+1. Write tests that will FAIL because the feature is NOT implemented yet
+2. Tests should define the expected behavior and interface
+3. Include both positive and negative test cases
+4. Tests should be specific to THIS feature only
+5. Use appropriate testing framework (pytest for Python, jest for JS, etc.)
+6. Tests should be executable, not just examples
+
+REQUIRED OUTPUT FORMAT:
+Generate ONLY executable test files in this format, using the required test file name given below:
+
+```python
+# filename: tests/test_<feature>.py
+import pytest
+from main import FeatureName  # This import will fail initially
+
+def test_feature_behavior():
+    # This test MUST fail initially
+    result = FeatureName.do_something()
+    assert result == expected_value
+
+def test_edge_case():
+    with pytest.raises(ValueError):
+        FeatureName.invalid_input()
+```"""
+
+CODER_TDD_INSTRUCTIONS = """TDD IMPLEMENTATION RULES:
+1. Write ONLY the code needed to make the tests pass
+2. Do NOT add features not covered by tests
+3. Keep implementation simple - no premature optimization
+4. Ensure all test assertions are satisfied
+5. Maintain compatibility with existing code
+6. Focus on making tests green
+
+OUTPUT FORMAT:
+```python
+# filename: path/to/implementation.py
+<implementation code>
+```"""
 
 
 class TDDFeatureImplementer:
@@ -57,14 +132,20 @@ class TDDFeatureImplementer:
                  review_integration: ReviewIntegration,
                  retry_strategy: RetryStrategy,
                  retry_config: RetryConfig,
-                 phase_tracker: Optional[TDDPhaseTracker] = None):
+                 phase_tracker: Optional[TDDPhaseTracker] = None,
+                 speculation: Optional[Dict[str, Any]] = None,
+                 project_dir: Optional[Path] = None):
         self.tracer = tracer
         self.progress_monitor = progress_monitor
         self.review_integration = review_integration
         self.retry_strategy = retry_strategy
         self.retry_config = retry_config
         self.validator = CodeValidator()
+        self.context_builder = ContextBuilder()
         self.phase_tracker = phase_tracker or TDDPhaseTracker()
+        self.speculation = {**SPECULATIVE_RETRY_CONFIG, **(speculation or {})}
+        # Test timing history lives with the generated project (cwd if None)
+        self.project_dir = project_dir
         # Initialize test executor for RED phase orchestrator
         test_config = TestExecutionConfig(
             run_tests=True,
@@ -73,7 +154,8 @@ class TDDFeatureImplementer:
             expect_failure=True,
             cache_results=True,
             extract_coverage=False,
-            verbose_output=True
+            verbose_output=True,
+            timing_history_dir=self.project_dir
         )
         self.test_executor = TestExecutor(self.validator, test_config)
         self.red_phase_orchestrator = RedPhaseOrchestrator(self.test_executor, self.phase_tracker)
@@ -222,6 +304,10 @@ class TDDFeatureImplementer:
         
         # Use CodeAccumulator for efficient memory management
         code_accumulator = CodeAccumulator(feature_id, memory_threshold_mb=50)
+        implementation_start = datetime.now()
+        coder_calls = 0
+        speculative_calls = 0
+        cancelled_candidates = 0
         
         try:
             while not implementation_successful and retry_count <= self.retry_config.max_retries:
@@ -261,36 +347,91 @@ class TDDFeatureImplementer:
                             red_phase_context=red_phase_info if retry_count == 0 else None
                         )
                     
-                    # Run coder agent
-                    coder_result = await run_team_member_with_tracking(
-                        "feature_coder_agent",
-                        coder_context,
-                        f"mvp_tdd_implement_{feature_index}_attempt_{retry_count}"
-                    )
-                    
-                    implementation_code = self._extract_implementation_code(coder_result)
-                    
-                    # Update accumulated code for retry context using efficient storage
-                    code_files = self._parse_code_files(implementation_code)
-                    code_accumulator.add_retry_attempt(retry_count, code_files, 
-                                                      {"errors": final_test_result.errors} if final_test_result.errors else None)
+                    # Pick the model tier for this attempt, escalating on retries
+                    route = None
+                    if MODEL_ROUTING_CONFIG["enabled"]:
+                        route = get_model_router().select(
+                            "feature_coder_agent", feature.get('complexity'), retry_count
+                        )
+                        coder_context = add_model_directive(coder_context, route.model)
+                        logger.info(f"Using {route.model} for {feature_title} ({route.reason})")
+                    attempt_start = datetime.now()
                     
-                    self.tracer.complete_step(impl_step_id, {
-                        "implementation_complete": True,
-                        "retry_count": retry_count
-                    })
+                    # Speculate once enough serial attempts failed and the budget allows two or more candidates
+                    candidate_count = min(self.speculation["candidates"],
+                                          self.speculation["max_candidates"] - speculative_calls)
+                    candidate = None
+                    outcome = None
+                    if (self.speculation["enabled"] and retry_count >= self.speculation["start_after_failures"]
+                            and candidate_count >= 2):
+                        logger.info(f"🔀 Generating {candidate_count} candidates for {feature_title} concurrently")
+                        outcome = await self._run_speculative_round(
+                            coder_context,
+                            candidate_count,
+                            test_code,
+                            existing_code,
+                            code_accumulator.get_accumulated_code(),
+                            feature_title,
+                            f"mvp_tdd_implement_{feature_index}_attempt_{retry_count}"
+                        )
+                        speculative_calls += outcome.launched
+                        coder_calls += outcome.launched
+                        cancelled_candidates += outcome.cancelled
+                        candidate = select_candidate(outcome, lambda result: (result[2].passed, result[2].failed))
+                        if outcome.winner:
+                            logger.info(f"   Candidate {outcome.winner.index} passed in "
+                                        f"{outcome.winner.duration:.1f}s, cancelled {outcome.cancelled}")
                     
-                    # Phase 4: Run tests again (expect success)
-                    logger.info(f"Running tests for {feature_title} (expecting success)...")
-                    updated_code = existing_code.copy()
-                    updated_code.update(code_accumulator.get_accumulated_code())
+                    if candidate:
+                        implementation_code, code_files, final_test_result = candidate.result
+                        code_accumulator.add_retry_attempt(retry_count, code_files, None)
+                        
+                        self.tracer.complete_step(impl_step_id, {
+                            "implementation_complete": True,
+                            "retry_count": retry_count,
+                            "speculative_candidates": outcome.launched
+                        })
+                    else:
+                        # Run coder agent
+                        coder_result = await run_team_member_with_tracking(
+                            "feature_coder_agent",
+                            coder_context,
+                            f"mvp_tdd_implement_{feature_index}_attempt_{retry_count}"
+                        )
+                        coder_calls += 1
+                        
+                        implementation_code = self._extract_implementation_code(coder_result)
+                        
+                        # Update accumulated code for retry context using efficient storage
+                        code_files = self._parse_code_files(implementation_code)
+                        code_accumulator.add_retry_attempt(retry_count, code_files, 
+                                                          {"errors": final_test_result.errors} if final_test_result.errors else None)
+                        
+                        self.tracer.complete_step(impl_step_id, {
+                            "implementation_complete": True,
+                            "retry_count": retry_count
+                        })
+                        
+                        # Phase 4: Run tests again (expect success)
+                        logger.info(f"Running tests for {feature_title} (expecting success)...")
+                        updated_code = existing_code.copy()
+                        updated_code.update(code_accumulator.get_accumulated_code())
+                        
+                        final_test_result = await self._run_tests(
+                            test_code,
+                            updated_code,
+                            feature_title,
+                            expect_failure=False
+                        )
                     
-                    final_test_result = await self._run_tests(
-                        test_code,
-                        updated_code,
-                        feature_title,
-                        expect_failure=False
-                    )
+                    if route and outcome:
+                        get_model_router().record_candidates(route, outcome.finished)
+                    elif route:
+                        get_model_router().record(
+                            route,
+                            final_test_result.success,
+                            (datetime.now() - attempt_start).total_seconds()
+                        )
                     
                     if final_test_result.success:
                         # Tests are now passing - transition to YELLOW phase using orchestrator
@@ -361,6 +502,18 @@ class TDDFeatureImplementer:
                             logger.error(f"❌ Tests still failing for {feature_title} after {retry_count} attempts")
                             break
             
+            get_speculation_metrics().record_feature(
+                feature_id,
+                mode="speculative" if speculative_calls else "serial",
+                success=implementation_successful,
+                time_to_green=(datetime.now() - implementation_start).total_seconds(),
+                coder_calls=coder_calls,
+                rounds=retry_count + 1,
+                cancelled=cancelled_candidates
+            )
+            if MODEL_ROUTING_CONFIG["enabled"]:
+                get_model_router().save()
+            
             # Phase 5: Review implementation if tests are passing (YELLOW → GREEN)
             if implementation_successful and self.phase_tracker.get_current_phase(feature_id) == TDDPhase.YELLOW:
                 logger.info(f"Requesting implementation review for {feature_title}...")
@@ -473,6 +626,62 @@ class TDDFeatureImplementer:
             # Clean up code accumulator resources
             code_accumulator.cleanup()
     
+    async def _run_speculative_round(self,
+                                     coder_context: str,
+                                     count: int,
+                                     test_code: str,
+                                     existing_code: Dict[str, str],
+                                     accumulated_code: Dict[str, str],
+                                     feature_title: str,
+                                     tracking_id: str) -> SpeculationOutcome:
+        """
+        Generate count implementations concurrently and run the tests against
+        each, keeping the first that passes.
+        
+        Each finished candidate's result is a tuple of
+        (implementation_code, code_files, test_result). Every candidate is
+        tested in a temporary directory of its own holding its code and the
+        tests, so concurrent candidates don't overwrite each other's files.
+        """
+        from orchestrator.orchestrator_agent import run_team_member_with_tracking
+        
+        async def attempt(index: int, variant: str):
+            context = coder_context
+            approach = candidate_approach(index)
+            if approach:
+                context += f"\n\nCANDIDATE APPROACH:\n{approach}"
+            
+            coder_result = await run_team_member_with_tracking(
+                "feature_coder_agent", context, f"{tracking_id}_c{index}"
+            )
+            implementation_code = self._extract_implementation_code(coder_result)
+            code_files = self._parse_code_files(implementation_code)
+            
+            candidate_code = existing_code.copy()
+            candidate_code.update(accumulated_code)
+            candidate_code.update(code_files)
+            with tempfile.TemporaryDirectory(prefix=f"{tracking_id}_c{index}_") as working_dir:
+                self._write_files(Path(working_dir), {**candidate_code, **self._parse_code_files(test_code)})
+                test_result = await self._run_tests(
+                    test_code, candidate_code, feature_title, expect_failure=False,
+                    validator=CodeValidator(working_dir=Path(working_dir))
+                )
+            return (implementation_code, code_files, test_result), test_result.success
+        
+        variants = [f"approach_{i}" for i in range(count)]
+        return await race_candidates(variants, attempt, timeout=self.speculation["round_timeout"])
+    
+    def _write_files(self, directory: Path, files: Dict[str, str]):
+        """Write code files into a directory, ignoring paths that leave it"""
+        root = directory.resolve()
+        for filename, content in files.items():
+            path = (root / filename).resolve()
+            if root not in path.parents:
+                logger.warning(f"Skipping file outside the candidate directory: {filename}")
+                continue
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+    
     def _feature_to_snake_case(self, feature_title: str) -> str:
         """Convert feature title to snake_case for test file naming"""
         # Remove special characters and convert to lowercase
@@ -522,58 +731,33 @@ class TDDFeatureImplementer:
         else:
             test_filename = f"tests/test_{feature_snake_case}.py"
         
-        context = f"""
-You are implementing Test-Driven Development (TDD) for a specific feature.
-Your task is to write tests BEFORE the implementation exists.
-
-PROJECT REQUIREMENTS:
-{requirements}
-
-FEATURE TO TEST:
+        existing_code_context = self._format_existing_code(
+            existing_code,
+            focus_text=f"{feature['title']}\n{feature['description']}{criteria_section}",
+            token_budget=test_writer_config.get("context_token_budget")
+        )
+        
+        # Requirements, design and instructions are the same for every feature:
+        # keep them first so the provider can reuse the cached prompt prefix
+        return PromptBuilder().stable(
+            """You are implementing Test-Driven Development (TDD) for a specific feature.
+Your task is to write tests BEFORE the implementation exists.""",
+            f"PROJECT REQUIREMENTS:\n{requirements}",
+            f"DESIGN CONTEXT:\n{design_output[:1000]}...",
+            TEST_WRITER_INSTRUCTIONS
+        ).volatile(
+            f"""FEATURE TO TEST:
 Title: {feature['title']}
 Description: {feature['description']}
-{criteria_section}
-
-DESIGN CONTEXT:
-{design_output[:1000]}...
-
-EXISTING CODE:
-{self._format_existing_code(existing_code)}
-
-CRITICAL TDD INSTRUCTIONS:
-1. Write tests that will FAIL because the feature is NOT implemented yet
-2. Tests should define the expected behavior and interface
-3. Include both positive and negative test cases
-4. Tests should be specific to THIS feature only
-5. Use appropriate testing framework (pytest for Python, jest for JS, etc.)
-6. Tests should be executable, not just examples
-
-REQUIRED OUTPUT FORMAT:
-Generate ONLY executable test files in this format:
-
-```python
-# filename: {test_filename}
-import pytest
-from main import FeatureName  # This import will fail initially
-
-def test_feature_behavior():
-    # This test MUST fail initially
-    result = FeatureName.do_something()
-    assert result == expected_value
-
-def test_edge_case():
-    with pytest.raises(ValueError):
-        FeatureName.invalid_input()
-```
-
-IMPORTANT: 
+{criteria_section}""",
+            f"EXISTING CODE:\n{existing_code_context}",
+            f"""REQUIRED TEST FILE: {test_filename}
 - Always use exactly this filename: {test_filename}
 - Do NOT create multiple test files for the same feature
 - If testing the main API endpoints, add tests to the existing test file
 
-Write tests that clearly define what the feature should do.
-"""
-        return context
+Write tests that clearly define what the feature should do."""
+        ).build()
     
     def _create_coder_context_tdd(self,
                                 feature: Dict[str, str],
@@ -585,73 +769,63 @@ Write tests that clearly define what the feature should do.
                                 red_phase_context: Optional[Dict[str, Any]] = None) -> str:
         """Create context for coder agent in TDD mode with RED phase guidance"""
         
-        # Base context
-        context = f"""
-You are implementing code to make failing tests pass (TDD Green Phase).
-
-FEATURE TO IMPLEMENT:
+        builder = PromptBuilder().stable(
+            "You are implementing code to make failing tests pass (TDD Green Phase).",
+            CODER_TDD_INSTRUCTIONS
+        )
+        
+        # Files the tests import or fail in are shown first, within the coder's budget
+        test_results_text = self._format_test_results(test_result)
+        existing_code_context = self._format_existing_code(
+            existing_code,
+            focus_text=f"{feature['title']}\n{feature['description']}\n{test_code}",
+            failing_output=test_results_text,
+            token_budget=coder_config.get("context_token_budget")
+        )
+        builder.volatile(
+            f"EXISTING CODE:\n{existing_code_context}",
+            f"""FEATURE TO IMPLEMENT:
 Title: {feature['title']}
-Description: {feature['description']}
-
-FAILING TESTS:
-{test_code}
-
-TEST RESULTS:
-{self._format_test_results(test_result)}
-"""
-
+Description: {feature['description']}""",
+            f"FAILING TESTS:\n{test_code}",
+            f"TEST RESULTS:\n{test_results_text}"
+        )
+        
         # Add RED phase context if available
         if red_phase_context:
-            context += f"""
-RED PHASE ANALYSIS:
+            red_phase = f"""RED PHASE ANALYSIS:
 - Total failures: {red_phase_context['failure_summary']['total_failures']}
 - Failure types: {', '.join(red_phase_context['failure_summary']['failure_types'])}
 """
             if red_phase_context.get('missing_components'):
-                context += f"- Missing components: {', '.join(red_phase_context['missing_components'])}\n"
+                red_phase += f"- Missing components: {', '.join(red_phase_context['missing_components'])}\n"
             
             if red_phase_context.get('implementation_hints'):
-                context += "\nIMPLEMENTATION HINTS:\n"
+                red_phase += "\nIMPLEMENTATION HINTS:\n"
                 for hint in red_phase_context['implementation_hints']:
-                    context += f"- {hint}\n"
+                    red_phase += f"- {hint}\n"
             
-            context += "\n"
+            builder.volatile(red_phase)
         
         if retry_count > 0:
-            context += f"""
-RETRY ATTEMPT: {retry_count}
+            builder.volatile(f"""RETRY ATTEMPT: {retry_count}
 Previous implementation failed to make all tests pass.
-Focus on the specific test failures above.
-"""
+Focus on the specific test failures above.""")
         
-        context += f"""
-EXISTING CODE:
-{self._format_existing_code(existing_code)}
-
-TDD IMPLEMENTATION RULES:
-1. Write ONLY the code needed to make the tests pass
-2. Do NOT add features not covered by tests
-3. Keep implementation simple - no premature optimization
-4. Ensure all test assertions are satisfied
-5. Maintain compatibility with existing code
-6. Focus on making tests green
-
-OUTPUT FORMAT:
-```python
-# filename: path/to/implementation.py
-<implementation code>
-```
-
-Make the tests pass with minimal, clean code.
-"""
-        return context
+        builder.volatile("Make the tests pass with minimal, clean code.")
+        return builder.build()
     
     async def _run_tests(self,
                         test_code: str,
                         implementation_code: Dict[str, str],
                         feature_name: str,
-                        expect_failure: bool) -> TestResult:
-        """Run tests using enhanced test executor with RED phase support"""
+                        expect_failure: bool,
+                        validator: Optional[CodeValidator] = None) -> TestResult:
+        """Run tests using enhanced test executor with RED phase support
+        
+        validator defaults to the implementer's own; speculative candidates
+        pass one working in their own directory.
+        """
         # Use enhanced test executor with expect_failure support
         test_config = TestExecutionConfig(
             run_tests=True,
@@ -660,7 +834,8 @@ Make the tests pass with minimal, clean code.
             expect_failure=expect_failure,  # Pass RED phase expectation
             cache_results=True,  # Use caching for performance
             extract_coverage=not expect_failure,  # No coverage in RED phase
-            verbose_output=True  # Get detailed failure info
+            verbose_output=True,  # Get detailed failure info
+            timing_history_dir=self.project_dir  # Candidates share the project's history
         )
         
         try:
@@ -675,8 +850,9 @@ Make the tests pass with minimal, clean code.
             test_files = self._extract_test_files(test_code)
             
             # Use the enhanced test executor
-            if self.validator:
-                executor = TestExecutor(self.validator, test_config)
+            validator = validator or self.validator
+            if validator:
+                executor = TestExecutor(validator, test_config)
                 result = await executor.execute_tests(
                     all_code, 
                     feature_name,
@@ -805,19 +981,18 @@ Output:
         matches = re.findall(r'# filename: (test.*\.py)', test_code)
         return matches
     
-    def _format_existing_code(self, code_dict: Dict[str, str]) -> str:
-        """Format existing code for context"""
-        if not code_dict:
-            return "No existing code yet."
-        
-        formatted = []
-        for filename, content in code_dict.items():
-            # Show first 30 lines of each file
-            lines = content.split('\n')[:30]
-            preview = '\n'.join(lines)
-            formatted.append(f"=== {filename} ===\n{preview}\n")
-        
-        return '\n'.join(formatted)
+    def _format_existing_code(self,
+                              code_dict: Dict[str, str],
+                              focus_text: str = "",
+                              failing_output: str = "",
+                              token_budget: Optional[int] = None) -> str:
+        """Format the existing code most relevant to the task within a token budget"""
+        return self.context_builder.build(
+            code_dict,
+            focus_text=focus_text,
+            failing_output=failing_output,
+            token_budget=token_budget
+        )
     
     def _format_code_for_validator(self, code_dict: Dict[str, str]) -> str:
         """Format code for validator"""
@@ -835,23 +1010,15 @@ Output:
     
     def _parse_code_files(self, code_output: str) -> Dict[str, str]:
         """Parse code files from output"""
-        files = {}
-        
         # Look for our standard format
-        file_pattern = r'```(?:python|py|javascript|js)\s*\n#\s*filename:\s*(\S+)\n(.*?)```'
-        matches = re.findall(file_pattern, code_output, re.DOTALL)
-        
-        if matches:
-            for filename, content in matches:
-                files[filename] = content.strip()
-        
-        return files
+        return extract_files(code_output, styles=(HASH_FILENAME,))
 
 
 def create_tdd_implementer(tracer: WorkflowExecutionTracer,
                           progress_monitor: ProgressMonitor,
                           review_integration: ReviewIntegration,
-                          phase_tracker: Optional[TDDPhaseTracker] = None) -> TDDFeatureImplementer:
+                          phase_tracker: Optional[TDDPhaseTracker] = None,
+                          project_dir: Optional[Path] = None) -> TDDFeatureImplementer:
     """Factory function to create TDD implementer with default configuration"""
     retry_config = RetryConfig()
     retry_strategy = RetryStrategy()
@@ -862,5 +1029,6 @@ def create_tdd_implementer(tracer: WorkflowExecutionTracer,
         review_integration=review_integration,
         retry_strategy=retry_strategy,
         retry_config=retry_config,
-        phase_tracker=phase_tracker
+        phase_tracker=phase_tracker,
+        project_dir=project_dir
     )
\ No newline at end of file
@@ -266,6 +266,55 @@ class TDDPhaseTracker:
                     "Cannot start implementation without being in RED phase."
                 )
     
+    def export_feature(self, feature_id: str) -> Dict:
+        """
+        Export a feature's phase and history in JSON-serializable form.
+        
+        Args:
+            feature_id: Feature to export
+            
+        Returns:
+            Dictionary accepted by restore_feature
+        """
+        phase = self._feature_phases.get(feature_id)
+        return {
+            "phase": phase.value if phase else None,
+            "history": [
+                {
+                    "from_phase": t.from_phase.value if t.from_phase else None,
+                    "to_phase": t.to_phase.value,
+                    "timestamp": t.timestamp.isoformat(),
+                    "reason": t.reason,
+                    "metadata": t.metadata
+                }
+                for t in self._phase_history.get(feature_id, [])
+            ],
+            "metadata": self._feature_metadata.get(feature_id, {})
+        }
+    
+    def restore_feature(self, feature_id: str, data: Dict) -> None:
+        """
+        Restore a feature exported by export_feature (e.g. from a checkpoint).
+        
+        Args:
+            feature_id: Feature to restore
+            data: Exported phase, history and metadata
+        """
+        if not data.get("phase"):
+            return
+        self._feature_phases[feature_id] = TDDPhase(data["phase"])
+        self._phase_history[feature_id] = [
+            PhaseTransition(
+                from_phase=TDDPhase(t["from_phase"]) if t["from_phase"] else None,
+                to_phase=TDDPhase(t["to_phase"]),
+                timestamp=datetime.fromisoformat(t["timestamp"]),
+                reason=t.get("reason", ""),
+                metadata=t.get("metadata", {})
+            )
+            for t in data.get("history", [])
+        ]
+        self._feature_metadata[feature_id] = data.get("metadata", {})
+    
     def get_phase_distribution(self) -> Dict[TDDPhase, int]:
         """
         Get the distribution of features across phases.
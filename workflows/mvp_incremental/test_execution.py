@@ -6,6 +6,7 @@ This module implements test execution with enhanced capabilities for TDD workflo
 - Enhanced test output parsing with detailed failure context
 - Test result caching mechanism for performance
 - Detailed failure context extraction for better debugging
+- Per-test timing history for slowest-first ordering and RED-phase fail-fast
 """
 
 import asyncio
@@ -23,6 +24,7 @@ from workflows.logger import workflow_logger as logger
 from workflows.mvp_incremental.validator import CodeValidator
 from workflows.mvp_incremental.error_analyzer import SimplifiedErrorAnalyzer, ErrorContext
 from workflows.mvp_incremental.test_cache_manager import get_test_cache
+from workflows.mvp_incremental.test_timing_history import get_test_timing_history, hash_code
 
 
 @dataclass
@@ -65,6 +67,9 @@ class TestExecutionConfig:
     cache_results: bool = True  # Cache test results for performance
     extract_coverage: bool = True  # Extract test coverage data
     verbose_output: bool = True  # Include detailed test output
+    track_timing: bool = True  # Record per-test durations and order tests by history
+    fail_fast_red_phase: bool = True  # Stop RED-phase runs at the first failure
+    timing_history_dir: Optional[Path] = None  # Project dir for timing history (cwd if None)
 
 
 # Legacy cache class kept for compatibility but now uses enhanced cache manager
@@ -92,6 +97,9 @@ class TestExecutor:
         self.error_analyzer = SimplifiedErrorAnalyzer()
         # Use enhanced cache manager directly
         self._result_cache = get_test_cache() if config.cache_results else None
+        self._timing_history = (
+            get_test_timing_history(config.timing_history_dir) if config.track_timing else None
+        )
         
     async def execute_tests(self, 
                           code: str, 
@@ -147,6 +155,14 @@ class TestExecutor:
                     logger.debug(f"Cache stats: {stats['hit_rate']} hit rate, {stats['entries']} entries")
                 return cached_result
             
+        # Order tests by recorded durations
+        code_hash = hash_code(code)
+        if self._timing_history:
+            if expect_failure:
+                test_files = self._timing_history.order_for_red_phase(test_files, code_hash)
+            else:
+                test_files = self._timing_history.order_slowest_first(test_files, code_hash)
+            
         # Run the tests
         start_time = datetime.now()
         result = await self._run_tests(test_files, expect_failure)
@@ -155,6 +171,10 @@ class TestExecutor:
         # Update execution time
         result.execution_time = execution_time
         
+        # Remember how long each test took
+        if self._timing_history and self._timing_history.record_run(result.output, code_hash):
+            self._timing_history.save()
+        
         # Validate expected failure behavior
         if expect_failure:
             if result.failed == 0:
@@ -178,6 +198,12 @@ class TestExecutor:
             
         return result
         
+    def get_timing_report(self) -> Dict[str, Any]:
+        """Percentile timing report from the test timing history."""
+        if not self._timing_history:
+            return {}
+        return self._timing_history.get_timing_report()
+        
     async def _run_tests(self, test_files: List[str], expect_failure: bool) -> TestResult:
         """Run pytest on the specified test files with enhanced output parsing."""
         # Build command with verbose output and coverage if requested
@@ -186,6 +212,11 @@ class TestExecutor:
             test_command += " -v"
         if self.config.extract_coverage and not expect_failure:
             test_command += " --cov --cov-report=term-missing"
+        if self.config.track_timing:
+            test_command += " --durations=0 --durations-min=0"
+        if expect_failure and self.config.fail_fast_red_phase:
+            # Any failure confirms the RED phase, no need to run the rest
+            test_command += " -x"
         
         try:
             # Use the validator's execute method to run tests
@@ -0,0 +1,285 @@
+"""
+Test Timing History for MVP Incremental and TDD Workflows
+
+Persists how long individual tests took, keyed by pytest node id and the hash
+of the code under test, so that test executors can:
+- Order test files slowest-first (longest-processing-time first, which also
+  gives sharding a weight to balance on)
+- Put tests without history and fast tests first in RED-phase runs, where the
+  first observed failure is all we need
+- Report percentile timings per test and per file
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Dict, List, Optional, Any, Iterable
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+from workflows.logger import workflow_logger as logger
+
+
+# Matches pytest "--durations" lines, e.g. "0.52s call     tests/test_api.py::test_create"
+_DURATION_LINE = re.compile(r'^\s*(\d+(?:\.\d+)?)s\s+(setup|call|teardown)\s+(\S+::\S+)', re.MULTILINE)
+# Matches verbose outcome lines, e.g. "tests/test_api.py::test_create PASSED"
+_OUTCOME_LINE = re.compile(r'^(\S+::\S+)\s+(PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)', re.MULTILINE)
+
+
+@dataclass
+class TimingSample:
+    """A single observed test duration."""
+    duration: float
+    code_hash: str
+    outcome: str = "passed"
+    timestamp: float = 0.0
+
+
+def hash_code(code: Any) -> str:
+    """Hash implementation code (a string or a filename -> content mapping)."""
+    if isinstance(code, dict):
+        content = "\n".join(f"{name}\0{code[name]}" for name in sorted(code))
+    else:
+        content = code or ""
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+def parse_pytest_durations(output: str) -> Dict[str, float]:
+    """Sum setup/call/teardown durations per node id from pytest --durations output."""
+    durations: Dict[str, float] = {}
+    for seconds, _when, node_id in _DURATION_LINE.findall(output):
+        durations[node_id] = durations.get(node_id, 0.0) + float(seconds)
+    return durations
+
+
+def parse_pytest_outcomes(output: str) -> Dict[str, str]:
+    """Extract per-test outcomes from verbose pytest output."""
+    return {node_id: outcome.lower() for node_id, outcome in _OUTCOME_LINE.findall(output)}
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile with linear interpolation."""
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (percentile / 100) * (len(sorted_values) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class TestTimingHistory:
+    """
+    Persistent per-project history of test durations.
+
+    Samples are grouped by node id and tagged with the code hash they were
+    measured against. Estimates prefer samples for the current code hash and
+    fall back to all samples for the test.
+    """
+
+    def __init__(self,
+                 history_path: Optional[Path] = None,
+                 max_samples_per_test: int = 20):
+        """
+        Initialize timing history.
+
+        Args:
+            history_path: JSON file the history is persisted to (in-memory if None)
+            max_samples_per_test: Number of most recent samples kept per test
+        """
+        self.history_path = Path(history_path) if history_path else None
+        self.max_samples_per_test = max_samples_per_test
+        self._samples: Dict[str, List[TimingSample]] = {}
+        self._dirty = False
+
+        if self.history_path and self.history_path.exists():
+            self._load()
+
+    def record(self,
+               node_id: str,
+               duration: float,
+               code_hash: str = "",
+               outcome: str = "passed"):
+        """Record one test duration."""
+        samples = self._samples.setdefault(node_id, [])
+        samples.append(TimingSample(
+            duration=duration,
+            code_hash=code_hash,
+            outcome=outcome,
+            timestamp=time.time()
+        ))
+        if len(samples) > self.max_samples_per_test:
+            del samples[:-self.max_samples_per_test]
+        self._dirty = True
+
+    def record_run(self, output: str, code_hash: str = "") -> int:
+        """
+        Record all test durations found in a pytest run's output.
+
+        Args:
+            output: Combined pytest stdout/stderr (run with --durations=0)
+            code_hash: Hash of the code the tests ran against
+
+        Returns:
+            Number of tests recorded
+        """
+        durations = parse_pytest_durations(output)
+        outcomes = parse_pytest_outcomes(output)
+        for node_id, duration in durations.items():
+            self.record(node_id, duration, code_hash, outcomes.get(node_id, "passed"))
+        return len(durations)
+
+    def expected_duration(self, node_id: str, code_hash: Optional[str] = None) -> Optional[float]:
+        """Median of recorded durations for a test, or None if it was never run."""
+        samples = self._samples.get(node_id)
+        if not samples:
+            return None
+        if code_hash:
+            matching = [s.duration for s in samples if s.code_hash == code_hash]
+            if matching:
+                return _percentile(sorted(matching), 50)
+        return _percentile(sorted(s.duration for s in samples), 50)
+
+    def expected_file_duration(self, test_file: str, code_hash: Optional[str] = None) -> Optional[float]:
+        """Sum of expected durations of all known tests in a file."""
+        prefix = self._normalize_file(test_file) + "::"
+        estimates = [
+            self.expected_duration(node_id, code_hash)
+            for node_id in self._samples
+            if self._normalize_file(node_id).startswith(prefix)
+        ]
+        if not estimates:
+            return None
+        return sum(estimates)
+
+    def order_slowest_first(self, test_files: Iterable[str], code_hash: Optional[str] = None) -> List[str]:
+        """
+        Order test files by expected duration, slowest first.
+
+        Files without history come first since they may be arbitrarily slow.
+        """
+        def sort_key(test_file: str):
+            estimate = self.expected_file_duration(test_file, code_hash)
+            return (estimate is not None, -(estimate or 0.0))
+
+        return sorted(test_files, key=sort_key)
+
+    def order_for_red_phase(self, test_files: Iterable[str], code_hash: Optional[str] = None) -> List[str]:
+        """
+        Order test files so a failure is observed as early as possible.
+
+        Files without history (newly written tests) come first, then the
+        fastest known files.
+        """
+        def sort_key(test_file: str):
+            estimate = self.expected_file_duration(test_file, code_hash)
+            return (estimate is not None, estimate or 0.0)
+
+        return sorted(test_files, key=sort_key)
+
+    def get_timing_report(self, percentiles: Iterable[float] = (50, 90, 99)) -> Dict[str, Any]:
+        """
+        Build a percentile timing report.
+
+        Returns:
+            Dictionary with overall, per-file and per-test statistics
+        """
+        percentiles = list(percentiles)
+
+        def summarize(durations: List[float]) -> Dict[str, Any]:
+            values = sorted(durations)
+            summary = {
+                "count": len(values),
+                "mean": sum(values) / len(values) if values else 0.0,
+                "max": values[-1] if values else 0.0
+            }
+            for p in percentiles:
+                summary[f"p{int(p) if float(p).is_integer() else p}"] = _percentile(values, p)
+            return summary
+
+        tests = {
+            node_id: summarize([s.duration for s in samples])
+            for node_id, samples in self._samples.items()
+        }
+
+        # Files are summarized by the median duration of each of their tests
+        file_totals: Dict[str, float] = {}
+        for node_id, samples in self._samples.items():
+            test_file = node_id.split("::", 1)[0]
+            file_totals[test_file] = file_totals.get(test_file, 0.0) + self.expected_duration(node_id)
+
+        all_durations = [s.duration for samples in self._samples.values() for s in samples]
+        slowest = sorted(tests, key=self.expected_duration, reverse=True)[:10]
+
+        return {
+            "tests_tracked": len(self._samples),
+            "samples": len(all_durations),
+            "overall": summarize(all_durations),
+            "files": dict(sorted(file_totals.items(), key=lambda item: item[1], reverse=True)),
+            "slowest_tests": [{"node_id": node_id, **tests[node_id]} for node_id in slowest],
+            "tests": tests
+        }
+
+    def save(self):
+        """Persist history atomically if it changed."""
+        if not self.history_path or not self._dirty:
+            return
+
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "version": 1,
+                "tests": {
+                    node_id: [asdict(s) for s in samples]
+                    for node_id, samples in self._samples.items()
+                }
+            }
+            tmp_path = self.history_path.with_suffix(self.history_path.suffix + ".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.history_path)
+            self._dirty = False
+            logger.debug(f"Saved timing history for {len(self._samples)} tests to {self.history_path}")
+        except Exception as e:
+            logger.error(f"Failed to save test timing history: {e}")
+
+    def clear(self):
+        """Forget all recorded timings."""
+        self._samples.clear()
+        self._dirty = True
+
+    def _load(self):
+        """Load history from disk."""
+        try:
+            with open(self.history_path, 'r') as f:
+                data = json.load(f)
+            for node_id, samples in data.get("tests", {}).items():
+                self._samples[node_id] = [TimingSample(**s) for s in samples][-self.max_samples_per_test:]
+            logger.debug(f"Loaded timing history for {len(self._samples)} tests")
+        except Exception as e:
+            logger.error(f"Failed to load test timing history: {e}")
+
+    @staticmethod
+    def _normalize_file(path: str) -> str:
+        """Normalize a test file path for prefix matching."""
+        path = path.replace("\\", "/")
+        return path[2:] if path.startswith("./") else path
+
+
+# Histories per project, keyed by history file path
+_histories: Dict[str, TestTimingHistory] = {}
+
+
+def get_test_timing_history(project_dir: Optional[Path] = None) -> TestTimingHistory:
+    """Get or create the timing history for a project directory."""
+    base = Path(project_dir) if project_dir else Path(".")
+    history_path = (base / ".cache" / "test_timing_history.json").resolve()
+    key = str(history_path)
+
+    if key not in _histories:
+        _histories[key] = TestTimingHistory(history_path=history_path)
+
+    return _histories[key]
@@ -48,6 +48,19 @@ class TestableFeature:
             "tdd_phase": self.tdd_phase.value if self.tdd_phase else None
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestableFeature":
+        """Rebuild a feature converted with to_dict"""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            description=data["description"],
+            test_criteria=TestCriteria(**data["test_criteria"]),
+            dependencies=data.get("dependencies", []),
+            test_files=data.get("test_files", []),
+            tdd_phase=TDDPhase(data["tdd_phase"]) if data.get("tdd_phase") else None
+        )
+    
     def can_start_implementation(self) -> bool:
         """Check if feature is in RED phase and ready for implementation"""
         return self.tdd_phase == TDDPhase.RED
@@ -122,8 +122,9 @@ class CodeValidator:
         try:
             # Determine if this is a shell command or Python code
             if code.strip().startswith(('python', 'pytest', 'pip', 'npm', 'git')):
-                # Execute as shell command
-                result = subprocess.run(
+                # Execute as shell command (in a thread so concurrent validations don't block each other)
+                result = await asyncio.to_thread(
+                    subprocess.run,
                     code,
                     shell=True,
                     capture_output=True,
@@ -145,7 +146,8 @@ class CodeValidator:
                     temp_file = f.name
                     
                 try:
-                    result = subprocess.run(
+                    result = await asyncio.to_thread(
+                        subprocess.run,
                         ['python', temp_file],
                         capture_output=True,
                         text=True,
@@ -10,6 +10,7 @@ from pathlib import Path
 from shared.data_models import (
     TeamMember, CodingTeamInput, TeamMemberResult
 )
+from shared.utils.code_block_parser import HASH_FILENAME, HASH_SECTION, extract_files
 from workflows.monitoring import WorkflowExecutionTracer, WorkflowExecutionReport
 from workflows.workflow_config import MAX_REVIEW_RETRIES
 from workflows.agent_output_handler import get_output_handler
@@ -415,18 +416,8 @@ def _format_existing_code(code_dict: Dict[str, str]) -> str:
 
 def _parse_code_files(code_output: str) -> Dict[str, str]:
     """Parse code files from output"""
-    files = {}
-    
-    import re
-    # Look for filename markers
-    pattern = r'(?:# filename:|// filename:)\s*(\S+)\n(.*?)(?=(?:# filename:|// filename:)|$)'
-    matches = re.findall(pattern, code_output, re.DOTALL)
-    
-    if matches:
-        for filename, content in matches:
-            files[filename] = content.strip()
-    
-    return files
+    # Look for filename markers, fenced or not
+    return extract_files(code_output, styles=(HASH_FILENAME, HASH_SECTION))
 
 
 def _format_components_summary(components: List[Dict[str, str]]) -> str:
@@ -7,6 +7,9 @@ import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from shared.utils.code_block_parser import (
+    FILE, FILENAME, HASH_FILENAME, HASH_SECTION, MARKDOWN, parse_code_blocks
+)
 from workflows.logger import workflow_logger as logger
 
 
@@ -95,32 +98,25 @@ class TDDFileManager:
                     timestamp=""
                 )
         
-        # Multiple patterns to catch different formats
-        patterns = [
-            # Pattern 1: FILENAME: format (coder agent)
-            (r'FILENAME:\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', 'FILENAME'),
-            # Pattern 2: # filename: format (TDD cycle)
-            (r'#\s*filename:\s*(\S+)\n(.*?)(?=#\s*filename:|$)', 'hash_filename'),
-            # Pattern 3: File: format
-            (r'File:\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', 'File'),
-            # Pattern 4: Markdown header format
-            (r'###\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', 'markdown'),
-        ]
-        
-        for pattern, pattern_name in patterns:
-            matches = re.findall(pattern, output, re.MULTILINE | re.DOTALL)
-            if matches:
-                logger.info(f"Found {len(matches)} files using {pattern_name} pattern")
-                for filename, content in matches:
-                    filename = filename.strip()
-                    content = content.strip()
-                    files[filename] = content
-                    
-                    # Categorize files
-                    if 'test' in filename.lower():
-                        self.test_files[filename] = content
-                    else:
-                        self.implementation_files[filename] = content
+        # Formats accepted from the coder, test writer and TDD cycle agents
+        styles = (FILENAME, HASH_FILENAME, HASH_SECTION, FILE, MARKDOWN)
+        blocks = [block for block in parse_code_blocks(output)
+                  if block.filename and block.style in styles]
+        for style in styles:
+            count = sum(1 for block in blocks if block.style == style)
+            if count:
+                logger.info(f"Found {count} files using {style} pattern")
+        
+        for block in blocks:
+            filename = block.filename
+            content = block.content.strip()
+            files[filename] = content
+            
+            # Categorize files
+            if 'test' in filename.lower():
+                self.test_files[filename] = content
+            else:
+                self.implementation_files[filename] = content
                         
         # Update current project files if we have a project
         if self.current_project:
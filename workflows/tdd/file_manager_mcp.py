@@ -4,12 +4,14 @@ Handles coordination between coder agent file generation and test execution usin
 """
 import re
 import os
-import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from shared.utils.code_block_parser import (
+    FILE, FILENAME, HASH_FILENAME, HASH_SECTION, MARKDOWN, parse_code_blocks
+)
 from workflows.logger import workflow_logger as logger
-from shared.filesystem_client import MCPFileSystemClient, get_filesystem_client
+from shared.filesystem_client import MCPFileSystemClient, get_filesystem_client, run_sync
 
 
 @dataclass
@@ -56,6 +58,19 @@ class TDDFileManagerMCP:
         if self.use_mcp and hasattr(self, '_mcp_context'):
             await self._mcp_context.__aexit__(exc_type, exc_val, exc_tb)
     
+    def _run_mcp(self, operation):
+        """Run an MCP operation from synchronous code.
+        
+        Runs on the shared background event loop so every call reuses the
+        same warm filesystem server connection instead of spawning a new
+        server in a fresh event loop.
+        """
+        async def run_connected():
+            async with self.mcp_client.connect():
+                return await operation()
+        
+        return run_sync(run_connected())
+    
     def extract_project_location(self, coder_output: str) -> Optional[str]:
         """
         Extract project location from coder agent output
@@ -124,32 +139,25 @@ class TDDFileManagerMCP:
                     timestamp=""
                 )
         
-        # Multiple patterns to catch different formats
-        patterns = [
-            # Pattern 1: FILENAME: format (coder agent)
-            (r'FILENAME:\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', 'FILENAME'),
-            # Pattern 2: # filename: format (TDD cycle)
-            (r'#\s*filename:\s*(\S+)\n(.*?)(?=#\s*filename:|$)', 'hash_filename'),
-            # Pattern 3: File: format
-            (r'File:\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', 'File'),
-            # Pattern 4: Markdown header format
-            (r'###\s*(.+?)\n```(?:\w*)\n([\s\S]+?)\n```', 'markdown'),
-        ]
+        # Formats accepted from the coder, test writer and TDD cycle agents
+        styles = (FILENAME, HASH_FILENAME, HASH_SECTION, FILE, MARKDOWN)
+        blocks = [block for block in parse_code_blocks(output)
+                  if block.filename and block.style in styles]
+        for style in styles:
+            count = sum(1 for block in blocks if block.style == style)
+            if count:
+                logger.info(f"Found {count} files using {style} pattern")
         
-        for pattern, pattern_name in patterns:
-            matches = re.findall(pattern, output, re.MULTILINE | re.DOTALL)
-            if matches:
-                logger.info(f"Found {len(matches)} files using {pattern_name} pattern")
-                for filename, content in matches:
-                    filename = filename.strip()
-                    content = content.strip()
-                    files[filename] = content
-                    
-                    # Categorize files
-                    if 'test' in filename.lower():
-                        self.test_files[filename] = content
-                    else:
-                        self.implementation_files[filename] = content
+        for block in blocks:
+            filename = block.filename
+            content = block.content.strip()
+            files[filename] = content
+            
+            # Categorize files
+            if 'test' in filename.lower():
+                self.test_files[filename] = content
+            else:
+                self.implementation_files[filename] = content
                         
         # Update current project files if we have a project
         if self.current_project:
@@ -246,25 +254,33 @@ class TDDFileManagerMCP:
         
         # If using MCP, we need to run this asynchronously
         if self.use_mcp:
-            # Create async task and run it
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                return loop.run_until_complete(self._update_files_async(files))
-            finally:
-                loop.close()
+            return self._run_mcp(lambda: self._update_files_async(files))
         else:
             # Use direct file I/O
             return self._update_files_direct(files)
     
     async def _update_files_async(self, files: Dict[str, str]) -> bool:
-        """Async version of update_files_in_project for MCP"""
+        """Async version of update_files_in_project for MCP
+        
+        Writes all files with batched write_files calls.
+        """
+        if not self.mcp_client:
+            return False
+            
         try:
-            for filename, content in files.items():
-                file_path = self.current_project.project_path / filename
-                
-                success = await self._write_file_mcp(file_path, content)
-                if success:
+            from config.mcp_config import MCP_FILESYSTEM_CONFIG
+            sandbox_root = Path(MCP_FILESYSTEM_CONFIG["sandbox_root"])
+            
+            relative_paths = {
+                filename: str((self.current_project.project_path / filename).relative_to(sandbox_root))
+                for filename in files
+            }
+            written = await self.mcp_client.write_files({
+                relative_paths[filename]: content for filename, content in files.items()
+            }, if_changed=True)
+            
+            for filename in files:
+                if written.get(relative_paths[filename]):
                     logger.info(f"Updated {filename} in project via MCP")
                 else:
                     logger.error(f"Failed to update {filename} via MCP")
@@ -305,12 +321,7 @@ class TDDFileManagerMCP:
             if file_path.exists():
                 if self.use_mcp:
                     # Run async operation synchronously
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        return loop.run_until_complete(self._read_file_mcp(file_path))
-                    finally:
-                        loop.close()
+                    return self._run_mcp(lambda: self._read_file_mcp(file_path))
                 else:
                     return self._read_file_direct(file_path)
                     
@@ -328,13 +339,8 @@ class TDDFileManagerMCP:
         if self.current_project.project_path.exists():
             if self.use_mcp:
                 # Use MCP to list files
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    additional_files = loop.run_until_complete(self._list_files_mcp())
-                    files.extend(additional_files)
-                finally:
-                    loop.close()
+                additional_files = self._run_mcp(lambda: self._list_files_mcp())
+                files.extend(additional_files)
             else:
                 # Direct file listing
                 for file_path in self.current_project.project_path.rglob('*'):
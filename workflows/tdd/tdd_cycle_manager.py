@@ -170,7 +170,11 @@ class TDDCycleManager:
         language = self._detect_language(test_code, implementation_code)
         
         # Use real test executor
-        test_executor = TestExecutor(use_docker=False, timeout=30)
+        test_executor = TestExecutor(
+            use_docker=False,
+            timeout=30,
+            history_dir=self.file_manager.get_test_directory(use_project_dir=True)
+        )
         
         # Get project directory from file manager based on config
         from workflows.tdd.tdd_config import TEST_CONFIG
@@ -13,14 +13,21 @@ import re
 
 from workflows.logger import workflow_logger as logger
 from workflows.tdd.tdd_cycle_manager import TestExecutionResult, TDDPhase
+from workflows.mvp_incremental.test_timing_history import TestTimingHistory, get_test_timing_history, hash_code
 
 
 class TestExecutor:
     """Executes tests and analyzes results for TDD workflow"""
     
-    def __init__(self, use_docker: bool = False, timeout: int = 30):
+    def __init__(self, use_docker: bool = False, timeout: int = 30,
+                 track_timing: bool = True, fail_fast_red_phase: bool = True,
+                 history_dir: Optional[Path] = None):
         self.use_docker = use_docker
         self.timeout = timeout
+        self.track_timing = track_timing
+        # Project whose timing history is used when no project directory is given
+        self.history_dir = history_dir
+        self.fail_fast_red_phase = fail_fast_red_phase
         self._test_runners_checked = False
         self._available_runners = {}
         
@@ -70,11 +77,12 @@ class TestExecutor:
         project_directory: Optional[Path] = None
     ) -> TestExecutionResult:
         """Execute Python tests using pytest"""
+        code_hash = hash_code(implementation_code)
         
         # Use project directory if provided, otherwise use temp directory
         if project_directory and project_directory.exists():
             logger.info(f"Using project directory for tests: {project_directory}")
-            return await self._run_tests_in_directory(project_directory, phase)
+            return await self._run_tests_in_directory(project_directory, phase, code_hash)
         
         # Fallback to temporary directory
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -102,7 +110,9 @@ class TestExecutor:
             
             # Run pytest
             try:
-                result = await self._run_pytest(temp_path)
+                test_paths = self._order_test_paths(list(test_files), phase, code_hash, project_directory)
+                result = await self._run_pytest(temp_path, test_paths, self._fail_fast(phase))
+                self._record_timings(result, code_hash, project_directory)
                 return self._parse_pytest_result(result, phase, len(test_files))
             except Exception as e:
                 logger.error(f"Error executing Python tests: {str(e)}")
@@ -116,8 +126,59 @@ class TestExecutor:
                     output=str(e)
                 )
     
-    async def _run_pytest(self, test_dir: Path) -> subprocess.CompletedProcess:
-        """Run pytest and return result"""
+    def _fail_fast(self, phase: TDDPhase) -> bool:
+        """RED phase only needs to observe one failure"""
+        return phase == TDDPhase.RED and self.fail_fast_red_phase
+    
+    def _order_test_paths(
+        self,
+        test_paths: List[str],
+        phase: TDDPhase,
+        code_hash: str,
+        project_directory: Optional[Path]
+    ) -> List[str]:
+        """Order test files using recorded durations"""
+        if not self.track_timing:
+            return test_paths
+        history = self._timing_history(project_directory)
+        if phase == TDDPhase.RED:
+            return history.order_for_red_phase(test_paths, code_hash)
+        return history.order_slowest_first(test_paths, code_hash)
+    
+    def _record_timings(
+        self,
+        result: subprocess.CompletedProcess,
+        code_hash: str,
+        project_directory: Optional[Path]
+    ):
+        """Store per-test durations from a pytest run"""
+        if not self.track_timing:
+            return
+        history = self._timing_history(project_directory)
+        if history.record_run(result.stdout + "\n" + result.stderr, code_hash):
+            history.save()
+    
+    def get_timing_report(self, project_directory: Optional[Path] = None) -> Dict:
+        """Percentile timing report for a project's tests"""
+        return self._timing_history(project_directory).get_timing_report()
+    
+    def _timing_history(self, project_directory: Optional[Path]) -> TestTimingHistory:
+        """Timing history of the project, stored with the project rather than the cwd"""
+        return get_test_timing_history(project_directory or self.history_dir)
+    
+    async def _run_pytest(
+        self,
+        test_dir: Path,
+        test_paths: Optional[List[str]] = None,
+        fail_fast: bool = False
+    ) -> subprocess.CompletedProcess:
+        """Run pytest and return result
+        
+        Args:
+            test_dir: Directory to run pytest in
+            test_paths: Optional test files (relative to test_dir) in run order
+            fail_fast: Stop at the first failing test
+        """
         # Try different pytest commands
         pytest_commands = [
             ["python", "-m", "pytest"],
@@ -129,13 +190,16 @@ class TestExecutor:
             try:
                 # Build full command
                 if "pytest" in " ".join(base_cmd):
-                    cmd = base_cmd + [
-                        str(test_dir),
+                    cmd = base_cmd + (test_paths or [str(test_dir)]) + [
                         "-v",
                         "--tb=short",
                         "--no-header",
                         "-q"
                     ]
+                    if self.track_timing:
+                        cmd.extend(["--durations=0", "--durations-min=0"])
+                    if fail_fast:
+                        cmd.append("-x")
                     
                     # Add JSON report if pytest-json-report is available
                     try:
@@ -191,7 +255,12 @@ class TestExecutor:
             stderr=error_msg
         )
     
-    async def _run_tests_in_directory(self, directory: Path, phase: TDDPhase) -> TestExecutionResult:
+    async def _run_tests_in_directory(
+        self,
+        directory: Path,
+        phase: TDDPhase,
+        code_hash: str = ""
+    ) -> TestExecutionResult:
         """Run tests in a specific directory"""
         try:
             # Count test files
@@ -211,7 +280,14 @@ class TestExecutor:
                 )
             
             # Run pytest in the directory
-            result = await self._run_pytest(directory)
+            test_paths = self._order_test_paths(
+                list(dict.fromkeys(str(f.relative_to(directory)) for f in test_files)),
+                phase,
+                code_hash,
+                directory
+            )
+            result = await self._run_pytest(directory, test_paths, self._fail_fast(phase))
+            self._record_timings(result, code_hash, directory)
             return self._parse_pytest_result(result, phase, len(test_files))
             
         except Exception as e:
@@ -20,3 +20,140 @@ EXECUTION_CONFIG = {
 # Generated code output path
 # Controls where the executor agent saves generated project files
 GENERATED_CODE_PATH = "./generated"  # Path relative to project root
+
+# Shared dependency cache for generated projects
+# Wheels and the npm cache are shared across projects, and installed
+# environments are snapshotted by their normalized dependency set
+DEPENDENCY_CACHE_CONFIG = {
+    "enabled": True,
+    "cache_dir": None,  # Defaults to ~/.cache/agent_blackwell/dependencies
+    "offline": False,  # Install only from the local cache (no index access)
+    "snapshots": True,  # Reuse installed environments for identical dependency sets
+    "max_snapshots": 20  # Least recently used snapshots beyond this are removed
+}
+
+# Compose stack reuse for multi-container validation
+# Stacks with identical service definitions are kept running between
+# validations; database state is reset and application services restarted
+COMPOSE_STACK_CONFIG = {
+    "reuse": True,
+    "idle_timeout": 600,  # Seconds an unused stack is kept before teardown
+    "max_stacks": 4  # Idle stacks beyond this are torn down, least recently used first
+}
+
+# Parallel feature implementation for the MVP incremental workflow
+# Features are scheduled as a dependency DAG and start as soon as their
+# own dependencies are done. Opt-in: designs often leave dependencies
+# undeclared, and such features would then run before the code they use.
+PARALLEL_FEATURE_CONFIG = {
+    "enabled": False,
+    "max_workers": 3,  # Concurrent feature implementations
+    "feature_timeout": 900,  # Seconds per feature
+    "min_features": 2,  # Fewer features run sequentially
+    "prioritize_critical_path": True  # Start features on the longest dependency chain first
+}
+
+# Speculative retries for feature implementation
+# After the configured number of serial failures, each retry round asks the
+# coder for several candidates concurrently, validates them in separate
+# sessions and keeps the first one that passes
+SPECULATIVE_RETRY_CONFIG = {
+    "enabled": False,  # Costs up to `candidates` coder calls per round
+    "candidates": 3,  # Concurrent candidates per round
+    "max_candidates": 6,  # Coder calls per feature across all speculative rounds
+    "start_after_failures": 1,  # Serial attempts before speculating (0 = from the first attempt)
+    "round_timeout": 600  # Seconds before unfinished candidates are cancelled
+}
+
+# Model cascade routing for coder calls in the feature loops
+# Each call picks a model from model_ladder (agents/agent_configs.py) by
+# feature complexity, retry count and recorded success rates. Opt-in: it
+# can send calls to a cheaper model than the coder agents are configured with
+MODEL_ROUTING_CONFIG = {
+    "enabled": False,
+    "stats_path": None,  # Defaults to ~/.cache/agent_blackwell/model_routes.json
+    "min_samples": 3,  # Calls before a model's success rate on a route is trusted
+    "success_threshold": 0.7,  # Success rate at which a cheaper model is preferred
+    "explore_rate": 0.1  # Chance of trying one tier cheaper on a first attempt
+}
+
+# Request hedging for agent calls
+# A call still running at its agent/model p90 latency gets a duplicate
+# request and the first response wins. Only agents without side effects
+# are listed (the coder and executor write files and start containers)
+REQUEST_HEDGING_CONFIG = {
+    "enabled": False,
+    "percentile": 90,  # Latency percentile at which a duplicate is sent
+    "budget": 0.1,  # Fraction of calls per agent/model that may be duplicated
+    "min_samples": 20,  # Calls before hedging starts
+    "window": 200,  # Latency samples kept per agent/model
+    "agents": {  # Per-agent overrides; "replicas" lists base URLs for the duplicate
+        "planner_agent": {},
+        "designer_agent": {},
+        "test_writer_agent": {},
+        "feature_coder_agent": {},
+        "reviewer_agent": {"budget": 0.15},
+        "feature_reviewer_agent": {"budget": 0.15}
+    }
+}
+
+# Rate limiting of agent LLM calls per provider
+# Token buckets cap requests and tokens per minute; the number of calls in
+# flight adapts (AIMD) to latency and to 429/5xx errors. Queued calls are
+# served by priority: interactive API sessions, then normal, then batch runs
+LLM_RATE_LIMIT_CONFIG = {
+    "enabled": True,
+    "completion_tokens_estimate": 1500,  # Tokens counted for the response of each call
+    "default": {
+        "requests_per_minute": 500,
+        "tokens_per_minute": 200000,
+        "initial_concurrency": 4,
+        "min_concurrency": 1,
+        "max_concurrency": 16,
+        "latency_target": 90.0  # Seconds per agent call above which concurrency is reduced
+    },
+    "providers": {  # Per-provider overrides, keyed by the model prefix
+        "openai": {
+            "requests_per_minute": 500,
+            "tokens_per_minute": 800000,
+            "initial_concurrency": 8,
+            "max_concurrency": 32
+        }
+    }
+}
+
+# Durable workflow checkpoints
+# Completed phases and features are written to disk as the workflow runs, so
+# an interrupted run can continue with `python run.py resume <session_id>`
+CHECKPOINT_CONFIG = {
+    "enabled": True,
+    "checkpoint_dir": None,  # Defaults to ~/.cache/agent_blackwell/checkpoints
+    "keep_completed": False  # Keep the checkpoints of runs that finished
+}
+
+# Orchestrator server lifecycle (run.py)
+# The CLI probes the agent server's readiness with exponential backoff instead
+# of sleeping, and reuses a healthy server running the same code. With warm
+# standby, servers started by the CLI keep running for later invocations
+# (or start one with `python run.py orchestrator start`)
+ORCHESTRATOR_SERVER_CONFIG = {
+    "port": 8080,
+    "startup_timeout": 30,  # Seconds to wait for all agents to be registered
+    "probe_initial_delay": 0.05,  # Doubled after each failed probe...
+    "probe_max_delay": 1.0,  # ...up to this many seconds
+    "reuse_running": True,
+    "warm_standby": False,
+    "log_file": None  # Output of background servers; defaults to ~/.cache/agent_blackwell/orchestrator_server.log
+}
+
+# Record and replay of agent calls (shared/utils/agent_replay.py)
+# Record mode appends every agent call to a compressed archive; replay mode
+# answers calls from it without the agent server, so a recorded run can be
+# reproduced offline and its non-LLM work profiled
+# (`python run.py --record-agents PATH ...` / `--replay-agents PATH ...`)
+AGENT_REPLAY_CONFIG = {
+    "mode": "off",  # "off", "record" or "replay"
+    "archive": None,  # Path of the replay archive (.jsonl.gz)
+    "on_miss": "sequence",  # Unrecorded calls: "sequence" (agent's next recording), "live" or "error"
+    "replay_timing": "instant"  # "instant", or "recorded" to wait as long as the recorded call took
+}
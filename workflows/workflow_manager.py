@@ -1,14 +1,98 @@
 """
 Workflow manager for coordinating different workflow implementations.
+
+Workflow implementations are registered as entry points ("module:function")
+and only imported the first time they run, so importing this module (and
+run.py or the API on top of it) doesn't pay for every workflow, the Docker
+SDK and the agent frameworks up front. Use verify_imports() (or
+`python run.py diagnose`) to check that all of them can be imported.
 """
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import asyncio
 import traceback
 import importlib
 
-# Import verification function
-def verify_imports():
-    """Verify all imports are working correctly and print diagnostics"""
+# Import shared data models
+from shared.data_models import (
+    TeamMember, 
+    TeamMemberResult, 
+    CodingTeamInput
+)
+
+from workflows.monitoring import WorkflowExecutionTracer, WorkflowExecutionReport
+from workflows.checkpoint_store import WorkflowCheckpoint
+from shared.utils.prompt_builder import prompt_cache_scope
+
+
+# Workflow entry points, imported on first use
+WORKFLOW_REGISTRY: Dict[str, str] = {
+    "tdd": "workflows.tdd.tdd_workflow:execute_tdd_workflow",
+    "full": "workflows.full.full_workflow:execute_full_workflow",
+    "enhanced_full": "workflows.full.enhanced_full_workflow:execute_enhanced_full_workflow",
+    "incremental": "workflows.incremental.incremental_workflow:execute_incremental_workflow",
+    "mvp_incremental": "workflows.mvp_incremental.mvp_incremental:execute_mvp_incremental_workflow",
+    "mvp_incremental_tdd": "workflows.mvp_incremental.mvp_incremental_tdd:execute_mvp_incremental_tdd_workflow",
+    "individual": "workflows.individual.individual_workflow:execute_individual_workflow",
+}
+
+# Alternative names accepted for registered workflows
+WORKFLOW_ALIASES: Dict[str, str] = {
+    "tdd_workflow": "tdd",
+    "full_workflow": "full",
+    "enhanced_full_workflow": "enhanced_full",
+    "incremental_workflow": "incremental",
+    "mvp_incremental_workflow": "mvp_incremental",
+    "mvp_tdd": "mvp_incremental_tdd",
+}
+
+# Single steps run through the individual workflow
+INDIVIDUAL_STEPS = ["planning", "design", "test_writing", "implementation", "review"]
+
+_resolved_workflows: Dict[str, Callable] = {}
+
+
+def register_workflow(name: str, entry_point: str, aliases: Optional[List[str]] = None):
+    """
+    Register a workflow implementation.
+    
+    Args:
+        name: Workflow type
+        entry_point: "module:function" of the async workflow function
+        aliases: Alternative names for the workflow type
+    """
+    WORKFLOW_REGISTRY[name] = entry_point
+    for alias in aliases or []:
+        WORKFLOW_ALIASES[alias] = name
+    _resolved_workflows.pop(name, None)
+
+
+def resolve_workflow_name(workflow_type: str) -> Optional[str]:
+    """Registered workflow name for a workflow type or alias, or None if unknown"""
+    workflow_type = WORKFLOW_ALIASES.get(workflow_type, workflow_type)
+    if workflow_type in INDIVIDUAL_STEPS:
+        return "individual"
+    return workflow_type if workflow_type in WORKFLOW_REGISTRY else None
+
+
+def get_workflow_function(workflow_type: str) -> Callable:
+    """
+    Import (once) and return the workflow function for a workflow type.
+    
+    Raises:
+        ValueError: If the workflow type is not registered
+    """
+    name = resolve_workflow_name(workflow_type)
+    if name is None:
+        raise ValueError(f"Unknown workflow type: {workflow_type}")
+    if name not in _resolved_workflows:
+        module_name, function_name = WORKFLOW_REGISTRY[name].split(":")
+        module = importlib.import_module(module_name)
+        _resolved_workflows[name] = getattr(module, function_name)
+    return _resolved_workflows[name]
+
+
+def verify_imports() -> bool:
+    """Verify all workflow imports are working correctly and log diagnostics"""
     import logging
     logger = logging.getLogger("workflow_manager")
     logger.debug("\n===== WORKFLOW IMPORT VERIFICATION =====")
@@ -23,13 +107,12 @@ def verify_imports():
     
     import_checks = {
         "shared.data_models": ["TeamMember", "TeamMemberResult", "CodingTeamInput", "WorkflowStep"],
-        "workflows.tdd.tdd_workflow": ["execute_tdd_workflow"],
-        "workflows.full.full_workflow": ["execute_full_workflow"],
-        "workflows.individual.individual_workflow": ["execute_individual_workflow"],
-        "workflows.incremental.incremental_workflow": ["execute_incremental_workflow"],
-        "workflows.mvp_incremental.mvp_incremental": ["execute_mvp_incremental_workflow"],
-        "workflows.monitoring": ["WorkflowExecutionTracer", "WorkflowExecutionReport"]
+        "workflows.monitoring": ["WorkflowExecutionTracer", "WorkflowExecutionReport"],
+        "agents.executor.docker_manager": ["DockerEnvironmentManager"]
     }
+    for entry_point in WORKFLOW_REGISTRY.values():
+        module_name, function_name = entry_point.split(":")
+        import_checks.setdefault(module_name, []).append(function_name)
     
     all_imports_successful = True
     
@@ -72,33 +155,14 @@ def verify_imports():
     
     return all_imports_successful
 
-# Run import verification
-verify_imports()
 
-# Import shared data models
-from shared.data_models import (
-    TeamMember, 
-    TeamMemberResult, 
-    CodingTeamInput
-)
-
-# Import workflow implementations
-from workflows.tdd.tdd_workflow import execute_tdd_workflow
-from workflows.full.full_workflow import execute_full_workflow
-from workflows.full.enhanced_full_workflow import execute_enhanced_full_workflow
-from workflows.individual.individual_workflow import execute_individual_workflow
-from workflows.incremental.incremental_workflow import execute_incremental_workflow
-from workflows.mvp_incremental.mvp_incremental import execute_mvp_incremental_workflow
-from workflows.mvp_incremental.mvp_incremental_tdd import execute_mvp_incremental_tdd_workflow
-from workflows.monitoring import WorkflowExecutionTracer, WorkflowExecutionReport
-
-# Import Docker manager for cleanup
-from agents.executor.docker_manager import DockerEnvironmentManager
-
-# Import core initialization
-from core.initialize import initialize_core
-
-# Core will be initialized when needed
+async def cleanup_docker_session(session_id: str):
+    """Remove the Docker containers of an executor session"""
+    # Imported here so the Docker SDK is only loaded when there is something to clean up
+    from agents.executor.docker_manager import DockerEnvironmentManager
+    docker_manager = DockerEnvironmentManager(session_id)
+    await docker_manager.initialize()
+    await docker_manager.cleanup_session(session_id)
 
 
 _core_initialized = False
@@ -179,44 +243,25 @@ async def execute_workflow(input_data: CodingTeamInput,
         logger.debug(f"🚀 Executing {workflow_type} workflow...")
         
         # Execute the appropriate workflow with monitoring
-        if workflow_type == "tdd" or workflow_type == "tdd_workflow":
-            logger.debug(f"🧪 Executing TDD (Test-Driven Development) workflow")
-            results = await execute_tdd_workflow(input_data, tracer)
-            logger.debug(f"✅ TDD workflow completed successfully")
-        elif workflow_type == "full" or workflow_type == "full_workflow":
-            logger.debug(f"📋 Executing full workflow")
-            results = await execute_full_workflow(input_data, tracer)
-            logger.debug(f"✅ Full workflow completed successfully")
-        elif workflow_type == "enhanced_full" or workflow_type == "enhanced_full_workflow":
-            logger.debug(f"🚀 Executing enhanced full workflow")
-            results = await execute_enhanced_full_workflow(input_data, tracer=tracer)
-            logger.debug(f"✅ Enhanced full workflow completed successfully")
-        elif workflow_type == "incremental" or workflow_type == "incremental_workflow":
-            logger.debug(f"🔄 Executing incremental workflow")
-            results = await execute_incremental_workflow(input_data, tracer)
-            logger.debug(f"✅ Incremental workflow completed successfully")
-        elif workflow_type == "mvp_incremental" or workflow_type == "mvp_incremental_workflow":
-            logger.debug(f"🎯 Executing MVP incremental workflow")
-            results = await execute_mvp_incremental_workflow(input_data, tracer)
-            logger.debug(f"✅ MVP incremental workflow completed successfully")
-        elif workflow_type == "mvp_incremental_tdd" or workflow_type == "mvp_tdd":
-            logger.debug(f"🧪 Executing MVP incremental TDD workflow")
-            results = await execute_mvp_incremental_tdd_workflow(input_data, tracer)
-            logger.debug(f"✅ MVP incremental TDD workflow completed successfully")
-        elif workflow_type in ["individual", "planning", "design", "test_writing", "implementation", "review"]:
-            # For individual workflows, set the step type if not already set
-            if workflow_type != "individual" and not input_data.step_type:
-                logger.debug(f"🎯 Setting step type to '{workflow_type}' for individual workflow")
-                input_data.step_type = workflow_type
-            logger.debug(f"👤 Executing individual workflow: {input_data.step_type or workflow_type}")
-            results = await execute_individual_workflow(input_data, tracer)
-            logger.debug(f"✅ Individual workflow completed successfully")
-        else:
+        workflow_name = resolve_workflow_name(workflow_type)
+        if workflow_name is None:
             error_msg = f"Unknown workflow type: {workflow_type}. Valid types are: tdd, full, enhanced_full, incremental, mvp_incremental, mvp_incremental_tdd, mvp_tdd, flagship, individual, planning, design, test_writing, implementation, review"
             logger.error(f"❌ {error_msg}")
             tracer.complete_execution(error=error_msg)
             raise ValueError(error_msg)
         
+        if workflow_type in INDIVIDUAL_STEPS and not input_data.step_type:
+            # For individual workflows, set the step type if not already set
+            logger.debug(f"🎯 Setting step type to '{workflow_type}' for individual workflow")
+            input_data.step_type = workflow_type
+        
+        workflow_function = get_workflow_function(workflow_name)
+        logger.debug(f"📋 Executing {workflow_name} workflow")
+        # Prompt prefix reuse is measured per workflow run
+        with prompt_cache_scope():
+            results = await workflow_function(input_data, tracer=tracer)
+        logger.debug(f"✅ {workflow_name} workflow completed successfully")
+        
         logger.debug(f"📈 Processing workflow results...")
         
         # Ensure results is a list
@@ -372,9 +417,7 @@ async def execute_workflow(input_data: CodingTeamInput,
             if session_id_for_cleanup:
                 try:
                     logger.info(f"\n🧹 Initiating Docker cleanup for session: {session_id_for_cleanup}")
-                    docker_manager = DockerEnvironmentManager(session_id_for_cleanup)
-                    await docker_manager.initialize()
-                    await docker_manager.cleanup_session(session_id_for_cleanup)
+                    await cleanup_docker_session(session_id_for_cleanup)
                     logger.info(f"✅ Docker cleanup completed for session: {session_id_for_cleanup}")
                 except Exception as cleanup_error:
                     logger.warning(f"⚠️  Docker cleanup failed: {str(cleanup_error)}")
@@ -407,14 +450,44 @@ async def execute_workflow(input_data: CodingTeamInput,
                     # Try to find any executor sessions from tracer
                     if hasattr(tracer, 'execution_id'):
                         logger.debug(f"\n🧹 Running backup Docker cleanup for execution: {tracer.execution_id}")
-                        docker_manager = DockerEnvironmentManager(tracer.execution_id)
-                        await docker_manager.initialize()
-                        await docker_manager.cleanup_session(tracer.execution_id)
+                        await cleanup_docker_session(tracer.execution_id)
             except Exception as cleanup_error:
                 logger.debug(f"⚠️  Backup Docker cleanup failed: {str(cleanup_error)}")
                 # Silent fail - don't break workflow due to cleanup
 
 
+# Workflows that checkpoint their progress and can be resumed
+RESUMABLE_WORKFLOWS = ["enhanced_full", "mvp_incremental"]
+
+
+async def resume(session_id: str,
+                 tracer: Optional[WorkflowExecutionTracer] = None) -> Tuple[List[TeamMemberResult], WorkflowExecutionReport]:
+    """
+    Resume an interrupted workflow run from its checkpoint.
+    
+    Completed phases and features are restored from the checkpoint; the rest
+    of the workflow runs as usual.
+    
+    Args:
+        session_id: Checkpoint session id printed when the run started
+        tracer: Optional tracer for monitoring execution
+        
+    Returns:
+        Tuple of (team member results, execution report)
+    """
+    checkpoint = WorkflowCheckpoint.load(session_id)
+    if checkpoint is None:
+        raise ValueError(f"No checkpoint found for session {session_id}")
+    if checkpoint.workflow_type not in RESUMABLE_WORKFLOWS:
+        raise ValueError(f"Workflow type {checkpoint.workflow_type} cannot be resumed. "
+                         f"Resumable types are: {', '.join(RESUMABLE_WORKFLOWS)}")
+    if checkpoint.status == "completed":
+        raise ValueError(f"Session {session_id} already completed")
+    
+    input_data = checkpoint.get_input()
+    return await execute_workflow(input_data, tracer)
+
+
 # Legacy support functions
 async def run_workflow(workflow_type: str, requirements: str, 
                       team_members: Optional[List[str]] = None) -> List[TeamMemberResult]: